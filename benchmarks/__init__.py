@@ -0,0 +1,10 @@
+"""
+效能基準測試套件 - 分別測量模擬和繪製的熱點路徑\n
+\n
+使用方式（在專案根目錄執行）:\n
+python -m benchmarks run --output results/bench_<commit>.json\n
+python -m benchmarks compare results/bench_old.json results/bench_new.json --threshold 0.15\n
+\n
+世界以 config/cupertino_map_edited.csv 和 scripts/expand_map.py 產生的較大合成地圖建立，\n
+每個測試項目可以對實體數量做掃描，結果寫成 JSON 方便在不同提交之間比較\n
+"""
@@ -0,0 +1,105 @@
+######################載入套件######################
+import argparse
+import os
+import sys
+
+# 在專案根目錄執行，地圖和圖片都以相對路徑讀取
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+######################子命令######################
+def command_run(args):
+    """
+    執行基準測試並寫出結果\n
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+    os.chdir(PROJECT_ROOT)
+    sys.path.insert(0, os.path.abspath(PROJECT_ROOT))
+
+    import pygame
+    from benchmarks.world import WorldCache, ensure_display
+    from benchmarks.cases import BENCHMARK_CASES
+    from benchmarks.runner import run_benchmarks, write_results
+
+    pygame.init()
+    try:
+        ensure_display()
+        results = run_benchmarks(BENCHMARK_CASES, WorldCache(), args.quick, args.filter, args.verbose)
+    finally:
+        pygame.quit()
+
+    if output:
+        write_results(results, output)
+        print(f"結果已寫入 {output}")
+
+    if baseline:
+        from benchmarks.runner import load_results
+        return report_comparison(load_results(baseline), results, args.threshold)
+    return 0
+
+
+def command_compare(args):
+    """
+    比較兩個結果檔案，有退步時回傳非零結束碼\n
+    """
+    from benchmarks.runner import load_results
+
+    return report_comparison(load_results(args.baseline), load_results(args.current), args.threshold)
+
+
+def report_comparison(baseline, current, threshold):
+    """
+    印出比較表\n
+    \n
+    回傳:\n
+    int: 結束碼，有任何項目退步超過門檻時為 1\n
+    """
+    from benchmarks.runner import compare_results
+
+    comparisons = compare_results(baseline, current, threshold)
+    print(f"基準: {baseline['metadata'].get('commit')}  目前: {current['metadata'].get('commit')}  門檻: {threshold:.0%}")
+    for item in comparisons:
+        mark = "❌ 退步" if item["regressed"] else ("✅ 進步" if item["change"] < -threshold else "  持平")
+        print(f"{mark}  {item['key']:<70} {item['baseline_ms']:10.3f} → {item['current_ms']:10.3f} ms  {item['change']:+7.1%}")
+
+    regressions = [item for item in comparisons if item["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} 個項目退步超過 {threshold:.0%}")
+        return 1
+    print("沒有項目退步")
+    return 0
+
+
+######################主程式######################
+def main():
+    """
+    基準測試命令列入口\n
+    """
+    from benchmarks.runner import DEFAULT_REGRESSION_THRESHOLD
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="小鎮生活模擬器效能基準測試")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="執行基準測試")
+    run_parser.add_argument("--output", help="結果 JSON 路徑")
+    run_parser.add_argument("--quick", action="store_true", help="快速模式：較少的參數組合和較短的量測時間")
+    run_parser.add_argument("--filter", help="只執行名稱包含這個字串的項目")
+    run_parser.add_argument("--baseline", help="執行完後和這個結果檔案比較")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="退步門檻（比例）")
+    run_parser.add_argument("--verbose", action="store_true", help="顯示遊戲系統的輸出")
+    run_parser.set_defaults(handler=command_run)
+
+    compare_parser = subparsers.add_parser("compare", help="比較兩個結果檔案")
+    compare_parser.add_argument("baseline", help="基準結果 JSON")
+    compare_parser.add_argument("current", help="目前結果 JSON")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="退步門檻（比例）")
+    compare_parser.set_defaults(handler=command_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+main()
@@ -0,0 +1,243 @@
+######################載入套件######################
+import os
+import random
+import tempfile
+import pygame
+from config.settings import *
+from src.systems.projectile_system import PROJECTILE_OWNER_BB_GUN
+
+# 每個測試項目建立輸入資料用的亂數種子
+CASE_SEED = 7
+
+# 模擬測試的固定 dt（60 FPS）
+FRAME_DT = 1 / 60
+
+
+######################測試項目######################
+class BenchmarkCase:
+    """
+    基準測試項目 - 一條要量的熱點路徑和它的參數掃描\n
+    \n
+    setup(worlds, **params) 回傳要計時的函式，\n
+    或 (要計時的函式, 每次計時前呼叫的準備函式)，準備函式的時間不計入\n
+    """
+
+    def __init__(self, name, description, setup, sweep, quick_sweep=None):
+        """
+        參數:\n
+        name (str): 測試項目名稱\n
+        description (str): 說明\n
+        setup (callable): 建立計時函式\n
+        sweep (list): 完整模式的參數組合列表\n
+        quick_sweep (list): 快速模式的參數組合列表，None 表示只跑 sweep 的第一組\n
+        """
+        self.name = name
+        self.description = description
+        self.setup = setup
+        self.sweep = sweep
+        self.quick_sweep = quick_sweep if quick_sweep is not None else sweep[:1]
+
+    def get_sweep(self, quick=False):
+        """
+        取得要執行的參數組合\n
+        """
+        return self.quick_sweep if quick else self.sweep
+
+
+class BenchmarkTarget:
+    """
+    子彈碰撞測試用的靜態目標（只有碰撞框，不會受傷）\n
+    """
+
+    def __init__(self, x, y, size=30):
+        self.rect = pygame.Rect(int(x), int(y), size, size)
+
+
+######################模擬熱點######################
+def setup_find_path(worlds, map_size=None, layout="town", queries=20):
+    """
+    NPC 人行道 A* 尋路：每次計時跑 queries 組固定的起終點\n
+    \n
+    layout="town" 使用小鎮的人行道佈局（起終點取自最大的相連區塊）\n
+    layout="open" 使用整張都是人行道的格子地圖，量長距離尋路的成本\n
+    """
+    from src.systems.tile_system import TileMapManager, TileType
+
+    world = worlds.get(map_size=map_size)
+    if layout == "open":
+        tile_map = TileMapManager(world.map_pixel_width, world.map_pixel_height, grid_size=world.tile_map.grid_size)
+        for row in tile_map.grid:
+            for tile in row:
+                tile.tile_type = TileType.SIDEWALK
+        positions = [tile_map.grid_to_world(x, y) for y in range(tile_map.grid_height) for x in range(tile_map.grid_width)]
+        queries = min(queries, 5)
+    else:
+        tile_map = world.tile_map
+        positions = world.get_largest_sidewalk_network()
+
+    rng = random.Random(CASE_SEED)
+    pairs = [(rng.choice(positions), rng.choice(positions)) for _ in range(queries)]
+
+    def run():
+        for start, end in pairs:
+            tile_map.find_path_for_npc(start, end)
+
+    return run
+
+
+def setup_npc_update(worlds, npc_count=None):
+    """
+    NPCManager.update 一幀\n
+    """
+    world = worlds.get(npc_count=npc_count)
+    npc_manager = world.npc_manager
+    player_position = world.get_player_position()
+
+    def run():
+        npc_manager.update(FRAME_DT, player_position)
+
+    return run
+
+
+def setup_wildlife_update(worlds, animal_scale=1.0):
+    """
+    WildlifeManager.update 一幀\n
+    """
+    world = worlds.get(animal_scale=animal_scale)
+    wildlife_manager = world.wildlife_manager
+    player_position = world.get_player_position()
+
+    def run():
+        wildlife_manager.update(FRAME_DT, player_position, "town")
+
+    return run
+
+
+def setup_bullet_collisions(worlds, bullets=500, targets=50):
+    """
+    ShootingSystem.check_bullet_collisions：bullets 發子彈對 targets 個目標\n
+    \n
+    命中的子彈會被移除，所以每次計時前重新放置同一批子彈\n
+    """
+    world = worlds.get()
+    shooting_system = world.shooting_system
+    projectiles = shooting_system.projectiles
+    rng = random.Random(CASE_SEED)
+    width, height = world.map_pixel_width, world.map_pixel_height
+    target_list = [BenchmarkTarget(rng.uniform(0, width), rng.uniform(0, height)) for _ in range(targets)]
+    bullet_list = [((rng.uniform(0, width), rng.uniform(0, height)), (rng.uniform(0, width), rng.uniform(0, height)))
+                   for _ in range(bullets)]
+
+    def prepare():
+        projectiles.clear()
+        for start, target in bullet_list:
+            projectiles.spawn(start, target, 1, shooting_system.BULLET_SPEED, shooting_system.BULLET_MAX_LIFE,
+                              shooting_system.BULLET_RADIUS, PROJECTILE_OWNER_BB_GUN)
+
+    def run():
+        shooting_system.check_bullet_collisions(target_list)
+
+    return run, prepare
+
+
+######################繪製和載入熱點######################
+def setup_draw_terrain(worlds, map_size=None):
+    """
+    TerrainBasedSystem.draw_terrain_layer 繪製到離屏表面，攝影機依序走過固定的位置\n
+    """
+    world = worlds.get(map_size=map_size)
+    terrain_system = world.terrain_system
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(CASE_SEED)
+    max_x = max(0, world.map_pixel_width - SCREEN_WIDTH)
+    max_y = max(0, world.map_pixel_height - SCREEN_HEIGHT)
+    cameras = [(rng.uniform(0, max_x), rng.uniform(0, max_y)) for _ in range(16)]
+    state = {"index": 0}
+
+    def run():
+        camera_x, camera_y = cameras[state["index"] % len(cameras)]
+        state["index"] += 1
+        terrain_system.draw_terrain_layer(surface, camera_x, camera_y)
+
+    return run
+
+
+def setup_load_terrain(worlds, map_size=None):
+    """
+    TerrainBasedSystem.load_terrain_map：從檔案載入地圖並分析地形\n
+    """
+    from src.systems.terrain_based_system import TerrainBasedSystem
+    from benchmarks.world import BASE_MAP_PATH, get_synthetic_map
+
+    world = worlds.get()
+    map_path = BASE_MAP_PATH if map_size is None else get_synthetic_map(map_size)
+
+    def run():
+        TerrainBasedSystem(world.player).load_terrain_map(map_path)
+
+    return run
+
+
+def setup_save_load(worlds, operation="save"):
+    """
+    手機存檔、讀檔（寫到暫存目錄，不影響玩家的存檔）\n
+    """
+    from src.utils.phone_ui import PhoneUI
+
+    world = worlds.get()
+    phone_ui = PhoneUI()
+    phone_ui.save_file = os.path.join(tempfile.mkdtemp(prefix="town_benchmark_save_"), "game_save.json")
+    phone_ui.save_game(world.player, world.time_manager)
+
+    if operation == "save":
+        def run():
+            phone_ui.save_game(world.player, world.time_manager)
+    else:
+        def run():
+            phone_ui.load_game()
+
+    return run
+
+
+######################測試項目列表######################
+BENCHMARK_CASES = [
+    BenchmarkCase(
+        "tile_map.find_path_for_npc", "NPC 人行道 A* 尋路",
+        setup_find_path,
+        [{"layout": "town"}, {"layout": "town", "map_size": 200}, {"layout": "open"}],
+        [{"layout": "town"}, {"layout": "open"}],
+    ),
+    BenchmarkCase(
+        "npc_manager.update", "NPC 更新一幀",
+        setup_npc_update,
+        [{"npc_count": 50}, {"npc_count": 99}, {"npc_count": 200}, {"npc_count": 400}],
+        [{"npc_count": 99}],
+    ),
+    BenchmarkCase(
+        "wildlife_manager.update", "野生動物更新一幀",
+        setup_wildlife_update,
+        [{"animal_scale": 1.0}, {"animal_scale": 2.0}, {"animal_scale": 4.0}],
+    ),
+    BenchmarkCase(
+        "shooting_system.check_bullet_collisions", "子彈碰撞檢查",
+        setup_bullet_collisions,
+        [{"bullets": bullets, "targets": targets} for bullets in (100, 1000, 5000) for targets in (50, 500)],
+        [{"bullets": 1000, "targets": 50}],
+    ),
+    BenchmarkCase(
+        "terrain_system.draw_terrain_layer", "地形層繪製到離屏表面",
+        setup_draw_terrain,
+        [{"map_size": None}, {"map_size": 200}],
+    ),
+    BenchmarkCase(
+        "terrain_system.load_terrain_map", "載入地形地圖並分析地形",
+        setup_load_terrain,
+        [{"map_size": None}, {"map_size": 200}],
+    ),
+    BenchmarkCase(
+        "phone_ui.save_load", "存檔和讀檔",
+        setup_save_load,
+        [{"operation": "save"}, {"operation": "load"}],
+        [{"operation": "save"}, {"operation": "load"}],
+    ),
+]
@@ -0,0 +1,218 @@
+######################載入套件######################
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+import pygame
+
+# 結果檔案格式版本
+RESULTS_VERSION = 1
+
+# 預設的退步門檻（中位數慢 15% 以上視為退步）
+DEFAULT_REGRESSION_THRESHOLD = 0.15
+
+# 每組參數至少量幾次、最少量多久（秒）、最多量幾次
+MIN_SAMPLES = 5
+MIN_SAMPLE_TIME = 1.0
+QUICK_MIN_SAMPLE_TIME = 0.2
+MAX_SAMPLES = 500
+
+
+######################執行測試######################
+def run_benchmarks(cases, worlds, quick=False, name_filter=None, verbose=False):
+    """
+    執行基準測試\n
+    \n
+    每組參數先暖身一次，之後至少量 MIN_SAMPLES 次且累計超過最短時間\n
+    建立世界和暖身時遊戲系統的輸出會被隱藏（verbose 時保留）\n
+    \n
+    參數:\n
+    cases (list): BenchmarkCase 列表\n
+    worlds (WorldCache): 測試世界快取\n
+    quick (bool): 快速模式（較少參數組合、較短量測時間）\n
+    name_filter (str): 只執行名稱包含這個字串的項目\n
+    verbose (bool): 是否顯示遊戲系統的輸出\n
+    \n
+    回傳:\n
+    dict: 可以寫成 JSON 的測試結果\n
+    """
+    min_time = QUICK_MIN_SAMPLE_TIME if quick else MIN_SAMPLE_TIME
+    results = []
+
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+
+        for params in case.get_sweep(quick):
+            key = make_result_key(case.name, params)
+            print(f"▶ {key}", flush=True)
+
+            with _quiet(not verbose):
+                prepared = case.setup(worlds, **params)
+                run, prepare = prepared if isinstance(prepared, tuple) else (prepared, None)
+                if prepare:
+                    prepare()
+                run()  # 暖身
+
+                samples = _measure(run, prepare, min_time)
+
+            stats = summarize_samples(samples)
+            results.append({
+                "key": key,
+                "case": case.name,
+                "params": params,
+                "stats": stats,
+            })
+            print(f"  中位數 {stats['median_ms']:.3f} ms（{stats['samples']} 次，最快 {stats['min_ms']:.3f} ms）", flush=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": get_environment_metadata(quick),
+        "results": results,
+    }
+
+
+def _measure(run, prepare, min_time):
+    """
+    重複計時直到達到最少次數和最短時間\n
+    \n
+    回傳:\n
+    list: 每次的耗時（毫秒）\n
+    """
+    samples = []
+    perf_counter = time.perf_counter
+    total = 0.0
+    while len(samples) < MAX_SAMPLES and (len(samples) < MIN_SAMPLES or total < min_time):
+        if prepare:
+            prepare()
+        start = perf_counter()
+        run()
+        elapsed = perf_counter() - start
+        total += elapsed
+        samples.append(elapsed * 1000)
+    return samples
+
+
+def summarize_samples(samples):
+    """
+    計算耗時統計\n
+    \n
+    參數:\n
+    samples (list): 每次的耗時（毫秒）\n
+    \n
+    回傳:\n
+    dict: 統計結果\n
+    """
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "min_ms": round(ordered[0], 4),
+        "median_ms": round(statistics.median(ordered), 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "stdev_ms": round(statistics.stdev(ordered), 4) if len(ordered) > 1 else 0.0,
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def make_result_key(case_name, params):
+    """
+    結果的比對鍵，例如 npc_manager.update[npc_count=99]\n
+    """
+    if not params:
+        return case_name
+    formatted = ",".join(f"{name}={value}" for name, value in sorted(params.items()))
+    return f"{case_name}[{formatted}]"
+
+
+@contextlib.contextmanager
+def _quiet(enabled):
+    """
+    暫時隱藏標準輸出\n
+    """
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def get_environment_metadata(quick=False):
+    """
+    記錄執行環境，比較結果時用來確認是否在同一台機器上量的\n
+    """
+    commit = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "quick": quick,
+    }
+
+
+######################結果檔案######################
+def write_results(results, file_path):
+    """
+    把測試結果寫成 JSON\n
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+def load_results(file_path):
+    """
+    讀取測試結果 JSON\n
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        results = json.load(file)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"不支援的結果檔案版本：{file_path}")
+    return results
+
+
+def compare_results(baseline, current, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    比較兩次測試結果的中位數\n
+    \n
+    參數:\n
+    baseline (dict): 基準結果\n
+    current (dict): 目前結果\n
+    threshold (float): 退步門檻，目前 / 基準 - 1 超過這個比例就算退步\n
+    \n
+    回傳:\n
+    list: 每個共同項目的比較結果，包含 key、baseline_ms、current_ms、change、regressed\n
+    """
+    baseline_stats = {result["key"]: result["stats"] for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        before = baseline_stats.get(result["key"])
+        if before is None:
+            continue
+        before_ms = before["median_ms"]
+        after_ms = result["stats"]["median_ms"]
+        change = after_ms / before_ms - 1 if before_ms > 0 else 0.0
+        comparisons.append({
+            "key": result["key"],
+            "baseline_ms": before_ms,
+            "current_ms": after_ms,
+            "change": change,
+            "regressed": change > threshold,
+        })
+    return comparisons
@@ -0,0 +1,217 @@
+######################載入套件######################
+import os
+import random
+import tempfile
+import pygame
+import config.settings
+from config.settings import *
+from src.player.player import Player
+from src.systems.time_system import TimeManager
+from src.systems.tile_system import TileMapManager
+from src.systems.terrain_based_system import TerrainBasedSystem
+from src.systems.road_system import RoadManager
+from src.systems.npc.npc_manager import NPCManager
+from src.systems.wildlife.wildlife_manager import WildlifeManager
+from src.systems.shooting_system import ShootingSystem
+
+# 預設使用的地形地圖（和 TownScene 相同）
+BASE_MAP_PATH = "config/cupertino_map_edited.csv"
+
+# 所有世界都用同一個亂數種子建立，讓不同提交之間量的是同一個世界
+BENCHMARK_SEED = 20240611
+
+# 合成地圖的快取目錄（以 scripts/expand_map.py 產生）
+SYNTHETIC_MAP_DIRECTORY = os.path.join(tempfile.gettempdir(), "town_benchmark_maps")
+
+
+######################測試世界######################
+class BenchmarkWorld:
+    """
+    測試世界 - 和 TownScene 相同方式連接好的模擬系統，但不建立 UI 和場景\n
+    \n
+    只包含基準測試會用到的系統：地形、格子地圖、道路、NPC、野生動物、射擊\n
+    """
+
+    def __init__(self, map_path=BASE_MAP_PATH, npc_count=None, animal_scale=1.0, seed=BENCHMARK_SEED):
+        """
+        建立測試世界\n
+        \n
+        參數:\n
+        map_path (str): 地形地圖路徑（CSV 或 .terrain）\n
+        npc_count (int): NPC 數量，None 表示使用 TOTAL_TOWN_NPCS\n
+        animal_scale (float): 野生動物目標數量的倍率\n
+        seed (int): 亂數種子\n
+        """
+        random.seed(seed)
+        self.map_path = map_path
+
+        self.time_manager = TimeManager(time_scale=1.0)
+        self.player = Player()
+        self.terrain_system = TerrainBasedSystem(self.player)
+        if not self.terrain_system.load_terrain_map(map_path):
+            raise RuntimeError(f"無法載入地形地圖: {map_path}")
+
+        self.map_pixel_width = self.terrain_system.map_width * self.terrain_system.tile_size
+        self.map_pixel_height = self.terrain_system.map_height * self.terrain_system.tile_size
+        self.town_bounds = (0, 0, self.map_pixel_width, self.map_pixel_height)
+        self.player.x = self.map_pixel_width // 2
+        self.player.y = self.map_pixel_height // 2
+
+        # 格子地圖和道路（NPC 導航使用）
+        self.tile_map = TileMapManager(self.map_pixel_width, self.map_pixel_height, grid_size=20)
+        self.tile_map.create_town_layout(self.town_bounds)
+        self.road_manager = RoadManager()
+        self.road_manager.create_road_network_for_town(self.town_bounds)
+
+        # NPC
+        self.npc_manager = NPCManager(self.time_manager)
+        self.npc_manager.set_buildings_reference(self.terrain_system.buildings)
+        self.npc_manager.set_terrain_system_reference(self.terrain_system)
+        self.npc_manager.set_road_system_reference(self.road_manager)
+        self.npc_manager.set_tile_map_reference(self.tile_map)
+        self._initialize_npcs(npc_count)
+
+        # 野生動物
+        self.wildlife_manager = WildlifeManager()
+        self.wildlife_manager.set_terrain_system(self.terrain_system)
+        self.wildlife_manager.set_habitat_bounds(self.town_bounds, self.town_bounds)
+        for rarity, count in self.wildlife_manager.target_counts.items():
+            self.wildlife_manager.target_counts[rarity] = max(1, int(round(count * animal_scale)))
+        self.wildlife_manager.initialize_animals(scene_type="all")
+
+        self.shooting_system = ShootingSystem()
+
+    def _initialize_npcs(self, npc_count):
+        """
+        以指定數量建立 NPC\n
+        \n
+        NPC 數量由設定檔的職業配額決定，這裡暫時依原本的農夫比例覆寫配額\n
+        """
+        overrides = {}
+        if npc_count is not None:
+            farmer_count = round(npc_count * FARMER_COUNT / TOTAL_TOWN_NPCS)
+            overrides = {
+                "TOTAL_TOWN_NPCS": npc_count,
+                "FARMER_COUNT": farmer_count,
+                "OTHER_PROFESSIONS_COUNT": npc_count - farmer_count,
+            }
+
+        originals = {name: getattr(config.settings, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(config.settings, name, value)
+        try:
+            self.npc_manager.initialize_npcs(self.town_bounds, self.town_bounds)
+        finally:
+            for name, value in originals.items():
+                setattr(config.settings, name, value)
+
+    def get_player_position(self):
+        """
+        玩家位置（地圖中央）\n
+        """
+        return (self.player.x, self.player.y)
+
+    def get_largest_sidewalk_network(self):
+        """
+        最大一片相連的人行道、斑馬線格子的世界座標\n
+        \n
+        人行道在地圖上分成許多互不相連的區塊，隨機挑的起終點大多不在同一區塊，\n
+        尋路會立刻失敗，所以尋路測試的起終點都從最大的區塊挑\n
+        """
+        from collections import deque
+        from src.systems.tile_system import TileType
+
+        walkable = (TileType.SIDEWALK, TileType.CROSSWALK)
+        grid = self.tile_map.grid
+        visited = set()
+        largest = []
+        for row in grid:
+            for tile in row:
+                if tile.tile_type not in walkable or (tile.x, tile.y) in visited:
+                    continue
+
+                component = []
+                queue = deque([(tile.x, tile.y)])
+                visited.add((tile.x, tile.y))
+                while queue:
+                    x, y = queue.popleft()
+                    component.append((x, y))
+                    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                        if (nx, ny) in visited:
+                            continue
+                        neighbor = self.tile_map.get_tile(nx, ny)
+                        if neighbor is not None and neighbor.tile_type in walkable:
+                            visited.add((nx, ny))
+                            queue.append((nx, ny))
+
+                if len(component) > len(largest):
+                    largest = component
+
+        return [self.tile_map.grid_to_world(x, y) for x, y in sorted(largest)]
+
+
+######################世界快取######################
+class WorldCache:
+    """
+    測試世界快取 - 相同參數的世界只建立一次，讓多個測試項目共用\n
+    """
+
+    def __init__(self):
+        """
+        初始化快取\n
+        """
+        self.worlds = {}
+
+    def get(self, map_size=None, npc_count=None, animal_scale=1.0):
+        """
+        取得測試世界\n
+        \n
+        參數:\n
+        map_size (int): 合成地圖邊長（格數），None 表示使用原始地圖\n
+        npc_count (int): NPC 數量\n
+        animal_scale (float): 野生動物數量倍率\n
+        \n
+        回傳:\n
+        BenchmarkWorld: 測試世界\n
+        """
+        key = (map_size, npc_count, animal_scale)
+        world = self.worlds.get(key)
+        if world is None:
+            map_path = BASE_MAP_PATH if map_size is None else get_synthetic_map(map_size)
+            world = BenchmarkWorld(map_path, npc_count, animal_scale)
+            self.worlds[key] = world
+        return world
+
+
+def get_synthetic_map(size):
+    """
+    取得邊長為 size 的合成地圖，沒有的話用 scripts/expand_map.py 產生\n
+    \n
+    合成地圖的亂數種子固定，所以每次產生的內容都相同\n
+    \n
+    參數:\n
+    size (int): 地圖邊長（格數）\n
+    \n
+    回傳:\n
+    str: 地圖檔案路徑\n
+    """
+    from scripts.expand_map import expand_map
+
+    path = os.path.join(SYNTHETIC_MAP_DIRECTORY, f"cupertino_map_{size}x{size}.csv")
+    if not os.path.exists(path):
+        os.makedirs(SYNTHETIC_MAP_DIRECTORY, exist_ok=True)
+        state = random.getstate()
+        random.seed(BENCHMARK_SEED + size)
+        try:
+            expand_map(size, size, path, BASE_MAP_PATH)
+        finally:
+            random.setstate(state)
+    return path
+
+
+def ensure_display():
+    """
+    建立一個小的顯示表面（讀取圖片時 convert() 需要）\n
+    """
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -129,6 +129,31 @@ NPC_NEAR_DISTANCE = 300  # 完整更新距離
 NPC_MEDIUM_DISTANCE = 600  # 簡化更新距離
 NPC_FAR_DISTANCE = 1000  # 最簡化更新距離
 
+# NPC 細節層級 (LOD) 設定
+NPC_SIMULATION_RADIUS = 500  # 進入此距離時掛上行為、路徑等詳細元件
+NPC_DETAIL_RELEASE_DISTANCE = NPC_MEDIUM_DISTANCE  # 超過此距離時釋放詳細元件（遲滯避免反覆建立）
+NPC_LOD_UPDATE_INTERVAL = 10  # 每10幀檢查一次 NPC 細節層級
+
+# NPC 狀態表設定（狀態面板、資訊面板共用）
+NPC_STATUS_DISTANCE_BUCKET = 50  # 依距離排序時的距離分級（像素）
+NPC_STATUS_DISTANCE_REFRESH_INTERVAL = 0.5  # 距離分級最短重新計算間隔（秒）
+NPC_STATUS_ROW_REFRESH_INTERVAL = 0.5  # 可見列的位置文字重新整理間隔（秒）
+
+# NPC 對話設定
+NPC_CONVERSATION_HISTORY_SIZE = 10  # 每個 NPC 保留的對話歷史筆數
+
+# 防重疊傳送系統的安全位置索引格子大小（像素）
+ANTI_OVERLAP_CELL_SIZE = 20
+
+# 道路空間索引格子大小（像素），路段和路口依此分格查詢
+ROAD_SPATIAL_CELL_SIZE = 200
+
+# 道路路網 ALT 最短路徑的地標數量（越多估計越準，預處理越久）
+ROAD_GRAPH_LANDMARK_COUNT = 4
+
+# 東西向主幹道號誌依距離錯開相位，形成往東的綠波
+ROAD_GREEN_WAVE_ENABLED = True
+
 # 系統更新頻率優化
 TIME_SYSTEM_UPDATE_INTERVAL = 2  # 每2幀更新一次時間系統
 POWER_SYSTEM_UPDATE_INTERVAL = 3  # 每3幀更新一次電力系統
@@ -207,6 +232,12 @@ GUN_RANGE = 200
 # 子彈速度，單位為像素/幀 (調慢一些讓玩家更容易看見子彈飛行)
 BULLET_SPEED = 5
 
+# 子彈引擎初始陣列容量（每秒10發 x 最長存活3秒）
+PROJECTILE_INITIAL_CAPACITY = 32
+
+# 子彈碰撞粗篩的格子大小，單位為像素
+PROJECTILE_BROAD_PHASE_CELL_SIZE = 64
+
 # 初始武器設定
 INITIAL_WEAPON = "手槍"
 INITIAL_AMMO = 50
@@ -259,6 +290,9 @@ OFFICE_BUILDING_COUNT = 8  # 辦公大樓數量
 
 # 基礎設施
 POWER_PLANT_COUNT = 1  # 電力場數量
+POWER_GRID_COLUMNS = 6  # 電力區域網格欄數
+POWER_GRID_ROWS = 5  # 電力區域網格列數（6x5 = 30 個電力區域）
+POWER_WORKER_COUNT = POWER_GRID_COLUMNS * POWER_GRID_ROWS  # 電力工人數量（每區一名）
 FARM_AREA_COUNT = 5  # 農田區域數量
 
 # 蔬果園設定（新增）
@@ -405,3 +439,114 @@ CHINESE_FONTS = [
     "C:/Windows/Fonts/simhei.ttf",  # 黑體
     None,  # 預設字體 (Fallback)
 ]
+
+######################圖片資源設定######################
+# 旋轉圖片快取的角度區間（度），同一區間內的角度共用一張旋轉圖
+ASSET_ANGLE_BUCKET_DEGREES = 15
+
+# 遊戲啟動時在背景預先載入的圖片清單
+ASSET_PRELOAD_MANIFEST = [
+    "assets/images/rabbit.png",
+    "assets/images/turtle.png",
+    "assets/images/sheep.png",
+    "assets/images/山獅.png",
+    "assets/images/panther.png",
+    "assets/images/bear.png",
+    "assets/images/things/AK47.png",
+    "assets/images/things/加特靈.png",
+    "assets/images/things/SPAS12.png",
+    "assets/images/things/可樂.png",
+    "assets/images/things/薯條.png",
+    "assets/images/things/熱狗.png",
+    "assets/images/things/漢堡.png",
+    "assets/images/things/急救箱.png",
+    "assets/images/things/止痛藥.png",
+    "assets/images/things/繃帶.png",
+    "assets/images/things/帽帽.png",
+    "assets/images/things/帽衣.png",
+    "assets/images/things/衣服.png",
+    "assets/images/things/耳機.png",
+    "assets/images/things/香蕉裝.png",
+    "assets/images/playerhome/roguelikeIndoor_magenta.png",
+]
+
+######################音樂區域設定######################
+# 音樂區域切換的遲滯：離開目前區域後要再走這麼遠（格數）才切換音樂
+AUDIO_ZONE_HYSTERESIS_TILES = 2
+
+# 或是在新區域停留這麼久（秒）也會切換，站在窄小的區域裡一樣會換音樂
+AUDIO_ZONE_DWELL_TIME = 1.0
+
+# 背景音樂交叉淡入淡出時間（毫秒）
+MUSIC_CROSSFADE_MS = 1500
+
+# 最多保留幾首已解碼的背景音樂
+MUSIC_TRACK_CACHE_SIZE = 3
+
+######################野生動物生成設定######################
+# 生成時把地圖切成 N x N 個區域，優先在動物最少的區域生成
+WILDLIFE_SPAWN_REGIONS = 10
+
+# 新生成的動物和既有動物的最小距離（像素），也是間距索引的格子大小
+WILDLIFE_SPAWN_MIN_SPACING = 100
+
+# 每個區域最多抽幾個格子檢查間距，都太擠就換下一個區域
+WILDLIFE_SPAWN_SAMPLES_PER_REGION = 4
+
+######################樹木設定######################
+# 地圖上可砍伐的樹木數量（從森林的 Poisson 圓盤取樣結果中隨機挑選），None 表示種滿森林
+TREE_TARGET_COUNT = 50
+
+# 樹木之間的最小距離（像素）
+TREE_MIN_DISTANCE = 60
+
+# Poisson 圓盤取樣時每個活躍點的嘗試次數
+TREE_POISSON_ATTEMPTS = 30
+
+# 樹木索引的格子大小（像素），砍樹目標和碰撞查詢只看附近的格子
+TREE_INDEX_CELL_SIZE = 64
+
+######################地形區塊繪製設定######################
+# 地形和靜態裝飾預先烘焙成區塊圖片，每個區塊的邊長（格數）
+TERRAIN_RENDER_CHUNK_TILES = 8
+
+# 最多保留幾個烘焙好的區塊圖片（靜態層、動態層各自計算）
+TERRAIN_RENDER_CHUNK_CACHE_SIZE = 32
+
+######################模擬步長設定######################
+# 遊戲邏輯以固定步長更新（每秒次數），和畫面刷新率 FPS 無關；低階電腦可改成 30
+SIMULATION_HZ = 60
+
+# 每次畫面刷新最多追趕幾個模擬步，超過的時間直接丟掉，避免越追越慢
+MAX_SIMULATION_STEPS_PER_FRAME = 5
+
+# 單次畫面刷新最多計入的實際時間（秒），視窗拖曳、除錯中斷後不會一口氣補很多步
+MAX_FRAME_TIME = 0.25
+
+# 繪製時是否在前後兩個模擬步之間內插實體位置
+RENDER_INTERPOLATION = True
+
+# 一步內移動超過這個距離（像素）視為傳送，不內插
+RENDER_INTERPOLATION_MAX_JUMP = 200
+
+# 移動速度設定值的單位是「每 1/60 秒移動的像素數」，移動時乘上 dt * SPEED_REFERENCE_FPS
+SPEED_REFERENCE_FPS = 60
+
+# 火車在車站停留的時間（秒）
+TRAIN_STATION_WAIT_TIME = 3.0
+
+# 農夫在原地不動多久（秒）視為卡住並緊急傳送
+FARMER_STUCK_TELEPORT_TIME = 5.0
+
+# 蔬果園模擬一天所需的時間（秒）
+VEGETABLE_GARDEN_SIMULATED_DAY_TIME = 30.0
+
+######################模擬子程序設定######################
+# 是否把 NPC、野生動物、農夫排程和鐵路交給另一個程序模擬（需要支援 fork 的平台）
+SIMULATION_WORKER_ENABLED = False
+
+# 共享記憶體快照最多容納幾隻動物，超過的動物不會出現在畫面上
+SIMULATION_WORKER_ANIMAL_CAPACITY = 256
+
+# 停止模擬子程序時最多等待幾秒，超過就強制結束
+SIMULATION_WORKER_STOP_TIMEOUT = 2.0
@@ -1,7 +1,40 @@
 ######################載入套件######################
+import argparse
+import os
+import random
 import pygame
 import sys
 from src.core.game_engine import GameEngine
+from src.core.input_session import InputRecorder
+
+
+######################命令列參數######################
+def parse_arguments():
+    """
+    解析命令列參數\n
+    \n
+    --record 會把這次遊戲的輸入錄製成檔案，之後可以用 scripts/replay_session.py 重播\n
+    \n
+    回傳:\n
+    argparse.Namespace: 解析結果\n
+    """
+    parser = argparse.ArgumentParser(description="小鎮生活模擬器")
+    parser.add_argument("--record", metavar="PATH", help="把輸入錄製到指定檔案")
+    parser.add_argument("--seed", type=int, help="固定亂數種子（錄製時未指定會自動產生）")
+    parser.add_argument("--fixed-dt", type=float, help="固定每幀的 dt（秒），例如 0.016667")
+    parser.add_argument("--simulation-hz", type=int, help="每秒模擬步數（預設依設定檔，低階電腦可用 30）")
+    return parser.parse_args()
+
+
+def ensure_stable_hash_seed():
+    """
+    錄製時以固定的字串雜湊種子重新啟動程式\n
+    \n
+    集合的走訪順序會受字串雜湊影響，固定之後重播才會和錄製時走同樣的順序\n
+    """
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        environment = dict(os.environ, PYTHONHASHSEED="0")
+        os.execve(sys.executable, [sys.executable] + sys.argv, environment)
 
 
 ######################主程式######################
@@ -23,12 +56,23 @@ def main():
     - SystemExit: 正常程式結束\n
     """
     try:
+        # 錄製時要先固定字串雜湊種子（會重新啟動程式）
+        arguments = parse_arguments()
+        if arguments.record:
+            ensure_stable_hash_seed()
+
         # 初始化 Pygame，這是所有 Pygame 功能的基礎
         pygame.init()
         print("Pygame 初始化成功")
 
         # 建立遊戲引擎實例並啟動主迴圈
-        game = GameEngine()
+        if arguments.record:
+            seed = arguments.seed if arguments.seed is not None else random.randrange(2 ** 31)
+            recorder = InputRecorder(arguments.record, seed, arguments.fixed_dt)
+            game = GameEngine(seed=seed, fixed_dt=arguments.fixed_dt, load_save=False, recorder=recorder,
+                              simulation_hz=arguments.simulation_hz)
+        else:
+            game = GameEngine(seed=arguments.seed, fixed_dt=arguments.fixed_dt, simulation_hz=arguments.simulation_hz)
         print("遊戲引擎創建完成，準備開始遊戲")
 
         # 開始執行遊戲主迴圈，直到玩家退出
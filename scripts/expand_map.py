@@ -1,104 +1,146 @@
 ######################載入套件######################
+import argparse
 import csv
+import os
 import random
+import sys
+
+# 讓腳本可以從專案根目錄匯入 src 套件
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.utils.terrain_store import TerrainStore
+
+# 原始設計以 100x100 地圖為基準，其他尺寸依比例縮放
+BASE_SIZE = 100
 
 ######################地圖擴展工具######################
-def expand_map_to_100x100():
+def expand_map(width=100, height=100, output_path='config/cupertino_map_100x100.csv',
+               source_path='config/cupertino_map_edited.csv'):
     """
-    將現有的 40x30 地圖擴展為 100x100 地圖\n
+    將現有的小地圖擴展為任意大小的地圖\n
     \n
     擴展策略:\n
     1. 將原始地圖置於新地圖的左上角\n
     2. 在右側和下方用相似的地形模式填充\n
     3. 保持原有的地形分佈比例\n
+    4. 大型森林、河流、住宅區和道路網依照地圖大小等比例放置\n
+    \n
+    輸出檔案副檔名為 .terrain 時寫成區塊檔案（遊戲以 mmap 開啟，適合 2000x2000 等大地圖），\n
+    其他副檔名寫成 CSV\n
+    \n
+    參數:\n
+    width (int): 新地圖寬度（格數）\n
+    height (int): 新地圖高度（格數）\n
+    output_path (str): 輸出檔案路徑\n
+    source_path (str): 原始地圖 CSV 路徑\n
     """
     # 讀取原始地圖
     original_map = []
-    with open('config/cupertino_map_edited.csv', 'r', encoding='utf-8') as file:
+    with open(source_path, 'r', encoding='utf-8') as file:
         csv_reader = csv.reader(file)
         for row in csv_reader:
-            original_map.append([int(cell.strip()) for cell in row if cell.strip()])
-    
-    print(f"原始地圖尺寸: {len(original_map[0])}x{len(original_map)}")
-    
+            terrain_row = [int(cell.strip()) for cell in row if cell.strip()]
+            if terrain_row:
+                original_map.append(terrain_row)
+
+    original_width = len(original_map[0])
+    original_height = len(original_map)
+    print(f"原始地圖尺寸: {original_width}x{original_height}")
+
     # 分析原始地圖的地形分佈
-    terrain_stats = {}
-    total_cells = 0
-    for row in original_map:
-        for cell in row:
-            terrain_stats[cell] = terrain_stats.get(cell, 0) + 1
-            total_cells += 1
-    
+    terrain_stats = _count_terrain(bytes(row) for row in original_map)
+    total_cells = original_width * original_height
+
     print("原始地圖地形分佈:")
-    for terrain, count in sorted(terrain_stats.items()):
-        percentage = (count / total_cells) * 100
-        print(f"地形 {terrain}: {count} 個 ({percentage:.1f}%)")
-    
-    # 創建 100x100 的新地圖
-    new_map = [[0 for _ in range(100)] for _ in range(100)]
-    
+    _print_distribution(terrain_stats, total_cells)
+
+    # 創建新地圖（每列一個 bytearray，每格一個 byte）
+    new_map = [bytearray(width) for _ in range(height)]
+
     # 步驟1: 複製原始地圖到左上角
-    for y in range(min(30, 100)):
-        for x in range(min(40, 100)):
-            if y < len(original_map) and x < len(original_map[0]):
-                new_map[y][x] = original_map[y][x]
-    
-    # 步驟2: 擴展右側區域 (x: 40-99)
-    for y in range(100):
-        for x in range(40, 100):
-            if y < 30:
+    copy_width = min(original_width, width)
+    copy_height = min(original_height, height)
+    for y in range(copy_height):
+        new_map[y][:copy_width] = bytes(original_map[y][:copy_width])
+
+    # 步驟2: 擴展右側區域
+    half_width = original_width // 2
+    for y in range(height):
+        row = new_map[y]
+        for x in range(copy_width, width):
+            if y < original_height:
                 # 對於上方區域，基於鄰近的原始地圖進行擴展
-                source_x = min(39, x - 40 + 20)  # 映射到原始地圖的右側部分
-                source_y = y
-                if source_y < len(original_map):
-                    # 基於原始地形，加入一些隨機變化
-                    base_terrain = original_map[source_y][source_x]
-                    new_map[y][x] = _get_similar_terrain(base_terrain)
-                else:
-                    new_map[y][x] = _get_random_terrain_by_distribution(terrain_stats, total_cells)
+                source_x = min(original_width - 1, (x - copy_width) % (original_width - half_width) + half_width)
+                base_terrain = original_map[y][source_x]
+                row[x] = _get_similar_terrain(base_terrain)
             else:
                 # 對於下方區域，使用分佈式隨機生成
-                new_map[y][x] = _get_random_terrain_by_distribution(terrain_stats, total_cells)
-    
-    # 步驟3: 擴展下方區域 (y: 30-99)
-    for y in range(30, 100):
-        for x in range(40):
-            # 基於上方對應位置的地形
-            source_y = min(29, y - 30 + 15)  # 映射到原始地圖的下方部分
-            source_x = x
-            if source_x < len(original_map[0]):
-                base_terrain = original_map[source_y][source_x]
-                new_map[y][x] = _get_similar_terrain(base_terrain)
-            else:
-                new_map[y][x] = _get_random_terrain_by_distribution(terrain_stats, total_cells)
-    
+                row[x] = _get_random_terrain_by_distribution(terrain_stats, total_cells)
+
+    # 步驟3: 擴展下方區域
+    half_height = original_height // 2
+    for y in range(copy_height, height):
+        row = new_map[y]
+        # 基於上方對應位置的地形
+        source_y = min(original_height - 1, (y - copy_height) % (original_height - half_height) + half_height)
+        source_row = original_map[source_y]
+        for x in range(copy_width):
+            row[x] = _get_similar_terrain(source_row[x])
+
     # 步驟4: 添加一些大型區域以保持真實感
-    _add_forest_areas(new_map)
-    _add_water_areas(new_map)
-    _add_residential_areas(new_map)
-    _add_road_network(new_map)
-    
+    _add_forest_areas(new_map, width, height)
+    _add_water_areas(new_map, width, height)
+    _add_residential_areas(new_map, width, height)
+    _add_road_network(new_map, width, height)
+
     # 儲存新地圖
-    with open('config/cupertino_map_100x100.csv', 'w', newline='', encoding='utf-8') as file:
-        csv_writer = csv.writer(file)
-        for row in new_map:
-            csv_writer.writerow(row)
-    
-    print(f"新地圖已儲存為 cupertino_map_100x100.csv")
-    
+    if output_path.endswith('.terrain'):
+        store = TerrainStore.create(output_path, width, height)
+        store.write_region(0, 0, new_map)
+        store.flush()
+        store.close()
+    else:
+        with open(output_path, 'w', newline='', encoding='utf-8') as file:
+            csv_writer = csv.writer(file)
+            for row in new_map:
+                csv_writer.writerow(row)
+
+    print(f"新地圖 {width}x{height} 已儲存為 {output_path}")
+
     # 分析新地圖的地形分佈
-    new_terrain_stats = {}
-    new_total_cells = 0
-    for row in new_map:
-        for cell in row:
-            new_terrain_stats[cell] = new_terrain_stats.get(cell, 0) + 1
-            new_total_cells += 1
-    
     print("\n新地圖地形分佈:")
-    for terrain, count in sorted(new_terrain_stats.items()):
-        percentage = (count / new_total_cells) * 100
+    _print_distribution(_count_terrain(new_map), width * height)
+
+def expand_map_to_100x100():
+    """
+    將現有的地圖擴展為 100x100 地圖（原本的預設行為）\n
+    """
+    expand_map(100, 100, 'config/cupertino_map_100x100.csv')
+
+def _count_terrain(rows):
+    """
+    逐列整批統計各地形的格數\n
+    """
+    terrain_stats = {}
+    for row in rows:
+        for terrain in set(row):
+            terrain_stats[terrain] = terrain_stats.get(terrain, 0) + row.count(terrain)
+    return terrain_stats
+
+def _print_distribution(terrain_stats, total_cells):
+    """
+    輸出地形分佈\n
+    """
+    for terrain, count in sorted(terrain_stats.items()):
+        percentage = (count / total_cells) * 100
         print(f"地形 {terrain}: {count} 個 ({percentage:.1f}%)")
 
+def _scaled(value, size):
+    """
+    把 100x100 基準座標換算到實際地圖大小\n
+    """
+    return int(value * size / BASE_SIZE)
+
 def _get_similar_terrain(base_terrain):
     """
     根據基礎地形返回相似的地形類型\n
@@ -118,7 +160,7 @@ def _get_similar_terrain(base_terrain):
         10: [10, 3],      # 鐵軌 -> 鐵軌、道路
         11: [11, 6, 8]    # 火車站 -> 火車站、商業區、停車場
     }
-    
+
     possible_terrains = similar_terrains.get(base_terrain, [0])
     # 80% 機率保持原地形，20% 機率選擇相似地形
     if random.random() < 0.8:
@@ -132,76 +174,83 @@ def _get_random_terrain_by_distribution(terrain_stats, total_cells):
     """
     rand_value = random.random()
     cumulative_prob = 0
-    
+
     for terrain, count in terrain_stats.items():
         probability = count / total_cells
         cumulative_prob += probability
         if rand_value <= cumulative_prob:
             return terrain
-    
+
     return 0  # 預設返回草地
 
-def _add_forest_areas(map_data):
+def _add_forest_areas(map_data, width, height):
     """
     在新地圖中添加一些大型森林區域\n
     """
     # 在右下角添加一個大森林
-    for y in range(70, 90):
-        for x in range(70, 95):
+    for y in range(_scaled(70, height), _scaled(90, height)):
+        for x in range(_scaled(70, width), _scaled(95, width)):
             if random.random() < 0.8:
                 map_data[y][x] = 1
-    
+
     # 在中間區域添加一些小森林
-    for y in range(40, 60):
-        for x in range(50, 70):
+    for y in range(_scaled(40, height), _scaled(60, height)):
+        for x in range(_scaled(50, width), _scaled(70, width)):
             if random.random() < 0.3:
                 map_data[y][x] = 1
 
-def _add_water_areas(map_data):
+def _add_water_areas(map_data, width, height):
     """
     在新地圖中添加一些水體區域\n
     """
     # 添加一條從左下到右下的河流
-    for x in range(20, 80):
-        y = int(80 + 10 * random.random())
-        if 0 <= y < 100:
+    for x in range(_scaled(20, width), _scaled(80, width)):
+        y = int(_scaled(80, height) + _scaled(10, height) * random.random())
+        if 0 <= y < height:
             map_data[y][x] = 2
             # 河流寬度變化
-            if random.random() < 0.5 and y + 1 < 100:
+            if random.random() < 0.5 and y + 1 < height:
                 map_data[y + 1][x] = 2
 
-def _add_residential_areas(map_data):
+def _add_residential_areas(map_data, width, height):
     """
     在新地圖中添加一些住宅區\n
     """
     # 在中右區域添加住宅區
-    for y in range(10, 40):
-        for x in range(60, 85):
+    for y in range(_scaled(10, height), _scaled(40, height)):
+        for x in range(_scaled(60, width), _scaled(85, width)):
             if random.random() < 0.4:
                 map_data[y][x] = 5
-    
+
     # 在下方添加住宅區
-    for y in range(50, 80):
-        for x in range(10, 40):
+    for y in range(_scaled(50, height), _scaled(80, height)):
+        for x in range(_scaled(10, width), _scaled(40, width)):
             if random.random() < 0.3:
                 map_data[y][x] = 5
 
-def _add_road_network(map_data):
+def _add_road_network(map_data, width, height):
     """
     在新地圖中添加道路網絡\n
     """
-    # 添加主要的橫向道路
-    for x in range(100):
-        map_data[50][x] = 3  # 中央橫向道路
-        map_data[25][x] = 3  # 上方橫向道路
-        map_data[75][x] = 3  # 下方橫向道路
-    
-    # 添加主要的縱向道路
-    for y in range(100):
-        map_data[y][50] = 3  # 中央縱向道路
-        map_data[y][25] = 3  # 左側縱向道路
-        map_data[y][75] = 3  # 右側縱向道路
+    # 添加主要的橫向道路（上方、中央、下方）
+    road_row = bytes([3]) * width
+    for y in (_scaled(25, height), _scaled(50, height), _scaled(75, height)):
+        map_data[y][:] = road_row
+
+    # 添加主要的縱向道路（左側、中央、右側）
+    for x in (_scaled(25, width), _scaled(50, width), _scaled(75, width)):
+        for y in range(height):
+            map_data[y][x] = 3
 
 ######################主程式######################
 if __name__ == "__main__":
-    expand_map_to_100x100()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="擴展 Cupertino 地形地圖")
+    parser.add_argument("--width", type=int, default=100, help="新地圖寬度（格數）")
+    parser.add_argument("--height", type=int, default=100, help="新地圖高度（格數）")
+    parser.add_argument("--output", default=None,
+                        help="輸出檔案，.terrain 為區塊檔案，其他為 CSV（預設 config/cupertino_map_<寬>x<高>.csv）")
+    parser.add_argument("--source", default="config/cupertino_map_edited.csv", help="原始地圖 CSV")
+    args = parser.parse_args()
+
+    output = args.output or f"config/cupertino_map_{args.width}x{args.height}.csv"
+    expand_map(args.width, args.height, output, args.source)
@@ -0,0 +1,110 @@
+######################載入套件######################
+import argparse
+import hashlib
+import os
+import sys
+
+# 讓腳本可以從專案根目錄匯入 src 套件
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PROJECT_ROOT)
+
+
+######################輸入重播工具######################
+def replay_session(session_path, output_path, max_frames=None, headless=True):
+    """
+    用錄製的輸入重播一次 TownScene，並寫出幀時間分析報告\n
+    \n
+    引擎以錄製檔的亂數種子建立、使用模擬遊戲時鐘，不載入存檔，\n
+    所以同一份錄製檔每次重播的遊戲過程都相同，只有耗時會不同\n
+    報告中的 final_state 可以用來比對兩次重播是否一致\n
+    \n
+    參數:\n
+    session_path (str): 錄製檔路徑（main.py --record 產生）\n
+    output_path (str): 分析報告輸出路徑（JSON）\n
+    max_frames (int): 最多重播幾幀，None 表示全部\n
+    headless (bool): 是否不開視窗、不出聲音\n
+    \n
+    回傳:\n
+    dict: 分析報告的摘要\n
+    """
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    session_path = os.path.abspath(session_path)
+    output_path = os.path.abspath(output_path)
+    os.chdir(PROJECT_ROOT)  # 地圖、圖片等資源以專案根目錄的相對路徑讀取
+
+    import pygame
+    from src.core.game_engine import GameEngine
+    from src.core.input_session import InputReplayer
+    from src.core.frame_profiler import FrameProfiler
+
+    pygame.init()
+    try:
+        replayer = InputReplayer(session_path)
+        engine = GameEngine(seed=replayer.seed, fixed_dt=replayer.fixed_dt, load_save=False)
+        profiler = FrameProfiler()
+        played = engine.run_replay(replayer, profiler, max_frames)
+
+        profiler.write_report(output_path, {
+            "session": session_path,
+            "seed": replayer.seed,
+            "fixed_dt": replayer.fixed_dt,
+            "frames_recorded": len(replayer),
+            "frames_played": played,
+            "final_state": _final_state(engine),
+        })
+        return profiler.get_summary()
+    finally:
+        pygame.quit()
+
+
+def _final_state(engine):
+    """
+    重播結束時的遊戲狀態摘要，用來確認重播結果是否可重現\n
+    """
+    state = {
+        "scene": engine.scene_manager.get_current_scene_name(),
+        "game_state": engine.state_manager.current_state.value,
+        "game_time": engine.time_manager.get_time_string(),
+    }
+    player = engine.current_player
+    if player is not None:
+        state["player_position"] = [round(player.x, 3), round(player.y, 3)]
+        state["player_money"] = getattr(player, "money", None)
+        state["player_health"] = getattr(player, "health", None)
+
+    # NPC 位置的雜湊，任何一個 NPC 的行為不同都會改變
+    town_scene = engine.scene_manager.scenes.get("town")
+    if town_scene is not None and hasattr(town_scene, "npc_manager"):
+        digest = hashlib.sha1()
+        for npc in town_scene.npc_manager.all_npcs:
+            digest.update(f"{npc.x:.3f},{npc.y:.3f};".encode())
+        state["npc_positions_sha1"] = digest.hexdigest()
+    return state
+
+
+######################主程式######################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="重播錄製的輸入並分析幀時間")
+    parser.add_argument("session", help="錄製檔路徑（main.py --record 產生）")
+    parser.add_argument("--output", default=None, help="分析報告路徑（預設為錄製檔旁的 <名稱>.profile.json）")
+    parser.add_argument("--max-frames", type=int, default=None, help="最多重播幾幀")
+    parser.add_argument("--window", action="store_true", help="開啟視窗顯示重播畫面")
+    args = parser.parse_args()
+
+    # 固定字串雜湊種子，集合走訪順序才會和錄製時相同
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        environment = dict(os.environ, PYTHONHASHSEED="0")
+        os.execve(sys.executable, [sys.executable] + sys.argv, environment)
+
+    output = args.output or os.path.splitext(args.session)[0] + ".profile.json"
+    summary = replay_session(args.session, output, args.max_frames, headless=not args.window)
+
+    frame_ms = summary["frame_ms"]
+    print(f"重播 {summary['frames']} 幀，平均 {frame_ms['mean']:.2f} ms，"
+          f"p95 {frame_ms['p95']:.2f} ms，p99 {frame_ms['p99']:.2f} ms，最慢 {frame_ms['max']:.2f} ms")
+    for label, stats in list(summary["systems"].items())[:10]:
+        print(f"  {label:<40} {stats['mean_ms']:8.3f} ms/幀  {stats['share'] * 100:5.1f}%")
+    print(f"報告已寫入 {output}")
@@ -0,0 +1,188 @@
+######################載入套件######################
+import json
+import math
+import os
+import time
+
+
+# 會被計時的方法名稱（以及所有 draw_ 開頭的方法）
+PROFILED_METHOD_NAMES = ("update", "draw")
+
+
+######################幀時間分析器######################
+class FrameProfiler:
+    """
+    幀時間分析器 - 記錄每一幀的更新、繪製時間和各系統的耗時\n
+    \n
+    attach() 會把場景上各系統物件的 update、draw、draw_* 方法換成計時版本，\n
+    所以不需要修改系統本身就能得到各系統的時間分布\n
+    系統時間是含子呼叫的時間，一個系統內部呼叫其他系統時會重複計算\n
+    \n
+    每幀的紀錄包含：\n
+    - update_ms / draw_ms: 場景更新、繪製的總時間\n
+    - systems: 這一幀各系統的耗時（毫秒）\n
+    """
+
+    def __init__(self):
+        """
+        初始化幀時間分析器\n
+        """
+        self.frames = []
+        self.system_totals = {}  # 系統名稱 -> 累計毫秒
+        self.system_calls = {}  # 系統名稱 -> 呼叫次數
+        self._current_systems = {}
+        self._frame_start = 0.0
+        self._phase_start = 0.0
+        self._update_ms = 0.0
+        self._draw_ms = 0.0
+        self._attached = []  # (物件, 方法名稱) 用來還原
+
+    ######################掛載計時######################
+    def attach(self, scene):
+        """
+        把場景上所有系統物件的更新、繪製方法換成計時版本\n
+        \n
+        參數:\n
+        scene (Scene): 要分析的場景\n
+        """
+        seen = set()
+        for attribute_name, system in sorted(vars(scene).items()):
+            if system is None or isinstance(system, (int, float, str, bool, list, dict, tuple, set)):
+                continue
+            # 同一個物件可能掛在好幾個屬性上，只計時一次
+            if not hasattr(system, "__dict__") or id(system) in seen:
+                continue
+            seen.add(id(system))
+            for method_name in dir(type(system)):
+                if method_name in PROFILED_METHOD_NAMES or method_name.startswith("draw_"):
+                    method = getattr(system, method_name, None)
+                    if callable(method):
+                        label = f"{attribute_name}.{method_name}"
+                        setattr(system, method_name, self._timed(label, method))
+                        self._attached.append((system, method_name))
+
+    def detach(self):
+        """
+        還原所有被換成計時版本的方法\n
+        """
+        for system, method_name in self._attached:
+            system.__dict__.pop(method_name, None)
+        self._attached = []
+
+    def _timed(self, label, method):
+        """
+        建立計時版本的方法\n
+        """
+        current_systems = self._current_systems
+        system_totals = self.system_totals
+        system_calls = self.system_calls
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = (perf_counter() - start) * 1000
+                current_systems[label] = current_systems.get(label, 0.0) + elapsed
+                system_totals[label] = system_totals.get(label, 0.0) + elapsed
+                system_calls[label] = system_calls.get(label, 0) + 1
+
+        return timed
+
+    ######################每幀紀錄######################
+    def begin_frame(self):
+        """
+        開始記錄一幀\n
+        """
+        self._current_systems.clear()
+        self._update_ms = 0.0
+        self._draw_ms = 0.0
+        self._frame_start = time.perf_counter()
+        self._phase_start = self._frame_start
+
+    def end_update(self):
+        """
+        標記更新階段結束、繪製階段開始\n
+        """
+        now = time.perf_counter()
+        self._update_ms = (now - self._phase_start) * 1000
+        self._phase_start = now
+
+    def end_frame(self):
+        """
+        結束記錄一幀\n
+        """
+        now = time.perf_counter()
+        self._draw_ms = (now - self._phase_start) * 1000
+        self.frames.append({
+            "frame": len(self.frames),
+            "frame_ms": round((now - self._frame_start) * 1000, 4),
+            "update_ms": round(self._update_ms, 4),
+            "draw_ms": round(self._draw_ms, 4),
+            "systems": {label: round(ms, 4) for label, ms in self._current_systems.items()},
+        })
+
+    ######################報告######################
+    def get_summary(self):
+        """
+        計算整段紀錄的幀時間統計和各系統耗時佔比\n
+        \n
+        回傳:\n
+        dict: 統計摘要\n
+        """
+        frame_times = sorted(frame["frame_ms"] for frame in self.frames)
+        total_ms = sum(frame_times)
+        summary = {
+            "frames": len(frame_times),
+            "total_ms": round(total_ms, 3),
+            "frame_ms": {
+                "mean": round(total_ms / len(frame_times), 4) if frame_times else 0,
+                "p50": _percentile(frame_times, 50),
+                "p95": _percentile(frame_times, 95),
+                "p99": _percentile(frame_times, 99),
+                "max": frame_times[-1] if frame_times else 0,
+            },
+            "update_ms": round(sum(frame["update_ms"] for frame in self.frames), 3),
+            "draw_ms": round(sum(frame["draw_ms"] for frame in self.frames), 3),
+            "systems": {},
+        }
+
+        for label, ms in sorted(self.system_totals.items(), key=lambda item: -item[1]):
+            summary["systems"][label] = {
+                "total_ms": round(ms, 3),
+                "mean_ms": round(ms / len(frame_times), 4) if frame_times else 0,
+                "calls": self.system_calls[label],
+                "share": round(ms / total_ms, 4) if total_ms else 0,
+            }
+        return summary
+
+    def write_report(self, file_path, metadata=None):
+        """
+        把摘要和每幀紀錄寫成 JSON 檔案\n
+        \n
+        參數:\n
+        file_path (str): 輸出檔案路徑\n
+        metadata (dict): 額外寫進報告的資訊（錄製檔、種子等）\n
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        report = {
+            "metadata": metadata or {},
+            "summary": self.get_summary(),
+            "trace": self.frames,
+        }
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def _percentile(sorted_values, percent):
+    """
+    取已排序數列的百分位數（最近排名法）\n
+    """
+    if not sorted_values:
+        return 0
+    rank = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
@@ -0,0 +1,83 @@
+######################載入套件######################
+import time
+import pygame
+
+
+# 模擬時鐘的起始時間（秒），避免和「上次時間 = 0」的初始值剛好相等
+SIMULATED_CLOCK_EPOCH = 1000.0
+
+
+######################遊戲時鐘######################
+class GameClock:
+    """
+    遊戲時鐘 - 遊戲邏輯讀取「現在時間」的唯一來源\n
+    \n
+    即時模式下直接回傳系統時間（和原本呼叫 time.time()、pygame.time.get_ticks() 相同）\n
+    模擬模式下時間只由遊戲引擎每幀推進 dt，錄製和重播輸入時使用，\n
+    讓冷卻時間、閃爍、天氣等依時間運作的邏輯在每次重播時都落在同一幀\n
+    """
+
+    def __init__(self):
+        """
+        初始化遊戲時鐘（預設為即時模式）\n
+        """
+        self.simulated = False
+        self.elapsed = 0.0  # 模擬模式下已經推進的秒數
+
+    def use_simulated_time(self, start=0.0):
+        """
+        切換到模擬模式\n
+        \n
+        參數:\n
+        start (float): 起始的已推進秒數\n
+        """
+        self.simulated = True
+        self.elapsed = start
+
+    def use_real_time(self):
+        """
+        切換回即時模式\n
+        """
+        self.simulated = False
+
+    def advance(self, dt):
+        """
+        推進模擬時間（即時模式下不做事）\n
+        \n
+        參數:\n
+        dt (float): 時間間隔（秒）\n
+        """
+        if self.simulated:
+            self.elapsed += dt
+
+    def time(self):
+        """
+        現在時間（秒），取代 time.time()\n
+        """
+        if self.simulated:
+            return SIMULATED_CLOCK_EPOCH + self.elapsed
+        return time.time()
+
+    def get_ticks(self):
+        """
+        遊戲開始後經過的毫秒數，取代 pygame.time.get_ticks()\n
+        """
+        if self.simulated:
+            return int(self.elapsed * 1000)
+        return pygame.time.get_ticks()
+
+
+######################全域遊戲時鐘######################
+game_clock = None
+
+def get_game_clock():
+    """
+    取得全域遊戲時鐘實例\n
+    \n
+    回傳:\n
+    GameClock: 遊戲時鐘實例\n
+    """
+    global game_clock
+    if game_clock is None:
+        game_clock = GameClock()
+    return game_clock
@@ -1,5 +1,6 @@
 ######################載入套件######################
 import pygame
+import random
 import sys
 from config.settings import *
 from src.core.state_manager import StateManager, GameState
@@ -10,9 +11,13 @@ from src.scenes.forest_scene import ForestScene
 from src.scenes.lake_scene import LakeScene
 from src.scenes.home_scene import HomeScene
 from src.utils.font_manager import init_font_system
+from src.utils.asset_manager import get_asset_manager
 from src.systems.time_system import TimeManager
 from src.utils.time_ui import TimeDisplayUI
 from src.systems.music_system import MusicManager
+from src.core.game_clock import get_game_clock
+from src.core.input_session import get_input_source
+from src.core.render_interpolation import get_render_interpolation
 
 
 ######################遊戲引擎######################
@@ -32,13 +37,38 @@ class GameEngine:
     5. 控制遊戲的啟動和關閉\n
     """
 
-    def __init__(self):
+    def __init__(self, seed=None, fixed_dt=None, load_save=True, recorder=None, simulation_hz=None):
         """
         初始化遊戲引擎\n
         \n
         設定遊戲視窗、建立管理器、註冊場景\n
         準備遊戲運行所需的所有基礎設施\n
-        """
+        \n
+        指定亂數種子時會改用模擬遊戲時鐘，讓同一份輸入錄製每次重播都得到相同結果\n
+        \n
+        參數:\n
+        seed (int): 亂數種子，None 表示不固定\n
+        fixed_dt (float): 固定模擬步長（秒），每次畫面刷新剛好跑一步，None 表示依實際經過時間追趕\n
+        load_save (bool): 是否載入既有存檔\n
+        recorder (InputRecorder): 輸入錄製器，None 表示不錄製\n
+        simulation_hz (int): 每秒模擬步數，None 表示使用 SIMULATION_HZ\n
+        """
+        # 可重現執行的設定（錄製、重播輸入時使用）
+        self.seed = seed
+        self.fixed_dt = fixed_dt
+        self.recorder = recorder
+        self.frame_count = 0
+
+        # 固定步長模擬：畫面刷新累積實際時間，每滿一個步長就更新一次遊戲邏輯
+        self.simulation_dt = fixed_dt if fixed_dt is not None else 1.0 / (simulation_hz or SIMULATION_HZ)
+        self.accumulator = 0.0
+        self.pending_events = []  # 還沒交給模擬步處理的輸入事件
+        if seed is not None:
+            random.seed(seed)
+            get_game_clock().use_simulated_time()
+        if recorder is not None:
+            get_input_source().use_event_state()
+
         # 建立遊戲視窗
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
@@ -46,6 +76,9 @@ class GameEngine:
         # 初始化字體系統 - 支援繁體中文顯示
         init_font_system()
 
+        # 在背景預先讀取常用圖片，生成動物和商品時不需要讀取磁碟
+        get_asset_manager().preload(ASSET_PRELOAD_MANIFEST)
+
         # 建立時鐘物件，用於控制遊戲幀率
         self.clock = pygame.time.Clock()
 
@@ -81,8 +114,11 @@ class GameEngine:
         # 初始化所有場景
         self._initialize_scenes()
 
-        # 檢查並載入既有存檔
-        self._check_and_load_save()
+        # 檢查並載入既有存檔（可重現執行時一律從新遊戲開始）
+        if load_save:
+            self._check_and_load_save()
+        else:
+            self._start_new_game()
 
         print("遊戲引擎初始化完成")
 
@@ -274,14 +310,24 @@ class GameEngine:
             # 切換到家的場景
             self.scene_manager.change_scene(SCENE_HOME)
 
-    def handle_events(self):
+    def handle_events(self, events=None):
         """
         處理所有輸入事件\n
         \n
         收集並處理玩家的鍵盤、滑鼠、視窗等輸入\n
         先讓當前場景處理事件，再處理全域事件\n
+        \n
+        參數:\n
+        events (list): 要處理的事件，None 表示從 pygame 事件佇列讀取\n
         """
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+
+        input_source = get_input_source()
+        for event in events:
+            # 錄製、重播時由事件追蹤按鍵和滑鼠狀態
+            input_source.observe(event)
+
             # 處理視窗關閉事件
             if event.type == pygame.QUIT:
                 self.state_manager.change_state(GameState.QUIT)
@@ -392,12 +438,17 @@ class GameEngine:
         """
         更新遊戲邏輯 - 已優化輸入響應順序並支援暫停凍結\n
         \n
-        每幀調用一次，更新所有遊戲系統\n
+        每個模擬步調用一次，更新所有遊戲系統\n
         在暫停狀態下會凍結所有遊戲邏輯，只保持UI更新\n
         \n
         參數:\n
-        dt (float): 與上一幀的時間差，單位為秒\n
+        dt (float): 模擬步長，單位為秒\n
         """
+        # 推進步數計數和遊戲時鐘（模擬模式下遊戲時間只由 dt 決定）
+        self.frame_count += 1
+        get_render_interpolation().begin_step()
+        get_game_clock().advance(dt)
+
         # 根據遊戲狀態執行對應的更新邏輯
         if self.state_manager.is_state(GameState.PLAYING):
             # 遊戲進行中：更新所有系統
@@ -406,13 +457,13 @@ class GameEngine:
             self.scene_manager.update(dt)
             
             # 中優先級：核心遊戲系統
-            frame_count = int(pygame.time.get_ticks() / 16.67)  # 假設60FPS
+            frame_count = self.frame_count
 
-            # 時間系統 - 每2幀更新一次（仍保持準確性）
+            # 時間系統 - 每2步更新一次（仍保持準確性）
             if frame_count % 2 == 0:
                 self.time_manager.update(dt * 2)  # 補償跳過的時間
 
-            # 電力系統 - 每3幀更新一次
+            # 電力系統 - 每3步更新一次
             # 最低優先級：UI 更新
             if frame_count % 4 == 0:
                 self.time_display.update(dt * 4)
@@ -487,27 +538,41 @@ class GameEngine:
         遊戲主迴圈 - 引擎的核心運行方法\n
         \n
         持續執行直到遊戲結束，每次迴圈執行：\n
-        1. 處理輸入事件\n
-        2. 更新遊戲邏輯\n
-        3. 繪製遊戲畫面\n
-        4. 控制幀率\n
+        1. 控制幀率並累積經過的時間\n
+        2. 每累積滿一個模擬步長就處理輸入、更新一次遊戲邏輯\n
+        3. 以剩餘的累積時間內插實體位置，繪製遊戲畫面\n
         \n
-        這是遊戲的心跳，確保遊戲以穩定的幀率運行\n
+        遊戲邏輯固定以 simulation_dt 更新，行為不會因為畫面刷新率不同而改變\n
+        單次刷新最多計入 MAX_FRAME_TIME 秒、追趕 MAX_SIMULATION_STEPS_PER_FRAME 步，\n
+        電腦跟不上時遊戲變慢，而不是越追越慢直到卡死\n
         """
         print("遊戲主迴圈開始")
+        interpolation = get_render_interpolation()
+        step_dt = self.simulation_dt
 
         while self.running:
-            # 計算這一幀與上一幀的時間差
-            dt = self.clock.tick(FPS) / 1000.0  # 轉換為秒
+            # 累積這一幀經過的時間（固定 dt 模式下每幀剛好一步）
+            frame_time = self.clock.tick(FPS) / 1000.0  # 轉換為秒
+            if self.fixed_dt is not None:
+                frame_time = step_dt
+            self.accumulator += min(frame_time, MAX_FRAME_TIME)
 
             try:
-                # 處理所有輸入事件
-                self.handle_events()
-
-                # 更新遊戲邏輯
-                self.update(dt)
-
-                # 繪製遊戲畫面
+                # 輸入事件留給下一個模擬步處理
+                self.pending_events.extend(pygame.event.get())
+
+                steps = 0
+                while self.accumulator >= step_dt and self.running:
+                    if steps >= MAX_SIMULATION_STEPS_PER_FRAME:
+                        # 追不上：丟掉落後的時間，只保留不滿一步的部分
+                        self.accumulator %= step_dt
+                        break
+                    self._simulation_step(step_dt)
+                    self.accumulator -= step_dt
+                    steps += 1
+
+                # 繪製遊戲畫面（位置內插在上一步和最新一步之間）
+                interpolation.set_alpha(self.accumulator / step_dt)
                 self.draw()
 
             except Exception as e:
@@ -524,6 +589,67 @@ class GameEngine:
         self._cleanup()
         print("遊戲主迴圈結束")
 
+    def _simulation_step(self, dt):
+        """
+        執行一個模擬步：處理累積的輸入事件並更新遊戲邏輯\n
+        \n
+        錄製時每一步寫入一筆紀錄，重播時逐筆執行就會得到相同的模擬步\n
+        \n
+        參數:\n
+        dt (float): 模擬步長（秒）\n
+        """
+        events = self.pending_events
+        self.pending_events = []
+        if self.recorder is not None:
+            self.recorder.record_frame(dt, events)
+        self.handle_events(events)
+        self.update(dt)
+
+    def run_replay(self, replayer, profiler=None, max_frames=None):
+        """
+        重播錄製的輸入 - 不等待幀率，用錄製的 dt 和事件逐步執行（每步繪製一次、不內插）\n
+        \n
+        引擎需要用錄製檔的亂數種子建立，重播結果才會和錄製時相同\n
+        \n
+        參數:\n
+        replayer (InputReplayer): 輸入重播器\n
+        profiler (FrameProfiler): 幀時間分析器，None 表示不分析\n
+        max_frames (int): 最多重播幾幀，None 表示全部\n
+        \n
+        回傳:\n
+        int: 實際重播的幀數\n
+        """
+        frame_total = len(replayer) if max_frames is None else min(max_frames, len(replayer))
+        input_source = get_input_source()
+        input_source.use_event_state()
+        get_render_interpolation().set_alpha(1.0)
+        if profiler is not None:
+            profiler.attach(self.scene_manager.current_scene)
+
+        played = 0
+        try:
+            for index in range(frame_total):
+                if not self.running:
+                    break
+                dt, events = replayer.get_frame(index)
+
+                if profiler is not None:
+                    profiler.begin_frame()
+                self.handle_events(events)
+                self.update(dt)
+                if profiler is not None:
+                    profiler.end_update()
+                self.draw()
+                if profiler is not None:
+                    profiler.end_frame()
+                played += 1
+        finally:
+            if profiler is not None:
+                profiler.detach()
+            input_source.use_live_state()
+
+        return played
+
     def _cleanup(self):
         """
         遊戲結束時的清理工作\n
@@ -531,6 +657,10 @@ class GameEngine:
         釋放遊戲資源，確保程式正常退出\n
         """
         try:
+            # 結束輸入錄製
+            if self.recorder is not None:
+                self.recorder.close()
+
             # 清理音樂管理器
             if hasattr(self, 'music_manager') and self.music_manager:
                 self.music_manager.cleanup()
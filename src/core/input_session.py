@@ -0,0 +1,278 @@
+######################載入套件######################
+import json
+import os
+import pygame
+from config.settings import *
+
+
+# 輸入紀錄檔案格式版本
+INPUT_SESSION_VERSION = 1
+
+# 會被錄製的事件類型和要保存的屬性
+RECORDED_EVENT_FIELDS = {
+    pygame.KEYDOWN: ("key", "mod", "unicode", "scancode"),
+    pygame.KEYUP: ("key", "mod", "unicode", "scancode"),
+    pygame.MOUSEBUTTONDOWN: ("pos", "button"),
+    pygame.MOUSEBUTTONUP: ("pos", "button"),
+    pygame.MOUSEMOTION: ("pos", "rel", "buttons"),
+    pygame.MOUSEWHEEL: ("x", "y", "flipped"),
+    pygame.QUIT: (),
+}
+
+
+######################輸入來源######################
+class InputSource:
+    """
+    輸入來源 - 輸入控制器和場景讀取「目前按住的按鍵、滑鼠位置」的地方\n
+    \n
+    即時模式直接問 pygame；事件模式則由處理過的事件自行追蹤按鍵和滑鼠狀態\n
+    錄製和重播都使用事件模式，這樣 InputController、MouseController\n
+    在重播時看到的輸入和錄製時完全相同\n
+    """
+
+    def __init__(self):
+        """
+        初始化輸入來源（預設為即時模式）\n
+        """
+        self.tracking_events = False
+        self.held_keys = set()
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = [False, False, False]
+
+    def use_event_state(self):
+        """
+        切換到事件模式並清除追蹤狀態\n
+        """
+        self.tracking_events = True
+        self.held_keys = set()
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = [False, False, False]
+
+    def use_live_state(self):
+        """
+        切換回即時模式\n
+        """
+        self.tracking_events = False
+
+    def observe(self, event):
+        """
+        依事件更新事件模式下的按鍵和滑鼠狀態\n
+        \n
+        參數:\n
+        event (pygame.event.Event): 輸入事件\n
+        """
+        if not self.tracking_events:
+            return
+
+        if event.type == pygame.KEYDOWN:
+            self.held_keys.add(event.key)
+        elif event.type == pygame.KEYUP:
+            self.held_keys.discard(event.key)
+        elif event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = tuple(event.pos)
+        elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            self.mouse_pos = tuple(event.pos)
+            if 1 <= event.button <= 3:
+                self.mouse_buttons[event.button - 1] = event.type == pygame.MOUSEBUTTONDOWN
+
+    def get_pressed(self):
+        """
+        取得按鍵狀態，取代 pygame.key.get_pressed()\n
+        \n
+        回傳:\n
+        可以用按鍵常數索引的按鍵狀態\n
+        """
+        if self.tracking_events:
+            return EventKeyState(self.held_keys)
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self):
+        """
+        取得滑鼠位置，取代 pygame.mouse.get_pos()\n
+        """
+        if self.tracking_events:
+            return self.mouse_pos
+        return pygame.mouse.get_pos()
+
+    def get_mouse_pressed(self):
+        """
+        取得滑鼠按鍵狀態，取代 pygame.mouse.get_pressed()\n
+        """
+        if self.tracking_events:
+            return tuple(self.mouse_buttons)
+        return pygame.mouse.get_pressed()
+
+
+class EventKeyState:
+    """
+    事件模式下的按鍵狀態，和 pygame.key.get_pressed() 一樣用按鍵常數索引\n
+    """
+
+    def __init__(self, held_keys):
+        """
+        參數:\n
+        held_keys (set): 按住的按鍵常數\n
+        """
+        self.held_keys = held_keys
+
+    def __getitem__(self, key):
+        return key in self.held_keys
+
+
+######################輸入錄製######################
+class InputRecorder:
+    """
+    輸入錄製器 - 把每幀的 dt 和輸入事件寫成 JSON Lines 檔案\n
+    \n
+    第一行是檔頭（亂數種子、固定 dt、螢幕尺寸），之後每幀一行：\n
+    {"f": 幀編號, "t": 累計秒數, "dt": 這幀的 dt, "e": [事件...]}\n
+    沒有事件的幀省略 "e"\n
+    """
+
+    def __init__(self, file_path, seed, fixed_dt=None):
+        """
+        開始錄製\n
+        \n
+        參數:\n
+        file_path (str): 輸出檔案路徑\n
+        seed (int): 本次遊戲使用的亂數種子\n
+        fixed_dt (float): 固定 dt，None 表示使用實際幀時間\n
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.file_path = file_path
+        self.frame = 0
+        self.elapsed = 0.0
+        self.event_count = 0
+        self._file = open(file_path, "w", encoding="utf-8")
+        self._write({
+            "version": INPUT_SESSION_VERSION,
+            "seed": seed,
+            "fixed_dt": fixed_dt,
+            "screen": [SCREEN_WIDTH, SCREEN_HEIGHT],
+        })
+
+    def _write(self, record):
+        """
+        寫入一行 JSON\n
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+
+    def record_frame(self, dt, events):
+        """
+        記錄一幀\n
+        \n
+        參數:\n
+        dt (float): 這一幀的 dt\n
+        events (list): 這一幀處理的事件\n
+        """
+        self.elapsed += dt
+        record = {"f": self.frame, "t": round(self.elapsed, 6), "dt": dt}
+        encoded = [encode_event(event) for event in events if event.type in RECORDED_EVENT_FIELDS]
+        if encoded:
+            record["e"] = encoded
+            self.event_count += len(encoded)
+        self._write(record)
+        self.frame += 1
+
+    def close(self):
+        """
+        結束錄製並關閉檔案\n
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"輸入錄製完成：{self.file_path}（{self.frame} 幀，{self.event_count} 個事件）")
+
+
+######################輸入重播######################
+class InputReplayer:
+    """
+    輸入重播器 - 讀取錄製檔，逐幀提供 dt 和事件\n
+    """
+
+    def __init__(self, file_path):
+        """
+        載入錄製檔\n
+        \n
+        參數:\n
+        file_path (str): 錄製檔路徑\n
+        """
+        self.file_path = file_path
+        with open(file_path, "r", encoding="utf-8") as file:
+            lines = [json.loads(line) for line in file if line.strip()]
+
+        if not lines or lines[0].get("version") != INPUT_SESSION_VERSION:
+            raise ValueError(f"不支援的輸入錄製檔：{file_path}")
+
+        self.header = lines[0]
+        self.frames = lines[1:]
+        self.seed = self.header.get("seed")
+        self.fixed_dt = self.header.get("fixed_dt")
+
+    def __len__(self):
+        """
+        錄製的幀數\n
+        """
+        return len(self.frames)
+
+    def get_frame(self, index):
+        """
+        取得某一幀的 dt 和事件\n
+        \n
+        參數:\n
+        index (int): 幀編號\n
+        \n
+        回傳:\n
+        tuple: (dt, 事件列表)\n
+        """
+        record = self.frames[index]
+        return record["dt"], [decode_event(data) for data in record.get("e", ())]
+
+
+######################事件編碼######################
+def encode_event(event):
+    """
+    把 pygame 事件轉成可以寫進 JSON 的字典\n
+    """
+    data = {"type": pygame.event.event_name(event.type)}
+    for field in RECORDED_EVENT_FIELDS[event.type]:
+        if hasattr(event, field):
+            value = getattr(event, field)
+            data[field] = list(value) if isinstance(value, tuple) else value
+    return data
+
+
+def decode_event(data):
+    """
+    把錄製的字典轉回 pygame 事件\n
+    """
+    event_type = EVENT_TYPES_BY_NAME[data["type"]]
+    attributes = {}
+    for field in RECORDED_EVENT_FIELDS[event_type]:
+        if field in data:
+            value = data[field]
+            attributes[field] = tuple(value) if isinstance(value, list) else value
+    return pygame.event.Event(event_type, attributes)
+
+
+EVENT_TYPES_BY_NAME = {pygame.event.event_name(event_type): event_type for event_type in RECORDED_EVENT_FIELDS}
+
+
+######################全域輸入來源######################
+input_source = None
+
+def get_input_source():
+    """
+    取得全域輸入來源實例\n
+    \n
+    回傳:\n
+    InputSource: 輸入來源實例\n
+    """
+    global input_source
+    if input_source is None:
+        input_source = InputSource()
+    return input_source
@@ -0,0 +1,127 @@
+######################載入套件######################
+from config.settings import RENDER_INTERPOLATION, RENDER_INTERPOLATION_MAX_JUMP
+
+
+######################繪製內插######################
+class RenderInterpolation:
+    """
+    繪製內插 - 在前後兩個模擬步之間內插實體的繪製位置\n
+    \n
+    遊戲邏輯以固定步長更新，畫面刷新率和模擬步長不同時，\n
+    直接畫最新的位置會讓移動看起來一頓一頓的\n
+    \n
+    使用方式：\n
+    1. 實體在每次更新開頭呼叫 record(self)，記住這一步開始前的位置\n
+    2. 遊戲引擎每個模擬步開頭呼叫 begin_step()，畫面刷新前以 set_alpha() 設定內插比例\n
+    3. 繪製時用 get_position() 取得內插後的位置\n
+    \n
+    最近一步沒有更新的實體（暫停、LOD 跳過）直接畫目前位置\n
+    """
+
+    def __init__(self, enabled=RENDER_INTERPOLATION, max_jump=RENDER_INTERPOLATION_MAX_JUMP):
+        """
+        初始化繪製內插\n
+        \n
+        參數:\n
+        enabled (bool): 是否內插\n
+        max_jump (float): 一步內移動超過這個距離（像素）視為傳送，不內插\n
+        """
+        self.enabled = enabled
+        self.max_jump = max_jump
+        self.step = 0  # 目前的模擬步編號
+        self.alpha = 1.0  # 上一步到最新一步之間的內插比例（1.0 表示最新位置）
+
+    def begin_step(self):
+        """
+        開始一個新的模擬步\n
+        """
+        self.step += 1
+
+    def set_alpha(self, alpha):
+        """
+        設定這次畫面刷新的內插比例\n
+        \n
+        參數:\n
+        alpha (float): 累積時間 / 模擬步長，0.0 到 1.0\n
+        """
+        self.alpha = min(1.0, max(0.0, alpha))
+
+    def record(self, entity):
+        """
+        記住實體在這一步開始前的位置\n
+        \n
+        參數:\n
+        entity: 有 x、y 屬性的實體\n
+        """
+        entity.prev_x = entity.x
+        entity.prev_y = entity.y
+        entity.interpolation_step = self.step
+
+    def interpolate(self, prev_x, prev_y, x, y, step):
+        """
+        內插一組位置\n
+        \n
+        參數:\n
+        prev_x (float): 這一步開始前的 X 座標\n
+        prev_y (float): 這一步開始前的 Y 座標\n
+        x (float): 目前的 X 座標\n
+        y (float): 目前的 Y 座標\n
+        step (int): 記錄位置時的模擬步編號\n
+        \n
+        回傳:\n
+        tuple: 繪製位置 (x, y)\n
+        """
+        if not self.enabled or step != self.step:
+            return (x, y)
+
+        dx = x - prev_x
+        dy = y - prev_y
+        if abs(dx) > self.max_jump or abs(dy) > self.max_jump:
+            return (x, y)
+
+        alpha = self.alpha
+        return (prev_x + dx * alpha, prev_y + dy * alpha)
+
+    def get_position(self, entity):
+        """
+        取得實體的繪製位置\n
+        \n
+        參數:\n
+        entity: 用 record() 記錄過位置的實體\n
+        \n
+        回傳:\n
+        tuple: 繪製位置 (x, y)\n
+        """
+        step = getattr(entity, "interpolation_step", None)
+        if step is None:
+            return (entity.x, entity.y)
+        return self.interpolate(entity.prev_x, entity.prev_y, entity.x, entity.y, step)
+
+    def get_offset(self, entity):
+        """
+        目前位置和繪製位置的差距，繪製時加到攝影機偏移上就能畫在內插位置\n
+        \n
+        參數:\n
+        entity: 用 record() 記錄過位置的實體\n
+        \n
+        回傳:\n
+        tuple: (x 差距, y 差距)\n
+        """
+        render_x, render_y = self.get_position(entity)
+        return (entity.x - render_x, entity.y - render_y)
+
+
+######################全域繪製內插######################
+render_interpolation = None
+
+def get_render_interpolation():
+    """
+    取得全域繪製內插實例\n
+    \n
+    回傳:\n
+    RenderInterpolation: 繪製內插實例\n
+    """
+    global render_interpolation
+    if render_interpolation is None:
+        render_interpolation = RenderInterpolation()
+    return render_interpolation
@@ -1,6 +1,7 @@
 ######################載入套件######################
 import pygame
 from src.player.player import Player
+from src.core.input_session import get_input_source
 
 
 ######################輸入控制器######################
@@ -179,8 +180,8 @@ class InputController:
         參數:\n
         dt (float): 與上一幀的時間差，單位為秒\n
         """
-        # 使用 Pygame 最快的按鍵檢測方法
-        current_keys = pygame.key.get_pressed()
+        # 使用 Pygame 最快的按鍵檢測方法（重播輸入時改讀重播的按鍵狀態）
+        current_keys = get_input_source().get_pressed()
 
         # 檢查奔跑狀態（Shift 鍵）
         if current_keys[pygame.K_LSHIFT] or current_keys[pygame.K_RSHIFT]:
@@ -323,7 +324,7 @@ class InputController:
         回傳:\n
         tuple: (x, y) 滑鼠螢幕座標\n
         """
-        return pygame.mouse.get_pos()
+        return get_input_source().get_mouse_pos()
 
     def stop_all_input(self):
         """
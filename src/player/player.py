@@ -4,6 +4,8 @@ import math
 from config.settings import *
 from src.utils.helpers import clamp, fast_movement_calculate
 from src.systems.weapon_system import WeaponManager
+from src.core.game_clock import get_game_clock
+from src.core.render_interpolation import get_render_interpolation
 
 
 ######################玩家角色類別######################
@@ -167,6 +169,9 @@ class Player:
         參數:\n
         dt (float): 與上一幀的時間差，單位為秒\n
         """
+        # 記住這一步開始前的位置，繪製時內插
+        get_render_interpolation().record(self)
+
         # 先處理移動（最高優先級）
         self._update_movement(dt)
 
@@ -227,7 +232,7 @@ class Player:
         參數:\n
         dt (float): 時間間隔\n
         """
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = get_game_clock().get_ticks() / 1000.0
         
         # 處理購買物品的持續血量回復（新增）
         if hasattr(self, 'health_regen_rate') and self.health_regen_rate > 0:
@@ -286,7 +291,7 @@ class Player:
         bool: 是否成功造成傷害\n
         """
         # 檢查無敵時間
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = get_game_clock().get_ticks() / 1000.0
         if current_time - self.last_damage_time < self.invulnerable_time:
             return False
 
@@ -1008,6 +1013,11 @@ class Player:
         if self.is_driving:
             return
 
+        # 畫在前後兩個模擬步之間的內插位置
+        offset_x, offset_y = get_render_interpolation().get_offset(self)
+        camera_x += offset_x
+        camera_y += offset_y
+
         # 計算螢幕座標
         screen_x = self.rect.x - camera_x
         screen_y = self.rect.y - camera_y
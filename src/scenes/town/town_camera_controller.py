@@ -1,6 +1,7 @@
 ######################載入套件######################
 import pygame
 from config.settings import *
+from src.core.render_interpolation import get_render_interpolation
 
 
 ######################小鎮攝影機控制器######################
@@ -25,6 +26,11 @@ class TownCameraController:
         """
         self.camera_x = 0
         self.camera_y = 0
+
+        # 上一步開始前的攝影機位置（繪製內插用）
+        self.prev_camera_x = 0
+        self.prev_camera_y = 0
+        self.interpolation_step = None
         
         # 地圖邊界
         self.map_width = map_width
@@ -44,6 +50,12 @@ class TownCameraController:
         參數:\n
         player (Player): 玩家物件\n
         """
+        # 記住這一步開始前的位置，繪製時內插
+        interpolation = get_render_interpolation()
+        self.prev_camera_x = self.camera_x
+        self.prev_camera_y = self.camera_y
+        self.interpolation_step = interpolation.step
+
         # 計算玩家在螢幕上的位置
         player_screen_x = player.x - self.camera_x
         player_screen_y = player.y - self.camera_y
@@ -82,6 +94,17 @@ class TownCameraController:
         # 限制 Y 軸邊界
         self.camera_y = max(0, min(self.camera_y, self.map_height - SCREEN_HEIGHT))
 
+    def get_render_position(self):
+        """
+        取得繪製用的攝影機位置（前後兩個模擬步之間的內插位置）\n
+        \n
+        回傳:\n
+        tuple: (camera_x, camera_y)\n
+        """
+        return get_render_interpolation().interpolate(
+            self.prev_camera_x, self.prev_camera_y, self.camera_x, self.camera_y, self.interpolation_step
+        )
+
     def get_visible_rect(self):
         """
         獲取當前可見區域的矩形\n
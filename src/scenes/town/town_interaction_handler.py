@@ -448,10 +448,9 @@ class TownInteractionHandler:
                     picked_resources.append(resource)
                     self.ui_manager.show_message(f"獲得 {item_name}", 1.5)
         
-        # 移除已拾取的資源
+        # 移除已拾取的資源（地圖上的資源圖示也一併移除）
         for resource in picked_resources:
-            if resource in terrain_system.forest_resources:
-                terrain_system.forest_resources.remove(resource)
+            terrain_system.collect_forest_resource(resource)
 
     def _set_interaction_cooldown(self):
         """
@@ -6,6 +6,7 @@ from src.core.scene_manager import Scene
 from src.core.state_manager import GameState
 from src.player.player import Player
 from src.player.input_controller import InputController
+from src.core.input_session import get_input_source
 from src.utils.font_manager import get_font_manager
 from src.utils.npc_info_ui import NPCInfoUI
 from src.utils.npc_status_ui import NPCStatusDisplayUI  # 新增NPC狀態顯示
@@ -20,6 +21,7 @@ from src.systems.wildlife.wildlife_manager import WildlifeManager  # 新增野
 from src.systems.convenience_store_health_system import ConvenienceStoreHealthSystem  # 新增便利商店血量藥水
 from src.systems.anti_overlap_system import AntiOverlapTeleportSystem  # 新增防重疊系統
 from src.systems.street_light_system import StreetLightSystem  # 新增路燈系統
+from src.systems.audio_zone_system import AudioZoneMap, AudioZoneController
 from src.systems.vegetable_garden_system import VegetableGardenSystem  # 新增蔬果園系統
 from src.systems.shooting_system import ShootingSystem, CrosshairSystem, ShootingSoundManager  # 修改射擊系統導入
 from src.systems.shop_system import ShopManager  # 新增商店系統
@@ -28,6 +30,7 @@ from src.systems.church_system import Church, BlessingSystem, ChurchScene  # 新
 from src.systems.axe_system import TreeManager, Axe  # 新增斧頭系統
 from src.systems.building_label_system import BuildingLabelSystem, BuildingTypeDetector  # 新增建築標示系統
 from src.systems.weather_system import WeatherEffectSystem  # 新增天氣特效系統
+from src.systems.simulation_worker import SimulationWorkerClient
 from src.scenes.town.town_camera_controller import TownCameraController
 from src.scenes.town.town_ui_manager import TownUIManager
 from src.scenes.town.town_interaction_handler import TownInteractionHandler
@@ -90,6 +93,13 @@ class TownScene(Scene):
         # 初始化場景內容
         self._initialize_scene_content()
 
+        # NPC、野生動物、農夫排程和鐵路改在模擬子程序更新（第一次更新時啟動）
+        self.simulation_worker = None
+        if SIMULATION_WORKER_ENABLED:
+            self.simulation_worker = SimulationWorkerClient(
+                self.npc_manager, self.wildlife_manager, self.terrain_system.railway_system
+            )
+
         print("小鎮場景初始化完成")
 
     def _initialize_player(self):
@@ -255,8 +265,17 @@ class TownScene(Scene):
         # 初始化野生動物 - 設定在地形代碼1的區域
         self.wildlife_manager.initialize_animals(scene_type="all")  # 初始化所有類型動物（森林、湖泊、草原）
         
+        # 預先計算音樂區域（地形和傳奇動物領地）
+        self.audio_zone_controller = None
+        if self.music_manager:
+            self.audio_zone_controller = AudioZoneController(self.music_manager, AudioZoneMap(self.terrain_system))
+
         # 初始化路燈系統
         self.street_light_system.initialize_street_lights()
+
+        # 路燈和建築訂閱電力區域的停電、復電
+        self.street_light_system.connect_power_manager(self.npc_manager.power_manager)
+        self.terrain_system.connect_power_manager(self.npc_manager.power_manager)
         
         # 初始化蔬果園系統
         self.vegetable_garden_system.initialize_gardens()
@@ -369,6 +388,12 @@ class TownScene(Scene):
         # 更新攝影機跟隨玩家
         self.camera_controller.update(self.player)
 
+        # 地形區塊分頁：攝影機和玩家附近的區塊常駐
+        self.terrain_system.update_terrain_paging(
+            (self.camera_controller.camera_x + SCREEN_WIDTH / 2, self.camera_controller.camera_y + SCREEN_HEIGHT / 2),
+            (self.player.x, self.player.y),
+        )
+
         # 檢查地形生態區域
         self._check_terrain_ecology_zones()
         
@@ -381,10 +406,19 @@ class TownScene(Scene):
 
         # 更新核心系統
         player_pos = (self.player.x, self.player.y)
-        self.npc_manager.update(dt, player_pos)
-        
-        # 更新野生動物系統 - 在小鎮場景中的森林區域
-        self.wildlife_manager.update(dt, player_pos, "town")
+
+        # 推進交通號誌的共用時鐘（所有路口的號誌狀態由它推算）
+        self.road_manager.update(dt)
+
+        worker_running = self.simulation_worker is not None and self.simulation_worker.ensure_started()
+        if worker_running:
+            # 模擬子程序負責更新，這裡套用最新的快照
+            self.simulation_worker.sync(player_pos)
+        else:
+            self.npc_manager.update(dt, player_pos)
+            
+            # 更新野生動物系統 - 在小鎮場景中的森林區域
+            self.wildlife_manager.update(dt, player_pos, "town")
         
         # 更新玩家商品效果
         self.shop_manager.update_player_effects(self.player)
@@ -406,8 +440,8 @@ class TownScene(Scene):
         if not hasattr(self, '_bullet_debug_counter'):
             self._bullet_debug_counter = 0
         self._bullet_debug_counter += 1
-        if self._bullet_debug_counter % 300 == 0 and len(self.shooting_system.bullets) > 0:
-            print(f"🔸 當前場景中有 {len(self.shooting_system.bullets)} 發子彈")
+        if self._bullet_debug_counter % 300 == 0 and self.shooting_system.get_bullet_count() > 0:
+            print(f"🔸 當前場景中有 {self.shooting_system.get_bullet_count()} 發子彈")
         
         # 檢查子彈與野生動物碰撞
         if hasattr(self, 'wildlife_manager') and self.wildlife_manager:
@@ -419,7 +453,7 @@ class TownScene(Scene):
                 print(f"🦎 野生動物狀態: 總計 {len(self.wildlife_manager.all_animals)} 隻，活著 {len(active_animals)} 隻")
             
             # 子彈與動物共存檢測（減少輸出頻率）
-            bullet_count = len(self.shooting_system.bullets)
+            bullet_count = self.shooting_system.get_bullet_count()
             animal_count = len(active_animals)
             
             # 只在有子彈且每120幀時輸出調試信息
@@ -455,14 +489,14 @@ class TownScene(Scene):
                             print(f"🏆 擊殺 {animal.animal_type.value}！獲得 {reward_money} 元")
         
         # 檢查持續按住滑鼠左鍵的全自動射擊（BB槍特性）
-        mouse_buttons = pygame.mouse.get_pressed()
+        mouse_buttons = get_input_source().get_mouse_pressed()
         if mouse_buttons[0] and self.player.is_fire_enabled():  # 左鍵按住且開火功能啟用
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = get_input_source().get_mouse_pos()
             camera_offset = (self.camera_controller.camera_x, self.camera_controller.camera_y)
             self.shooting_system.handle_mouse_shoot(self.player, mouse_pos, camera_offset)
         
         # 更新準心位置
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_input_source().get_mouse_pos()
         self.crosshair_system.update(mouse_pos)
         
         # 檢查武器裝備狀態來顯示/隱藏準心
@@ -476,7 +510,7 @@ class TownScene(Scene):
             self.crosshair_system.hide()
 
         # 更新地形系統（包含鐵路系統）
-        self.terrain_system.update(dt)
+        self.terrain_system.update(dt, update_railway=not worker_running)
         
         # 更新街燈系統
         self.street_light_system.update(dt)
@@ -515,6 +549,10 @@ class TownScene(Scene):
         # 檢查自動拾取
         self.interaction_handler.check_automatic_pickups(self.terrain_system)
 
+        # 把這一步對 NPC、動物的修改和推進指令送給模擬子程序
+        if worker_running:
+            self.simulation_worker.step(dt, (self.player.x, self.player.y), self.time_manager)
+
     def _check_terrain_ecology_zones(self):
         """
         檢查玩家是否進入特殊生態區域\n
@@ -540,23 +578,20 @@ class TownScene(Scene):
     def _update_music_and_sfx(self):
         """
         根據玩家位置和狀態更新背景音樂和音效\n
+        \n
+        音樂區域已預先計算，玩家沒有換區域時只是一次區域 ID 比較\n
         """
-        if not self.music_manager:
+        if not self.audio_zone_controller:
             return
-            
-        player_pos = self.player.get_center_position()
-        terrain_type = self.terrain_system.get_terrain_at_position(player_pos[0], player_pos[1])
         
-        # 檢查是否在傳奇動物領地
-        in_legendary_territory = False
-        if hasattr(self, 'wildlife_manager'):
-            in_legendary_territory = self.wildlife_manager.is_player_in_legendary_territory(player_pos)
+        # 傳奇動物生成或移除後重建領地
+        self.audio_zone_controller.sync_territories(self.wildlife_manager)
         
-        # 更新背景音樂
-        self.music_manager.update_music_for_location(terrain_type, in_legendary_territory)
+        # 換區域時切換背景音樂和環境音效（草原風聲）
+        self.audio_zone_controller.update(self.player.get_center_position())
         
-        # 更新環境音效（草原風聲）
-        self.music_manager.play_grassland_ambient(terrain_type)
+        # 背景解碼完成後開始交叉淡入淡出
+        self.music_manager.update()
 
     def draw(self, screen):
         """
@@ -581,7 +616,7 @@ class TownScene(Scene):
         self.weapon_wheel_ui.draw(screen)
         
         # 繪製射擊系統UI（準星、子彈、武器資訊）
-        self.shooting_system.draw_bullets(screen, (self.camera_controller.camera_x, self.camera_controller.camera_y))
+        self.shooting_system.draw_bullets(screen, self.camera_controller.get_render_position())
         self.shooting_system.draw_shooting_ui(screen, self.player)
         
         # 繪製住宅內部檢視 UI（在最上層）
@@ -600,14 +635,13 @@ class TownScene(Scene):
         self.terrain_system.railway_system.draw_destination_menu(screen, get_font_manager())
         
         # 繪製NPC狀態顯示UI（在最上層）
-        self.npc_status_ui.draw(screen, self.npc_manager)
+        self.npc_status_ui.draw(screen, self.npc_manager, (self.player.x, self.player.y))
         
         # 繪製農夫狀態UI（在最上層）
         if hasattr(self.npc_manager, 'farmer_scheduler'):
             self.farmer_status_ui.draw(screen, self.npc_manager.farmer_scheduler, self.time_manager)
             # 在地圖上顯示農夫狀態標記
-            camera_x = self.camera_controller.camera_x
-            camera_y = self.camera_controller.camera_y
+            camera_x, camera_y = self.camera_controller.get_render_position()
             self.farmer_status_ui.draw_farmer_info_on_map(screen, camera_x, camera_y, self.npc_manager.farmer_scheduler)
 
     def _draw_terrain(self, screen, visible_rect):
@@ -618,8 +652,7 @@ class TownScene(Scene):
         screen (Surface): 遊戲螢幕\n
         visible_rect (Rect): 可見區域\n
         """
-        camera_x = self.camera_controller.camera_x
-        camera_y = self.camera_controller.camera_y
+        camera_x, camera_y = self.camera_controller.get_render_position()
 
         # 調試信息：每10幀打印一次
         if not hasattr(self, '_debug_frame_count'):
@@ -631,17 +664,11 @@ class TownScene(Scene):
             print(f"地圖尺寸: {self.terrain_system.map_width}x{self.terrain_system.map_height}")
             print(f"建築物數量: {len(self.terrain_system.buildings)}")
 
-        # 繪製地形基礎
+        # 繪製地形基礎（包含水波紋、農地、蔬果園底色）
         self.terrain_system.draw_terrain_layer(screen, camera_x, camera_y)
 
-        # 繪製森林元素
-        self.terrain_system.draw_forest_elements(screen, camera_x, camera_y)
-
-        # 繪製水體元素
-        self.terrain_system.draw_water_elements(screen, camera_x, camera_y)
-
-        # 繪製蔬果園（新增）
-        self.terrain_system.draw_vegetable_gardens(screen, camera_x, camera_y)
+        # 繪製樹木、森林資源、作物
+        self.terrain_system.draw_decoration_overlay(screen, camera_x, camera_y)
         
         # 繪製街燈系統
         self.street_light_system.draw(screen, (camera_x, camera_y))
@@ -666,8 +693,7 @@ class TownScene(Scene):
         screen (Surface): 遊戲螢幕\n
         visible_rect (Rect): 可見區域\n
         """
-        camera_x = self.camera_controller.camera_x
-        camera_y = self.camera_controller.camera_y
+        camera_x, camera_y = self.camera_controller.get_render_position()
 
         # 調試信息：每10幀打印一次
         if not hasattr(self, '_debug_entity_frame_count'):
@@ -798,7 +824,7 @@ class TownScene(Scene):
                         camera_offset = (self.camera_controller.camera_x, self.camera_controller.camera_y)
                         shoot_result = self.shooting_system.handle_mouse_shoot(self.player, event.pos, camera_offset)
                         print(f"🔫 左鍵射擊: can_shoot={self.player.can_shoot()}, shoot_result={shoot_result}")
-                        print(f"   當前子彈數: {len(self.shooting_system.bullets)}")
+                        print(f"   當前子彈數: {self.shooting_system.get_bullet_count()}")
                     else:
                         print(f"❌ 無法射擊: can_shoot={self.player.can_shoot()}")
                         # 嘗試處理火車站點擊
@@ -1103,6 +1129,7 @@ class TownScene(Scene):
         離開場景\n
         """
         print("離開小鎮場景")
+        # 模擬子程序不在這裡停止：子程序持有 NPC 路徑、排程等完整狀態，回到小鎮時繼續使用
 
     def get_player(self):
         """
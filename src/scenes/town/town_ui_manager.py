@@ -2,9 +2,46 @@
 import pygame
 from src.utils.font_manager import get_font_manager
 from src.utils.helpers import draw_text
+from src.utils.object_pool import ObjectPool
 from config.settings import *
 
 
+######################提示訊息記錄######################
+class UIMessage:
+    """
+    提示訊息記錄 - 由 TownUIManager 的物件池重複使用\n
+    \n
+    保存訊息文字、剩餘顯示時間，以及渲染好的文字和背景表面\n
+    重複顯示相同文字時沿用已渲染的表面，不用每幀重新渲染\n
+    """
+
+    def __init__(self, text, duration=3.0):
+        """
+        初始化訊息記錄\n
+        \n
+        參數:\n
+        text (str): 訊息文字\n
+        duration (float): 顯示時間（秒）\n
+        """
+        self.reset(text, duration)
+
+    def reset(self, text, duration=3.0):
+        """
+        重設訊息記錄（物件池取出時呼叫）\n
+        \n
+        參數:\n
+        text (str): 訊息文字\n
+        duration (float): 顯示時間（秒）\n
+        """
+        if getattr(self, "text", None) != text:
+            self.text_surface = None
+            self.text_rect = None
+            self.bg_surface = None
+            self.bg_rect = None
+        self.text = text
+        self.timer = duration
+
+
 ######################小鎮 UI 管理器######################
 class TownUIManager:
     """
@@ -38,8 +75,8 @@ class TownUIManager:
         self.show_controls_hint = True
         
         # 訊息系統
-        self.current_message = ""
-        self.message_timer = 0
+        self.active_message = None  # 目前顯示的 UIMessage
+        self.message_pool = ObjectPool(UIMessage, prewarm=2)
         self.message_duration = 3.0  # 訊息顯示時間（秒）
         
         # HUD 設定
@@ -48,6 +85,16 @@ class TownUIManager:
         
         print("小鎮 UI 管理器初始化完成")
 
+    @property
+    def current_message(self):
+        """目前顯示的訊息文字"""
+        return self.active_message.text if self.active_message else ""
+
+    @property
+    def message_timer(self):
+        """目前訊息的剩餘顯示時間"""
+        return self.active_message.timer if self.active_message else 0
+
     def update(self, dt):
         """
         更新 UI 狀態\n
@@ -56,10 +103,11 @@ class TownUIManager:
         dt (float): 時間差\n
         """
         # 更新訊息計時器
-        if self.message_timer > 0:
-            self.message_timer -= dt
-            if self.message_timer <= 0:
-                self.current_message = ""
+        if self.active_message:
+            self.active_message.timer -= dt
+            if self.active_message.timer <= 0:
+                self.message_pool.release(self.active_message)
+                self.active_message = None
 
     def draw(self, screen, camera_controller, npc_manager, time_manager):
         """
@@ -125,9 +173,9 @@ class TownUIManager:
         screen (Surface): 遊戲螢幕\n
         npc_manager (NPCManager): NPC 管理器\n
         """
-        # 獲取附近的 NPC
+        # 獲取附近 NPC 的狀態資訊（由狀態表的距離索引取出，依距離排序）
         player_pos = (self.player.x, self.player.y)
-        nearby_npcs = npc_manager.get_npcs_in_range(player_pos, 200)
+        nearby_npcs = npc_manager.get_npc_status_list(player_pos, 200)
         
         # 更新並繪製 NPC 資訊
         self.npc_info_ui.update_npc_list(nearby_npcs)
@@ -140,28 +188,30 @@ class TownUIManager:
         參數:\n
         screen (Surface): 遊戲螢幕\n
         """
-        if not self.current_message:
+        message = self.active_message
+        if not message or not message.text:
             return
         
-        # 計算訊息位置（螢幕中央上方）
-        message_y = SCREEN_HEIGHT // 4
-        
-        # 繪製訊息背景
-        font = self.font_manager.get_font(LARGE_FONT_SIZE)
-        text_surface = font.render(self.current_message, True, self.hud_text_color)
-        text_rect = text_surface.get_rect()
-        text_rect.centerx = SCREEN_WIDTH // 2
-        text_rect.y = message_y
-        
-        # 背景矩形稍微大一點
-        bg_rect = text_rect.inflate(20, 10)
-        bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-        bg_surface.set_alpha(180)
-        bg_surface.fill((0, 0, 0))
+        # 文字和背景只在訊息內容改變時渲染一次
+        if message.text_surface is None:
+            # 計算訊息位置（螢幕中央上方）
+            message_y = SCREEN_HEIGHT // 4
+            
+            font = self.font_manager.get_font(LARGE_FONT_SIZE)
+            message.text_surface = font.render(message.text, True, self.hud_text_color)
+            message.text_rect = message.text_surface.get_rect()
+            message.text_rect.centerx = SCREEN_WIDTH // 2
+            message.text_rect.y = message_y
+            
+            # 背景矩形稍微大一點
+            message.bg_rect = message.text_rect.inflate(20, 10)
+            message.bg_surface = pygame.Surface((message.bg_rect.width, message.bg_rect.height))
+            message.bg_surface.set_alpha(180)
+            message.bg_surface.fill((0, 0, 0))
         
         # 繪製背景和文字
-        screen.blit(bg_surface, bg_rect.topleft)
-        screen.blit(text_surface, text_rect.topleft)
+        screen.blit(message.bg_surface, message.bg_rect.topleft)
+        screen.blit(message.text_surface, message.text_rect.topleft)
 
     def _draw_controls_hint(self, screen):
         """
@@ -180,8 +230,9 @@ class TownUIManager:
         message (str): 要顯示的訊息\n
         duration (float): 顯示時間（秒）\n
         """
-        self.current_message = message
-        self.message_timer = duration
+        if self.active_message:
+            self.message_pool.release(self.active_message)
+        self.active_message = self.message_pool.acquire(message, duration)
         print(f"UI 訊息: {message}")
 
     def toggle_npc_info(self):
@@ -222,5 +273,6 @@ class TownUIManager:
             "show_npc_info": self.show_npc_info,
             "show_controls_hint": self.show_controls_hint,
             "current_message": self.current_message,
-            "message_timer": round(self.message_timer, 2) if self.message_timer > 0 else 0
+            "message_timer": round(self.message_timer, 2) if self.message_timer > 0 else 0,
+            "message_pool": self.message_pool.get_statistics(),
         }
\ No newline at end of file
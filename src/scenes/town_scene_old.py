@@ -1243,14 +1243,8 @@ class TownScene(Scene):
         # 繪製地形層（背景）
         self.terrain_system.draw_terrain_layer(screen, self.camera_x, self.camera_y)
 
-        # 繪製森林元素
-        self.terrain_system.draw_forest_elements(screen, self.camera_x, self.camera_y)
-
-        # 繪製水體元素
-        self.terrain_system.draw_water_elements(screen, self.camera_x, self.camera_y)
-
-        # 繪製蔬果園（新增）
-        self.terrain_system.draw_vegetable_gardens(screen, self.camera_x, self.camera_y)
+        # 繪製樹木、森林資源、作物
+        self.terrain_system.draw_decoration_overlay(screen, self.camera_x, self.camera_y)
 
         # 繪製建築物
         self.terrain_system.draw_buildings(screen, self.camera_x, self.camera_y)
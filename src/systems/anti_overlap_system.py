@@ -2,7 +2,335 @@
 import pygame
 import math
 import random
+from array import array
+from collections import deque
 from config.settings import *
+from src.core.game_clock import get_game_clock
+
+
+######################安全位置索引######################
+class SafePositionIndex:
+    """
+    安全位置索引 - 預先計算每個格子最近的安全格子\n
+    \n
+    把地圖切成 cell_size 大小的格子，每個格子中心依照地形和障礙物判斷是否安全\n
+    每種安全類別（玩家、一般NPC、農夫）各自做一次多源距離轉換，\n
+    記錄每個格子最近的安全格子，尋找安全位置只需要一次陣列查詢\n
+    \n
+    地形或障礙物（建築物、樹木）改變時只重新計算受影響的格子\n
+    """
+
+    # 8 方向鄰居
+    NEIGHBORS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+    # 尚未到達的距離
+    UNREACHED = 2 ** 31 - 1
+
+    def __init__(self, terrain_system, safety_classes, cell_size=ANTI_OVERLAP_CELL_SIZE, clearance=4):
+        """
+        初始化安全位置索引\n
+        \n
+        參數:\n
+        terrain_system (TerrainBasedSystem): 地形系統\n
+        safety_classes (dict): 安全類別名稱 -> 安全地形代碼列表\n
+        cell_size (int): 格子大小（像素）\n
+        clearance (int): 實體碰撞矩形的半邊長，障礙物依此向外擴張\n
+        """
+        self.terrain_system = terrain_system
+        self.safety_classes = {name: frozenset(types) for name, types in safety_classes.items()}
+        self.cell_size = cell_size
+        self.clearance = clearance
+
+        self.grid_width = 0
+        self.grid_height = 0
+        self._blocked = array("H")  # 每個格子被幾個障礙物覆蓋
+        self._fields = {}  # 安全類別 -> (safe, nearest, dist)，第一次使用時才建立
+
+        # 變更偵測：地形儲存的版本號和障礙物集合
+        self._terrain_revision = 0
+        self._obstacles = set()
+        self._obstacle_signature = None
+
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        完整重建格子、障礙物和所有已建立的距離轉換\n
+        """
+        terrain = self.terrain_system
+        tile_size = terrain.tile_size
+        self.grid_width = max(1, terrain.map_width * tile_size // self.cell_size)
+        self.grid_height = max(1, terrain.map_height * tile_size // self.cell_size)
+
+        self._blocked = array("H", bytes(2 * self.grid_width * self.grid_height))
+        self._obstacles = set(self._collect_obstacles())
+        self._obstacle_signature = self._get_obstacle_signature()
+        for rect in self._obstacles:
+            self._mark_obstacle(rect, 1)
+
+        self._terrain_revision = terrain.terrain_store.revision
+
+        built_classes = list(self._fields)
+        self._fields = {}
+        for name in built_classes:
+            self._get_field(name)
+
+    def refresh(self):
+        """
+        檢查地形和障礙物是否改變，只更新受影響的格子\n
+        \n
+        回傳:\n
+        int: 重新計算的格子數量\n
+        """
+        changed_cells = set()
+
+        # 地形變更：從地形儲存的變更紀錄取得改過的格子
+        terrain_store = self.terrain_system.terrain_store
+        if terrain_store.revision != self._terrain_revision:
+            changed_tiles = terrain_store.changes_since(self._terrain_revision)
+            if changed_tiles is None:
+                # 變更紀錄已不完整（大範圍修改），整個重建
+                self.rebuild()
+                return self.grid_width * self.grid_height
+
+            self._terrain_revision = terrain_store.revision
+            tile_size = self.terrain_system.tile_size
+            for tile_x, tile_y in set(changed_tiles):
+                changed_cells.update(self._cells_in_rect(
+                    tile_x * tile_size, tile_y * tile_size, tile_size, tile_size
+                ))
+
+        # 障礙物變更：數量改變時比較新舊集合
+        signature = self._get_obstacle_signature()
+        if signature != self._obstacle_signature:
+            self._obstacle_signature = signature
+            obstacles = set(self._collect_obstacles())
+            for rect in self._obstacles - obstacles:
+                changed_cells.update(self._mark_obstacle(rect, -1))
+            for rect in obstacles - self._obstacles:
+                changed_cells.update(self._mark_obstacle(rect, 1))
+            self._obstacles = obstacles
+
+        if changed_cells:
+            for name in self._fields:
+                self._update_field(name, changed_cells)
+
+        return len(changed_cells)
+
+    def find_nearest_safe(self, safety_class, x, y):
+        """
+        查詢最近的安全位置\n
+        \n
+        參數:\n
+        safety_class (str): 安全類別名稱\n
+        x (float): 世界座標 X\n
+        y (float): 世界座標 Y\n
+        \n
+        回傳:\n
+        tuple: 安全格子中心的世界座標，整張地圖都沒有安全格子時回傳 None\n
+        """
+        _, nearest, _ = self._get_field(safety_class)
+        cell_x = min(self.grid_width - 1, max(0, int(x // self.cell_size)))
+        cell_y = min(self.grid_height - 1, max(0, int(y // self.cell_size)))
+        source = nearest[cell_y * self.grid_width + cell_x]
+        if source < 0:
+            return None
+        return self._cell_center(source)
+
+    def _cell_center(self, cell):
+        """
+        格子索引轉換為格子中心的世界座標\n
+        """
+        cell_x = cell % self.grid_width
+        cell_y = cell // self.grid_width
+        return ((cell_x + 0.5) * self.cell_size, (cell_y + 0.5) * self.cell_size)
+
+    def _collect_obstacles(self):
+        """
+        收集所有障礙物矩形（建築物和樹木碰撞框）\n
+        \n
+        回傳:\n
+        list: (x, y, width, height) 列表\n
+        """
+        obstacles = [
+            (building.x, building.y, building.width, building.height)
+            for building in getattr(self.terrain_system, "buildings", [])
+        ]
+        for forest_area in getattr(self.terrain_system, "forest_areas", []):
+            for tree in forest_area["trees"]:
+                obstacles.append(tuple(tree["collision_rect"]))
+        return obstacles
+
+    def _get_obstacle_signature(self):
+        """
+        障礙物數量簽章，用來便宜地判斷是否需要比較障礙物集合\n
+        """
+        tree_count = sum(
+            len(forest_area["trees"]) for forest_area in getattr(self.terrain_system, "forest_areas", [])
+        )
+        return (len(getattr(self.terrain_system, "buildings", [])), tree_count)
+
+    def _cells_in_rect(self, x, y, width, height):
+        """
+        回傳中心點落在矩形內的格子索引\n
+        """
+        cell_size = self.cell_size
+        start_x = max(0, int(x // cell_size))
+        start_y = max(0, int(y // cell_size))
+        end_x = min(self.grid_width, int((x + width) // cell_size) + 1)
+        end_y = min(self.grid_height, int((y + height) // cell_size) + 1)
+        return [
+            cell_y * self.grid_width + cell_x
+            for cell_y in range(start_y, end_y)
+            for cell_x in range(start_x, end_x)
+        ]
+
+    def _mark_obstacle(self, rect, delta):
+        """
+        在障礙物計數上加入或移除一個障礙物\n
+        \n
+        以格子中心放置 clearance 半邊長的碰撞矩形，與障礙物重疊的格子視為被阻擋\n
+        \n
+        參數:\n
+        rect (tuple): 障礙物矩形 (x, y, width, height)\n
+        delta (int): 1 為加入，-1 為移除\n
+        \n
+        回傳:\n
+        list: 受影響的格子索引\n
+        """
+        x, y, width, height = rect
+        left = x - self.clearance
+        top = y - self.clearance
+        right = x + width + self.clearance
+        bottom = y + height + self.clearance
+        half = self.cell_size / 2
+
+        affected = []
+        for cell in self._cells_in_rect(left, top, right - left, bottom - top):
+            center_x, center_y = self._cell_center(cell)
+            # 與 pygame.Rect.colliderect 相同的嚴格重疊判斷
+            if left < center_x < right and top < center_y < bottom:
+                self._blocked[cell] += delta
+                affected.append(cell)
+        return affected
+
+    def _is_cell_safe(self, cell, safe_types):
+        """
+        判斷格子中心對指定安全類別是否安全\n
+        """
+        if self._blocked[cell]:
+            return False
+        center_x, center_y = self._cell_center(cell)
+        tile_size = self.terrain_system.tile_size
+        tile_x = int(center_x // tile_size)
+        tile_y = int(center_y // tile_size)
+        terrain_code = self.terrain_system.terrain_store.get_terrain_at(tile_x, tile_y)
+        if terrain_code is None:
+            terrain_code = 0  # 超出範圍默認為草地
+        # 水域（地形代碼2）永遠不安全
+        return terrain_code != 2 and terrain_code in safe_types
+
+    def _get_field(self, safety_class):
+        """
+        取得安全類別的距離轉換，第一次使用時才計算\n
+        """
+        field = self._fields.get(safety_class)
+        if field is not None:
+            return field
+
+        safe_types = self.safety_classes[safety_class]
+        cell_count = self.grid_width * self.grid_height
+        safe = bytearray(cell_count)
+        nearest = array("i", [-1]) * cell_count
+        dist = array("i", [self.UNREACHED]) * cell_count
+
+        queue = deque()
+        for cell in range(cell_count):
+            if self._is_cell_safe(cell, safe_types):
+                safe[cell] = 1
+                nearest[cell] = cell
+                dist[cell] = 0
+                queue.append(cell)
+
+        field = (safe, nearest, dist)
+        self._propagate(field, queue)
+        self._fields[safety_class] = field
+        return field
+
+    def _update_field(self, safety_class, changed_cells):
+        """
+        增量更新距離轉換\n
+        \n
+        新增的安全格子直接當作新的來源向外擴散\n
+        失去安全的格子，把以它為最近來源的格子重設，再從周圍未受影響的格子重新擴散\n
+        """
+        safe, nearest, dist = self._fields[safety_class]
+        safe_types = self.safety_classes[safety_class]
+
+        queue = deque()
+        removed_sources = set()
+        for cell in changed_cells:
+            is_safe = self._is_cell_safe(cell, safe_types)
+            if is_safe and not safe[cell]:
+                safe[cell] = 1
+                nearest[cell] = cell
+                dist[cell] = 0
+                queue.append(cell)
+            elif not is_safe and safe[cell]:
+                safe[cell] = 0
+                removed_sources.add(cell)
+
+        if removed_sources:
+            affected = [cell for cell, source in enumerate(nearest) if source in removed_sources]
+            for cell in affected:
+                nearest[cell] = -1
+                dist[cell] = self.UNREACHED
+
+            # 從受影響區域邊界上仍有來源的格子重新擴散
+            width = self.grid_width
+            height = self.grid_height
+            for cell in affected:
+                cell_x = cell % width
+                cell_y = cell // width
+                for dx, dy in self.NEIGHBORS:
+                    neighbor_x = cell_x + dx
+                    neighbor_y = cell_y + dy
+                    if 0 <= neighbor_x < width and 0 <= neighbor_y < height:
+                        neighbor = neighbor_y * width + neighbor_x
+                        if nearest[neighbor] >= 0:
+                            queue.append(neighbor)
+
+        self._propagate((safe, nearest, dist), queue)
+
+    def _propagate(self, field, queue):
+        """
+        沿 8 方向鄰居擴散最近來源（依歐氏距離更新）\n
+        """
+        _, nearest, dist = field
+        width = self.grid_width
+        height = self.grid_height
+        neighbors = self.NEIGHBORS
+
+        while queue:
+            cell = queue.popleft()
+            source = nearest[cell]
+            source_x = source % width
+            source_y = source // width
+            cell_x = cell % width
+            cell_y = cell // width
+
+            for dx, dy in neighbors:
+                neighbor_x = cell_x + dx
+                neighbor_y = cell_y + dy
+                if 0 <= neighbor_x < width and 0 <= neighbor_y < height:
+                    neighbor = neighbor_y * width + neighbor_x
+                    offset_x = neighbor_x - source_x
+                    offset_y = neighbor_y - source_y
+                    distance = offset_x * offset_x + offset_y * offset_y
+                    if distance < dist[neighbor]:
+                        dist[neighbor] = distance
+                        nearest[neighbor] = source
+                        queue.append(neighbor)
 
 
 ######################碰撞防止傳送系統######################
@@ -34,9 +362,14 @@ class AntiOverlapTeleportSystem:
         # 農夫NPC特殊安全區域類型（包含農地和基礎區域）
         self.farmer_safe_terrain_types = [3, 5, 6, 8]  # 道路、住宅區、商業區、農地
         
-        # 傳送搜索範圍
-        self.search_radius = 100  # 搜索安全位置的半徑
-        self.max_search_attempts = 20  # 最大搜索嘗試次數
+        # 最近安全位置索引（每種安全類別一份距離轉換）
+        self.safe_position_index = None
+        if self.terrain_system and getattr(self.terrain_system, "terrain_store", None):
+            self.safe_position_index = SafePositionIndex(self.terrain_system, {
+                "player": self.player_safe_terrain_types,
+                "npc": self.npc_safe_terrain_types,
+                "farmer": self.farmer_safe_terrain_types,
+            })
         
         print("🚧 碰撞防止傳送系統已初始化 - NPC不能在草地上，但農夫可以在農地上")
 
@@ -49,13 +382,17 @@ class AntiOverlapTeleportSystem:
         player (Player): 玩家物件\n
         npc_manager (NPCManager): NPC管理器（可選）\n
         """
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = get_game_clock().get_ticks() / 1000.0
         
         # 限制檢查頻率以避免性能問題
         if current_time - self.last_check_time < self.check_interval:
             return
         
         self.last_check_time = current_time
+
+        # 地形或障礙物改變時增量更新安全位置索引
+        if self.safe_position_index:
+            self.safe_position_index.refresh()
         
         # 檢查玩家是否需要傳送
         self._check_and_teleport_player(player)
@@ -247,20 +584,7 @@ class AntiOverlapTeleportSystem:
         回傳:\n
         tuple: 安全位置座標，如果找不到則返回None\n
         """
-        # 使用螺旋搜索方式尋找安全位置
-        for radius in range(10, self.search_radius, 20):
-            for angle_step in range(0, 360, 30):  # 每30度檢查一次
-                angle = angle_step * 3.14159 / 180  # 轉換為弧度
-                
-                test_x = center_x + radius * math.cos(angle)
-                test_y = center_y + radius * math.sin(angle)
-                
-                # 確保在地圖範圍內
-                if self._is_within_map_bounds(test_x, test_y):
-                    if self._is_position_safe_for_player(test_x, test_y):
-                        return (test_x, test_y)
-        
-        return None
+        return self._lookup_safe_position("player", center_x, center_y)
 
     def _find_safe_position_for_npc(self, center_x, center_y):
         """
@@ -273,20 +597,7 @@ class AntiOverlapTeleportSystem:
         回傳:\n
         tuple: 安全位置座標，如果找不到則返回None\n
         """
-        # 使用螺旋搜索方式尋找安全位置
-        for radius in range(10, self.search_radius, 20):
-            for angle_step in range(0, 360, 30):  # 每30度檢查一次
-                angle = angle_step * 3.14159 / 180  # 轉換為弧度
-                
-                test_x = center_x + radius * math.cos(angle)
-                test_y = center_y + radius * math.sin(angle)
-                
-                # 確保在地圖範圍內
-                if self._is_within_map_bounds(test_x, test_y):
-                    if self._is_position_safe_for_npc(test_x, test_y):
-                        return (test_x, test_y)
-        
-        return None
+        return self._lookup_safe_position("npc", center_x, center_y)
 
     def _find_safe_position_for_npc_by_profession(self, npc, center_x, center_y):
         """
@@ -300,20 +611,39 @@ class AntiOverlapTeleportSystem:
         回傳:\n
         tuple: 安全位置座標，如果找不到則返回None\n
         """
-        # 使用螺旋搜索方式尋找安全位置
-        for radius in range(10, self.search_radius, 20):
-            for angle_step in range(0, 360, 30):  # 每30度檢查一次
-                angle = angle_step * 3.14159 / 180  # 轉換為弧度
-                
-                test_x = center_x + radius * math.cos(angle)
-                test_y = center_y + radius * math.sin(angle)
-                
-                # 確保在地圖範圍內
-                if self._is_within_map_bounds(test_x, test_y):
-                    if self._is_position_safe_for_npc_by_profession(npc, test_x, test_y):
-                        return (test_x, test_y)
-        
-        return None
+        return self._lookup_safe_position(self._get_npc_safety_class(npc), center_x, center_y)
+
+    def _get_npc_safety_class(self, npc):
+        """
+        根據NPC職業決定安全類別\n
+        \n
+        參數:\n
+        npc (NPC): NPC物件\n
+        \n
+        回傳:\n
+        str: "farmer" 或 "npc"\n
+        """
+        from src.systems.npc.profession import Profession
+        if getattr(npc, 'profession', None) == Profession.FARMER:
+            return "farmer"
+        return "npc"
+
+    def _lookup_safe_position(self, safety_class, center_x, center_y):
+        """
+        從安全位置索引查詢最近的安全位置\n
+        \n
+        參數:\n
+        safety_class (str): 安全類別 ("player", "npc", "farmer")\n
+        center_x (float): 搜索中心X座標\n
+        center_y (float): 搜索中心Y座標\n
+        \n
+        回傳:\n
+        tuple: 安全位置座標，如果找不到則返回None\n
+        """
+        if not self.safe_position_index:
+            # 沒有地形資料時任何位置都安全
+            return (center_x, center_y)
+        return self.safe_position_index.find_nearest_safe(safety_class, center_x, center_y)
 
     def _is_within_map_bounds(self, x, y):
         """
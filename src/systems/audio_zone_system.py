@@ -0,0 +1,250 @@
+######################載入套件######################
+from src.systems.music_system import MusicType
+from src.core.game_clock import get_game_clock
+from config.settings import AUDIO_ZONE_HYSTERESIS_TILES, AUDIO_ZONE_DWELL_TIME
+
+
+######################音樂區域編碼######################
+# 區域 ID = 音樂索引 * 2 + 是否有草原風聲
+ZONE_MUSIC = (MusicType.DEFAULT, MusicType.FOREST, MusicType.TOWN, MusicType.LEGENDARY_TERRITORY)
+MUSIC_INDEX = {music_type: index for index, music_type in enumerate(ZONE_MUSIC)}
+
+# 地形代碼對應的背景音樂（優先級：傳奇動物領地 > 森林 > 小鎮 > 預設）
+TERRAIN_MUSIC = {
+    1: MusicType.FOREST,  # 森林
+    5: MusicType.TOWN,  # 住宅區/小鎮
+}
+
+# 播放草原風聲的地形代碼
+AMBIENT_TERRAIN = 3
+
+
+def make_zone_id(music_type, ambient):
+    """
+    組合區域 ID\n
+    """
+    return MUSIC_INDEX[music_type] * 2 + (1 if ambient else 0)
+
+
+def get_zone_music(zone_id):
+    """
+    區域的背景音樂類型\n
+    """
+    return ZONE_MUSIC[zone_id >> 1]
+
+
+def zone_has_ambient(zone_id):
+    """
+    區域是否播放草原風聲\n
+    """
+    return bool(zone_id & 1)
+
+
+def _build_terrain_translation():
+    """
+    地形代碼 -> 區域 ID 的 bytes.translate 對照表\n
+    """
+    table = bytearray(256)
+    for terrain_code in range(256):
+        music_type = TERRAIN_MUSIC.get(terrain_code, MusicType.DEFAULT)
+        table[terrain_code] = make_zone_id(music_type, terrain_code == AMBIENT_TERRAIN)
+    return bytes(table)
+
+
+TERRAIN_ZONE_TRANSLATION = _build_terrain_translation()
+
+
+######################音樂區域地圖######################
+class AudioZoneMap:
+    """
+    音樂區域地圖 - 預先算好每個地形格子的音樂區域 ID\n
+    \n
+    地形代碼以 bytes.translate 整列轉換成區域 ID，傳奇動物領地以圓形蓋上去\n
+    地圖只記錄每格實際的區域，遲滯由 AudioZoneController 依玩家的移動處理，\n
+    只有一兩格寬的小區域也會保留下來\n
+    """
+
+    def __init__(self, terrain_system):
+        """
+        初始化音樂區域地圖\n
+        \n
+        參數:\n
+        terrain_system (TerrainBasedSystem): 地形系統\n
+        """
+        self.terrain_system = terrain_system
+
+        self.width = 0
+        self.height = 0
+        self.tile_size = 1
+        self.terrain_zones = bytearray()  # 只有地形的區域 ID
+        self.zone_grid = bytearray()  # 再加上傳奇動物領地，查詢用
+        self.territories = ()
+
+        self.build()
+
+    def build(self):
+        """
+        從地形地圖建立區域 ID\n
+        """
+        terrain_system = self.terrain_system
+        self.width = terrain_system.map_width
+        self.height = terrain_system.map_height
+        self.tile_size = terrain_system.tile_size
+
+        zones = bytearray(self.width * self.height)
+        store = terrain_system.terrain_store
+        for y in range(self.height):
+            start = y * self.width
+            zones[start:start + self.width] = store.read_row(y).translate(TERRAIN_ZONE_TRANSLATION)
+        self.terrain_zones = zones
+        self.set_territories(self.territories)
+
+    def set_territories(self, territories):
+        """
+        設定傳奇動物領地並重建查詢用的區域地圖\n
+        \n
+        參數:\n
+        territories (iterable): (中心 x, 中心 y, 半徑) 的列表（世界座標）\n
+        """
+        self.territories = tuple(territories)
+        grid = bytearray(self.terrain_zones)
+        for center_x, center_y, radius in self.territories:
+            self._stamp_circle(grid, center_x, center_y, radius)
+        self.zone_grid = grid
+
+    def _stamp_circle(self, grid, center_x, center_y, radius):
+        """
+        把圓形範圍內的格子設為傳奇動物領地（保留草原風聲）\n
+        """
+        tile_size = self.tile_size
+        min_x = max(0, int((center_x - radius) // tile_size))
+        max_x = min(self.width - 1, int((center_x + radius) // tile_size))
+        min_y = max(0, int((center_y - radius) // tile_size))
+        max_y = min(self.height - 1, int((center_y + radius) // tile_size))
+        radius_sq = radius * radius
+        half = tile_size / 2
+
+        for ty in range(min_y, max_y + 1):
+            dy = ty * tile_size + half - center_y
+            row_start = ty * self.width
+            for tx in range(min_x, max_x + 1):
+                dx = tx * tile_size + half - center_x
+                if dx * dx + dy * dy > radius_sq:
+                    continue
+                index = row_start + tx
+                grid[index] = make_zone_id(MusicType.LEGENDARY_TERRITORY, zone_has_ambient(self.terrain_zones[index]))
+
+    def get_zone_at(self, world_x, world_y):
+        """
+        查詢位置的區域 ID（地圖外視為預設區域）\n
+        """
+        tile_x = int(world_x // self.tile_size)
+        tile_y = int(world_y // self.tile_size)
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.zone_grid[tile_y * self.width + tile_x]
+        return make_zone_id(MusicType.DEFAULT, False)
+
+
+######################音樂區域控制器######################
+class AudioZoneController:
+    """
+    音樂區域控制器 - 玩家換區域時切換背景音樂和環境音效\n
+    \n
+    每幀只比較玩家所在格子的區域 ID 和目前區域 ID：\n
+    - 相同：不做事\n
+    - 只差在草原風聲：立即切換風聲，背景音樂不變\n
+    - 音樂不同：維持目前的音樂並在背景預先解碼新區域的音樂，\n
+      離開目前區域後走了 hysteresis_tiles 格遠，或在新區域停留 dwell_time 秒，才交叉淡入淡出\n
+    \n
+    遲滯是玩家這一側的狀態，在森林邊緣來回走不會反覆切換，窄小的區域也不會被抹掉\n
+    """
+
+    def __init__(self, music_manager, zone_map, hysteresis_tiles=AUDIO_ZONE_HYSTERESIS_TILES,
+                 dwell_time=AUDIO_ZONE_DWELL_TIME):
+        """
+        初始化音樂區域控制器\n
+        \n
+        參數:\n
+        music_manager (MusicManager): 音樂管理器\n
+        zone_map (AudioZoneMap): 音樂區域地圖\n
+        hysteresis_tiles (float): 離開目前區域後要走多遠（格數）才切換音樂\n
+        dwell_time (float): 在新區域停留多久（秒）也會切換音樂\n
+        """
+        self.music_manager = music_manager
+        self.zone_map = zone_map
+        self.hysteresis_distance = max(0, hysteresis_tiles) * zone_map.tile_size
+        self.dwell_time = dwell_time
+        self.current_zone = None
+        self.preload_hint = None  # 最近一次預先解碼的音樂
+        self.territory_revision = None  # 已套用的傳奇動物領地版本
+
+        # 離開目前區域後的遲滯狀態
+        self.exit_position = None  # 離開目前區域時的位置
+        self.candidate_zone = None  # 目前所在、但還沒切換過去的區域
+        self.candidate_since = 0.0  # 進入 candidate_zone 的時間
+
+    def sync_territories(self, wildlife_manager):
+        """
+        傳奇動物生成或移除後重建領地（版本相同時只是一次比較）\n
+        \n
+        參數:\n
+        wildlife_manager (WildlifeManager): 野生動物管理器\n
+        """
+        if wildlife_manager.territory_revision == self.territory_revision:
+            return
+        self.territory_revision = wildlife_manager.territory_revision
+        self.zone_map.set_territories(wildlife_manager.get_legendary_territories())
+        self.current_zone = None  # 下一幀依新的地圖重新判斷
+
+    def update(self, player_position):
+        """
+        依玩家位置切換音樂\n
+        \n
+        參數:\n
+        player_position (tuple): 玩家位置 (x, y)\n
+        """
+        player_x, player_y = player_position
+        zone = self.zone_map.get_zone_at(player_x, player_y)
+        if zone == self.current_zone:
+            self.exit_position = None
+            self.candidate_zone = None
+            return
+
+        # 一開始，或只差在草原風聲時直接切換
+        if self.current_zone is None or get_zone_music(zone) == get_zone_music(self.current_zone):
+            self._enter_zone(zone)
+            return
+
+        now = get_game_clock().time()
+        if self.exit_position is None:
+            self.exit_position = (player_x, player_y)
+        if zone != self.candidate_zone:
+            self.candidate_zone = zone
+            self.candidate_since = now
+            self._preload_zone_music(zone)
+
+        dx = player_x - self.exit_position[0]
+        dy = player_y - self.exit_position[1]
+        if (dx * dx + dy * dy >= self.hysteresis_distance * self.hysteresis_distance
+                or now - self.candidate_since >= self.dwell_time):
+            self._enter_zone(zone)
+
+    def _preload_zone_music(self, zone):
+        """
+        靠近邊界時預先解碼對面區域的音樂\n
+        """
+        music_type = get_zone_music(zone)
+        if music_type != self.preload_hint:
+            self.preload_hint = music_type
+            self.music_manager.preload_music(music_type)
+
+    def _enter_zone(self, zone):
+        """
+        進入新的區域\n
+        """
+        self.current_zone = zone
+        self.preload_hint = None
+        self.exit_position = None
+        self.candidate_zone = None
+        self.music_manager.crossfade_to(get_zone_music(zone))
+        self.music_manager.set_grassland_ambient(zone_has_ambient(zone))
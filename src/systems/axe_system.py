@@ -2,6 +2,11 @@
 import pygame
 import random
 from config.settings import *
+from src.core.game_clock import get_game_clock
+from src.utils.poisson_disk import poisson_disk_sample
+
+# 可以生成樹木的地形代碼（森林）
+FOREST_TERRAIN_CODE = 1
 
 
 ######################斧頭工具######################
@@ -294,6 +299,9 @@ class TreeManager:
     - 創建和放置樹木\n
     - 處理樹木砍伐\n
     - 樹木重生系統\n
+    \n
+    樹木放在以 TREE_INDEX_CELL_SIZE 分格的索引中（以樹木左上角分格），\n
+    砍樹目標、間距檢查、重生都只查詢附近的格子\n
     """
 
     def __init__(self, terrain_system=None):
@@ -306,54 +314,121 @@ class TreeManager:
         self.terrain_system = terrain_system
         self.trees = []
         self.chopped_trees = []  # 被砍伐的樹木位置記錄
+
+        # 樹木格子索引
+        self.index_cell_size = TREE_INDEX_CELL_SIZE
+        self.tree_grid = {}  # {(格 x, 格 y): [Tree]}
+        self.max_tree_size = 0  # 最大的樹木尺寸，查詢時用來擴大搜尋範圍
+        self.min_distance = TREE_MIN_DISTANCE
         
         # 樹木重生設定
         self.respawn_time = 300  # 5分鐘後重生
         
         print("樹木管理器初始化完成")
 
-    def generate_trees_on_terrain(self):
+    def generate_trees_on_terrain(self, max_trees=TREE_TARGET_COUNT):
         """
         根據地形生成樹木\n
         \n
-        在森林地形（地形代碼1）生成樹木\n
+        在森林地形（地形代碼1）上以 Poisson 圓盤取樣，樹木之間至少相隔 min_distance，\n
+        再從取樣結果中隨機挑 max_trees 棵，讓樹木分散在所有森林\n
+        \n
+        參數:\n
+        max_trees (int): 樹木數量上限，None 表示種滿森林\n
         """
         if not self.terrain_system:
             print("警告：沒有地形系統引用，無法生成樹木")
             return
         
-        # 在地形代碼1的區域生成樹木
-        tree_count = 0
-        attempts = 0
-        max_attempts = 1000
+        positions = self._sample_forest_positions()
+        if max_trees is not None and len(positions) > max_trees:
+            positions = random.sample(positions, max_trees)
         
-        while tree_count < 50 and attempts < max_attempts:  # 生成50棵樹
-            attempts += 1
-            
-            # 隨機選擇位置
-            x = random.randint(0, self.terrain_system.map_width - 1)
-            y = random.randint(0, self.terrain_system.map_height - 1)
-            
-            # 檢查地形代碼
-            if (0 <= y < len(self.terrain_system.map_data) and 
-                0 <= x < len(self.terrain_system.map_data[y])):
-                
-                terrain_code = self.terrain_system.map_data[y][x]
-                
-                if terrain_code == 1:  # 森林地形
-                    # 轉換為世界座標
-                    world_x = x * self.terrain_system.tile_size
-                    world_y = y * self.terrain_system.tile_size
-                    
-                    # 檢查是否與現有樹木重疊
-                    if not self._is_position_occupied(world_x, world_y):
-                        tree_type = random.choice(["oak", "pine"])
-                        tree = Tree(world_x, world_y, tree_type)
-                        self.trees.append(tree)
-                        tree_count += 1
+        # 取樣點彼此已相隔 min_distance，只需要避開生成前就存在的樹木
+        has_existing_trees = bool(self.trees)
+        tree_count = 0
+        for world_x, world_y in positions:
+            if has_existing_trees and self._is_position_occupied(world_x, world_y, self.min_distance):
+                continue
+            tree_type = random.choice(["oak", "pine"])
+            self._add_tree(Tree(world_x, world_y, tree_type))
+            tree_count += 1
         
         print(f"生成了 {tree_count} 棵樹木")
 
+    def _sample_forest_positions(self):
+        """
+        在森林格子上做 Poisson 圓盤取樣\n
+        \n
+        每個森林格子都是候選起點（隨機順序），不相連的森林也會各自長滿\n
+        \n
+        回傳:\n
+        list: 樹木左上角的世界座標 [(x, y), ...]\n
+        """
+        terrain_store = self.terrain_system.terrain_store
+        tile_size = self.terrain_system.tile_size
+        needle = bytes((FOREST_TERRAIN_CODE,))
+
+        seed_points = []
+        for tile_y in range(self.terrain_system.map_height):
+            row = terrain_store.read_row(tile_y)
+            tile_x = row.find(needle)
+            while tile_x != -1:
+                seed_points.append(((tile_x + random.random()) * tile_size, (tile_y + random.random()) * tile_size))
+                tile_x = row.find(needle, tile_x + 1)
+        random.shuffle(seed_points)
+
+        def is_forest(x, y):
+            return terrain_store.get_terrain_at(int(x // tile_size), int(y // tile_size)) == FOREST_TERRAIN_CODE
+
+        samples = poisson_disk_sample(
+            self.terrain_system.map_width * tile_size,
+            self.terrain_system.map_height * tile_size,
+            self.min_distance,
+            is_forest,
+            seed_points,
+            TREE_POISSON_ATTEMPTS,
+        )
+        return [(int(x), int(y)) for x, y in samples]
+
+    ######################樹木索引######################
+    def _get_tree_cell(self, x, y):
+        """
+        位置所在的索引格子\n
+        """
+        return int(x // self.index_cell_size), int(y // self.index_cell_size)
+
+    def _add_tree(self, tree):
+        """
+        加入樹木並放進索引\n
+        """
+        self.trees.append(tree)
+        self.tree_grid.setdefault(self._get_tree_cell(tree.x, tree.y), []).append(tree)
+        self.max_tree_size = max(self.max_tree_size, tree.width, tree.height)
+
+    def _remove_tree(self, tree):
+        """
+        移除樹木並從索引中刪除\n
+        """
+        if tree in self.trees:
+            self.trees.remove(tree)
+        cell = self._get_tree_cell(tree.x, tree.y)
+        cell_trees = self.tree_grid.get(cell)
+        if cell_trees and tree in cell_trees:
+            cell_trees.remove(tree)
+            if not cell_trees:
+                del self.tree_grid[cell]
+
+    def _iter_trees_near(self, x, y, radius):
+        """
+        列出左上角在 (x, y) 周圍 radius 範圍（正方形）內格子中的樹木\n
+        """
+        min_cell_x, min_cell_y = self._get_tree_cell(x - radius, y - radius)
+        max_cell_x, max_cell_y = self._get_tree_cell(x + radius, y + radius)
+        for cell_y in range(min_cell_y, max_cell_y + 1):
+            for cell_x in range(min_cell_x, max_cell_x + 1):
+                yield from self.tree_grid.get((cell_x, cell_y), ())
+
     def _is_position_occupied(self, x, y, min_distance=60):
         """
         檢查位置是否被其他樹木佔據\n
@@ -366,9 +441,11 @@ class TreeManager:
         回傳:\n
         bool: 是否被佔據\n
         """
-        for tree in self.trees:
-            distance = ((tree.x - x) ** 2 + (tree.y - y) ** 2) ** 0.5
-            if distance < min_distance:
+        min_distance_sq = min_distance * min_distance
+        for tree in self._iter_trees_near(x, y, min_distance):
+            dx = tree.x - x
+            dy = tree.y - y
+            if dx * dx + dy * dy < min_distance_sq:
                 return True
         return False
 
@@ -379,15 +456,24 @@ class TreeManager:
         參數:\n
         x (int): X座標\n
         y (int): Y座標\n
-        max_distance (float): 最大距離\n
+        max_distance (float): 最大距離（到樹木中心）\n
         \n
         回傳:\n
-        Tree: 找到的樹木，如果沒有則返回None\n
-        """
-        for tree in self.trees:
-            if tree.is_alive and tree.is_near_position(x, y, max_distance):
-                return tree
-        return None
+        Tree: 範圍內最近的樹木，如果沒有則返回None\n
+        """
+        closest_tree = None
+        closest_distance_sq = max_distance * max_distance
+        # 索引以左上角分格，搜尋範圍加上樹木尺寸才會涵蓋中心在範圍內的樹木
+        for tree in self._iter_trees_near(x, y, max_distance + self.max_tree_size):
+            if not tree.is_alive:
+                continue
+            dx = x - (tree.x + tree.width // 2)
+            dy = y - (tree.y + tree.height // 2)
+            distance_sq = dx * dx + dy * dy
+            if distance_sq <= closest_distance_sq:
+                closest_distance_sq = distance_sq
+                closest_tree = tree
+        return closest_tree
 
     def chop_tree(self, tree, player):
         """
@@ -413,17 +499,15 @@ class TreeManager:
             player.money += tree.money_reward
             
             # 記錄砍伐時間用於重生
-            import time
             chopped_info = {
                 "position": (tree.x, tree.y),
                 "tree_type": tree.tree_type,
-                "chopped_time": time.time()
+                "chopped_time": get_game_clock().time()
             }
             self.chopped_trees.append(chopped_info)
             
-            # 從活樹列表中移除
-            if tree in self.trees:
-                self.trees.remove(tree)
+            # 從活樹列表和索引中移除
+            self._remove_tree(tree)
             
             return {
                 "success": True,
@@ -447,8 +531,7 @@ class TreeManager:
         """
         檢查樹木重生\n
         """
-        import time
-        current_time = time.time()
+        current_time = get_game_clock().time()
         respawned_trees = []
         
         for chopped_info in self.chopped_trees[:]:
@@ -458,7 +541,7 @@ class TreeManager:
                 tree_type = chopped_info["tree_type"]
                 
                 new_tree = Tree(x, y, tree_type)
-                self.trees.append(new_tree)
+                self._add_tree(new_tree)
                 respawned_trees.append(chopped_info)
                 
                 print(f"樹木在 ({x}, {y}) 重新生長")
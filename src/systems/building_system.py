@@ -5,6 +5,7 @@ import math
 from config.settings import *
 from src.systems.furniture_system import HouseInteriorManager
 from src.utils.font_manager import FontManager
+from src.core.game_clock import get_game_clock
 
 
 ######################建築類別######################
@@ -36,6 +37,7 @@ class Building:
 
         # 建築狀態 - 先初始化預設值
         self.is_open = True
+        self.has_power = True  # 所屬電力區域是否有電（由電力管理器推送）
         self.staff_count = 0
         self.customers = []
         self.services = []
@@ -504,7 +506,7 @@ class Hospital(Building):
 
         patient_record = {
             "patient": patient,
-            "admission_time": pygame.time.get_ticks(),
+            "admission_time": get_game_clock().get_ticks(),
             "cause": cause,
             "treatment_duration": 24,  # 住院24小時 (遊戲時間)
         }
@@ -600,12 +602,13 @@ class ResidentialHouse(Building):
             self.has_interior = True
             print(f"為住宅 {self.name} 創建了內部佈置")
 
-    def add_resident(self, npc):
+    def add_resident(self, npc, log=True):
         """
         添加居民到住宅\n
         \n
         參數:\n
         npc (NPC): 要添加的NPC\n
+        log (bool): 是否輸出分配訊息（批次分配時關閉，只輸出總結）\n
         \n
         回傳:\n
         bool: 是否成功添加\n
@@ -615,7 +618,8 @@ class ResidentialHouse(Building):
         
         self.residents.append(npc)
         npc.set_home((self.x + self.width // 2, self.y + self.height // 2))
-        print(f"NPC {npc.name} 被分配到住宅 {self.name}")
+        if log:
+            print(f"NPC {npc.name} 被分配到住宅 {self.name}")
         return True
 
     def remove_resident(self, npc):
@@ -975,7 +979,7 @@ class GridBuildingManager:
         # 檢查座標是否在地圖範圍內
         if (0 <= tile_x < self.terrain_system.map_width and 
             0 <= tile_y < self.terrain_system.map_height):
-            return self.terrain_system.map_data[tile_y][tile_x]
+            return self.terrain_system.terrain_store.get_terrain_at(tile_x, tile_y)
         
         return None
 
@@ -1,8 +1,8 @@
 ######################載入套件######################
 import pygame
-import time
 from config.settings import *
 from src.utils.font_manager import get_font_manager, FontManager
+from src.core.game_clock import get_game_clock
 
 
 ######################教堂建築######################
@@ -255,7 +255,7 @@ class BlessingSystem:
         參數:\n
         player (Player): 玩家物件\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
         
         # 記錄祝福資訊
         blessing_info = {
@@ -291,7 +291,7 @@ class BlessingSystem:
             return False
         
         blessing = self.active_blessings[player_id]
-        current_time = time.time()
+        current_time = get_game_clock().time()
         
         # 檢查祝福是否過期
         if current_time > blessing["end_time"]:
@@ -315,7 +315,7 @@ class BlessingSystem:
         
         player_id = id(player)
         blessing = self.active_blessings[player_id]
-        current_time = time.time()
+        current_time = get_game_clock().time()
         
         return max(0, blessing["end_time"] - current_time)
 
@@ -365,7 +365,7 @@ class BlessingSystem:
         參數:\n
         dt (float): 時間間隔\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
         expired_blessings = []
         
         # 檢查過期的祝福
@@ -1,9 +1,52 @@
 ######################載入套件######################
 import pygame
 import random
+from src.utils.texture_atlas import TextureAtlas
 from config.settings import *
 
 
+######################玩家家具圖集######################
+PLAYER_HOME_SHEET_PATH = "assets/images/playerhome/roguelikeIndoor_magenta.png"
+
+# 圖集為 16x16 的格子，格子間隔 1 像素，洋紅色為透明色
+# 區域定義：名稱 -> (col, row, 寬格數, 高格數)
+FURNITURE_ATLAS_REGIONS = {
+    "bed": (14, 6, 2, 2),
+    "table": (4, 4, 2, 1),
+    "chair": (1, 2, 1, 1),
+    "sofa": (12, 0, 2, 2),
+    "kitchen": (4, 12, 4, 1),
+    "wardrobe": (23, 11, 2, 2),
+    "tv": (14, 14, 1, 1),
+    "bookshelf": (25, 11, 1, 2),
+    "save_point": (22, 8, 1, 1),
+    "workbench": (0, 15, 2, 1),
+    "storage": (2, 15, 1, 1),
+    "door_closed": (25, 8, 1, 2),
+    "door_open": (26, 8, 1, 2),
+}
+
+_furniture_atlas = None
+
+def get_furniture_atlas():
+    """
+    取得所有家具和門共用的材質圖集\n
+    \n
+    回傳:\n
+    TextureAtlas: 玩家家具圖集\n
+    """
+    global _furniture_atlas
+    if _furniture_atlas is None:
+        _furniture_atlas = TextureAtlas(
+            PLAYER_HOME_SHEET_PATH,
+            tile_size=16,
+            spacing=1,
+            colorkey=(255, 0, 255),
+            regions=FURNITURE_ATLAS_REGIONS,
+        )
+    return _furniture_atlas
+
+
 ######################家具類別######################
 class Furniture:
     """
@@ -278,42 +321,19 @@ class Furniture:
         # 創建螢幕矩形
         screen_rect = pygame.Rect(screen_x, screen_y, self.width, self.height)
         
-        # 載入並使用玩家家專用圖片
-        try:
-            import pygame
-            import os
-            player_home_image_path = "assets/images/playerhome/roguelikeIndoor_magenta.png"
-            
-            # 嘗試載入圖片
-            if hasattr(self, '_cached_image') and self._cached_image:
-                # 使用快取的圖片
-                furniture_image = self._cached_image
-            else:
-                # 載入原始圖片
-                if os.path.exists(player_home_image_path):
-                    original_image = pygame.image.load(player_home_image_path).convert_alpha()
-                    # 縮放圖片到家具大小
-                    furniture_image = pygame.transform.scale(original_image, (self.width, self.height))
-                    # 快取圖片避免重複載入
-                    self._cached_image = furniture_image
-                else:
-                    # 如果圖片不存在，使用原來的繪製方式
-                    furniture_image = None
-            
-            # 繪製家具
-            if furniture_image:
-                # 使用圖片繪製
-                screen.blit(furniture_image, screen_rect)
-                # 加上邊框以便識別
-                pygame.draw.rect(screen, (0, 0, 0), screen_rect, 2)
-            else:
-                # 使用原來的純色繪製方式
-                pygame.draw.rect(screen, self.color, screen_rect)
-                pygame.draw.rect(screen, (0, 0, 0), screen_rect, 1)
-            
-        except Exception as e:
-            # 如果載入圖片失敗，使用原來的繪製方式
-            print(f"家具圖片載入失敗: {e}")
+        # 從共用圖集取得已縮放到家具大小的圖片
+        atlas = get_furniture_atlas()
+        region_name = self.furniture_type if atlas.has_region(self.furniture_type) else "table"
+        furniture_image = atlas.get(region_name, (self.width, self.height))
+        
+        # 繪製家具
+        if furniture_image:
+            # 使用圖片繪製
+            screen.blit(furniture_image, screen_rect)
+            # 加上邊框以便識別
+            pygame.draw.rect(screen, (0, 0, 0), screen_rect, 2)
+        else:
+            # 圖集不存在時使用原來的純色繪製方式
             pygame.draw.rect(screen, self.color, screen_rect)
             pygame.draw.rect(screen, (0, 0, 0), screen_rect, 1)
         
@@ -440,48 +460,18 @@ class Door:
         else:
             color = self.color
         
-        # 載入並使用玩家家專用圖片
-        try:
-            import pygame
-            import os
-            player_home_image_path = "assets/images/playerhome/roguelikeIndoor_magenta.png"
-            
-            # 嘗試載入圖片
-            if hasattr(self, '_cached_image') and self._cached_image:
-                # 使用快取的圖片
-                door_image = self._cached_image
-            else:
-                # 載入原始圖片
-                if os.path.exists(player_home_image_path):
-                    original_image = pygame.image.load(player_home_image_path).convert_alpha()
-                    # 縮放圖片到門的大小
-                    door_image = pygame.transform.scale(original_image, (self.width, self.height))
-                    # 如果是開著的門，調暗一些
-                    if self.is_open:
-                        # 創建一個半透明的黑色遮罩
-                        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                        overlay.fill((0, 0, 0, 80))  # 半透明黑色
-                        door_image.blit(overlay, (0, 0))
-                    # 快取圖片避免重複載入
-                    self._cached_image = door_image
-                else:
-                    # 如果圖片不存在，使用原來的繪製方式
-                    door_image = None
-            
-            # 繪製門
-            if door_image:
-                # 使用圖片繪製
-                screen.blit(door_image, screen_rect)
-                # 加上邊框以便識別
-                pygame.draw.rect(screen, (139, 69, 19), screen_rect, 3)  # 棕色邊框
-            else:
-                # 使用原來的純色繪製方式
-                pygame.draw.rect(screen, color, screen_rect)
-                pygame.draw.rect(screen, (0, 0, 0), screen_rect, 1)
-            
-        except Exception as e:
-            # 如果載入圖片失敗，使用原來的繪製方式
-            print(f"門圖片載入失敗: {e}")
+        # 從共用圖集取得對應開關狀態的門圖片
+        region_name = "door_open" if self.is_open else "door_closed"
+        door_image = get_furniture_atlas().get(region_name, (self.width, self.height))
+        
+        # 繪製門
+        if door_image:
+            # 使用圖片繪製
+            screen.blit(door_image, screen_rect)
+            # 加上邊框以便識別
+            pygame.draw.rect(screen, (139, 69, 19), screen_rect, 3)  # 棕色邊框
+        else:
+            # 圖集不存在時使用原來的純色繪製方式
             pygame.draw.rect(screen, color, screen_rect)
             pygame.draw.rect(screen, (0, 0, 0), screen_rect, 1)
         
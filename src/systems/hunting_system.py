@@ -2,8 +2,8 @@
 import pygame
 import math
 import random
-import time
 from config.settings import *
+from src.core.game_clock import get_game_clock
 
 
 ######################狩獵系統######################
@@ -470,7 +470,7 @@ class HuntingSystem:
         
         # 瞄準圈（如果有目標）
         if self.target_animal:
-            circle_radius = 20 + int(math.sin(pygame.time.get_ticks() / 200) * 5)
+            circle_radius = 20 + int(math.sin(get_game_clock().get_ticks() / 200) * 5)
             pygame.draw.circle(screen, color, (x, y), circle_radius, 2)
 
     def draw_target_indicators(self, screen, camera_offset, animals_in_range):
@@ -1,7 +1,10 @@
 ######################載入套件######################
 import pygame
 import os
+import threading
+from collections import OrderedDict
 from enum import Enum
+from config.settings import MUSIC_CROSSFADE_MS, MUSIC_TRACK_CACHE_SIZE
 
 
 ######################音樂類型列舉######################
@@ -37,6 +40,10 @@ class MusicManager:
     2. 根據玩家位置/事件切換音樂\n
     3. 環境音效的管理\n
     4. 音量控制和淡入淡出效果\n
+    \n
+    依位置切換的背景音樂（crossfade_to）不使用 pygame.mixer.music：\n
+    音樂在背景執行緒解碼成 Sound，放在兩個保留的聲道上交叉淡入淡出，\n
+    主執行緒不會因為讀檔而卡住，解碼好的音樂保留在小型快取中\n
     """
 
     def __init__(self):
@@ -77,6 +84,19 @@ class MusicManager:
         # 當前播放狀態
         self.is_music_playing = False
         self.current_sound_effects = set()  # 正在播放的音效
+
+        # 交叉淡入淡出用的兩個保留聲道（音效不會佔用）
+        pygame.mixer.set_reserved(2)
+        self.music_channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+        self.active_channel_index = 0
+
+        # 背景解碼的音樂
+        self.decoded_tracks = OrderedDict()  # 音樂類型 -> Sound（最近使用的在後面）
+        self._decoded_pending = {}  # 背景執行緒解碼完成、尚未移到快取的音樂
+        self._decode_lock = threading.Lock()
+        self._decoding = set()  # 正在解碼的音樂類型
+        self.missing_tracks = set()  # 無法載入的音樂類型
+        self.pending_music = None  # 等待解碼完成後要切換的音樂
         
         # 載入音效檔案
         self._load_sound_effects()
@@ -140,6 +160,9 @@ class MusicManager:
             # 停止當前音樂
             if self.is_music_playing:
                 pygame.mixer.music.fadeout(500)  # 淡出500ms
+                for channel in self.music_channels:
+                    channel.fadeout(500)
+                self.pending_music = None
 
             # 檢查檔案是否存在
             if os.path.exists(file_path):
@@ -171,8 +194,11 @@ class MusicManager:
 
         try:
             pygame.mixer.music.fadeout(fade_out_ms)
+            for channel in self.music_channels:
+                channel.fadeout(fade_out_ms)
             self.is_music_playing = False
             self.current_music = None
+            self.pending_music = None
             print("背景音樂已停止")
         except pygame.error as e:
             print(f"停止音樂失敗: {e}")
@@ -238,6 +264,7 @@ class MusicManager:
         self.music_volume = max(0.0, min(1.0, volume))
         if self.enabled and self.is_music_playing:
             pygame.mixer.music.set_volume(self.music_volume)
+            self.music_channels[self.active_channel_index].set_volume(self.music_volume)
 
     def set_sfx_volume(self, volume):
         """
@@ -264,13 +291,149 @@ class MusicManager:
 
         # 優先級：傳奇動物領地 > 森林 > 小鎮 > 預設
         if in_legendary_territory:
-            self.play_music(MusicType.LEGENDARY_TERRITORY)
+            self.crossfade_to(MusicType.LEGENDARY_TERRITORY)
         elif terrain_type == 1:  # 森林地形
-            self.play_music(MusicType.FOREST)
+            self.crossfade_to(MusicType.FOREST)
         elif terrain_type == 5:  # 住宅區/小鎮
-            self.play_music(MusicType.TOWN)
+            self.crossfade_to(MusicType.TOWN)
         else:
-            self.play_music(MusicType.DEFAULT)
+            self.crossfade_to(MusicType.DEFAULT)
+
+    ######################背景解碼和交叉淡入淡出######################
+    def _resolve_music_type(self, music_type):
+        """
+        找出實際要播放的音樂類型（檔案不存在時改用預設音樂）\n
+        \n
+        回傳:\n
+        MusicType: 可播放的音樂類型，都不能播放時回傳 None\n
+        """
+        if music_type in self.missing_tracks or not os.path.exists(self.music_files.get(music_type, "")):
+            self.missing_tracks.add(music_type)
+            if music_type != MusicType.DEFAULT:
+                return self._resolve_music_type(MusicType.DEFAULT)
+            return None
+        return music_type
+
+    def preload_music(self, music_type):
+        """
+        在背景執行緒解碼音樂，之後切換時不需要讀檔\n
+        \n
+        參數:\n
+        music_type (MusicType): 音樂類型\n
+        """
+        if not self.enabled:
+            return
+
+        music_type = self._resolve_music_type(music_type)
+        if music_type is None or music_type in self.decoded_tracks or music_type in self._decoding:
+            return
+
+        self._decoding.add(music_type)
+        thread = threading.Thread(
+            target=self._decode_worker, args=(music_type, self.music_files[music_type]),
+            name=f"music-decode-{music_type.value}", daemon=True,
+        )
+        thread.start()
+
+    def _decode_worker(self, music_type, file_path):
+        """
+        背景執行緒：讀取並解碼整首音樂\n
+        """
+        try:
+            sound = pygame.mixer.Sound(file_path)
+        except pygame.error as e:
+            print(f"解碼音樂失敗 {music_type.value}: {e}")
+            sound = None
+        with self._decode_lock:
+            self._decoded_pending[music_type] = sound
+
+    def _collect_decoded_tracks(self):
+        """
+        把背景解碼完成的音樂移到快取（主執行緒）\n
+        """
+        with self._decode_lock:
+            finished = self._decoded_pending
+            self._decoded_pending = {}
+
+        for music_type, sound in finished.items():
+            self._decoding.discard(music_type)
+            if sound is None:
+                self.missing_tracks.add(music_type)
+                continue
+            self.decoded_tracks[music_type] = sound
+
+        # 超過快取大小時移除最久沒用的音樂（正在播放和等待播放的不移除）
+        for music_type in list(self.decoded_tracks):
+            if len(self.decoded_tracks) <= MUSIC_TRACK_CACHE_SIZE:
+                break
+            if music_type not in (self.current_music, self.pending_music):
+                del self.decoded_tracks[music_type]
+
+    def crossfade_to(self, music_type, fade_ms=MUSIC_CROSSFADE_MS):
+        """
+        交叉淡入淡出到指定的背景音樂（不會卡住主執行緒）\n
+        \n
+        音樂還沒解碼好時先在背景解碼，解碼完成後由 update 開始切換\n
+        \n
+        參數:\n
+        music_type (MusicType): 音樂類型\n
+        fade_ms (int): 交叉淡入淡出時間（毫秒）\n
+        """
+        if not self.enabled:
+            return
+
+        music_type = self._resolve_music_type(music_type)
+        if music_type is None:
+            return
+
+        if music_type == self.current_music and self.is_music_playing:
+            self.pending_music = None
+            return
+
+        self._collect_decoded_tracks()
+        if music_type in self.decoded_tracks:
+            self.pending_music = None
+            self._start_crossfade(music_type, fade_ms)
+        else:
+            self.pending_music = music_type
+            self.preload_music(music_type)
+
+    def _start_crossfade(self, music_type, fade_ms=MUSIC_CROSSFADE_MS):
+        """
+        在另一個聲道淡入新音樂，同時淡出目前的音樂\n
+        """
+        sound = self.decoded_tracks[music_type]
+        self.decoded_tracks.move_to_end(music_type)
+
+        old_channel = self.music_channels[self.active_channel_index]
+        if old_channel.get_busy():
+            old_channel.fadeout(fade_ms)
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade_ms)
+
+        self.active_channel_index = 1 - self.active_channel_index
+        new_channel = self.music_channels[self.active_channel_index]
+        new_channel.set_volume(self.music_volume)
+        new_channel.play(sound, loops=-1, fade_ms=fade_ms)
+
+        self.current_music = music_type
+        self.is_music_playing = True
+        print(f"切換音樂: {music_type.value}")
+
+    def update(self):
+        """
+        每幀呼叫：等待中的音樂解碼完成後開始交叉淡入淡出\n
+        """
+        if not self.enabled or self.pending_music is None:
+            return
+
+        self._collect_decoded_tracks()
+        if self.pending_music in self.decoded_tracks:
+            music_type = self.pending_music
+            self.pending_music = None
+            self._start_crossfade(music_type)
+        elif self.pending_music in self.missing_tracks:
+            self.pending_music = None
 
     def play_grassland_ambient(self, terrain_type):
         """
@@ -283,7 +446,19 @@ class MusicManager:
             return
 
         # 地形代碼 3 代表草原
-        if terrain_type == 3:
+        self.set_grassland_ambient(terrain_type == 3)
+
+    def set_grassland_ambient(self, active):
+        """
+        開啟或關閉草原風聲\n
+        \n
+        參數:\n
+        active (bool): 是否播放\n
+        """
+        if not self.enabled:
+            return
+
+        if active:
             if SoundEffectType.GRASSLAND_WIND not in self.current_sound_effects:
                 self.play_sound_effect(SoundEffectType.GRASSLAND_WIND, loop=True)
         else:
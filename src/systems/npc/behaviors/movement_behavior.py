@@ -52,7 +52,8 @@ class NPCMovementBehavior:
         self.wander_change_interval = 5.0  # 改變遊走目標的間隔
         self.last_wander_change = 0
         
-        print(f"NPC {npc.name} 移動行為初始化完成")
+        # 行為元件隨 NPC 細節層級頻繁建立，不逐一輸出
+        # print(f"NPC {npc.name} 移動行為初始化完成")
 
     def update(self, dt):
         """
@@ -54,7 +54,8 @@ class NPCWorkBehavior:
         self.tasks_completed_today = 0
         self.productivity_score = 0
         
-        print(f"NPC {npc.name} 工作行為初始化完成 - 職業: {npc.profession.value}")
+        # 行為元件隨 NPC 細節層級頻繁建立，不逐一輸出
+        # print(f"NPC {npc.name} 工作行為初始化完成 - 職業: {npc.profession.value}")
 
     def update(self, dt, time_manager):
         """
@@ -149,11 +150,9 @@ class NPCWorkBehavior:
             Profession.FARMER: self._find_farm_workplace(),
             Profession.DOCTOR: self._find_hospital_workplace(),
             Profession.NURSE: self._find_hospital_workplace(),
-            Profession.GUN_SHOP_STAFF: self._find_gun_shop_workplace(),
-            Profession.VENDOR: self._find_vendor_workplace(),
-            Profession.FISHING_SHOP_STAFF: self._find_fishing_shop_workplace(),
-            Profession.CONVENIENCE_STAFF: self._find_convenience_store_workplace(),
-            Profession.POWER_WORKER: self._find_power_workplace(),
+            Profession.GUN_SHOP_WORKER: self._find_gun_shop_workplace(),
+            Profession.STREET_VENDOR: self._find_vendor_workplace(),
+            Profession.CONVENIENCE_STORE_WORKER: self._find_convenience_store_workplace(),
             Profession.HUNTER: self._find_hunting_area()
         }
         
@@ -336,11 +335,9 @@ class NPCWorkBehavior:
             Profession.FARMER: ["澆水", "施肥", "除草", "收穫", "整理農具"],
             Profession.DOCTOR: ["診斷病人", "開處方", "檢查報告", "手術準備", "病歷記錄"],
             Profession.NURSE: ["照顧病人", "測量體溫", "發藥", "協助醫生", "整理病房"],
-            Profession.GUN_SHOP_STAFF: ["整理武器", "清潔槍械", "接待顧客", "檢查庫存", "安全檢查"],
-            Profession.VENDOR: ["準備商品", "接待顧客", "收款", "整理攤位", "補充貨品"],
-            Profession.FISHING_SHOP_STAFF: ["整理釣具", "接待顧客", "修理設備", "檢查庫存", "清潔店面"],
-            Profession.CONVENIENCE_STAFF: ["整理貨架", "收銀", "補充商品", "清潔店面", "檢查庫存"],
-            Profession.POWER_WORKER: ["檢查電線", "維護設備", "修理故障", "巡視區域", "記錄數據"],
+            Profession.GUN_SHOP_WORKER: ["整理武器", "清潔槍械", "接待顧客", "檢查庫存", "安全檢查"],
+            Profession.STREET_VENDOR: ["準備商品", "接待顧客", "收款", "整理攤位", "補充貨品"],
+            Profession.CONVENIENCE_STORE_WORKER: ["整理貨架", "收銀", "補充商品", "清潔店面", "檢查庫存"],
             Profession.HUNTER: ["巡邏森林", "設置陷阱", "追蹤動物", "維護裝備", "記錄觀察"]
         }
         
@@ -354,7 +351,7 @@ class NPCWorkBehavior:
         dt (float): 時間差\n
         time_manager (TimeManager): 時間管理器\n
         """
-        if self.npc.profession == Profession.POWER_WORKER:
+        if self.npc.worker_id:
             self._handle_power_worker_duties(dt)
         elif self.npc.profession == Profession.DOCTOR or self.npc.profession == Profession.NURSE:
             self._handle_medical_duties(dt)
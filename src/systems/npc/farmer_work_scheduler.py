@@ -164,7 +164,7 @@ class FarmerWorkScheduler:
         self._update_farmers_behavior(dt, current_hour, current_minute)
         
         # 檢查卡住的農夫（緊急傳送）
-        self._check_stuck_farmers()
+        self._check_stuck_farmers(dt)
 
     def _check_phase_transition(self, hour, minute):
         """
@@ -419,9 +419,12 @@ class FarmerWorkScheduler:
         # 只有在緊急情況（卡住）時才允許傳送
         # 這個邏輯在 _check_stuck_farmers 中處理
 
-    def _check_stuck_farmers(self):
+    def _check_stuck_farmers(self, dt):
         """
         檢查卡住的農夫並進行緊急傳送\n
+        \n
+        參數:\n
+        dt (float): 時間差（秒）\n
         """
         for farmer in self.farmers:
             # 檢查農夫是否長時間沒有移動（卡住）
@@ -430,10 +433,10 @@ class FarmerWorkScheduler:
                 
                 # 如果位置沒有變化
                 if farmer.last_position == current_pos:
-                    farmer.stuck_timer += 1
+                    farmer.stuck_timer += dt
                     
-                    # 如果卡住超過5秒（300幀 @ 60fps）
-                    if farmer.stuck_timer > 300:
+                    # 如果卡住超過 FARMER_STUCK_TELEPORT_TIME 秒
+                    if farmer.stuck_timer > FARMER_STUCK_TELEPORT_TIME:
                         self._emergency_teleport_farmer(farmer)
                         farmer.stuck_timer = 0
                 else:
@@ -4,7 +4,10 @@ import random
 import math
 from enum import Enum
 from src.systems.npc.profession import Profession, ProfessionData
-from config.settings import NPC_SPEED, NPC_COMMUTE_DISTANCE_THRESHOLD
+from src.systems.npc.npc_lod import NPCDetail
+from src.core.render_interpolation import get_render_interpolation
+from src.utils.helpers import chance_per_second
+from config.settings import NPC_SPEED, NPC_COMMUTE_DISTANCE_THRESHOLD, SPEED_REFERENCE_FPS
 
 
 ######################NPC 狀態列舉######################
@@ -39,8 +42,41 @@ class NPC:
     3. 移動和位置管理\n
     4. 健康狀態和受傷機制\n
     5. 對話和互動系統\n
+    \n
+    記憶體配置:\n
+    核心欄位（位置、狀態、職業、住所、工作地點、健康）使用 __slots__ 存放\n
+    行為元件、路徑規劃狀態放在 NPCDetail，只在玩家附近時掛上\n
     """
 
+    __slots__ = (
+        # 身份
+        "id", "name", "profession", "personality_type", "personality_profile", "dialogue_set_id",
+        # 位置和移動
+        "x", "y", "target_x", "target_y", "speed", "_state", "current_state",
+        "target_position", "last_position", "stuck_timer",
+        # 繪製內插（上一步開始前的位置）
+        "prev_x", "prev_y", "interpolation_step",
+        # 交通
+        "has_vehicle", "in_vehicle", "commute_distance_threshold", "vehicle_type", "can_use_train",
+        # 住所和工作
+        "workplace", "home_position", "current_work_area", "assigned_area", "shop_id", "worker_id",
+        "is_street_vendor", "services",
+        # 農夫工作狀態
+        "is_farmer", "work_phase", "can_teleport", "is_working_farmer",
+        # 時間表
+        "schedule", "current_hour", "current_day", "is_workday",
+        # 健康
+        "_is_injured", "hospital_stay_time", "injury_cause",
+        # 外觀和互動
+        "color", "size", "last_interaction_time", "_work_debug_counter",
+        # 系統引用
+        "terrain_system", "road_system", "tile_map", "power_manager", "buildings",
+        # 詳細元件（只在模擬半徑內存在）
+        "detail",
+        # 狀態變化通知（NPC 狀態表）
+        "status_listener",
+    )
+
     # NPC 編號計數器，確保每個 NPC 都有唯一 ID
     _id_counter = 1
 
@@ -56,15 +92,26 @@ class NPC:
         self.id = NPC._id_counter
         NPC._id_counter += 1
 
+        # 狀態或受傷狀況改變時通知的對象（NPCStatusTable）
+        self.status_listener = None
+
         self.name = self._generate_name()
         self.profession = profession
         self.state = NPCState.IDLE
+        self.current_state = NPCState.IDLE
+
+        # 詳細元件 - 由 NPCLODController 在玩家附近時掛上
+        self.detail = None
 
         # 位置和移動相關
         self.x, self.y = initial_position
         self.target_x = self.x
         self.target_y = self.y
         self.speed = NPC_SPEED  # 使用與玩家相同的移動速度
+        self.target_position = None  # 農夫排程系統指定的目標
+        self.last_position = None  # 卡住檢測用
+        self.stuck_timer = 0
+        get_render_interpolation().record(self)
         
         # 載具系統
         self.has_vehicle = random.choice([True, False])  # 隨機決定是否擁有載具
@@ -78,6 +125,8 @@ class NPC:
         self.workplace = None
         self.home_position = initial_position
         self.current_work_area = None  # 電力工人需要負責的區域
+        self.is_street_vendor = False
+        self.services = None
 
         # 農夫工作相關屬性
         self.is_farmer = False  # 是否為農夫
@@ -101,17 +150,17 @@ class NPC:
         self.size = 3  # NPC 顯示大小（縮小以配合玩家尺寸）
 
         # 對話系統（性格系統會重新生成這些對話）
-        self.dialogue_lines = ["你好。"]  # 預設對話，等待性格系統更新
         self.last_interaction_time = 0
+        self._work_debug_counter = 0
         
         # 性格系統相關屬性
         self.personality_type = None  # 性格類型，由性格系統設定
         self.personality_profile = None  # 完整的性格檔案
+        self.dialogue_set_id = None  # 共用對話語料庫中的句子組 ID，由性格系統設定
 
         # 特殊屬性
         self.assigned_area = None  # 電力工人的負責區域
         self.shop_id = None  # 商店員工的工作店鋪 ID
-        self.is_interacting_with_building = False  # 是否正在與建築物互動
 
         # 電力系統整合（電力工人專用）
         self.power_manager = None  # 電力管理器引用
@@ -120,10 +169,131 @@ class NPC:
         # 道路系統整合（路徑規劃用）
         self.road_system = None  # 道路系統引用，用於智能路徑規劃
         self.tile_map = None     # 格子地圖引用，用於路徑限制
-        self.current_path = []  # 當前規劃的路徑點列表
-        self.path_index = 0  # 當前路徑點索引
+        self.buildings = None  # 建築物引用，用於互動檢測
+
+        # 建立大量 NPC 時不逐一輸出
+        # print(f"創建 NPC: {self.name} ({self.profession.value})")
+
+    ######################細節層級 (LOD)######################
+    def attach_detail(self):
+        """
+        掛上詳細元件 - 進入玩家模擬半徑時呼叫\n
+        \n
+        遠處期間只保留目標座標，掛上後若仍在移動就重新規劃路徑\n
+        \n
+        回傳:\n
+        NPCDetail: 詳細元件\n
+        """
+        if self.detail is None:
+            self.detail = NPCDetail()
+            if self.state == NPCState.MOVING and not self._is_at_target():
+                self._set_target_position((self.target_x, self.target_y))
+        return self.detail
+
+    def release_detail(self):
+        """
+        釋放詳細元件 - 離開玩家模擬半徑時呼叫\n
+        """
+        self.detail = None
+
+    def _require_detail(self):
+        """
+        取得詳細元件，沒有的話立即掛上\n
+        """
+        if self.detail is None:
+            return self.attach_detail()
+        return self.detail
+
+    ######################狀態變化通知######################
+    @property
+    def state(self):
+        """NPC 行為狀態（改變時通知狀態表）"""
+        return self._state
 
-        print(f"創建 NPC: {self.name} ({self.profession.value})")
+    @state.setter
+    def state(self, value):
+        if getattr(self, "_state", None) is value:
+            return
+        self._state = value
+        if self.status_listener is not None:
+            self.status_listener.on_npc_status_changed(self)
+
+    @property
+    def is_injured(self):
+        """是否受傷住院（改變時通知狀態表）"""
+        return self._is_injured
+
+    @is_injured.setter
+    def is_injured(self, value):
+        if getattr(self, "_is_injured", None) == value:
+            return
+        self._is_injured = value
+        if self.status_listener is not None:
+            self.status_listener.on_npc_status_changed(self)
+
+    @property
+    def current_path(self):
+        """當前規劃的路徑點列表（未掛上詳細元件時為空）"""
+        return self.detail.current_path if self.detail is not None else []
+
+    @current_path.setter
+    def current_path(self, path):
+        if self.detail is not None or path:
+            self._require_detail().current_path = path
+
+    @property
+    def path_index(self):
+        """當前路徑點索引"""
+        return self.detail.path_index if self.detail is not None else 0
+
+    @path_index.setter
+    def path_index(self, index):
+        if self.detail is not None or index:
+            self._require_detail().path_index = index
+
+    @property
+    def is_interacting_with_building(self):
+        """是否正在與建築物互動"""
+        return self.detail is not None and self.detail.is_interacting_with_building
+
+    @is_interacting_with_building.setter
+    def is_interacting_with_building(self, interacting):
+        if self.detail is not None or interacting:
+            self._require_detail().is_interacting_with_building = interacting
+
+    @property
+    def dialogue_lines(self):
+        """
+        對話內容 - 共用對話語料庫中的句子 tuple，NPC 只記住句子組 ID\n
+        """
+        from src.systems.npc.personality_system import get_dialogue_corpus
+
+        corpus = get_dialogue_corpus()
+        set_id = self.dialogue_set_id
+        if set_id is None:
+            # 還沒由性格系統指定時依目前的職業、性格查詢（沒有性格時是預設對話）
+            set_id = corpus.get_set_id(self.profession, self.personality_type, "all")
+        return corpus.get_lines(set_id)
+
+    @property
+    def movement_behavior(self):
+        """移動行為元件（延遲建立）"""
+        detail = self._require_detail()
+        if detail.movement_behavior is None:
+            from src.systems.npc.behaviors.movement_behavior import NPCMovementBehavior
+
+            detail.movement_behavior = NPCMovementBehavior(self)
+        return detail.movement_behavior
+
+    @property
+    def work_behavior(self):
+        """工作行為元件（延遲建立）"""
+        detail = self._require_detail()
+        if detail.work_behavior is None:
+            from src.systems.npc.behaviors.work_behavior import NPCWorkBehavior
+
+            detail.work_behavior = NPCWorkBehavior(self)
+        return detail.work_behavior
 
     def _generate_name(self):
         """
@@ -135,57 +305,6 @@ class NPC:
         # 這個方法將被性格系統覆蓋，只是提供臨時名稱
         return f"居民{self.id}"
 
-    def _generate_dialogue(self):
-        """
-        根據職業生成對話內容\n
-        \n
-        回傳:\n
-        list: 對話句子列表\n
-        """
-        # 基礎對話 - 所有 NPC 都可能說的話
-        base_dialogues = [
-            "你好！",
-            "天氣真不錯呢。",
-            "小鎮最近很熱鬧。",
-            "希望你在這裡玩得開心！",
-        ]
-
-        # 職業專屬對話
-        profession_dialogues = {
-            Profession.FARMER: [
-                "今年的收成很不錯！",
-                "農田需要好好照顧。",
-                "新鮮的蔬菜正在生長。",
-            ],
-            Profession.DOCTOR: [
-                "保持健康很重要。",
-                "如果身體不舒服記得來醫院。",
-                "預防勝於治療。",
-            ],
-            Profession.PRIEST: [
-                "願神保佑你。",
-                "歡迎來教堂祈禱。",
-                "內心的平靜最重要。",
-            ],
-            Profession.HUNTER: [
-                "森林裡要小心野生動物。",
-                "狩獵需要技巧和耐心。",
-                "記住要保護保育類動物。",
-            ],
-            Profession.GUN_SHOP_WORKER: [
-                "需要什麼武器嗎？",
-                "安全使用武器很重要。",
-                "我們有最好的狩獵裝備。",
-            ],
-        }
-
-        # 合併基礎對話和職業對話
-        dialogues = base_dialogues.copy()
-        if self.profession in profession_dialogues:
-            dialogues.extend(profession_dialogues[self.profession])
-
-        return dialogues
-
     def simple_update(self, dt, current_time_hour, is_workday=True):
         """
         簡化的 NPC 更新 - 用於中距離 NPC\n
@@ -239,6 +358,9 @@ class NPC:
         self.current_day = current_day
         self.is_workday = is_workday
 
+        # 記住這一步開始前的位置，繪製時內插
+        get_render_interpolation().record(self)
+
         # 更新健康狀態
         self._update_health_status(dt)
 
@@ -275,11 +397,7 @@ class NPC:
                 self.state = NPCState.IDLE
 
                 # 如果是電力工人，通知電力系統工人復工
-                if (
-                    self.profession == Profession.POWER_WORKER
-                    and self.power_manager
-                    and self.worker_id
-                ):
+                if self.power_manager and self.worker_id:
                     self.power_manager.update_worker_status(self.worker_id, True)
 
                 print(f"{self.name} 康復出院了")
@@ -369,7 +487,7 @@ class NPC:
         self._check_building_interaction()
 
         # 根據職業執行特定工作行為
-        if self.profession == Profession.POWER_WORKER:
+        if self.worker_id:
             self._power_worker_behavior(dt)
         elif self.profession == Profession.FARMER:
             self._farmer_behavior(dt)
@@ -424,7 +542,7 @@ class NPC:
         dt (float): 時間間隔 (秒)\n
         """
         # 休息時可能會在小鎮中隨意走動
-        if random.random() < 0.01:  # 1% 機率改變休息地點
+        if chance_per_second(0.6, dt):  # 平均每秒 0.6 次改變休息地點
             self._wander_around()
 
     def _sleep_behavior(self, dt):
@@ -457,7 +575,7 @@ class NPC:
         dt (float): 時間間隔 (秒)\n
         """
         # 閒置時偶爾會隨機移動
-        if random.random() < 0.005:  # 0.5% 機率開始隨機移動
+        if chance_per_second(0.3, dt):  # 平均每秒 0.3 次開始隨機移動
             self._wander_around()
 
     def _update_movement(self, dt):
@@ -498,8 +616,8 @@ class NPC:
                     from config.settings import VEHICLE_SPEED
                     current_speed = VEHICLE_SPEED
                 
-                move_x = (dx / distance) * current_speed * dt * 60  # 60 用於幀率補償
-                move_y = (dy / distance) * current_speed * dt * 60
+                move_x = (dx / distance) * current_speed * dt * SPEED_REFERENCE_FPS
+                move_y = (dy / distance) * current_speed * dt * SPEED_REFERENCE_FPS
 
                 # 更新位置
                 self.x += move_x
@@ -855,8 +973,10 @@ class NPC:
         """
         self.target_x, self.target_y = position
 
-        # 優先使用格子地圖進行路徑規劃（限制在人行道和斑馬線）
-        if hasattr(self, "tile_map") and self.tile_map:
+        # 開車的 NPC 走道路網，其他優先使用格子地圖進行路徑規劃（限制在人行道和斑馬線）
+        if self.in_vehicle and hasattr(self, "road_system") and self.road_system:
+            self._plan_path_using_roads(position)
+        elif hasattr(self, "tile_map") and self.tile_map:
             self._plan_path_using_tile_map(position)
         elif hasattr(self, "road_system") and self.road_system:
             # 備用：使用道路系統
@@ -944,8 +1064,18 @@ class NPC:
         target_position (tuple): 目標位置 (x, y)\n
         """
         try:
-            # 尋找當前位置和目標位置最近的道路點
             current_pos = (self.x, self.y)
+
+            # 優先在道路網上搜尋最快路線（開車時計入紅綠燈等待時間）
+            route = self.road_system.find_route(
+                current_pos, target_position, use_traffic_lights=self.in_vehicle
+            )
+            if route:
+                self.current_path = route
+                self.path_index = 0
+                return
+
+            # 尋找當前位置和目標位置最近的道路點
             current_road = self.road_system.get_nearest_road(current_pos)
             target_road = self.road_system.get_nearest_road(target_position)
 
@@ -1088,11 +1218,7 @@ class NPC:
             self.state = NPCState.INJURED
 
             # 如果是電力工人，通知電力系統工人離線
-            if (
-                self.profession == Profession.POWER_WORKER
-                and self.power_manager
-                and self.worker_id
-            ):
+            if self.power_manager and self.worker_id:
                 self.power_manager.update_worker_status(self.worker_id, False)
 
             print(f"{self.name} 因為 {cause} 而受傷住院")
@@ -1107,14 +1233,12 @@ class NPC:
         回傳:\n
         str: 對話內容\n
         """
-        # 如果有性格檔案，使用性格化對話
-        if hasattr(self, 'personality_profile') and self.personality_profile:
-            # 這裡應該由NPC管理器的性格系統處理
-            # 暫時返回隨機對話
-            return random.choice(self.dialogue_lines)
-        else:
-            # 備用方案：返回基本對話
-            return random.choice(self.dialogue_lines)
+        # 從共用對話語料庫挑選（沒有性格時是預設對話）
+        from src.systems.npc.personality_system import get_dialogue_corpus
+
+        corpus = get_dialogue_corpus()
+        set_id = corpus.get_set_id(self.profession, self.personality_type, interaction_type)
+        return corpus.get_line(corpus.choose_line_id(set_id))
 
     def set_workplace(self, workplace_position):
         """
@@ -1150,7 +1274,7 @@ class NPC:
         參數:\n
         area_center (tuple): 區域中心座標 (x, y)\n
         """
-        if self.profession == Profession.POWER_WORKER:
+        if self.worker_id:
             self.assigned_area = area_center
             print(f"電力工人 {self.name} 被分配到區域 {area_center}")
 
@@ -1180,6 +1304,7 @@ class NPC:
         position_str = f"({int(self.x)}, {int(self.y)})"
 
         return {
+            "id": self.id,
             "name": self.name,
             "profession": self.profession.value,
             "position": position_str,
@@ -1204,7 +1329,7 @@ class NPC:
         if self.state == NPCState.SLEEPING:
             return "在家中睡覺"
         elif self.state == NPCState.WORKING:
-            if self.profession == Profession.POWER_WORKER and self.assigned_area:
+            if self.worker_id and self.assigned_area:
                 return f"在區域 {self.assigned_area} 巡查電力設施"
             elif self.profession == Profession.FARMER:
                 return "在農田工作"
@@ -1288,6 +1413,11 @@ class NPC:
         if self._should_hide_npc():
             return
 
+        # 畫在前後兩個模擬步之間的內插位置
+        offset_x, offset_y = get_render_interpolation().get_offset(self)
+        camera_x += offset_x
+        camera_y += offset_y
+
         # 計算在螢幕上的位置（世界座標轉螢幕座標）
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
@@ -1340,7 +1470,7 @@ class NPC:
                 Profession.PRIEST,  # 牧師在教堂內工作
                 Profession.GUN_SHOP_WORKER,  # 槍械店員工在店內工作
                 Profession.CONVENIENCE_STORE_WORKER,  # 便利商店員工在店內工作
-                Profession.FISHING_SHOP_WORKER,  # 釣魚店員工在店內工作
+                Profession.CHEF,  # 廚師在餐廳內工作
                 # 可以根據需要添加更多室內工作的職業
             ]
             return self.profession in indoor_work_professions
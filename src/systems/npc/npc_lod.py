@@ -0,0 +1,118 @@
+######################載入套件######################
+from config.settings import NPC_SIMULATION_RADIUS, NPC_DETAIL_RELEASE_DISTANCE, NPC_LOD_UPDATE_INTERVAL
+
+
+######################NPC 詳細元件######################
+class NPCDetail:
+    """
+    NPC 詳細元件 - 只有在玩家模擬半徑內的 NPC 才會掛上\n
+    \n
+    集中存放耗用記憶體較多的資料：\n
+    - 行為元件（移動行為、工作行為），第一次使用時才建立\n
+    - 路徑規劃狀態（路徑點列表、路徑索引）\n
+    - 建築互動狀態\n
+    \n
+    遠處 NPC 只保留 NPC 本身的精簡核心欄位，離開模擬半徑時整個元件釋放\n
+    """
+
+    __slots__ = (
+        "movement_behavior",
+        "work_behavior",
+        "current_path",
+        "path_index",
+        "is_interacting_with_building",
+    )
+
+    def __init__(self):
+        """
+        初始化詳細元件（所有內容都延遲建立）\n
+        """
+        self.movement_behavior = None
+        self.work_behavior = None
+        self.current_path = []
+        self.path_index = 0
+        self.is_interacting_with_building = False
+
+
+######################NPC 細節層級控制器######################
+class NPCLODController:
+    """
+    NPC 細節層級 (LOD) 控制器 - 依照與玩家的距離掛上或釋放詳細元件\n
+    \n
+    使用進入/離開兩個半徑做遲滯，避免 NPC 在邊界來回時反覆建立元件：\n
+    - 距離小於 attach_radius：掛上詳細元件\n
+    - 距離大於 release_radius：釋放詳細元件\n
+    \n
+    只做平方距離比較，每 NPC_LOD_UPDATE_INTERVAL 幀檢查一次\n
+    """
+
+    def __init__(self, attach_radius=NPC_SIMULATION_RADIUS, release_radius=NPC_DETAIL_RELEASE_DISTANCE,
+                 update_interval=NPC_LOD_UPDATE_INTERVAL):
+        """
+        初始化 LOD 控制器\n
+        \n
+        參數:\n
+        attach_radius (float): 掛上詳細元件的距離\n
+        release_radius (float): 釋放詳細元件的距離，需大於 attach_radius\n
+        update_interval (int): 每幾幀檢查一次\n
+        """
+        self.attach_radius = attach_radius
+        self.release_radius = max(release_radius, attach_radius)
+        self.update_interval = max(1, update_interval)
+        self._frame_counter = 0
+
+        # 統計資訊
+        self.attached_count = 0
+        self.attach_events = 0
+        self.release_events = 0
+
+    def update(self, npcs, player_position, force=False):
+        """
+        檢查所有 NPC 的距離並調整細節層級\n
+        \n
+        參數:\n
+        npcs (list): NPC 列表\n
+        player_position (tuple): 玩家位置 (x, y)\n
+        force (bool): 是否忽略更新間隔立即檢查\n
+        """
+        self._frame_counter += 1
+        if not force and self._frame_counter % self.update_interval != 0:
+            return
+
+        player_x, player_y = player_position
+        attach_squared = self.attach_radius * self.attach_radius
+        release_squared = self.release_radius * self.release_radius
+        attached_count = 0
+
+        for npc in npcs:
+            dx = npc.x - player_x
+            dy = npc.y - player_y
+            distance_squared = dx * dx + dy * dy
+
+            if npc.detail is None:
+                if distance_squared <= attach_squared:
+                    npc.attach_detail()
+                    self.attach_events += 1
+                    attached_count += 1
+            elif distance_squared > release_squared:
+                npc.release_detail()
+                self.release_events += 1
+            else:
+                attached_count += 1
+
+        self.attached_count = attached_count
+
+    def get_statistics(self):
+        """
+        獲取 LOD 統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "attached_npcs": self.attached_count,
+            "attach_events": self.attach_events,
+            "release_events": self.release_events,
+            "attach_radius": self.attach_radius,
+            "release_radius": self.release_radius,
+        }
@@ -5,8 +5,13 @@ import math
 from src.systems.npc.npc import NPC
 from src.systems.npc.profession import Profession, ProfessionData
 from src.systems.npc.personality_system import NPCPersonalitySystem
+from src.systems.npc.population_builder import NPCPopulationBuilder
+from src.systems.npc.npc_lod import NPCLODController
+from src.systems.npc.npc_status_table import NPCStatusTable
 from config.settings import SCREEN_WIDTH, SCREEN_HEIGHT
 from src.utils.font_manager import FontManager
+from src.core.game_clock import get_game_clock
+from src.systems.power_system import PowerManager
 
 
 ######################NPC 管理器######################
@@ -48,8 +53,8 @@ class NPCManager:
         # 職業分配統計
         self.profession_assignments = {profession: 0 for profession in Profession}
 
-        # 電力系統管理
-        self.power_areas = []  # 30個電力區域
+        # 電力系統管理（區域狀態由電力管理器在工人狀態改變時更新）
+        self.power_manager = PowerManager(time_manager)
         self.power_workers = []  # 30個電力工人
 
         # 建築物和工作場所
@@ -70,10 +75,19 @@ class NPCManager:
         # 農夫工作調度系統
         self.farmer_scheduler = None
 
+        # 族群建構器（生成位置、住宅、工作場所批次分配）
+        self.population_builder = None
+
         # 渲染優化
         self.render_distance = 300  # 只渲染這個距離內的 NPC
         self.update_distance = 500  # 只更新這個距離內的 NPC
 
+        # 細節層級控制（玩家附近才掛上行為、對話、路徑等詳細元件）
+        self.lod_controller = NPCLODController()
+
+        # NPC 狀態表（狀態面板、資訊面板共用的排序索引）
+        self.status_table = NPCStatusTable()
+
         print("NPC 管理器初始化完成（已整合性格系統）")
 
     def initialize_npcs(self, town_bounds, forest_bounds):
@@ -112,6 +126,9 @@ class NPCManager:
         # 初始化農夫工作調度系統
         self._initialize_farmer_scheduler()
 
+        # 建立狀態表的排序索引
+        self.status_table.set_npcs(self.all_npcs)
+
         print(
             f"NPC 創建完成: 小鎮 {len(self.town_npcs)} 個, 部落 0 個（已移除）, 總計 {len(self.all_npcs)} 個"
         )
@@ -155,11 +172,44 @@ class NPCManager:
         
         # print(f"已為 {len(self.all_npcs)} 個 NPC 設定地形系統參考")  # 暫時關閉
 
-    def _assign_npcs_to_houses(self):
+    def _get_population_builder(self):
+        """
+        取得族群建構器，建築物或地形參考變更後會重新建立\n
+        \n
+        回傳:\n
+        NPCPopulationBuilder: 族群建構器實例\n
+        """
+        terrain_system = getattr(self, "terrain_system", None)
+        buildings = getattr(self, "buildings", None) or []
+        tile_map = getattr(self, "tile_map", None)
+
+        builder = self.population_builder
+        if (
+            builder is None
+            or builder.terrain_system is not terrain_system
+            or builder.buildings is not buildings
+            or builder.tile_map is not tile_map
+        ):
+            builder = NPCPopulationBuilder(terrain_system, buildings, tile_map)
+            self.population_builder = builder
+        return builder
+
+    def _assign_npcs_to_houses(self, move_to_home=True):
         """
         將 NPC 分配到住宅中\n
         新需求：玩家之家不分配NPC，其餘住宅平均分配\n
+        \n
+        使用族群建構器批次分配，每個 NPC 分配到最近且仍有空位的住宅\n
+        \n
+        參數:\n
+        move_to_home (bool): 是否把 NPC 的初始位置設定為住宅中心\n
+        \n
+        回傳:\n
+        list: 成功分配到住宅的 NPC 列表\n
         """
+        if not self.all_npcs:
+            return []
+
         # 找出所有住宅建築
         houses = []
         player_home = None
@@ -168,81 +218,28 @@ class NPCManager:
             if hasattr(building, 'building_type') and building.building_type == "house":
                 if hasattr(building, 'is_player_home') and building.is_player_home:
                     player_home = building
-                    print(f"找到玩家之家：{building.name}")
                 else:
                     houses.append(building)
         
         if not houses:
             print("警告：找不到可分配的住宅建築（除了玩家之家）")
-            return
+            return []
         
         if player_home is None:
             print("警告：找不到玩家之家")
-            return
-        
-        print(f"找到 {len(houses)} 個可分配的住宅（玩家之家已排除）")
-        
-        # 計算每個住宅應該分配的NPC數量
-        total_npcs = len(self.all_npcs)
-        npcs_per_house = total_npcs // len(houses)
-        remaining_npcs = total_npcs % len(houses)
-        
-        # print(f"將 {total_npcs} 個NPC分配到 {len(houses)} 個住宅")  # 暫時關閉
-        # print(f"每個住宅基本分配 {npcs_per_house} 個NPC，{remaining_npcs} 個住宅額外分配1個")  # 暫時關閉
-        
-        npc_index = 0
-        successful_assignments = 0
+            return []
         
-        for i, house in enumerate(houses):
-            # 計算這個住宅應該分配多少個 NPC
-            npcs_for_this_house = npcs_per_house
-            if i < remaining_npcs:
-                npcs_for_this_house += 1
-            
-            # print(f"為住宅 {house.name} 分配 {npcs_for_this_house} 個NPC")  # 暫時關閉
-            
-            # 分配 NPC 到這個住宅
-            house_assignments = 0
-            for j in range(npcs_for_this_house):
-                if npc_index < len(self.all_npcs):
-                    npc = self.all_npcs[npc_index]
-                    
-                    # 如果是新的住宅類別並且有 add_resident 方法
-                    if hasattr(house, 'add_resident'):
-                        if house.add_resident(npc):
-                            # 設定 NPC 的初始位置為住宅中心
-                            house_center_x = house.x + house.width // 2
-                            house_center_y = house.y + house.height // 2
-                            npc.x = house_center_x
-                            npc.y = house_center_y
-                            house_assignments += 1
-                            successful_assignments += 1
-                            print(f"  - NPC {npc.name} ({npc.profession.value}) 分配到住宅成功")
-                        else:
-                            print(f"  - 住宅 {house.name} 已滿，無法分配 NPC {npc.name}")
-                    else:
-                        # 舊版建築，直接設定位置
-                        house_center_x = house.x + house.width // 2
-                        house_center_y = house.y + house.height // 2
-                        npc.set_home((house_center_x, house_center_y))
-                        npc.x = house_center_x
-                        npc.y = house_center_y
-                        house_assignments += 1
-                        successful_assignments += 1
-                        print(f"  - NPC {npc.name} ({npc.profession.value}) 分配到舊版住宅")
-                    
-                    npc_index += 1
-                else:
-                    break
-            
-            print(f"住宅 {house.name} 實際分配了 {house_assignments} 個NPC")
+        builder = self._get_population_builder()
+        housed_npcs = builder.assign_homes(self.all_npcs, houses, move_to_home=move_to_home)
         
-        print(f"住宅分配完成：成功分配 {successful_assignments} 個NPC到 {len(houses)} 個住宅中")
+        print(f"住宅分配完成：成功分配 {len(housed_npcs)} 個NPC到 {len(houses)} 個住宅中")
         print(f"玩家之家 {player_home.name} 保留給玩家使用")
         
         # 驗證分配結果
         self._verify_housing_assignments()
 
+        return housed_npcs
+
     def _verify_housing_assignments(self):
         """
         驗證住宅分配結果\n
@@ -297,38 +294,12 @@ class NPCManager:
 
     def _initialize_power_areas(self, town_bounds):
         """
-        初始化 30 個電力區域\n
+        初始化 30 個電力區域（6x5 網格，由電力管理器管理）\n
         \n
         參數:\n
         town_bounds (tuple): 小鎮邊界 (x, y, width, height)\n
         """
-        town_x, town_y, town_width, town_height = town_bounds
-
-        # 將小鎮劃分為 6x5 的網格 (30個區域)
-        area_width = town_width // 6
-        area_height = town_height // 5
-
-        for row in range(5):
-            for col in range(6):
-                area_center_x = town_x + col * area_width + area_width // 2
-                area_center_y = town_y + row * area_height + area_height // 2
-
-                area_info = {
-                    "id": row * 6 + col + 1,
-                    "center": (area_center_x, area_center_y),
-                    "bounds": (
-                        col * area_width + town_x,
-                        row * area_height + town_y,
-                        area_width,
-                        area_height,
-                    ),
-                    "assigned_worker": None,
-                    "has_power": True,
-                }
-
-                self.power_areas.append(area_info)
-
-        print(f"創建了 {len(self.power_areas)} 個電力區域")
+        self.power_manager.initialize_power_grid(town_bounds)
 
     def _create_town_npcs(self, town_bounds):
         """
@@ -352,6 +323,10 @@ class NPCManager:
         # 隨機打亂職業順序
         random.shuffle(town_professions)
 
+        # 一次抽樣所有 NPC 的生成位置（不重複），抽樣不足時才使用逐一嘗試的後備方案
+        builder = self._get_population_builder()
+        spawn_positions = builder.take_spawn_positions(len(town_professions), town_bounds)
+
         # 創建 NPC
         street_vendor_created = False  # 追蹤是否已創建路邊小販
         
@@ -363,12 +338,14 @@ class NPCManager:
                 street_vendor_created = True
                 print(f"創建路邊小販於隨機位置: {position}")
             else:
-                # 其他NPC在小鎮範圍內隨機位置創建
-                position = self._find_safe_spawn_position(town_bounds)
+                # 其他NPC使用預先抽樣的位置
+                position = spawn_positions[i]
+                if position is None:
+                    position = self._find_safe_spawn_position(town_bounds)
 
             npc = NPC(profession, position)
             
-            # 使用性格系統為NPC分配個性和姓名
+            # 使用性格系統為NPC分配個性和姓名（對話只記住共用語料庫的句子組 ID）
             self.personality_system.assign_personality_to_npc(npc)
             
             # 路邊小販特殊標記
@@ -530,28 +507,11 @@ class NPCManager:
         """
         town_x, town_y, town_width, town_height = town_bounds
         
-        # 在整個地圖範圍內嘗試找到合適位置
-        for attempt in range(100):  # 最多嘗試100次
-            # 在地圖範圍內隨機選擇位置
-            x = random.randint(town_x + 100, town_x + town_width - 100)
-            y = random.randint(town_y + 100, town_y + town_height - 100)
-            
-            # 檢查位置是否安全（不與建築物重疊）
-            if hasattr(self, "buildings") and self.buildings:
-                test_rect = pygame.Rect(x - 20, y - 20, 40, 40)  # 路邊小販稍大一些
-                
-                safe_position = True
-                for building in self.buildings:
-                    if test_rect.colliderect(building.rect):
-                        safe_position = False
-                        break
-                
-                if safe_position:
-                    print(f"路邊小販位置確定：({x}, {y})")
-                    return (x, y)
-            else:
-                # 如果還沒有建築物參考，直接返回
-                return (x, y)
+        # 從不限地形的候選格子池抽樣（已排除與建築物重疊的位置）
+        position = self._get_population_builder().take_any_terrain_position(town_bounds)
+        if position is not None:
+            print(f"路邊小販位置確定：{position}")
+            return position
         
         # 如果找不到理想位置，使用地圖中央區域
         center_x = town_x + town_width // 2
@@ -595,29 +555,35 @@ class NPCManager:
         參數:\n
         power_worker (NPC): 電力工人 NPC\n
         """
-        # 找到還沒有分配工人的區域
-        for area in self.power_areas:
-            if area["assigned_worker"] is None:
-                area["assigned_worker"] = power_worker
-                power_worker.assign_area(area["center"])
-                self.power_workers.append(power_worker)
-                break
+        worker_id = f"power_worker_{power_worker.id}"
+        self.power_manager.register_power_worker(worker_id, {"npc": power_worker})
+
+        area_id = self.power_manager.worker_to_area.get(worker_id)
+        if area_id is None:
+            return
+
+        # 工人住院、出院時由 NPC 直接通知電力管理器
+        power_worker.power_manager = self.power_manager
+        power_worker.worker_id = worker_id
+        power_worker.assign_area(self.power_manager.power_areas[area_id]["center"])
+        self.power_workers.append(power_worker)
 
     def _assign_workplaces(self):
         """
         為所有 NPC 分配工作場所\n
         """
-        # 這裡需要根據建築物系統的完成情況來實作
-        # 暫時使用隨機位置作為工作場所
+        builder = self._get_population_builder()
 
         for npc in self.town_npcs:
             workplace_names = ProfessionData.get_profession_workplaces(npc.profession)
 
             if workplace_names:
-                # 為現在先用隨機位置，之後會根據實際建築物位置調整
-                workplace_x = random.randint(100, 900)
-                workplace_y = random.randint(100, 600)
-                npc.set_workplace((workplace_x, workplace_y))
+                # 使用最近建築查詢找到對應類型的工作場所
+                workplace = builder.nearest_workplace(workplace_names, (npc.x, npc.y))
+                if workplace is None:
+                    # 沒有對應建築時使用隨機位置
+                    workplace = (random.randint(100, 900), random.randint(100, 600))
+                npc.set_workplace(workplace)
 
     def _assign_homes(self, town_bounds, forest_bounds):
         """
@@ -629,8 +595,15 @@ class NPCManager:
         """
         town_x, town_y, town_width, town_height = town_bounds
 
-        # 小鎮 NPC 的住所在小鎮內
+        # 已有住宅建築時，批次分配到最近的住宅（保留生成位置）
+        housed_ids = set()
+        if getattr(self, "buildings", None):
+            housed_ids = {id(npc) for npc in self._assign_npcs_to_houses(move_to_home=False)}
+
+        # 沒有分配到住宅的小鎮 NPC 住所在小鎮內隨機位置
         for npc in self.town_npcs:
+            if id(npc) in housed_ids:
+                continue
             home_x = random.randint(town_x + 30, town_x + town_width - 30)
             home_y = random.randint(town_y + 30, town_y + town_height - 30)
             npc.set_home((home_x, home_y))
@@ -708,6 +681,9 @@ class NPCManager:
             current_day = day_mapping.get(self.time_manager.day_of_week.value, 1)
             is_workday = self.time_manager.is_work_day
 
+        # 掛上或釋放詳細元件
+        self.lod_controller.update(self.all_npcs, player_position)
+
         # 使用分層更新策略
         # 第一層：附近的 NPC 完整更新（高頻率）
         nearby_distance = 300
@@ -717,7 +693,7 @@ class NPCManager:
             npc.update(dt, current_hour, current_day, is_workday)
 
         # 第二層：中距離的 NPC 簡化更新（中頻率）
-        frame_count = int(pygame.time.get_ticks() / 16.67)
+        frame_count = int(get_game_clock().get_ticks() / 16.67)
         if frame_count % 3 == 0:  # 每3幀更新一次
             medium_distance = 600
             medium_npcs = self.get_nearby_npcs(player_position, medium_distance)
@@ -738,9 +714,8 @@ class NPCManager:
                 ):
                     npc.minimal_update(current_hour, is_workday)
 
-        # 電力系統更新（低頻率）
-        if frame_count % 5 == 0:
-            self._update_power_system()
+        # 電力系統只推進時間，區域狀態在工人狀態改變時就已更新
+        self.power_manager.update(dt)
 
     def get_nearby_npcs(self, center_position, max_distance):
         """
@@ -815,6 +790,9 @@ class NPCManager:
         if self.farmer_scheduler:
             self.farmer_scheduler.update(dt, self.time_manager)
 
+        # 掛上或釋放詳細元件
+        self.lod_controller.update(self.all_npcs, player_position)
+
         # 根據玩家位置決定更新哪些 NPC (效能優化)
         npcs_to_update = self._get_npcs_in_range(player_position, self.update_distance)
 
@@ -822,22 +800,8 @@ class NPCManager:
         for npc in npcs_to_update:
             npc.update(dt, current_hour, current_day, is_workday)
 
-        # 更新電力系統
-        self._update_power_system()
-
-    def _update_power_system(self):
-        """
-        更新電力系統狀態\n
-        """
-        for area in self.power_areas:
-            worker = area["assigned_worker"]
-
-            if worker and worker.is_injured:
-                # 如果負責的電力工人住院，該區域停電
-                area["has_power"] = False
-            else:
-                # 電力工人正常工作，區域有電
-                area["has_power"] = True
+        # 電力系統只推進時間，區域狀態在工人狀態改變時就已更新
+        self.power_manager.update(dt)
 
     def _get_npcs_in_range(self, center_position, max_distance):
         """
@@ -900,6 +864,9 @@ class NPCManager:
         """
         獲取 NPC 狀態清單用於顯示\n
         \n
+        從狀態表的排序索引取出 NPC，只為範圍內的 NPC 建立狀態資訊\n
+        依距離排序時，距離分級只用來縮小範圍，結果仍依實際距離由近到遠排列\n
+        \n
         參數:\n
         player_position (tuple): 玩家位置，用於距離篩選\n
         max_distance (float): 最大顯示距離\n
@@ -907,33 +874,30 @@ class NPCManager:
         回傳:\n
         list: NPC 狀態資訊清單\n
         """
-        if player_position:
-            # 獲取玩家附近的 NPC
-            nearby_npcs = self._get_npcs_in_range(player_position, max_distance)
-        else:
-            # 顯示所有 NPC
-            nearby_npcs = self.all_npcs
+        table = self.status_table
+
+        if not player_position:
+            # 顯示所有 NPC，按姓名排序
+            return [npc.get_status_info() for npc in table.get_window("name", 0, len(table))]
+
+        # 用距離分級取出範圍內的候選 NPC，再依實際距離過濾和排序（近的在前面）
+        table.refresh_distances(player_position)
+        player_x, player_y = player_position
+        max_distance_sq = max_distance * max_distance
+
+        nearby_npcs = []
+        for npc in table.get_window("distance", 0, len(table), max_distance):
+            distance_sq = (npc.x - player_x) ** 2 + (npc.y - player_y) ** 2
+            if distance_sq <= max_distance_sq:
+                nearby_npcs.append((distance_sq, npc))
+        nearby_npcs.sort(key=lambda item: item[0])
 
-        # 獲取每個 NPC 的狀態資訊
         npc_status_list = []
-        for npc in nearby_npcs:
+        for distance_sq, npc in nearby_npcs:
             status_info = npc.get_status_info()
-            # 計算與玩家的距離
-            if player_position:
-                distance = math.sqrt(
-                    (npc.x - player_position[0]) ** 2
-                    + (npc.y - player_position[1]) ** 2
-                )
-                status_info["distance"] = int(distance)
+            status_info["distance"] = int(math.sqrt(distance_sq))
             npc_status_list.append(status_info)
 
-        # 按距離排序（近的在前面）
-        if player_position:
-            npc_status_list.sort(key=lambda x: x["distance"])
-        else:
-            # 按姓名排序
-            npc_status_list.sort(key=lambda x: x["name"])
-
         return npc_status_list
 
     def draw_power_grid_status(self, screen, font):
@@ -947,8 +911,9 @@ class NPCManager:
         y_offset = 10
 
         # 顯示總體電力狀態
-        powered_areas = sum(1 for area in self.power_areas if area["has_power"])
-        total_areas = len(self.power_areas)
+        power_stats = self.power_manager.get_power_stats()
+        powered_areas = power_stats["areas_with_power"]
+        total_areas = len(self.power_manager.power_areas)
 
         power_text = f"電力狀況: {powered_areas}/{total_areas} 區域有電"
         power_color = (0, 255, 0) if powered_areas == total_areas else (255, 255, 0)
@@ -963,9 +928,7 @@ class NPCManager:
         )
 
         # 顯示住院的電力工人數量
-        injured_power_workers = sum(
-            1 for worker in self.power_workers if worker.is_injured
-        )
+        injured_power_workers = len(self.power_workers) - power_stats["workers_on_duty"]
         if injured_power_workers > 0:
             injured_text = f"住院電力工人: {injured_power_workers} 人"
             injured_surface = font.render(injured_text, True, (255, 0, 0))
@@ -1050,11 +1013,12 @@ class NPCManager:
             "working_npcs": sum(
                 1 for npc in self.all_npcs if npc.state.value == "工作中"
             ),
-            "powered_areas": sum(1 for area in self.power_areas if area["has_power"]),
-            "total_areas": len(self.power_areas),
+            "powered_areas": self.power_manager.get_power_stats()["areas_with_power"],
+            "total_areas": len(self.power_manager.power_areas),
             "current_hour": int(self.time_manager.hour) if self.time_manager else 8,
             "profession_counts": self.profession_assignments.copy(),
             "personality_distribution": self.personality_system.get_personality_statistics(),
+            "lod": self.lod_controller.get_statistics(),
         }
 
         return stats
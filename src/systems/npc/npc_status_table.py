@@ -0,0 +1,241 @@
+######################載入套件######################
+import math
+from bisect import bisect_left, insort
+from src.systems.npc.npc import NPCState
+from src.core.game_clock import get_game_clock
+from config.settings import NPC_STATUS_DISTANCE_BUCKET, NPC_STATUS_DISTANCE_REFRESH_INTERVAL
+
+
+# 狀態排序順序（依列舉宣告順序）
+STATE_ORDER = {state: order for order, state in enumerate(NPCState)}
+
+
+######################NPC 狀態表######################
+class NPCStatusTable:
+    """
+    NPC 狀態表 - 狀態面板和資訊面板共用的即時 NPC 表格模型\n
+    \n
+    依姓名、職業、狀態、距離分級各維護一個排序索引（(排序值..., NPC ID) 的有序列表）：\n
+    - 姓名、職業不會改變，建立時排序一次\n
+    - 狀態、受傷由 NPC 的狀態變化通知更新，只移動該 NPC 在狀態索引中的位置\n
+    - 距離分級在查詢時依間隔重新計算，只移動分級有變的 NPC\n
+    \n
+    UI 只取目前捲動視窗內的 NPC，並用 take_dirty 找出需要重新繪製的列\n
+    """
+
+    SORT_KEYS = ("name", "profession", "state", "distance")
+
+    def __init__(self, distance_bucket=NPC_STATUS_DISTANCE_BUCKET,
+                 distance_refresh_interval=NPC_STATUS_DISTANCE_REFRESH_INTERVAL):
+        """
+        初始化狀態表\n
+        \n
+        參數:\n
+        distance_bucket (float): 距離分級大小（像素）\n
+        distance_refresh_interval (float): 距離分級最短重新計算間隔（秒）\n
+        """
+        self.distance_bucket = distance_bucket
+        self.distance_refresh_interval = distance_refresh_interval
+
+        self.npcs = {}  # {npc_id: NPC}
+        self.indexes = {sort_key: [] for sort_key in self.SORT_KEYS}  # 排序索引
+        self.index_entries = {sort_key: {} for sort_key in self.SORT_KEYS}  # {npc_id: 目前在索引中的項目}
+        self.distance_buckets = {}  # {npc_id: 距離分級}
+        self.status_flags = {}  # {npc_id: (是否受傷, 是否工作中)}
+        self.dirty_ids = set()  # 狀態改變、UI 還沒重新繪製的 NPC
+
+        # 增量維護的統計
+        self.injured_count = 0
+        self.working_count = 0
+
+        # 距離分級的計算基準
+        self.player_position = None
+        self.last_distance_refresh = None
+
+    def set_npcs(self, npcs):
+        """
+        設定表格內的 NPC，並讓 NPC 在狀態改變時通知狀態表\n
+        \n
+        參數:\n
+        npcs (list): NPC 列表\n
+        """
+        for npc in self.npcs.values():
+            if npc.status_listener is self:
+                npc.status_listener = None
+
+        self.npcs = {npc.id: npc for npc in npcs}
+        self.distance_buckets = {npc_id: 0 for npc_id in self.npcs}
+        self.status_flags = {}
+        self.dirty_ids = set(self.npcs)
+        self.injured_count = 0
+        self.working_count = 0
+        self.player_position = None
+        self.last_distance_refresh = None
+
+        for npc in npcs:
+            npc.status_listener = self
+            flags = self._get_status_flags(npc)
+            self.status_flags[npc.id] = flags
+            self.injured_count += flags[0]
+            self.working_count += flags[1]
+
+        for sort_key in self.SORT_KEYS:
+            entries = {npc_id: self._make_entry(sort_key, npc) for npc_id, npc in self.npcs.items()}
+            self.index_entries[sort_key] = entries
+            self.indexes[sort_key] = sorted(entries.values())
+
+    def __len__(self):
+        return len(self.npcs)
+
+    def _get_status_flags(self, npc):
+        """
+        NPC 的（是否受傷, 是否工作中）\n
+        """
+        return (npc.is_injured, npc.state == NPCState.WORKING)
+
+    def _make_entry(self, sort_key, npc):
+        """
+        建立 NPC 在指定排序索引中的項目，最後一個元素是 NPC ID\n
+        """
+        if sort_key == "name":
+            return (npc.name, npc.id)
+        if sort_key == "profession":
+            return (npc.profession.value, npc.name, npc.id)
+        if sort_key == "state":
+            return (STATE_ORDER.get(npc.state, len(STATE_ORDER)), npc.name, npc.id)
+        return (self.distance_buckets[npc.id], npc.name, npc.id)
+
+    def _reindex(self, sort_key, npc):
+        """
+        把 NPC 移到排序索引中的新位置（排序值沒變時不做事）\n
+        """
+        entries = self.index_entries[sort_key]
+        old_entry = entries[npc.id]
+        new_entry = self._make_entry(sort_key, npc)
+        if new_entry == old_entry:
+            return
+
+        index = self.indexes[sort_key]
+        del index[bisect_left(index, old_entry)]
+        insort(index, new_entry)
+        entries[npc.id] = new_entry
+
+    ######################變化通知######################
+    def on_npc_status_changed(self, npc):
+        """
+        NPC 的狀態或受傷狀況改變（由 NPC 的屬性設定呼叫）\n
+        \n
+        參數:\n
+        npc (NPC): 狀態改變的 NPC\n
+        """
+        if npc.id not in self.npcs:
+            return
+
+        old_injured, old_working = self.status_flags[npc.id]
+        injured, working = self._get_status_flags(npc)
+        self.status_flags[npc.id] = (injured, working)
+        self.injured_count += injured - old_injured
+        self.working_count += working - old_working
+
+        self._reindex("state", npc)
+        self.dirty_ids.add(npc.id)
+
+    def refresh_distances(self, player_position, force=False):
+        """
+        依玩家位置重新計算距離分級\n
+        \n
+        距離隨時在變，所以只在依距離查詢時、且距離上次計算超過間隔才重算，\n
+        分級沒有改變的 NPC 不會移動\n
+        \n
+        參數:\n
+        player_position (tuple): 玩家位置 (x, y)\n
+        force (bool): 是否忽略間隔立即重算\n
+        """
+        now = get_game_clock().time()
+        if (
+            not force
+            and self.last_distance_refresh is not None
+            and now - self.last_distance_refresh < self.distance_refresh_interval
+        ):
+            return
+
+        self.last_distance_refresh = now
+        self.player_position = player_position
+        player_x, player_y = player_position
+        bucket_size = self.distance_bucket
+        buckets = self.distance_buckets
+
+        for npc_id, npc in self.npcs.items():
+            dx = npc.x - player_x
+            dy = npc.y - player_y
+            bucket = int(math.sqrt(dx * dx + dy * dy) // bucket_size)
+            if bucket != buckets[npc_id]:
+                buckets[npc_id] = bucket
+                self._reindex("distance", npc)
+
+    ######################查詢######################
+    def count_within(self, max_distance):
+        """
+        距離分級在 max_distance 以內的 NPC 數量（以分級為單位，邊界分級整級計入）\n
+        """
+        max_bucket = int(max_distance // self.distance_bucket)
+        return bisect_left(self.indexes["distance"], (max_bucket + 1,))
+
+    def get_row_count(self, sort_key="name", max_distance=None):
+        """
+        取得表格列數\n
+        \n
+        參數:\n
+        sort_key (str): 排序方式\n
+        max_distance (float): 只計算這個距離分級以內的 NPC（只適用距離排序）\n
+        """
+        if sort_key == "distance" and max_distance is not None:
+            return self.count_within(max_distance)
+        return len(self.npcs)
+
+    def get_window(self, sort_key, start, count, max_distance=None):
+        """
+        取得排序後的一段 NPC（UI 的捲動視窗）\n
+        \n
+        參數:\n
+        sort_key (str): 排序方式（name、profession、state、distance）\n
+        start (int): 起始列\n
+        count (int): 列數\n
+        max_distance (float): 只取這個距離分級以內的 NPC（只適用距離排序）\n
+        \n
+        回傳:\n
+        list: NPC 列表\n
+        """
+        index = self.indexes[sort_key]
+        end = min(start + count, self.get_row_count(sort_key, max_distance))
+        npcs = self.npcs
+        return [npcs[entry[-1]] for entry in index[start:end]]
+
+    def take_dirty(self, npcs):
+        """
+        取出這些 NPC 中狀態改變過的 NPC ID，並清除它們的標記\n
+        \n
+        參數:\n
+        npcs (list): UI 目前顯示的 NPC\n
+        \n
+        回傳:\n
+        set: 需要重新繪製的 NPC ID\n
+        """
+        dirty = {npc.id for npc in npcs if npc.id in self.dirty_ids}
+        self.dirty_ids -= dirty
+        return dirty
+
+    def get_statistics(self):
+        """
+        取得狀態統計\n
+        \n
+        回傳:\n
+        dict: 總數、健康、受傷、工作中人數\n
+        """
+        total = len(self.npcs)
+        return {
+            "total": total,
+            "healthy": total - self.injured_count,
+            "injured": self.injured_count,
+            "working": self.working_count,
+        }
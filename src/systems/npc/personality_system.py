@@ -1,6 +1,11 @@
 ######################載入套件######################
 import random
+import sys
+import time
+from collections import deque
 from enum import Enum
+from src.systems.npc.profession import Profession
+from config.settings import NPC_CONVERSATION_HISTORY_SIZE
 
 
 ######################性格類型######################
@@ -280,6 +285,143 @@ class PersonalityDatabase:
             return cls.get_random_daily_talk(personality_type)
 
 
+######################共用對話語料庫######################
+# 互動類型，"all" 是 NPC 閒聊時使用的完整對話（問候 + 日常 + 職業）
+INTERACTION_TYPES = ("greeting", "daily", "profession", "all")
+
+# 沒有性格時的備用對話
+FALLBACK_LINES = ("你好。",)
+
+
+class DialogueCorpus:
+    """
+    共用對話語料庫 - 所有 NPC 共用、建立後不再改變的對話表\n
+    \n
+    啟動時把 PersonalityDatabase 的對話整理成：\n
+    - 句子表：每個句子只存一份（sys.intern），以句子 ID 表示\n
+    - 句子組表：內容相同的句子 ID tuple 只存一份，以句子組 ID 表示\n
+    - 索引：(職業, 性格, 互動類型) -> 句子組 ID\n
+    \n
+    NPC 只記住自己的句子組 ID，對話歷史只記句子 ID\n
+    """
+
+    def __init__(self):
+        """
+        初始化並建立語料庫\n
+        """
+        self.line_ids = {}  # {句子: 句子 ID}
+        self.lines = []  # 句子 ID -> 句子
+        self.set_ids = {}  # {句子 ID tuple: 句子組 ID}
+        self.line_sets = []  # 句子組 ID -> 句子 ID tuple
+        self.set_lines = []  # 句子組 ID -> 句子 tuple（直接給 random.choice 使用）
+        self.index = {}  # {(職業, 性格, 互動類型): 句子組 ID}
+
+        self._build()
+
+        self.lines = tuple(self.lines)
+        self.line_sets = tuple(self.line_sets)
+        self.set_lines = tuple(self.set_lines)
+
+    def _build(self):
+        """
+        為每個職業、性格、互動類型建立句子組\n
+        \n
+        沒有職業對話的組合改用日常對話，沒有性格時使用備用對話\n
+        """
+        for profession in Profession:
+            profession_talks = PersonalityDatabase.PROFESSION_TALKS.get(profession.name.lower(), {})
+
+            for personality_type in PersonalityType:
+                greetings = PersonalityDatabase.GREETINGS.get(personality_type, FALLBACK_LINES)
+                daily = PersonalityDatabase.DAILY_CONVERSATIONS.get(personality_type, ("...",))
+                profession_lines = profession_talks.get(personality_type, ())
+
+                self._add_set(profession, personality_type, "greeting", greetings)
+                self._add_set(profession, personality_type, "daily", daily)
+                self._add_set(profession, personality_type, "profession", profession_lines or daily)
+                self._add_set(profession, personality_type, "all",
+                              tuple(greetings) + tuple(daily) + tuple(profession_lines))
+
+            for interaction_type in INTERACTION_TYPES:
+                self._add_set(profession, None, interaction_type, FALLBACK_LINES)
+
+    def _intern_line(self, line):
+        """
+        取得句子 ID，新句子加入句子表\n
+        """
+        line_id = self.line_ids.get(line)
+        if line_id is None:
+            line_id = len(self.lines)
+            self.lines.append(sys.intern(line))
+            self.line_ids[line] = line_id
+        return line_id
+
+    def _add_set(self, profession, personality_type, interaction_type, lines):
+        """
+        把句子組加入索引，內容相同的句子組共用同一個 ID\n
+        """
+        line_ids = tuple(self._intern_line(line) for line in lines)
+        set_id = self.set_ids.get(line_ids)
+        if set_id is None:
+            set_id = len(self.line_sets)
+            self.line_sets.append(line_ids)
+            self.set_lines.append(tuple(self.lines[line_id] for line_id in line_ids))
+            self.set_ids[line_ids] = set_id
+        self.index[(profession, personality_type, interaction_type)] = set_id
+
+    def get_set_id(self, profession, personality_type, interaction_type="all"):
+        """
+        查詢句子組 ID\n
+        \n
+        參數:\n
+        profession (Profession): 職業\n
+        personality_type (PersonalityType): 性格類型，None 表示還沒分配性格\n
+        interaction_type (str): 互動類型 ("greeting", "daily", "profession", "all")\n
+        \n
+        回傳:\n
+        int: 句子組 ID\n
+        """
+        set_id = self.index.get((profession, personality_type, interaction_type))
+        if set_id is None:
+            # 未知的互動類型當作日常對話
+            set_id = self.index[(profession, personality_type, "daily")]
+        return set_id
+
+    def get_lines(self, set_id):
+        """
+        句子組的所有句子（共用的 tuple，不可修改）\n
+        """
+        return self.set_lines[set_id]
+
+    def get_line(self, line_id):
+        """
+        句子 ID 對應的句子\n
+        """
+        return self.lines[line_id]
+
+    def choose_line_id(self, set_id):
+        """
+        從句子組隨機挑一個句子 ID\n
+        """
+        return random.choice(self.line_sets[set_id])
+
+
+dialogue_corpus = None
+
+
+def get_dialogue_corpus():
+    """
+    取得全域對話語料庫（第一次使用時建立）\n
+    \n
+    回傳:\n
+    DialogueCorpus: 對話語料庫\n
+    """
+    global dialogue_corpus
+    if dialogue_corpus is None:
+        dialogue_corpus = DialogueCorpus()
+    return dialogue_corpus
+
+
 ######################姓名生成器######################
 class NameGenerator:
     """
@@ -407,13 +549,15 @@ class NPCPersonalitySystem:
         personality_name = NameGenerator.generate_name(personality_type)
         
         # 建立個人檔案
+        corpus = get_dialogue_corpus()
+        greeting_set_id = corpus.get_set_id(npc.profession, personality_type, "greeting")
         profile = {
             "id": npc.id,
             "name": personality_name,
             "personality_type": personality_type,
             "profession": npc.profession,
-            "greeting": PersonalityDatabase.get_random_greeting(personality_type),
-            "conversation_history": [],
+            "greeting_id": corpus.choose_line_id(greeting_set_id),
+            "conversation_history": deque(maxlen=NPC_CONVERSATION_HISTORY_SIZE),  # (句子 ID, 互動類型, 時間)
             "interaction_count": 0,
             "mood": 100,  # 心情指數 (0-100)
             "relationship_level": 0,  # 與玩家的關係等級
@@ -424,42 +568,27 @@ class NPCPersonalitySystem:
         npc.personality_type = personality_type
         npc.personality_profile = profile
         
-        # 生成性格化的對話內容
+        # 指向共用語料庫中的性格化對話
         self._generate_personality_dialogues(npc)
         
         # 記錄分配
         self.assigned_personalities[npc.id] = profile
         self.npc_profiles[npc.id] = profile
         
-        print(f"為NPC {npc.id} 分配性格：{personality_name} ({personality_type.value})")
+        # 大量分配時不逐一輸出
+        # print(f"為NPC {npc.id} 分配性格：{personality_name} ({personality_type.value})")
         return profile
 
     def _generate_personality_dialogues(self, npc):
         """
-        根據性格生成個性化對話\n
+        根據性格指定個性化對話\n
+        \n
+        NPC 只記住共用語料庫中的句子組 ID，不複製對話內容\n
         \n
         參數:\n
         npc (NPC): NPC物件\n
         """
-        personality_type = npc.personality_type
-        profession_name = npc.profession.value if hasattr(npc.profession, 'value') else str(npc.profession)
-        
-        # 生成多種類型的對話
-        dialogues = []
-        
-        # 問候語
-        dialogues.extend(PersonalityDatabase.GREETINGS.get(personality_type, ["你好。"]))
-        
-        # 日常對話
-        dialogues.extend(PersonalityDatabase.DAILY_CONVERSATIONS.get(personality_type, ["..."]))
-        
-        # 職業相關對話
-        profession_talks = PersonalityDatabase.PROFESSION_TALKS.get(profession_name.lower(), {})
-        if personality_type in profession_talks:
-            dialogues.extend(profession_talks[personality_type])
-        
-        # 更新NPC的對話列表
-        npc.dialogue_lines = dialogues
+        npc.dialogue_set_id = get_dialogue_corpus().get_set_id(npc.profession, npc.personality_type, "all")
 
     def get_npc_dialogue(self, npc, interaction_type="daily"):
         """
@@ -472,34 +601,20 @@ class NPCPersonalitySystem:
         回傳:\n
         str: 對話內容\n
         """
-        if not hasattr(npc, 'personality_type'):
-            return "你好。"  # 備用對話
+        if npc.personality_type is None:
+            return FALLBACK_LINES[0]  # 備用對話
         
-        personality_type = npc.personality_type
+        corpus = get_dialogue_corpus()
+        set_id = corpus.get_set_id(npc.profession, npc.personality_type, interaction_type)
+        line_id = corpus.choose_line_id(set_id)
         
-        if interaction_type == "greeting":
-            dialogue = PersonalityDatabase.get_random_greeting(personality_type)
-        elif interaction_type == "profession":
-            profession_name = npc.profession.value if hasattr(npc.profession, 'value') else str(npc.profession)
-            dialogue = PersonalityDatabase.get_profession_talk(profession_name, personality_type)
-        else:  # daily
-            dialogue = PersonalityDatabase.get_random_daily_talk(personality_type)
-        
-        # 記錄對話歷史
-        if npc.id in self.npc_profiles:
-            profile = self.npc_profiles[npc.id]
-            profile["conversation_history"].append({
-                "dialogue": dialogue,
-                "type": interaction_type,
-                "timestamp": time.time()
-            })
+        # 記錄對話歷史（固定長度，舊的自動丟棄）
+        profile = self.npc_profiles.get(npc.id)
+        if profile is not None:
+            profile["conversation_history"].append((line_id, interaction_type, time.time()))
             profile["interaction_count"] += 1
-            
-            # 保持對話歷史在合理範圍內
-            if len(profile["conversation_history"]) > 10:
-                profile["conversation_history"].pop(0)
         
-        return dialogue
+        return corpus.get_line(line_id)
 
     def update_npc_mood(self, npc_id, mood_change):
         """
@@ -539,7 +654,3 @@ class NPCPersonalitySystem:
             stats[personality_type.value] = count
         
         return stats
-
-
-# 導入時間模組用於對話歷史記錄
-import time
\ No newline at end of file
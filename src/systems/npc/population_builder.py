@@ -0,0 +1,567 @@
+######################載入套件######################
+import random
+import math
+
+
+######################NPC 族群建構器######################
+class NPCPopulationBuilder:
+    """
+    NPC 族群建構器 - 大量 NPC 的生成位置、住宅和工作場所批次分配\n
+    \n
+    取代原本逐一 NPC 的隨機嘗試：\n
+    1. 從地形格子一次性預先計算所有候選生成格（子格）\n
+    2. 建築物只柵格化一次，候選格直接排除被建築佔用的位置\n
+    3. 生成位置以不重複抽樣取得，每次抽樣 O(1)\n
+    4. 住宅和工作場所使用網格分桶的最近建築查詢批次分配\n
+    \n
+    所有查詢都不需要掃描建築列表，10k 個 NPC 的分配可在一秒內完成\n
+    """
+
+    # 地形代碼優先順序（與 NPCManager._find_safe_spawn_position 相同）
+    PREFERRED_TERRAIN_CODES = (5, 6, 8)  # 住宅區、商業區、農地
+    FALLBACK_TERRAIN_CODES = (3,)  # 道路
+
+    # 工作場所名稱對應的建築類型
+    WORKPLACE_BUILDING_TYPES = {
+        "教堂": "church",
+        "醫院": "hospital",
+        "槍械店": "gun_shop",
+        "便利商店": "convenience_store",
+        "釣魚店": "fishing_shop",
+        "餐廳": "restaurant",
+        "學校": "school",
+        "住宅區": "house",
+    }
+
+    def __init__(self, terrain_system=None, buildings=None, tile_map=None, cell_size=20):
+        """
+        初始化族群建構器\n
+        \n
+        參數:\n
+        terrain_system (TerrainBasedSystem): 地形系統，提供 terrain_store 和 tile_size\n
+        buildings (list): 建築物列表，需要有 x, y, width, height 屬性\n
+        tile_map (TileMapManager): 格子地圖，用於可行走檢查（可選）\n
+        cell_size (int): 候選生成子格大小（像素）\n
+        """
+        self.terrain_system = terrain_system
+        self.buildings = buildings or []
+        self.tile_map = tile_map
+        self.cell_size = cell_size
+
+        # 候選格子池，以 (bounds, margin, clearance, terrain_codes) 為鍵快取
+        self._spawn_pools = {}
+
+        # 建築分桶索引，以建築類型為鍵快取
+        self._building_indexes = {}
+
+    ######################生成格子池######################
+    def _build_blocked_cells(self, bounds, clearance):
+        """
+        將所有建築物柵格化到子格網格上\n
+        \n
+        子格中心落在「建築矩形往外擴張 clearance」範圍內即視為被佔用，\n
+        等同於以子格中心為圓心、邊長 2*clearance 的測試矩形與建築碰撞\n
+        \n
+        參數:\n
+        bounds (tuple): 區域邊界 (x, y, width, height)\n
+        clearance (int): 測試矩形半邊長\n
+        \n
+        回傳:\n
+        tuple: (blocked bytearray, 欄數, 列數)\n
+        """
+        area_x, area_y, area_width, area_height = bounds
+        cell = self.cell_size
+        cols = max(1, area_width // cell)
+        rows = max(1, area_height // cell)
+        blocked = bytearray(cols * rows)
+        half = cell / 2
+
+        for building in self.buildings:
+            # 子格中心 c 滿足 left < c < right 時測試矩形會與建築重疊
+            left = building.x - clearance - area_x
+            top = building.y - clearance - area_y
+            right = building.x + building.width + clearance - area_x
+            bottom = building.y + building.height + clearance - area_y
+
+            col_start = max(0, int(math.floor((left - half) / cell)) + 1)
+            col_end = min(cols - 1, int(math.ceil((right - half) / cell)) - 1)
+            row_start = max(0, int(math.floor((top - half) / cell)) + 1)
+            row_end = min(rows - 1, int(math.ceil((bottom - half) / cell)) - 1)
+
+            if col_start > col_end:
+                continue
+
+            span = col_end - col_start + 1
+            filled = b"\x01" * span
+            for row in range(row_start, row_end + 1):
+                offset = row * cols + col_start
+                blocked[offset:offset + span] = filled
+
+        return blocked, cols, rows
+
+    def _get_spawn_pool(self, bounds, margin, clearance, terrain_codes):
+        """
+        取得（或建立）候選生成格子池\n
+        \n
+        參數:\n
+        bounds (tuple): 區域邊界 (x, y, width, height)\n
+        margin (int): 與區域邊緣的最小距離\n
+        clearance (int): 與建築物的最小距離\n
+        terrain_codes (tuple): 允許的地形代碼，None 表示不限地形\n
+        \n
+        回傳:\n
+        list: 已打亂順序的候選子格中心座標列表（從尾端取出）\n
+        """
+        key = (tuple(bounds), margin, clearance, terrain_codes)
+        pool = self._spawn_pools.get(key)
+        if pool is not None:
+            return pool
+
+        area_x, area_y = bounds[0], bounds[1]
+        area_width, area_height = bounds[2], bounds[3]
+        blocked, cols, rows = self._build_blocked_cells(bounds, clearance)
+        cell = self.cell_size
+        half = cell // 2
+
+        terrain_store = None
+        tile_size = 1
+        map_width = map_height = 0
+        if terrain_codes is not None and self.terrain_system and getattr(self.terrain_system, "terrain_store", None):
+            terrain_store = self.terrain_system.terrain_store
+            tile_size = self.terrain_system.tile_size
+            map_width = self.terrain_system.map_width
+            map_height = self.terrain_system.map_height
+
+        min_x = area_x + margin
+        max_x = area_x + area_width - margin
+        min_y = area_y + margin
+        max_y = area_y + area_height - margin
+
+        pool = []
+        for row in range(rows):
+            world_y = area_y + row * cell + half
+            if world_y < min_y or world_y > max_y:
+                continue
+
+            grid_y = int(world_y // tile_size)
+            terrain_row = None
+            if terrain_store is not None:
+                if not 0 <= grid_y < map_height:
+                    continue
+                terrain_row = terrain_store.read_row(grid_y)
+
+            row_offset = row * cols
+            for col in range(cols):
+                if blocked[row_offset + col]:
+                    continue
+
+                world_x = area_x + col * cell + half
+                if world_x < min_x or world_x > max_x:
+                    continue
+
+                if terrain_row is not None:
+                    grid_x = int(world_x // tile_size)
+                    if not 0 <= grid_x < map_width:
+                        continue
+                    if terrain_row[grid_x] not in terrain_codes:
+                        continue
+
+                if self.tile_map and not self.tile_map.is_position_walkable(world_x, world_y):
+                    continue
+
+                pool.append((world_x, world_y))
+
+        # 一次打亂，之後從尾端取出即為不重複抽樣
+        random.shuffle(pool)
+        self._spawn_pools[key] = pool
+        return pool
+
+    def take_spawn_positions(self, count, bounds, margin=50, clearance=15):
+        """
+        不重複抽樣 NPC 生成位置\n
+        \n
+        先從優先地形（住宅區、商業區、農地）抽樣，不足時改用道路，\n
+        仍不足時從已抽出的位置重複抽樣；完全沒有候選格子時回傳 None\n
+        由呼叫端使用後備方案\n
+        \n
+        參數:\n
+        count (int): 需要的位置數量\n
+        bounds (tuple): 區域邊界 (x, y, width, height)\n
+        margin (int): 與區域邊緣的最小距離\n
+        clearance (int): 與建築物的最小距離\n
+        \n
+        回傳:\n
+        list: 長度為 count 的位置列表，不足的部分為 None\n
+        """
+        has_terrain = bool(self.terrain_system and getattr(self.terrain_system, "terrain_store", None))
+        if has_terrain:
+            tiers = (self.PREFERRED_TERRAIN_CODES, self.FALLBACK_TERRAIN_CODES)
+        else:
+            tiers = (None,)
+
+        positions = []
+        for terrain_codes in tiers:
+            if len(positions) >= count:
+                break
+            pool = self._get_spawn_pool(bounds, margin, clearance, terrain_codes)
+            take = min(count - len(positions), len(pool))
+            if take > 0:
+                positions.extend(pool[-take:])
+                del pool[-take:]
+
+        # 候選格子用完時（人口遠大於地圖容量），改為從已抽出的位置重複抽樣
+        missing = count - len(positions)
+        if missing > 0 and positions:
+            positions.extend(random.choices(positions, k=missing))
+        else:
+            positions.extend([None] * missing)
+        return positions
+
+    def take_any_terrain_position(self, bounds, margin=100, clearance=20):
+        """
+        在不限地形的條件下抽樣一個位置（路邊小販使用）\n
+        \n
+        參數:\n
+        bounds (tuple): 區域邊界 (x, y, width, height)\n
+        margin (int): 與區域邊緣的最小距離\n
+        clearance (int): 與建築物的最小距離\n
+        \n
+        回傳:\n
+        tuple: 位置 (x, y)，找不到時回傳 None\n
+        """
+        pool = self._get_spawn_pool(bounds, margin, clearance, None)
+        if pool:
+            return pool.pop()
+        return None
+
+    ######################建築分桶索引######################
+    def _get_building_index(self, building_type):
+        """
+        取得指定類型建築的網格分桶索引\n
+        \n
+        參數:\n
+        building_type (str): 建築類型\n
+        \n
+        回傳:\n
+        BuildingGridIndex: 該類型建築的索引\n
+        """
+        index = self._building_indexes.get(building_type)
+        if index is None:
+            centers = []
+            for building in self.buildings:
+                if getattr(building, "building_type", None) != building_type:
+                    continue
+                if getattr(building, "is_player_home", False):
+                    continue  # 玩家之家不參與分配
+                centers.append((building, _building_center(building)))
+            index = BuildingGridIndex(centers)
+            self._building_indexes[building_type] = index
+        return index
+
+    def assign_homes(self, npcs, houses, move_to_home=True):
+        """
+        批次將 NPC 分配到最近且尚有空位的住宅\n
+        \n
+        每棟住宅的容量與原本平均分配相同（總數 / 住宅數，餘數分給前幾棟），\n
+        並受住宅本身的 max_residents 限制\n
+        \n
+        參數:\n
+        npcs (list): 要分配的 NPC 列表\n
+        houses (list): 可分配的住宅列表（已排除玩家之家）\n
+        move_to_home (bool): 是否把 NPC 的位置移到住宅中心\n
+        \n
+        回傳:\n
+        list: 成功分配到住宅的 NPC 列表\n
+        """
+        if not npcs or not houses:
+            return []
+
+        base_share, remainder = divmod(len(npcs), len(houses))
+        entries = []
+        capacity = {}
+        for i, house in enumerate(houses):
+            share = base_share + (1 if i < remainder else 0)
+            max_residents = getattr(house, "max_residents", None)
+            if max_residents is not None:
+                share = min(share, max_residents - len(house.residents))
+            if share <= 0:
+                continue
+            capacity[id(house)] = share
+            entries.append((house, _building_center(house)))
+
+        index = BuildingGridIndex(entries)
+        assigned = []
+        for npc in npcs:
+            house = index.nearest((npc.x, npc.y))
+            # 住宅類別透過 add_resident 登記居民，住滿時換下一棟最近的住宅
+            while house is not None and hasattr(house, "add_resident") and not house.add_resident(npc, log=False):
+                index.remove(house)
+                house = index.nearest((npc.x, npc.y))
+            if house is None:
+                break
+
+            center = _building_center(house)
+            if not hasattr(house, "add_resident"):
+                # 舊版建築，直接設定住所
+                npc.set_home(center)
+            if move_to_home:
+                npc.x, npc.y = center
+            assigned.append(npc)
+
+            capacity[id(house)] -= 1
+            if capacity[id(house)] <= 0:
+                index.remove(house)
+
+        return assigned
+
+    def nearest_workplace(self, workplace_names, position):
+        """
+        查詢離指定位置最近的工作場所\n
+        \n
+        參數:\n
+        workplace_names (list): 職業的工作場所名稱列表\n
+        position (tuple): 查詢位置 (x, y)\n
+        \n
+        回傳:\n
+        tuple: 工作場所中心座標，沒有對應建築時回傳 None\n
+        """
+        best_center = None
+        best_distance = float("inf")
+
+        for name in workplace_names:
+            if name == "農田":
+                index = self._get_farm_index()
+            else:
+                building_type = self.WORKPLACE_BUILDING_TYPES.get(name)
+                if building_type is None:
+                    continue
+                index = self._get_building_index(building_type)
+
+            found = index.nearest_with_distance(position)
+            if found and found[1] < best_distance:
+                best_center = index.center_of(found[0])
+                best_distance = found[1]
+
+        return best_center
+
+    def _get_farm_index(self):
+        """
+        取得農地格子的分桶索引\n
+        \n
+        回傳:\n
+        BuildingGridIndex: 農地索引\n
+        """
+        index = self._building_indexes.get("farmland")
+        if index is None:
+            entries = []
+            farm_areas = getattr(self.terrain_system, "farm_areas", None) or []
+            for farm in farm_areas:
+                farm_x, farm_y = farm["position"]
+                farm_width, farm_height = farm["size"]
+                entries.append((farm, (farm_x + farm_width // 2, farm_y + farm_height // 2)))
+            index = BuildingGridIndex(entries)
+            self._building_indexes["farmland"] = index
+        return index
+
+
+######################網格分桶最近鄰索引######################
+class BuildingGridIndex:
+    """
+    建築物網格分桶索引 - 最近建築查詢\n
+    \n
+    將建築中心座標依格子分桶，查詢時從所在格子向外一圈一圈擴張，\n
+    一旦目前最佳距離小於下一圈可能的最短距離就停止\n
+    移除已滿的建築只需要從所在分桶刪除\n
+    """
+
+    def __init__(self, entries, bucket_size=None):
+        """
+        建立索引\n
+        \n
+        參數:\n
+        entries (list): (物件, (中心 x, 中心 y)) 列表\n
+        bucket_size (int): 分桶大小，None 表示依物件密度自動決定\n
+        """
+        self._centers = {}
+        self._buckets = {}
+        self._count = 0
+
+        if entries:
+            xs = [center[0] for _, center in entries]
+            ys = [center[1] for _, center in entries]
+            self._origin_x = min(xs)
+            self._origin_y = min(ys)
+            span = max(max(xs) - self._origin_x, max(ys) - self._origin_y, 1)
+        else:
+            self._origin_x = self._origin_y = 0
+            span = 1
+
+        if bucket_size is None:
+            # 平均每個分桶約 2 個物件
+            bucket_size = max(16, int(span / max(1, math.sqrt(len(entries) / 2))))
+        self.bucket_size = bucket_size
+
+        self._max_bucket_x = 0
+        self._max_bucket_y = 0
+        for item, center in entries:
+            self._insert(item, center)
+
+    def _bucket_of(self, x, y):
+        """
+        計算座標所屬的分桶\n
+        \n
+        參數:\n
+        x (float): X 座標\n
+        y (float): Y 座標\n
+        \n
+        回傳:\n
+        tuple: 分桶座標 (bx, by)\n
+        """
+        return (
+            int((x - self._origin_x) // self.bucket_size),
+            int((y - self._origin_y) // self.bucket_size),
+        )
+
+    def _insert(self, item, center):
+        """
+        插入物件到索引\n
+        \n
+        參數:\n
+        item (object): 物件\n
+        center (tuple): 中心座標\n
+        """
+        bucket = self._bucket_of(*center)
+        self._buckets.setdefault(bucket, []).append(item)
+        self._centers[id(item)] = (center, bucket)
+        self._count += 1
+        self._max_bucket_x = max(self._max_bucket_x, bucket[0])
+        self._max_bucket_y = max(self._max_bucket_y, bucket[1])
+
+    def remove(self, item):
+        """
+        從索引移除物件\n
+        \n
+        參數:\n
+        item (object): 要移除的物件\n
+        """
+        record = self._centers.pop(id(item), None)
+        if record is None:
+            return
+        bucket_items = self._buckets[record[1]]
+        bucket_items.remove(item)
+        if not bucket_items:
+            del self._buckets[record[1]]
+        self._count -= 1
+
+    def center_of(self, item):
+        """
+        取得物件的中心座標\n
+        \n
+        參數:\n
+        item (object): 物件\n
+        \n
+        回傳:\n
+        tuple: 中心座標\n
+        """
+        return self._centers[id(item)][0]
+
+    def __len__(self):
+        return self._count
+
+    def nearest(self, position):
+        """
+        查詢最近的物件\n
+        \n
+        參數:\n
+        position (tuple): 查詢位置 (x, y)\n
+        \n
+        回傳:\n
+        object: 最近的物件，索引為空時回傳 None\n
+        """
+        found = self.nearest_with_distance(position)
+        return found[0] if found else None
+
+    def nearest_with_distance(self, position):
+        """
+        查詢最近的物件和距離平方\n
+        \n
+        參數:\n
+        position (tuple): 查詢位置 (x, y)\n
+        \n
+        回傳:\n
+        tuple: (物件, 距離平方)，索引為空時回傳 None\n
+        """
+        if self._count == 0:
+            return None
+
+        px, py = position
+        center_bx, center_by = self._bucket_of(px, py)
+
+        # 查詢點在索引範圍外時，從投影到範圍內的分桶開始擴張，
+        # 投影不會增加距離，所以每圈的最短距離下限仍然成立
+        center_bx = min(max(center_bx, 0), self._max_bucket_x)
+        center_by = min(max(center_by, 0), self._max_bucket_y)
+
+        size = self.bucket_size
+        best_item = None
+        best_distance = float("inf")
+
+        max_ring = max(self._max_bucket_x, self._max_bucket_y)
+        ring = 0
+        while ring <= max_ring:
+            # 這一圈的最短可能距離超過目前最佳就停止
+            if best_item is not None:
+                min_ring_distance = (ring - 1) * size
+                if min_ring_distance > 0 and min_ring_distance * min_ring_distance > best_distance:
+                    break
+
+            for bx, by in _ring_buckets(center_bx, center_by, ring):
+                bucket_items = self._buckets.get((bx, by))
+                if not bucket_items:
+                    continue
+                for item in bucket_items:
+                    cx, cy = self._centers[id(item)][0]
+                    distance = (cx - px) * (cx - px) + (cy - py) * (cy - py)
+                    if distance < best_distance:
+                        best_distance = distance
+                        best_item = item
+            ring += 1
+
+        return (best_item, best_distance) if best_item is not None else None
+
+
+######################輔助函式######################
+def _building_center(building):
+    """
+    計算建築物中心座標\n
+    \n
+    參數:\n
+    building (Building): 建築物\n
+    \n
+    回傳:\n
+    tuple: 中心座標 (x, y)\n
+    """
+    return (building.x + building.width // 2, building.y + building.height // 2)
+
+
+def _ring_buckets(center_x, center_y, ring):
+    """
+    產生與中心分桶距離恰好為 ring 的所有分桶（正方形外圈）\n
+    \n
+    參數:\n
+    center_x (int): 中心分桶 X\n
+    center_y (int): 中心分桶 Y\n
+    ring (int): 圈數\n
+    \n
+    回傳:\n
+    generator: 分桶座標\n
+    """
+    if ring == 0:
+        yield (center_x, center_y)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (center_x + dx, center_y - ring)
+        yield (center_x + dx, center_y + ring)
+    for dy in range(-ring + 1, ring):
+        yield (center_x - ring, center_y + dy)
+        yield (center_x + ring, center_y + dy)
@@ -9,6 +9,8 @@ from ..utils.helpers import calculate_distance
 from config.settings import (
     POWER_PLANT_COUNT,
     POWER_WORKER_COUNT,
+    POWER_GRID_COLUMNS,
+    POWER_GRID_ROWS,
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
 )
@@ -43,6 +45,10 @@ class PowerManager:
     - 工人住院或離線時該區域停電\n
     - 支援回調機制通知電力狀態變化\n
     - 與建築系統整合，影響設施運作\n
+    \n
+    區域是規則的 6x5 網格，位置對應的區域 ID 直接由網格邊界算出\n
+    停電區域集合和值班工人數只在停電、復電、工人狀態改變時更新，\n
+    路燈、建築等訂閱者由推送得知變化，沒有變化時每幀不需要做任何電力計算\n
     """
 
     def __init__(self, time_manager=None):
@@ -57,7 +63,17 @@ class PowerManager:
 
         # 電力區域管理
         self.power_areas = {}  # {area_id: area_info}
-        self.total_areas = 30  # 總共 30 個電力區域
+        self.total_areas = POWER_GRID_COLUMNS * POWER_GRID_ROWS  # 總共 30 個電力區域
+
+        # 網格幾何（位置換算區域 ID 用）
+        self.grid_x = 0
+        self.grid_y = 0
+        self.area_width = 0
+        self.area_height = 0
+
+        # 增量維護的狀態
+        self.outage_areas = set()  # 目前停電的區域 ID
+        self.elapsed_time = 0.0  # 累計時間（秒），用來計算停電持續時間
 
         # 電力工人管理
         self.power_workers = {}  # {worker_id: worker_info}
@@ -72,11 +88,12 @@ class PowerManager:
         # 回調機制
         self.power_change_callbacks = []  # 電力狀態變化回調
         self.outage_callbacks = []  # 停電事件回調
+        self.power_subscribers = []  # 停電和復電都會推送的訂閱者
 
         # 統計資料
         self.stats = {
             "total_outages": 0,
-            "areas_with_power": 30,
+            "areas_with_power": self.total_areas,
             "workers_on_duty": 0,
             "power_efficiency": 1.0,
         }
@@ -96,15 +113,22 @@ class PowerManager:
         town_x, town_y, town_width, town_height = town_bounds
 
         # 計算每個區域的尺寸
-        area_width = town_width // 6  # 6列
-        area_height = town_height // 5  # 5行
+        area_width = town_width // POWER_GRID_COLUMNS  # 6列
+        area_height = town_height // POWER_GRID_ROWS  # 5行
+
+        self.grid_x = town_x
+        self.grid_y = town_y
+        self.area_width = area_width
+        self.area_height = area_height
+        self.power_areas = {}
+        self.outage_areas = set()
 
         area_count = 0
 
         # 創建 6x5 的電力區域網格
-        for row in range(5):
-            for col in range(6):
-                area_id = row * 6 + col + 1  # 區域 ID 從 1 開始
+        for row in range(POWER_GRID_ROWS):
+            for col in range(POWER_GRID_COLUMNS):
+                area_id = row * POWER_GRID_COLUMNS + col + 1  # 區域 ID 從 1 開始
 
                 # 計算區域中心點
                 center_x = town_x + col * area_width + area_width // 2
@@ -128,9 +152,11 @@ class PowerManager:
                     "status": PowerStatus.NORMAL,
                     "assigned_worker": None,
                     "buildings": [],  # 該區域內的建築物列表
+                    "street_lights": [],  # 該區域內的路燈列表
                     "power_demand": 0.0,  # 區域電力需求
                     "last_outage": None,  # 上次停電時間
                     "outage_duration": 0,  # 停電持續時間
+                    "outage_started": None,  # 停電開始時的累計時間
                 }
 
                 self.power_areas[area_id] = area_info
@@ -164,6 +190,8 @@ class PowerManager:
             "work_efficiency": 1.0,
         }
 
+        self.stats["workers_on_duty"] += 1
+
         # 自動分配可用區域
         assigned_area = self._assign_area_to_worker(worker_id)
 
@@ -242,6 +270,8 @@ class PowerManager:
         worker_info = self.power_workers[worker_id]
         old_status = worker_info["on_duty"]
         worker_info["on_duty"] = is_available
+        if old_status != is_available:
+            self.stats["workers_on_duty"] += 1 if is_available else -1
 
         assigned_area = worker_info["assigned_area"]
 
@@ -280,7 +310,9 @@ class PowerManager:
                 self.time_manager.get_time_string() if self.time_manager else "未知時間"
             )
             area_info["outage_duration"] = 0
+            area_info["outage_started"] = self.elapsed_time
 
+            self.outage_areas.add(area_id)
             self.stats["total_outages"] += 1
 
             print(f"區域 {area_id} 停電 - 原因：{reason}")
@@ -292,6 +324,7 @@ class PowerManager:
                 except Exception as e:
                     print(f"停電回調執行失敗：{e}")
 
+            self._notify_subscribers(area_id, False)
             self._update_stats()
 
     def _restore_power_to_area(self, area_id: int):
@@ -311,6 +344,10 @@ class PowerManager:
 
         if area_info["status"] == PowerStatus.OUTAGE:
             area_info["status"] = PowerStatus.NORMAL
+            area_info["outage_duration"] = self.elapsed_time - area_info["outage_started"]
+            area_info["outage_started"] = None
+
+            self.outage_areas.discard(area_id)
 
             print(f"區域 {area_id} 供電恢復")
 
@@ -321,6 +358,7 @@ class PowerManager:
                 except Exception as e:
                     print(f"供電恢復回調執行失敗：{e}")
 
+            self._notify_subscribers(area_id, True)
             self._update_stats()
 
     def get_area_power_status(self, position: Tuple[int, int]) -> PowerStatus:
@@ -337,31 +375,99 @@ class PowerManager:
         """
         area_id = self._get_area_by_position(position)
 
-        if area_id and area_id in self.power_areas:
+        if area_id is not None:
             return self.power_areas[area_id]["status"]
 
         return PowerStatus.NORMAL  # 預設有電
 
     def _get_area_by_position(self, position: Tuple[int, int]) -> Optional[int]:
         """
-        根據位置座標找出對應的電力區域 ID\n
+        根據位置座標找出負責供電的電力區域 ID\n
+        \n
+        區域是規則網格，直接用網格邊界換算欄列，不需要逐一比對區域\n
+        小鎮寬高不一定能被 6x5 整除，網格邊緣外的位置歸給最近的區域，\n
+        和建築、路燈分配區域的方式相同\n
         \n
         參數:\n
         position (tuple): 查詢位置 (x, y)\n
         \n
         回傳:\n
-        int: 區域 ID，如果位置不在任何區域內則回傳 None\n
+        int: 區域 ID，電網尚未初始化時回傳 None\n
         """
-        x, y = position
+        if not self.power_areas or self.area_width <= 0 or self.area_height <= 0:
+            return None
 
-        for area_id, area_info in self.power_areas.items():
-            area_x, area_y, area_width, area_height = area_info["bounds"]
+        col = int((position[0] - self.grid_x) // self.area_width)
+        row = int((position[1] - self.grid_y) // self.area_height)
+        col = min(max(col, 0), POWER_GRID_COLUMNS - 1)
+        row = min(max(row, 0), POWER_GRID_ROWS - 1)
+        return row * POWER_GRID_COLUMNS + col + 1
 
-            # 檢查位置是否在區域範圍內
-            if area_x <= x < area_x + area_width and area_y <= y < area_y + area_height:
-                return area_id
+    def get_area_id(self, position: Tuple[int, int]) -> Optional[int]:
+        """
+        查詢位置所屬的電力區域 ID\n
+        \n
+        參數:\n
+        position (tuple): 查詢位置 (x, y)\n
+        \n
+        回傳:\n
+        int: 區域 ID，電網尚未初始化時回傳 None\n
+        """
+        return self._get_area_by_position(position)
+
+    def assign_buildings(self, buildings: List):
+        """
+        把建築依中心點分到負責的電力區域，並設定建築目前的供電狀態\n
+        \n
+        之後停電、復電只會更新該區域的建築，繪製時不需要逐一查詢位置\n
+        \n
+        參數:\n
+        buildings (list): 建築物件列表（需要 rect 屬性）\n
+        """
+        for area_info in self.power_areas.values():
+            area_info["buildings"] = []
 
-        return None
+        for building in buildings:
+            area_id = self._get_area_by_position(building.rect.center)
+            building.power_area_id = area_id
+            if area_id is None:
+                building.has_power = True
+                continue
+
+            area_info = self.power_areas[area_id]
+            area_info["buildings"].append(building)
+            building.has_power = area_info["status"] != PowerStatus.OUTAGE
+
+    def assign_street_lights(self, street_lights: List[dict]):
+        """
+        把路燈分到負責的電力區域，並設定路燈目前的供電狀態\n
+        \n
+        參數:\n
+        street_lights (list): 路燈字典列表（需要 position 欄位）\n
+        """
+        for area_info in self.power_areas.values():
+            area_info["street_lights"] = []
+
+        for light in street_lights:
+            area_id = self._get_area_by_position(light["position"])
+            light["area_id"] = area_id
+            if area_id is None:
+                light["powered"] = True
+                continue
+
+            area_info = self.power_areas[area_id]
+            area_info["street_lights"].append(light)
+            light["powered"] = area_info["status"] != PowerStatus.OUTAGE
+
+    def _apply_area_power(self, area_id: int, has_power: bool):
+        """
+        更新區域內建築和路燈的供電旗標\n
+        """
+        area_info = self.power_areas[area_id]
+        for building in area_info["buildings"]:
+            building.has_power = has_power
+        for light in area_info["street_lights"]:
+            light["powered"] = has_power
 
     def register_power_change_callback(self, callback: Callable):
         """
@@ -383,46 +489,80 @@ class PowerManager:
         if callback not in self.outage_callbacks:
             self.outage_callbacks.append(callback)
 
+    def subscribe_power_changes(self, callback: Callable):
+        """
+        訂閱區域供電變化（停電和復電都會推送）\n
+        \n
+        訂閱時會先推送目前所有停電的區域，讓訂閱者的狀態和電網一致\n
+        \n
+        參數:\n
+        callback (function): 回調函數，簽名為 callback(area_id, has_power)\n
+        """
+        if callback in self.power_subscribers:
+            return
+
+        self.power_subscribers.append(callback)
+        for area_id in sorted(self.outage_areas):
+            callback(area_id, False)
+
+    def unsubscribe_power_changes(self, callback: Callable):
+        """
+        取消訂閱區域供電變化\n
+        \n
+        參數:\n
+        callback (function): 之前訂閱的回調函數\n
+        """
+        if callback in self.power_subscribers:
+            self.power_subscribers.remove(callback)
+
+    def _notify_subscribers(self, area_id: int, has_power: bool):
+        """
+        更新區域內的建築、路燈，再推送區域供電變化給所有訂閱者\n
+        """
+        self._apply_area_power(area_id, has_power)
+
+        for callback in self.power_subscribers:
+            try:
+                callback(area_id, has_power)
+            except Exception as e:
+                print(f"電力訂閱者更新失敗：{e}")
+
     def update(self, dt: float):
         """
         更新電力系統狀態\n
         \n
-        每幀調用，處理電力需求變化、維修進度等\n
+        每幀調用，只推進累計時間；停電持續時間在查詢區域資訊時才計算，\n
+        全域狀態在停電、復電時就已經更新\n
         \n
         參數:\n
         dt (float): 距離上次更新的時間間隔（秒）\n
         """
-        # 更新停電區域的停電時間
-        for area_id, area_info in self.power_areas.items():
-            if area_info["status"] == PowerStatus.OUTAGE:
-                area_info["outage_duration"] += dt
+        self.elapsed_time += dt
 
-        # 更新全域電力狀態
-        self._update_global_power_status()
+    def _refresh_outage_durations(self):
+        """
+        計算停電中區域的持續時間（只走訪停電的區域）\n
+        """
+        for area_id in self.outage_areas:
+            area_info = self.power_areas[area_id]
+            area_info["outage_duration"] = self.elapsed_time - area_info["outage_started"]
 
     def _update_global_power_status(self):
         """
         更新全域電力狀態\n
         \n
-        根據各區域狀態計算整體電力系統健康度\n
+        根據停電區域數量計算整體電力系統健康度\n
         """
         total_areas = len(self.power_areas)
 
         if total_areas == 0:
             return
 
-        # 計算有電的區域數量
-        powered_areas = sum(
-            1
-            for area in self.power_areas.values()
-            if area["status"] == PowerStatus.NORMAL
-        )
+        # 有電的區域數量由停電區域集合直接得出
+        powered_areas = total_areas - len(self.outage_areas)
 
         # 更新統計資料
         self.stats["areas_with_power"] = powered_areas
-        self.stats["workers_on_duty"] = sum(
-            1 for worker in self.power_workers.values() if worker["on_duty"]
-        )
 
         # 計算電力效率
         self.stats["power_efficiency"] = powered_areas / total_areas
@@ -459,6 +599,7 @@ class PowerManager:
         回傳:\n
         dict: 包含所有區域資訊的字典\n
         """
+        self._refresh_outage_durations()
         return self.power_areas.copy()
 
     def get_area_info(self, area_id: int) -> Optional[dict]:
@@ -471,6 +612,7 @@ class PowerManager:
         回傳:\n
         dict: 區域資訊，如果區域不存在則回傳 None\n
         """
+        self._refresh_outage_durations()
         return self.power_areas.get(area_id)
 
     def is_position_powered(self, position: Tuple[int, int]) -> bool:
@@ -494,9 +636,9 @@ class PowerManager:
         print(f"全域狀態：{self.global_power_status.value}")
         print(f"統計資料：{self.stats}")
 
-        for row in range(5):
-            for col in range(6):
-                area_id = row * 6 + col + 1
+        for row in range(POWER_GRID_ROWS):
+            for col in range(POWER_GRID_COLUMNS):
+                area_id = row * POWER_GRID_COLUMNS + col + 1
                 if area_id in self.power_areas:
                     area = self.power_areas[area_id]
                     status_symbol = "✓" if area["status"] == PowerStatus.NORMAL else "✗"
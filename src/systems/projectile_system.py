@@ -0,0 +1,367 @@
+######################載入套件######################
+import math
+from array import array
+import pygame
+from config.settings import *
+
+
+######################發射者類型######################
+# 每發子彈記錄發射來源，繪製樣式和統計都依此區分
+PROJECTILE_OWNER_BB_GUN = 0  # 射擊系統的全自動 BB 槍
+PROJECTILE_OWNER_WEAPON = 1  # 槍械管理器的武器（手槍、步槍等）
+
+
+######################子彈引擎######################
+class ProjectileSystem:
+    """
+    子彈引擎 - 以連續陣列存放場景中所有子彈\n
+    \n
+    射擊系統和槍械管理器都只負責「發射」，子彈資料統一放在這裡：\n
+    位置、速度、傷害、剩餘壽命、碰撞半徑、發射者各自是一條連續陣列\n
+    第 i 發子彈就是每條陣列的第 i 格，前 count 格是活躍子彈\n
+    \n
+    主要功能:\n
+    1. update: 一次迴圈積分所有子彈，失效的子彈和最後一發交換後移除\n
+    2. check_collisions: 目標碰撞框每次呼叫只放進格子一次，所有子彈共用\n
+    3. draw: 一次迴圈繪製所有子彈，依發射者選擇樣式\n
+    \n
+    陣列空間不足時倍增，穩定狀態下不會再配置新記憶體\n
+    """
+
+    def __init__(self, capacity=PROJECTILE_INITIAL_CAPACITY, cell_size=PROJECTILE_BROAD_PHASE_CELL_SIZE):
+        """
+        初始化子彈引擎\n
+        \n
+        參數:\n
+        capacity (int): 初始陣列容量\n
+        cell_size (int): 碰撞粗篩格子大小（像素）\n
+        """
+        self.cell_size = cell_size
+        self.capacity = 0
+        self.count = 0
+
+        # 子彈資料欄位（每個欄位一條連續陣列）
+        self._x = array("d")
+        self._y = array("d")
+        self._vx = array("d")
+        self._vy = array("d")
+        self._damage = array("d")
+        self._life = array("d")  # 剩餘存活時間（秒）
+        self._radius = array("i")
+        self._owner = array("b")
+
+        # 子彈超出世界邊界多少像素後移除
+        self.min_x = -50
+        self.min_y = -50
+        self.max_x = TOWN_TOTAL_WIDTH + 50
+        self.max_y = TOWN_TOTAL_HEIGHT + 50
+
+        # 統計資訊
+        self.high_water_mark = 0
+        self.spawned_count = 0
+        self.expired_count = 0
+        self.hit_count = 0
+
+        self._grow(max(1, capacity))
+
+    def __len__(self):
+        """
+        活躍子彈數量\n
+        """
+        return self.count
+
+    def _grow(self, capacity):
+        """
+        擴充所有欄位陣列到指定容量\n
+        \n
+        參數:\n
+        capacity (int): 新容量\n
+        """
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        zeros = [0] * extra
+        for column in (self._x, self._y, self._vx, self._vy, self._damage, self._life,
+                       self._radius, self._owner):
+            column.extend(zeros)
+        self.capacity = capacity
+
+    def spawn(self, start_pos, target_pos, damage, speed, max_life, radius, owner):
+        """
+        發射一發子彈\n
+        \n
+        參數:\n
+        start_pos (tuple): 起始位置 (x, y)\n
+        target_pos (tuple): 目標位置 (x, y)\n
+        damage (float): 傷害值\n
+        speed (float): 飛行速度（像素/秒）\n
+        max_life (float): 最長存活時間（秒）\n
+        radius (int): 碰撞半徑\n
+        owner (int): 發射者類型 PROJECTILE_OWNER_*\n
+        """
+        if self.count >= self.capacity:
+            self._grow(self.capacity * 2)
+
+        # 計算飛行方向
+        dx = target_pos[0] - start_pos[0]
+        dy = target_pos[1] - start_pos[1]
+        distance = math.sqrt(dx * dx + dy * dy)
+
+        i = self.count
+        self._x[i] = start_pos[0]
+        self._y[i] = start_pos[1]
+        if distance > 0:
+            self._vx[i] = dx / distance * speed
+            self._vy[i] = dy / distance * speed
+        else:
+            self._vx[i] = 0
+            self._vy[i] = 0
+        self._damage[i] = damage
+        self._life[i] = max_life
+        self._radius[i] = radius
+        self._owner[i] = owner
+
+        self.count += 1
+        self.spawned_count += 1
+        if self.count > self.high_water_mark:
+            self.high_water_mark = self.count
+
+    def _remove(self, i):
+        """
+        移除第 i 發子彈（把最後一發搬到第 i 格）\n
+        \n
+        參數:\n
+        i (int): 子彈索引\n
+        """
+        last = self.count - 1
+        if i != last:
+            self._x[i] = self._x[last]
+            self._y[i] = self._y[last]
+            self._vx[i] = self._vx[last]
+            self._vy[i] = self._vy[last]
+            self._damage[i] = self._damage[last]
+            self._life[i] = self._life[last]
+            self._radius[i] = self._radius[last]
+            self._owner[i] = self._owner[last]
+        self.count = last
+
+    def update(self, dt):
+        """
+        積分所有子彈的位置和壽命\n
+        \n
+        參數:\n
+        dt (float): 時間間隔\n
+        """
+        xs, ys, vxs, vys, lives = self._x, self._y, self._vx, self._vy, self._life
+        min_x, min_y, max_x, max_y = self.min_x, self.min_y, self.max_x, self.max_y
+
+        i = 0
+        while i < self.count:
+            life = lives[i] - dt
+            x = xs[i] + vxs[i] * dt
+            y = ys[i] + vys[i] * dt
+
+            # 壽命結束或飛出世界地圖邊界
+            if life <= 0 or x < min_x or x > max_x or y < min_y or y > max_y:
+                self._remove(i)
+                self.expired_count += 1
+                continue
+
+            xs[i] = x
+            ys[i] = y
+            lives[i] = life
+            i += 1
+
+    def check_collisions(self, targets, owner=None):
+        """
+        檢查子彈與目標的碰撞\n
+        \n
+        目標碰撞框先放進均勻格子，每發子彈只和所在格子的目標比對\n
+        同一發子彈碰到多個目標時，以 targets 中排在前面的為準\n
+        \n
+        參數:\n
+        targets (list): 目標列表，每個目標應該有 'rect' 屬性或 'get_rect()' 方法，以及可選的 'take_damage' 方法\n
+        owner (int): 只檢查指定發射者的子彈，None 表示全部\n
+        \n
+        回傳:\n
+        list: 命中資訊列表，每項包含 target、damage、position\n
+        """
+        hit_targets = []
+        if self.count == 0 or not targets:
+            return hit_targets
+
+        cell_size = self.cell_size
+        bounds = []  # 目標索引 -> (left, top, right, bottom)
+        grid = {}  # (格子x, 格子y) -> 目標索引列表
+
+        for index, target in enumerate(targets):
+            target_rect = None
+            if hasattr(target, "rect"):
+                target_rect = target.rect
+            elif hasattr(target, "get_rect"):
+                target_rect = target.get_rect()
+
+            if not target_rect:
+                bounds.append(None)
+                continue
+
+            left, top = target_rect.left, target_rect.top
+            right, bottom = target_rect.right, target_rect.bottom
+            bounds.append((left, top, right, bottom))
+
+            for cell_x in range(left // cell_size, (right - 1) // cell_size + 1):
+                for cell_y in range(top // cell_size, (bottom - 1) // cell_size + 1):
+                    grid.setdefault((cell_x, cell_y), []).append(index)
+
+        xs, ys, radii, owners = self._x, self._y, self._radius, self._owner
+
+        i = 0
+        while i < self.count:
+            if owner is not None and owners[i] != owner:
+                i += 1
+                continue
+
+            radius = radii[i]
+            left = int(xs[i]) - radius
+            top = int(ys[i]) - radius
+            right = left + radius * 2
+            bottom = top + radius * 2
+
+            # 找出碰撞框重疊、且在 targets 中最前面的目標
+            hit_index = -1
+            for cell_x in range(left // cell_size, (right - 1) // cell_size + 1):
+                for cell_y in range(top // cell_size, (bottom - 1) // cell_size + 1):
+                    for index in grid.get((cell_x, cell_y), ()):
+                        if hit_index != -1 and index >= hit_index:
+                            continue
+                        t_left, t_top, t_right, t_bottom = bounds[index]
+                        if left < t_right and right > t_left and top < t_bottom and bottom > t_top:
+                            hit_index = index
+
+            if hit_index == -1:
+                i += 1
+                continue
+
+            target = targets[hit_index]
+            damage = self._damage[i]
+            if damage == int(damage):
+                damage = int(damage)
+
+            # 對目標造成傷害
+            if hasattr(target, "take_damage"):
+                target.take_damage(damage)
+
+            hit_targets.append({
+                "target": target,
+                "damage": damage,
+                "position": (xs[i], ys[i]),
+            })
+
+            self._remove(i)
+            self.hit_count += 1
+
+        return hit_targets
+
+    def draw(self, screen, camera_offset=(0, 0), owner=None):
+        """
+        繪製所有子彈\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 繪製目標表面\n
+        camera_offset (tuple): 攝影機偏移量\n
+        owner (int): 只繪製指定發射者的子彈，None 表示全部\n
+        """
+        if self.count == 0:
+            return
+
+        draw_circle = pygame.draw.circle
+        draw_line = pygame.draw.line
+        camera_x, camera_y = camera_offset
+        xs, ys, vxs, vys, owners = self._x, self._y, self._vx, self._vy, self._owner
+
+        for i in range(self.count):
+            bullet_owner = owners[i]
+            if owner is not None and bullet_owner != owner:
+                continue
+
+            screen_x = int(xs[i] - camera_x)
+            screen_y = int(ys[i] - camera_y)
+
+            # 不在螢幕範圍內，不繪製
+            if (screen_x < -10 or screen_x > SCREEN_WIDTH + 10 or
+                screen_y < -10 or screen_y > SCREEN_HEIGHT + 10):
+                continue
+
+            if bullet_owner == PROJECTILE_OWNER_WEAPON:
+                # 武器子彈：小黃點加拖尾
+                draw_circle(screen, (255, 255, 0), (screen_x, screen_y), 3)
+                trail_x = screen_x - vxs[i] * 0.1
+                trail_y = screen_y - vys[i] * 0.1
+                draw_line(screen, (255, 200, 0), (trail_x, trail_y), (screen_x, screen_y), 2)
+            else:
+                # BB 彈：黃色圓點加白色中心點
+                draw_circle(screen, (255, 255, 0), (screen_x, screen_y), 3)
+                draw_circle(screen, (255, 255, 255), (screen_x, screen_y), 1)
+
+    def count_by_owner(self, owner):
+        """
+        計算指定發射者的活躍子彈數量\n
+        \n
+        參數:\n
+        owner (int): 發射者類型\n
+        \n
+        回傳:\n
+        int: 子彈數量\n
+        """
+        owners = self._owner
+        return sum(1 for i in range(self.count) if owners[i] == owner)
+
+    def clear(self, owner=None):
+        """
+        清除子彈\n
+        \n
+        參數:\n
+        owner (int): 只清除指定發射者的子彈，None 表示全部\n
+        """
+        if owner is None:
+            self.count = 0
+            return
+
+        i = 0
+        while i < self.count:
+            if self._owner[i] == owner:
+                self._remove(i)
+            else:
+                i += 1
+
+    def get_statistics(self):
+        """
+        獲取子彈引擎統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "active": self.count,
+            "capacity": self.capacity,
+            "high_water_mark": self.high_water_mark,
+            "spawned": self.spawned_count,
+            "expired": self.expired_count,
+            "hits": self.hit_count,
+        }
+
+
+######################全域子彈引擎######################
+projectile_system = None
+
+def get_projectile_system():
+    """
+    取得全域子彈引擎實例（射擊系統和槍械管理器共用）\n
+    \n
+    回傳:\n
+    ProjectileSystem: 子彈引擎實例\n
+    """
+    global projectile_system
+    if projectile_system is None:
+        projectile_system = ProjectileSystem()
+    return projectile_system
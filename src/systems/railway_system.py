@@ -5,6 +5,8 @@ import math
 from config.settings import *
 from src.utils.helpers import calculate_distance
 from src.utils.font_manager import get_font_manager
+from src.core.game_clock import get_game_clock
+from src.core.render_interpolation import get_render_interpolation
 
 ######################物件類別######################
 class TrainStation:
@@ -130,7 +132,7 @@ class Train:
         self.width = 24
         self.height = 12
         self.color = TRAIN_COLOR
-        self.speed = TRAIN_SPEED / 60  # 轉換為每幀像素數
+        self.speed = TRAIN_SPEED  # 每秒像素數
         
         # 路線相關
         self.route_points = route_points
@@ -139,45 +141,53 @@ class Train:
         
         # 移動狀態
         self.is_moving = True
-        self.wait_time = 0
-        self.max_wait_time = 180  # 在車站停留3秒（60fps）
+        self.wait_time = 0.0  # 已在車站停留的秒數
+        self.max_wait_time = TRAIN_STATION_WAIT_TIME
         
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        get_render_interpolation().record(self)
 
     def update(self, dt):
         """
         更新火車狀態\n
         \n
         參數:\n
-        dt (float): 時間增量\n
+        dt (float): 時間增量（秒）\n
         """
         if not self.route_points:
             return
+
+        # 記住這一步開始前的位置，繪製時內插
+        get_render_interpolation().record(self)
         
         if self.is_moving:
-            self._move_towards_target()
+            self._move_towards_target(dt)
         else:
             # 在車站等待
-            self.wait_time += 1
+            self.wait_time += dt
             if self.wait_time >= self.max_wait_time:
                 self.is_moving = True
-                self.wait_time = 0
+                self.wait_time = 0.0
 
-    def _move_towards_target(self):
+    def _move_towards_target(self, dt):
         """
         朝向目標點移動 - 支持平滑轉彎\n
+        \n
+        參數:\n
+        dt (float): 時間增量（秒）\n
         """
         if self.current_target_index >= len(self.route_points):
             self.current_target_index = 0  # 循環路線
         
         target_x, target_y = self.route_points[self.current_target_index]
+        step_distance = self.speed * dt  # 這一步移動的像素數
         
         # 計算到目標的距離和方向
         dx = target_x - self.x
         dy = target_y - self.y
         distance = math.sqrt(dx*dx + dy*dy)
         
-        if distance <= self.speed * 2:  # 提前準備轉向
+        if distance <= step_distance * 2:  # 提前準備轉向
             # 到達目標點附近，開始轉向下一個目標
             self.current_target_index = (self.current_target_index + 1) % len(self.route_points)
             
@@ -186,8 +196,8 @@ class Train:
                 self.is_moving = False
         else:
             # 計算移動方向
-            move_x = (dx / distance) * self.speed
-            move_y = (dy / distance) * self.speed
+            move_x = (dx / distance) * step_distance
+            move_y = (dy / distance) * step_distance
             
             # 添加轉彎平滑度 - 考慮下一個目標點
             if len(self.route_points) > 1:
@@ -202,8 +212,8 @@ class Train:
                     # 平滑轉彎：混合當前方向和下一個方向
                     blend_factor = max(0, (30 - distance) / 30)  # 距離越近，轉彎影響越大
                     
-                    move_x = move_x * (1 - blend_factor) + (next_dx / (math.sqrt(next_dx*next_dx + next_dy*next_dy) if next_dx*next_dx + next_dy*next_dy > 0 else 1)) * self.speed * blend_factor
-                    move_y = move_y * (1 - blend_factor) + (next_dy / (math.sqrt(next_dx*next_dx + next_dy*next_dy) if next_dx*next_dx + next_dy*next_dy > 0 else 1)) * self.speed * blend_factor
+                    move_x = move_x * (1 - blend_factor) + (next_dx / (math.sqrt(next_dx*next_dx + next_dy*next_dy) if next_dx*next_dx + next_dy*next_dy > 0 else 1)) * step_distance * blend_factor
+                    move_y = move_y * (1 - blend_factor) + (next_dy / (math.sqrt(next_dx*next_dx + next_dy*next_dy) if next_dx*next_dx + next_dy*next_dy > 0 else 1)) * step_distance * blend_factor
             
             # 應用移動
             self.x += move_x
@@ -225,8 +235,9 @@ class Train:
         camera_x (float): 攝影機X偏移\n
         camera_y (float): 攝影機Y偏移\n
         """
-        screen_x = self.x - camera_x
-        screen_y = self.y - camera_y
+        render_x, render_y = get_render_interpolation().get_position(self)
+        screen_x = render_x - camera_x
+        screen_y = render_y - camera_y
         
         # 繪製火車車身
         train_rect = pygame.Rect(screen_x, screen_y, self.width, self.height)
@@ -310,9 +321,9 @@ class RailwaySystem:
         station_count = 0
         
         # 尋找火車站地形（代碼11）
-        for y in range(terrain_system.map_height):
+        for y, row in enumerate(terrain_system.terrain_store.iter_rows()):
             for x in range(terrain_system.map_width):
-                if terrain_system.map_data[y][x] == 11:  # 火車站
+                if row[x] == 11:  # 火車站
                     # 計算火車站位置（2格填滿1個建築）
                     station_x = x * terrain_system.tile_size
                     station_y = y * terrain_system.tile_size
@@ -351,9 +362,9 @@ class RailwaySystem:
         track_count = 0
         
         # 尋找鐵軌地形（代碼10）
-        for y in range(terrain_system.map_height):
+        for y, row in enumerate(terrain_system.terrain_store.iter_rows()):
             for x in range(terrain_system.map_width):
-                if terrain_system.map_data[y][x] == 10:  # 鐵軌
+                if row[x] == 10:  # 鐵軌
                     # 計算鐵軌位置
                     track_x = x * terrain_system.tile_size
                     track_y = y * terrain_system.tile_size
@@ -375,7 +386,7 @@ class RailwaySystem:
                         signal = {
                             'position': (track_x + track_width//2, track_y),
                             'state': 'red' if random.random() < 0.5 else 'green',
-                            'timer': random.randint(180, 360),  # 3-6秒切換
+                            'timer': random.uniform(3.0, 6.0),  # 3-6秒切換
                             'rect': pygame.Rect(track_x + track_width//2 - 5, track_y - 10, 10, 10)
                         }
                         track['traffic_signal'] = signal
@@ -736,7 +747,7 @@ class RailwaySystem:
         更新鐵路系統\n
         \n
         參數:\n
-        dt (float): 時間增量\n
+        dt (float): 時間增量（秒）\n
         """
         # 更新所有火車
         for train in self.trains:
@@ -744,11 +755,11 @@ class RailwaySystem:
         
         # 更新交通號誌
         for signal in self.traffic_signals:
-            signal['timer'] -= 1
+            signal['timer'] -= dt
             if signal['timer'] <= 0:
                 # 切換號誌狀態
                 signal['state'] = 'green' if signal['state'] == 'red' else 'red'
-                signal['timer'] = random.randint(180, 360)  # 重置計時器
+                signal['timer'] = random.uniform(3.0, 6.0)  # 重置計時器（秒）
 
     def can_cross_railway(self, position):
         """
@@ -901,7 +912,7 @@ class RailwaySystem:
                 screen_y = station.y - camera_y
                 
                 # 繪製閃爍的邊框
-                current_time = pygame.time.get_ticks()
+                current_time = get_game_clock().get_ticks()
                 if (current_time // 300) % 2:  # 每0.3秒閃爍一次
                     highlight_rect = pygame.Rect(screen_x - 5, screen_y - 5, 
                                                station.width + 10, station.height + 10)
@@ -987,7 +998,7 @@ class RailwaySystem:
         screen.blit(title_text, title_text_rect)
         
         # 繪製閃爍的"現在發車"指示
-        current_time = pygame.time.get_ticks()
+        current_time = get_game_clock().get_ticks()
         if (current_time // 500) % 2:  # 每0.5秒閃爍一次
             try:
                 font_manager = get_font_manager()
@@ -0,0 +1,324 @@
+######################載入套件######################
+import heapq
+import math
+from config.settings import *
+
+# RoadSegment 的預設速限（km/h），以這個速限行駛時速度等於 VEHICLE_SPEED
+BASE_SPEED_LIMIT = 30
+
+# 節點座標四捨五入到小數第一位後視為同一個節點
+NODE_POSITION_PRECISION = 1
+
+
+######################道路路網圖######################
+class RoadGraph:
+    """
+    道路路網圖 - 以路口和路段交點為節點、路段為加權邊的無向圖\n
+    \n
+    建立時把每條路段在端點、和其他路段的交點處切開，\n
+    相鄰兩個節點之間的一段就是一條邊，權重是以速限行駛的秒數\n
+    \n
+    最短路徑使用 ALT (A*、地標、三角不等式)：\n
+    預先從幾個彼此距離最遠的地標節點各跑一次 Dijkstra，\n
+    查詢時用 |d(地標, 終點) - d(地標, 節點)| 的最大值當作 A* 的下界估計\n
+    \n
+    交通號誌等待時間是隨時間變化的邊權重：離開有號誌的路口前，\n
+    依抵達時間向 TrafficLight 詢問還要等多久才是綠燈\n
+    等待時間不會是負的，所以不含等待的地標下界仍然成立\n
+    """
+
+    def __init__(self, landmark_count=ROAD_GRAPH_LANDMARK_COUNT):
+        """
+        初始化道路路網圖\n
+        \n
+        參數:\n
+        landmark_count (int): ALT 地標數量\n
+        """
+        self.landmark_count = landmark_count
+
+        self.node_positions = []  # 節點 -> (x, y)
+        self.node_intersections = []  # 節點 -> Intersection 或 None
+        self.adjacency = []  # 節點 -> [(相鄰節點, 行駛秒數, 接近方向)]
+        self.edge_count = 0
+        self.segment_nodes = {}  # RoadSegment -> 沿路段排列的節點列表
+        self.spatial_index = None
+
+        # ALT 預處理結果
+        self.landmarks = []
+        self.landmark_distances = []  # 每個地標到所有節點的行駛秒數
+
+        # 統計資訊
+        self.route_queries = 0
+        self.settled_nodes = 0
+
+    ######################建立路網######################
+    def build(self, road_manager):
+        """
+        從道路管理器的路段和路口建立路網圖並做 ALT 預處理\n
+        \n
+        參數:\n
+        road_manager (RoadManager): 道路管理器（需要已建立空間索引）\n
+        """
+        segments = road_manager.road_segments
+        self.spatial_index = road_manager.spatial_index
+        self.node_positions = []
+        self.node_intersections = []
+        self.adjacency = []
+        self.edge_count = 0
+        self.segment_nodes = {}
+        node_lookup = {}
+
+        def node_at(x, y):
+            key = (round(x, NODE_POSITION_PRECISION), round(y, NODE_POSITION_PRECISION))
+            node = node_lookup.get(key)
+            if node is None:
+                node = len(self.node_positions)
+                node_lookup[key] = node
+                self.node_positions.append((x, y))
+                self.node_intersections.append(None)
+                self.adjacency.append([])
+            return node
+
+        # 每條路段上的切點（沿路段的比例 t, x, y）
+        cut_points = [[(0.0,) + tuple(s.start_pos), (1.0,) + tuple(s.end_pos)] for s in segments]
+        for a, b in self.spatial_index.segment_pairs():
+            crossing = _segment_crossing(segments[a].start_pos, segments[a].end_pos,
+                                         segments[b].start_pos, segments[b].end_pos)
+            if crossing is not None:
+                t_a, t_b, x, y = crossing
+                cut_points[a].append((t_a, x, y))
+                cut_points[b].append((t_b, x, y))
+
+        for segment, points in zip(segments, cut_points):
+            points.sort()
+            nodes = []
+            for _, x, y in points:
+                node = node_at(x, y)
+                if not nodes or nodes[-1] != node:
+                    nodes.append(node)
+            self.segment_nodes[segment] = nodes
+
+            # 依速限換算行駛速度
+            speed = VEHICLE_SPEED * getattr(segment, "speed_limit", BASE_SPEED_LIMIT) / BASE_SPEED_LIMIT
+            for u, w in zip(nodes, nodes[1:]):
+                ux, uy = self.node_positions[u]
+                wx, wy = self.node_positions[w]
+                travel_time = math.hypot(wx - ux, wy - uy) / speed
+                self.adjacency[u].append((w, travel_time, _approach_direction(ux, uy, wx, wy)))
+                self.adjacency[w].append((u, travel_time, _approach_direction(wx, wy, ux, uy)))
+                self.edge_count += 1
+
+        # 路口對應到同位置的節點（號誌等待時間從這裡查）
+        for intersection in road_manager.intersections:
+            x, y = intersection.position
+            node = node_lookup.get((round(x, NODE_POSITION_PRECISION), round(y, NODE_POSITION_PRECISION)))
+            if node is not None:
+                self.node_intersections[node] = intersection
+
+        self._select_landmarks()
+
+    def _select_landmarks(self):
+        """
+        以最遠點法挑選地標並計算地標到所有節點的距離\n
+        \n
+        第一個地標是離節點 0 最遠的節點，之後每次挑離已選地標最遠的節點\n
+        """
+        self.landmarks = []
+        self.landmark_distances = []
+        if not self.node_positions:
+            return
+
+        distances = self._static_distances(0)
+        nearest_landmark = [math.inf] * len(self.node_positions)
+        for _ in range(min(self.landmark_count, len(self.node_positions))):
+            # 距離有限的節點中挑最遠的（圖不連通時只在同一區塊中挑）
+            candidates = nearest_landmark if self.landmarks else distances
+            landmark = max(
+                (node for node in range(len(candidates)) if node not in self.landmarks and candidates[node] < math.inf),
+                key=lambda node: candidates[node],
+                default=None,
+            )
+            if landmark is None:
+                break
+
+            landmark_distances = self._static_distances(landmark)
+            self.landmarks.append(landmark)
+            self.landmark_distances.append(landmark_distances)
+            for node, distance in enumerate(landmark_distances):
+                if distance < nearest_landmark[node]:
+                    nearest_landmark[node] = distance
+
+    def _static_distances(self, source):
+        """
+        不含號誌等待的 Dijkstra，回傳 source 到所有節點的行駛秒數\n
+        """
+        distances = [math.inf] * len(self.node_positions)
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        adjacency = self.adjacency
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            for neighbor, travel_time, _ in adjacency[node]:
+                candidate = distance + travel_time
+                if candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+        return distances
+
+    ######################路徑查詢######################
+    def nearest_node(self, position):
+        """
+        找出離位置最近的路段上最近的節點\n
+        \n
+        參數:\n
+        position (tuple): 位置 (x, y)\n
+        \n
+        回傳:\n
+        int: 節點編號，沒有路網時回傳 None\n
+        """
+        if self.spatial_index is None:
+            return None
+        segment, _ = self.spatial_index.nearest_segment(position)
+        nodes = self.segment_nodes.get(segment)
+        if not nodes:
+            return None
+
+        px, py = position
+        positions = self.node_positions
+        return min(nodes, key=lambda node: (positions[node][0] - px) ** 2 + (positions[node][1] - py) ** 2)
+
+    def find_route(self, start_pos, target_pos, departure_time=0.0, use_traffic_lights=True):
+        """
+        規劃從起點到終點沿道路的最快路線\n
+        \n
+        起點和終點先對應到最近路段上最近的節點，再用 ALT 搜尋\n
+        \n
+        參數:\n
+        start_pos (tuple): 起點 (x, y)\n
+        target_pos (tuple): 終點 (x, y)\n
+        departure_time (float): 幾秒後出發（用來推算號誌狀態）\n
+        use_traffic_lights (bool): 是否把號誌等待時間算進成本\n
+        \n
+        回傳:\n
+        tuple: (路徑點列表, 預估秒數)，路徑最後一點是 target_pos；找不到路線時回傳 None\n
+        """
+        start = self.nearest_node(start_pos)
+        goal = self.nearest_node(target_pos)
+        if start is None or goal is None:
+            return None
+
+        self.route_queries += 1
+        target_landmarks = [distances[goal] for distances in self.landmark_distances]
+        landmark_distances = self.landmark_distances
+
+        def lower_bound(node):
+            bound = 0.0
+            for index, to_goal in enumerate(target_landmarks):
+                from_node = landmark_distances[index][node]
+                if to_goal < math.inf and from_node < math.inf:
+                    difference = abs(to_goal - from_node)
+                    if difference > bound:
+                        bound = difference
+            return bound
+
+        arrival = {start: 0.0}
+        parent = {start: None}
+        closed = set()
+        heap = [(lower_bound(start), 0.0, start)]
+        adjacency = self.adjacency
+        intersections = self.node_intersections
+
+        while heap:
+            _, elapsed, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            if node == goal:
+                break
+
+            intersection = intersections[node]
+            light = None
+            if use_traffic_lights and intersection is not None and intersection.has_traffic_light:
+                light = intersection.traffic_light
+
+            for neighbor, travel_time, direction in adjacency[node]:
+                if neighbor in closed:
+                    continue
+                wait = light.get_wait_time(direction, departure_time + elapsed) if light else 0.0
+                candidate = elapsed + wait + travel_time
+                if candidate < arrival.get(neighbor, math.inf):
+                    arrival[neighbor] = candidate
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (candidate + lower_bound(neighbor), candidate, neighbor))
+
+        self.settled_nodes += len(closed)
+        if goal not in closed:
+            return None
+
+        nodes = []
+        node = goal
+        while node is not None:
+            nodes.append(node)
+            node = parent[node]
+        nodes.reverse()
+
+        path = [self.node_positions[node] for node in nodes]
+        path.append(target_pos)
+        return path, arrival[goal]
+
+    def get_statistics(self):
+        """
+        獲取路網統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "nodes": len(self.node_positions),
+            "edges": self.edge_count,
+            "signalized_nodes": sum(1 for intersection in self.node_intersections if intersection is not None),
+            "landmarks": len(self.landmarks),
+            "route_queries": self.route_queries,
+            "avg_settled_nodes": self.settled_nodes / self.route_queries if self.route_queries else 0,
+        }
+
+
+def _segment_crossing(a1, a2, b1, b2):
+    """
+    計算兩條線段的交點（含端點相接）\n
+    \n
+    回傳:\n
+    tuple: (沿 a 的比例, 沿 b 的比例, x, y)，不相交或平行時回傳 None\n
+    """
+    adx, ady = a2[0] - a1[0], a2[1] - a1[1]
+    bdx, bdy = b2[0] - b1[0], b2[1] - b1[1]
+    denominator = adx * bdy - ady * bdx
+    if denominator == 0:
+        return None
+
+    ox, oy = b1[0] - a1[0], b1[1] - a1[1]
+    t_a = (ox * bdy - oy * bdx) / denominator
+    t_b = (ox * ady - oy * adx) / denominator
+    epsilon = 1e-9
+    if not (-epsilon <= t_a <= 1 + epsilon and -epsilon <= t_b <= 1 + epsilon):
+        return None
+
+    t_a = min(1.0, max(0.0, t_a))
+    t_b = min(1.0, max(0.0, t_b))
+    return t_a, t_b, a1[0] + adx * t_a, a1[1] + ady * t_a
+
+
+def _approach_direction(from_x, from_y, to_x, to_y):
+    """
+    從 from 節點出發時，對 from 路口而言載具的接近方向\n
+    \n
+    載具往 to 前進，代表它是從反方向駛入 from 路口，\n
+    判斷方式和 RoadManager._get_approach_direction 相同\n
+    """
+    dx = from_x - to_x
+    dy = from_y - to_y
+    if abs(dx) > abs(dy):
+        return "west" if dx < 0 else "east"
+    return "north" if dy < 0 else "south"
@@ -3,6 +3,7 @@ import pygame
 import math
 import random
 from config.settings import *
+from src.systems.road_graph import RoadGraph
 
 
 ######################路段類別######################
@@ -269,13 +270,15 @@ class Intersection:
     處理載具和行人的通行優先權\n
     """
 
-    def __init__(self, position, intersection_type="cross"):
+    def __init__(self, position, intersection_type="cross", clock=None, phase_offset=0.0):
         """
         初始化路口\n
         \n
         參數:\n
         position (tuple): 路口中心位置 (x, y)\n
         intersection_type (str): 路口類型 ("cross", "t_junction", "roundabout")\n
+        clock (SignalClock): 共用號誌時鐘\n
+        phase_offset (float): 號誌相位偏移（秒）\n
         """
         self.position = position
         self.intersection_type = intersection_type
@@ -283,7 +286,7 @@ class Intersection:
 
         # 交通號誌
         self.has_traffic_light = True
-        self.traffic_light = TrafficLight(position)
+        self.traffic_light = TrafficLight(position, clock, phase_offset)
 
         # 路口尺寸
         self.size = 80
@@ -332,7 +335,7 @@ class Intersection:
 
     def update(self, dt):
         """
-        更新路口狀態\n
+        更新路口狀態（號誌使用共用時鐘時不需要逐一更新）\n
         \n
         參數:\n
         dt (float): 時間間隔\n
@@ -408,127 +411,198 @@ class Intersection:
             )
 
 
+######################號誌時鐘######################
+class SignalClock:
+    """
+    號誌時鐘 - 所有交通號誌共用的遊戲時間\n
+    \n
+    號誌本身不保存計時器，狀態完全由「時鐘時間 + 相位偏移」決定，\n
+    每幀只需要推進這一個時鐘\n
+    """
+
+    def __init__(self, time=0.0):
+        """
+        初始化號誌時鐘\n
+        \n
+        參數:\n
+        time (float): 起始時間（秒）\n
+        """
+        self.time = time
+
+    def advance(self, dt):
+        """
+        推進時鐘\n
+        \n
+        參數:\n
+        dt (float): 時間間隔\n
+        """
+        self.time += dt
+
+
 ######################交通號誌類別######################
 class TrafficLight:
     """
     交通號誌類別 - 控制路口通行\n
     \n
-    管理紅綠燈的狀態轉換\n
-    協調車輛和行人的通行時間\n
-    提供視覺指示和邏輯判斷\n
+    號誌狀態是共用時鐘的純函數：循環位置 = (時鐘時間 + 相位偏移) % 週期\n
+    循環順序：南北綠 -> 南北黃 -> 東西綠 -> 東西黃\n
+    一個方向黃燈結束時另一個方向立刻轉綠，車輛綠燈或黃燈時同方向行人紅燈\n
+    任何時刻的號誌狀態都可以直接算出，不需要逐幀更新\n
     """
 
-    def __init__(self, position):
+    # 各階段在循環中的順序
+    PHASES = ("north_south_green", "north_south_yellow", "east_west_green", "east_west_yellow")
+
+    def __init__(self, position, clock=None, phase_offset=0.0):
         """
         初始化交通號誌\n
         \n
         參數:\n
         position (tuple): 號誌位置 (x, y)\n
+        clock (SignalClock): 共用號誌時鐘，None 表示使用自己的時鐘（由 update 推進）\n
+        phase_offset (float): 相位偏移（秒），用來協調相鄰路口形成綠波\n
         """
         self.position = position
 
-        # 號誌狀態 - 包含四個方向的狀態
-        self.states = {
-            "north_south": "green",  # 南北向狀態
-            "east_west": "red",  # 東西向狀態
-        }
-
-        # 行人穿越燈
-        self.pedestrian_states = {
-            "north_south": "red",
-            "east_west": "green",
-        }
-
         # 時間控制
         self.green_duration = 30.0  # 綠燈時間(秒)
         self.yellow_duration = 5.0  # 黃燈時間(秒)
-        self.red_duration = 35.0  # 紅燈時間(秒)
+        self.red_duration = 35.0  # 紅燈時間(秒)，等於另一方向的綠燈加黃燈
 
-        self.current_timer = 0.0
-        self.current_phase = "north_south_green"  # 當前階段
+        self.owns_clock = clock is None
+        self.clock = clock if clock is not None else SignalClock()
+        self.phase_offset = phase_offset
 
         # 視覺屬性
         self.light_radius = 8
         self.pole_width = 4
         self.pole_height = 40
 
-    def update(self, dt):
+    @property
+    def cycle_duration(self):
         """
-        更新交通號誌狀態\n
+        完整循環的秒數\n
+        """
+        return 2 * (self.green_duration + self.yellow_duration)
+
+    def get_cycle_position(self, time_offset=0.0):
+        """
+        取得 time_offset 秒後在循環中的位置\n
         \n
         參數:\n
-        dt (float): 時間間隔\n
+        time_offset (float): 從現在起的秒數\n
+        \n
+        回傳:\n
+        float: 循環位置（秒），0 是南北綠燈開始\n
         """
-        self.current_timer += dt
+        return (self.clock.time + self.phase_offset + time_offset) % self.cycle_duration
 
-        # 狀態轉換邏輯
-        if self.current_phase == "north_south_green":
-            if self.current_timer >= self.green_duration:
-                self._change_to_yellow("north_south")
+    def _phase_at(self, position):
+        """
+        依循環位置算出階段索引和在該階段經過的秒數\n
+        """
+        green = self.green_duration
+        yellow = self.yellow_duration
+        half = green + yellow
+        axis = 0 if position < half else 2
+        within = position - half if axis else position
+        if within < green:
+            return axis, within
+        return axis + 1, within - green
 
-        elif self.current_phase == "north_south_yellow":
-            if self.current_timer >= self.yellow_duration:
-                self._change_to_red("north_south")
-                self._change_to_green("east_west")
+    @property
+    def current_phase(self):
+        """
+        目前階段名稱\n
+        """
+        return self.PHASES[self._phase_at(self.get_cycle_position())[0]]
 
-        elif self.current_phase == "east_west_green":
-            if self.current_timer >= self.green_duration:
-                self._change_to_yellow("east_west")
+    @property
+    def current_timer(self):
+        """
+        目前階段已經經過的秒數\n
+        """
+        return self._phase_at(self.get_cycle_position())[1]
 
-        elif self.current_phase == "east_west_yellow":
-            if self.current_timer >= self.yellow_duration:
-                self._change_to_red("east_west")
-                self._change_to_green("north_south")
+    @property
+    def states(self):
+        """
+        各方向車輛號誌狀態\n
+        """
+        phase, _ = self._phase_at(self.get_cycle_position())
+        north_south = ("green", "yellow", "red", "red")[phase]
+        east_west = ("red", "red", "green", "yellow")[phase]
+        return {"north_south": north_south, "east_west": east_west}
 
-    def _change_to_green(self, direction):
+    @property
+    def pedestrian_states(self):
         """
-        切換到綠燈\n
-        \n
-        參數:\n
-        direction (str): 方向 ("north_south" 或 "east_west")\n
+        各方向行人號誌狀態（同方向車輛綠燈或黃燈時行人紅燈）\n
         """
-        self.states[direction] = "green"
-        self.pedestrian_states[direction] = "red"  # 車輛綠燈時行人紅燈
-        self.current_phase = f"{direction}_green"
-        self.current_timer = 0.0
+        phase, _ = self._phase_at(self.get_cycle_position())
+        north_south_moving = phase < 2
+        return {
+            "north_south": "red" if north_south_moving else "green",
+            "east_west": "green" if north_south_moving else "red",
+        }
 
-    def _change_to_yellow(self, direction):
+    def update(self, dt):
         """
-        切換到黃燈\n
+        推進號誌時間（只有使用自己時鐘的號誌需要；共用時鐘由道路管理器推進）\n
         \n
         參數:\n
-        direction (str): 方向\n
+        dt (float): 時間間隔\n
         """
-        self.states[direction] = "yellow"
-        self.current_phase = f"{direction}_yellow"
-        self.current_timer = 0.0
+        if self.owns_clock:
+            self.clock.advance(dt)
 
-    def _change_to_red(self, direction):
+    def _green_start(self, approach_direction):
         """
-        切換到紅燈\n
-        \n
-        參數:\n
-        direction (str): 方向\n
+        接近方向的綠燈在循環中的起點，無法判斷方向時回傳 None\n
         """
-        self.states[direction] = "red"
-        self.pedestrian_states[direction] = "green"  # 車輛紅燈時行人綠燈
+        if approach_direction in ["north", "south"]:
+            return 0.0
+        elif approach_direction in ["east", "west"]:
+            return self.green_duration + self.yellow_duration
+        return None
 
-    def can_vehicle_pass(self, approach_direction):
+    def can_vehicle_pass(self, approach_direction, time_offset=0.0):
         """
         檢查載具是否可以通過\n
         \n
         參數:\n
         approach_direction (str): 接近方向\n
+        time_offset (float): 從現在起幾秒後抵達\n
         \n
         回傳:\n
         bool: 是否可以通過\n
         """
-        if approach_direction in ["north", "south"]:
-            return self.states["north_south"] == "green"
-        elif approach_direction in ["east", "west"]:
-            return self.states["east_west"] == "green"
+        green_start = self._green_start(approach_direction)
+        if green_start is None:
+            return False
+        since_green = (self.get_cycle_position(time_offset) - green_start) % self.cycle_duration
+        return since_green < self.green_duration
 
-        return False
+    def get_wait_time(self, approach_direction, time_offset=0.0):
+        """
+        預測載具在 time_offset 秒後抵達時需要等待多久才是綠燈\n
+        \n
+        參數:\n
+        approach_direction (str): 接近方向 ("north", "south", "east", "west")\n
+        time_offset (float): 從現在起多少秒後抵達\n
+        \n
+        回傳:\n
+        float: 需要等待的秒數，綠燈時為 0\n
+        """
+        green_start = self._green_start(approach_direction)
+        if green_start is None:
+            return 0.0
+
+        cycle = self.cycle_duration
+        since_green = (self.get_cycle_position(time_offset) - green_start) % cycle
+        if since_green < self.green_duration:
+            return 0.0
+        return cycle - since_green
 
     def can_pedestrian_cross(self, crossing_direction):
         """
@@ -598,6 +672,243 @@ class TrafficLight:
             )
 
 
+######################道路空間索引######################
+class RoadSpatialIndex:
+    """
+    道路空間索引 - 把路段和路口放進均勻格子，查詢只檢查附近格子\n
+    \n
+    路段登記在它實際經過的每一個格子（不是整個外框），\n
+    最近路段查詢從查詢點所在格子一圈一圈往外找，\n
+    找到的距離小於下一圈的最短可能距離時就停止\n
+    結果和逐一比對所有路段相同（距離相同時取列表中較前面的）\n
+    """
+
+    def __init__(self, cell_size=ROAD_SPATIAL_CELL_SIZE):
+        """
+        初始化道路空間索引\n
+        \n
+        參數:\n
+        cell_size (int): 格子大小（像素）\n
+        """
+        self.cell_size = cell_size
+        self.segments = []
+        self.intersections = []
+        self._segment_cells = {}  # (格子x, 格子y) -> 路段索引列表
+        self._intersection_cells = {}  # (格子x, 格子y) -> 路口索引列表
+        self._bounds = None  # 有路段的格子範圍 (min_cx, min_cy, max_cx, max_cy)
+
+        # 統計資訊
+        self.nearest_queries = 0
+        self.segment_tests = 0
+
+    def build(self, segments, intersections):
+        """
+        重新建立索引\n
+        \n
+        參數:\n
+        segments (list): RoadSegment 列表\n
+        intersections (list): Intersection 列表\n
+        """
+        self.segments = list(segments)
+        self.intersections = list(intersections)
+        self._segment_cells = {}
+        self._intersection_cells = {}
+        self._bounds = None
+
+        for index, segment in enumerate(self.segments):
+            for cell in self._cells_on_segment(segment.start_pos, segment.end_pos):
+                self._segment_cells.setdefault(cell, []).append(index)
+
+        if self._segment_cells:
+            cell_xs = [cell[0] for cell in self._segment_cells]
+            cell_ys = [cell[1] for cell in self._segment_cells]
+            self._bounds = (min(cell_xs), min(cell_ys), max(cell_xs), max(cell_ys))
+
+        cell_size = self.cell_size
+        for index, intersection in enumerate(self.intersections):
+            ix, iy = intersection.position
+            cell = (int(ix // cell_size), int(iy // cell_size))
+            self._intersection_cells.setdefault(cell, []).append(index)
+
+    def _cells_on_segment(self, start_pos, end_pos):
+        """
+        列出線段經過的所有格子\n
+        \n
+        逐列格子把線段裁切到該列的 Y 範圍，再換算出涵蓋的格子欄\n
+        """
+        cell_size = self.cell_size
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+        if y1 > y2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+
+        cells = []
+        first_row = int(y1 // cell_size)
+        last_row = int(y2 // cell_size)
+        for cell_y in range(first_row, last_row + 1):
+            if y2 == y1:
+                row_x1, row_x2 = x1, x2
+            else:
+                # 線段在這一列格子中的 Y 範圍
+                top = max(y1, cell_y * cell_size)
+                bottom = min(y2, (cell_y + 1) * cell_size)
+                row_x1 = x1 + (x2 - x1) * (top - y1) / (y2 - y1)
+                row_x2 = x1 + (x2 - x1) * (bottom - y1) / (y2 - y1)
+            if row_x1 > row_x2:
+                row_x1, row_x2 = row_x2, row_x1
+            for cell_x in range(int(row_x1 // cell_size), int(row_x2 // cell_size) + 1):
+                cells.append((cell_x, cell_y))
+        return cells
+
+    def nearest_segment(self, position):
+        """
+        找出離指定位置最近的路段\n
+        \n
+        參數:\n
+        position (tuple): 位置 (x, y)\n
+        \n
+        回傳:\n
+        tuple: (RoadSegment, 距離)，沒有路段時回傳 (None, inf)\n
+        """
+        self.nearest_queries += 1
+        if self._bounds is None:
+            return None, float("inf")
+
+        px, py = position
+        cell_size = self.cell_size
+        center_x = int(px // cell_size)
+        center_y = int(py // cell_size)
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+
+        # 需要搜尋的最大圈數：涵蓋所有有路段的格子
+        max_ring = max(
+            abs(center_x - min_cx), abs(center_x - max_cx),
+            abs(center_y - min_cy), abs(center_y - max_cy),
+        )
+
+        segments = self.segments
+        segment_cells = self._segment_cells
+        tested = set()
+        best_index = -1
+        best_distance_sq = float("inf")
+
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(center_x, center_y, ring):
+                for index in segment_cells.get(cell, ()):
+                    if index in tested:
+                        continue
+                    tested.add(index)
+                    segment = segments[index]
+                    distance_sq = _point_to_segment_distance_sq(px, py, segment.start_pos, segment.end_pos)
+                    if distance_sq < best_distance_sq or (distance_sq == best_distance_sq and index < best_index):
+                        best_distance_sq = distance_sq
+                        best_index = index
+
+            # 下一圈以外的路段距離至少是 ring 個格子寬
+            reach = ring * cell_size
+            if best_index != -1 and best_distance_sq < reach * reach:
+                break
+
+        self.segment_tests += len(tested)
+        if best_index == -1:
+            return None, float("inf")
+        return segments[best_index], math.sqrt(best_distance_sq)
+
+    def _ring_cells(self, center_x, center_y, ring):
+        """
+        列出以中心格子為準、距離剛好 ring 圈的格子（只含有路段的範圍）\n
+        """
+        if ring == 0:
+            return [(center_x, center_y)]
+
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        left, right = center_x - ring, center_x + ring
+        top, bottom = center_y - ring, center_y + ring
+        cells = []
+        for cell_x in range(max(left, min_cx), min(right, max_cx) + 1):
+            if min_cy <= top:
+                cells.append((cell_x, top))
+            if bottom <= max_cy:
+                cells.append((cell_x, bottom))
+        for cell_y in range(max(top + 1, min_cy), min(bottom - 1, max_cy) + 1):
+            if min_cx <= left:
+                cells.append((left, cell_y))
+            if right <= max_cx:
+                cells.append((right, cell_y))
+        return cells
+
+    def intersections_near(self, position, radius):
+        """
+        找出半徑內的路口（依路口列表原本的順序）\n
+        \n
+        參數:\n
+        position (tuple): 位置 (x, y)\n
+        radius (float): 搜索半徑\n
+        \n
+        回傳:\n
+        list: 路口列表\n
+        """
+        px, py = position
+        cell_size = self.cell_size
+        radius_sq = radius * radius
+        found = []
+        for cell_x in range(int((px - radius) // cell_size), int((px + radius) // cell_size) + 1):
+            for cell_y in range(int((py - radius) // cell_size), int((py + radius) // cell_size) + 1):
+                for index in self._intersection_cells.get((cell_x, cell_y), ()):
+                    ix, iy = self.intersections[index].position
+                    if (px - ix) ** 2 + (py - iy) ** 2 <= radius_sq:
+                        found.append(index)
+        found.sort()
+        return [self.intersections[index] for index in found]
+
+    def segment_pairs(self):
+        """
+        列出至少共用一個格子的路段索引組合（可能相交的路段）\n
+        \n
+        回傳:\n
+        set: (較小索引, 較大索引) 組合\n
+        """
+        pairs = set()
+        for indices in self._segment_cells.values():
+            for i in range(len(indices)):
+                for j in range(i + 1, len(indices)):
+                    a, b = indices[i], indices[j]
+                    pairs.add((a, b) if a < b else (b, a))
+        return pairs
+
+    def get_statistics(self):
+        """
+        獲取索引統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "segments": len(self.segments),
+            "intersections": len(self.intersections),
+            "segment_cells": len(self._segment_cells),
+            "nearest_queries": self.nearest_queries,
+            "avg_segment_tests": self.segment_tests / self.nearest_queries if self.nearest_queries else 0,
+        }
+
+
+def _point_to_segment_distance_sq(px, py, line_start, line_end):
+    """
+    點到線段最短距離的平方\n
+    """
+    x1, y1 = line_start
+    x2, y2 = line_end
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return (px - x1) ** 2 + (py - y1) ** 2
+    t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / length_sq))
+    proj_x = x1 + t * dx
+    proj_y = y1 + t * dy
+    return (px - proj_x) ** 2 + (py - proj_y) ** 2
+
+
 ######################道路管理器######################
 class RoadManager:
     """
@@ -615,6 +926,9 @@ class RoadManager:
         self.road_segments = []
         self.intersections = []
         self.road_network = {}  # 道路網絡圖
+        self.spatial_index = RoadSpatialIndex()  # 路段和路口的格子索引
+        self.road_graph = RoadGraph()  # 路口和路段組成的路網圖
+        self.signal_clock = SignalClock()  # 所有路口號誌共用的時鐘
 
         # 道路生成設定
         self.grid_size = 200  # 道路網格大小
@@ -645,6 +959,9 @@ class RoadManager:
         # 創建路口
         self._create_intersections(town_bounds)
 
+        # 建立路段和路口的空間索引和路網圖
+        self.rebuild_spatial_index()
+
         # print(
         #     f"道路網絡創建完成: {len(self.road_segments)} 段道路, {len(self.intersections)} 個路口"
         # )  # 暫時關閉
@@ -761,7 +1078,9 @@ class RoadManager:
                 x = tx + col * (tw / cols)
                 y = ty + row * (th / rows)
 
-                intersection = Intersection((x, y), "cross")
+                intersection = Intersection(
+                    (x, y), "cross", self.signal_clock, self._get_green_wave_offset(x, tx)
+                )
 
                 # 為主要路口添加交通號誌
                 if row % 2 == 0 or col % 2 == 0:
@@ -771,16 +1090,50 @@ class RoadManager:
 
                 self.intersections.append(intersection)
 
+    def _get_green_wave_offset(self, x, town_left):
+        """
+        計算路口號誌的相位偏移，讓東西向主幹道形成往東的綠波\n
+        \n
+        距離西側邊界 d 像素的路口，東西向綠燈比西側晚 d / 載具速度 秒開始，\n
+        以載具速度往東行駛的車輛會一路遇到綠燈\n
+        \n
+        參數:\n
+        x (float): 路口 X 座標\n
+        town_left (float): 小鎮西側邊界\n
+        \n
+        回傳:\n
+        float: 相位偏移（秒）\n
+        """
+        if not ROAD_GREEN_WAVE_ENABLED:
+            return 0.0
+        return -(x - town_left) / VEHICLE_SPEED
+
     def update(self, dt):
         """
         更新道路系統\n
         \n
+        號誌狀態由共用時鐘推算，每幀只推進時鐘，不逐一更新路口\n
+        \n
         參數:\n
         dt (float): 時間間隔\n
         """
-        # 更新所有路口的交通號誌
-        for intersection in self.intersections:
-            intersection.update(dt)
+        self.signal_clock.advance(dt)
+
+    def rebuild_spatial_index(self):
+        """
+        依目前的路段和路口重新建立空間索引和路網圖\n
+        """
+        self.spatial_index.build(self.road_segments, self.intersections)
+        self.road_graph.build(self)
+
+    def _ensure_spatial_index(self):
+        """
+        路段或路口列表被直接修改過時重新建立索引\n
+        """
+        index = self.spatial_index
+        if (len(index.segments) != len(self.road_segments) or
+                len(index.intersections) != len(self.intersections)):
+            self.rebuild_spatial_index()
 
     def get_nearest_road(self, position):
         """
@@ -795,20 +1148,8 @@ class RoadManager:
         if not self.road_segments:
             return None
 
-        px, py = position
-        nearest_road = None
-        min_distance = float("inf")
-
-        for road in self.road_segments:
-            # 計算點到線段的距離
-            distance = self._point_to_line_distance(
-                position, road.start_pos, road.end_pos
-            )
-
-            if distance < min_distance:
-                min_distance = distance
-                nearest_road = road
-
+        self._ensure_spatial_index()
+        nearest_road, _ = self.spatial_index.nearest_segment(position)
         return nearest_road
 
     def _point_to_line_distance(self, point, line_start, line_end):
@@ -846,6 +1187,28 @@ class RoadManager:
         # 返回距離
         return math.sqrt((px - proj_x) ** 2 + (py - proj_y) ** 2)
 
+    def find_route(self, start_pos, target_pos, departure_time=0.0, use_traffic_lights=True):
+        """
+        沿道路網規劃最快路線\n
+        \n
+        參數:\n
+        start_pos (tuple): 起點\n
+        target_pos (tuple): 終點\n
+        departure_time (float): 幾秒後出發\n
+        use_traffic_lights (bool): 是否計入紅綠燈等待時間\n
+        \n
+        回傳:\n
+        list: 路徑點列表（最後一點是終點），找不到路線時回傳 None\n
+        """
+        if not self.road_segments:
+            return None
+
+        self._ensure_spatial_index()
+        route = self.road_graph.find_route(start_pos, target_pos, departure_time, use_traffic_lights)
+        if route is None:
+            return None
+        return route[0]
+
     def get_intersections_near(self, position, radius=100):
         """
         獲取附近的路口\n
@@ -857,17 +1220,8 @@ class RoadManager:
         回傳:\n
         list: 附近的路口列表\n
         """
-        px, py = position
-        nearby_intersections = []
-
-        for intersection in self.intersections:
-            ix, iy = intersection.position
-            distance = math.sqrt((px - ix) ** 2 + (py - iy) ** 2)
-
-            if distance <= radius:
-                nearby_intersections.append(intersection)
-
-        return nearby_intersections
+        self._ensure_spatial_index()
+        return self.spatial_index.intersections_near(position, radius)
 
     def can_vehicle_move_to(self, vehicle, target_position):
         """
@@ -1,143 +1,12 @@
 ######################載入套件######################
 import pygame
 import math
-import time
+from src.systems.projectile_system import get_projectile_system, PROJECTILE_OWNER_BB_GUN
 from config.settings import *
+from src.core.game_clock import get_game_clock
+from src.core.input_session import get_input_source
 
 
-######################子彈類別######################
-class Bullet:
-    """
-    子彈類別 - 處理子彈的飛行和碰撞\n
-    \n
-    管理子彈從發射到命中或消失的整個生命週期\n
-    包含飛行軌跡、碰撞檢測和視覺效果\n
-    """
-
-    def __init__(self, start_pos, target_pos, damage=25, speed=300):
-        """
-        初始化子彈\n
-        \n
-        參數:\n
-        start_pos (tuple): 起始位置 (x, y)\n
-        target_pos (tuple): 目標位置 (x, y)\n
-        damage (int): 傷害值\n
-        speed (float): 飛行速度（像素/秒）- 調慢以便玩家觀察\n
-        """
-        self.x, self.y = start_pos
-        self.damage = damage
-        self.speed = speed
-        self.is_active = True
-
-        # 計算飛行方向
-        dx = target_pos[0] - start_pos[0]
-        dy = target_pos[1] - start_pos[1]
-        distance = math.sqrt(dx**2 + dy**2)
-
-        if distance > 0:
-            self.velocity_x = (dx / distance) * speed
-            self.velocity_y = (dy / distance) * speed
-        else:
-            self.velocity_x = 0
-            self.velocity_y = 0
-
-        # 子彈生命週期
-        self.life_time = 0
-        self.max_life_time = 3.0  # 最大存在時間 (秒)
-
-        # 視覺效果（BB槍專用增強特效）
-        self.radius = 6  # 增大子彈半徑讓子彈更明顯
-        self.color = (255, 255, 100)  # 亮黃色子彈
-        self.trail_positions = []   # 拖尾軌跡
-        
-        # BB槍特效屬性
-        self.glow_intensity = 1.0  # 光暈強度
-        self.sparkle_timer = 0  # 閃爍計時器
-
-    def update(self, dt):
-        """
-        更新子彈位置\n
-        \n
-        參數:\n
-        dt (float): 時間間隔\n
-        """
-        if not self.is_active:
-            return
-
-        # 記錄軌跡位置（增加拖尾長度讓子彈更明顯）
-        self.trail_positions.append((self.x, self.y))
-        if len(self.trail_positions) > 12:  # 更長的拖尾
-            self.trail_positions.pop(0)
-
-        # 更新位置
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-
-        # 更新生命時間
-        self.life_time += dt
-        
-        # 更新特效
-        self.sparkle_timer += dt
-        
-        # 光暈強度隨時間變化（閃爍效果）
-        self.glow_intensity = 0.8 + 0.4 * math.sin(self.sparkle_timer * 15)
-
-        # 檢查生命週期
-        if self.life_time >= self.max_life_time:
-            self.is_active = False
-
-        # 檢查是否飛出世界地圖邊界（而不是螢幕邊界）
-        if (self.x < -50 or self.x > TOWN_TOTAL_WIDTH + 50 or 
-            self.y < -50 or self.y > TOWN_TOTAL_HEIGHT + 50):
-            self.is_active = False
-
-    def check_collision(self, target_rect):
-        """
-        檢查與目標的碰撞\n
-        \n
-        參數:\n
-        target_rect (pygame.Rect): 目標碰撞框\n
-        \n
-        回傳:\n
-        bool: 是否碰撞\n
-        """
-        if not self.is_active:
-            return False
-
-        bullet_rect = pygame.Rect(int(self.x) - self.radius, int(self.y) - self.radius, 
-                                 self.radius * 2, self.radius * 2)
-
-        if bullet_rect.colliderect(target_rect):
-            self.is_active = False
-            return True
-
-        return False
-
-    def draw(self, screen, camera_offset=(0, 0)):
-        """
-        繪製子彈（簡化版）\n
-        \n
-        參數:\n
-        screen (pygame.Surface): 繪製目標表面\n
-        camera_offset (tuple): 攝影機偏移量\n
-        """
-        if not self.is_active:
-            return
-
-        # 計算螢幕位置
-        screen_x = int(self.x - camera_offset[0])
-        screen_y = int(self.y - camera_offset[1])
-        
-        # 檢查子彈是否在螢幕範圍內
-        if (screen_x < -10 or screen_x > SCREEN_WIDTH + 10 or 
-            screen_y < -10 or screen_y > SCREEN_HEIGHT + 10):
-            return  # 不在螢幕範圍內，不繪製
-
-        # 簡化子彈繪製 - 只繪製核心圓點
-        pygame.draw.circle(screen, (255, 255, 0), (screen_x, screen_y), 3)  # 黃色圓點
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), 1)  # 白色中心點
-        
-
 ######################射擊系統######################
 class ShootingSystem:
     """
@@ -145,13 +14,22 @@ class ShootingSystem:
     \n
     負責處理射擊輸入、子彈生成、飛行軌跡和碰撞檢測\n
     整合武器系統，提供完整的射擊遊戲體驗\n
+    子彈資料放在與槍械管理器共用的子彈引擎中\n
     """
 
-    def __init__(self):
+    # BB 彈參數
+    BULLET_SPEED = 300  # 飛行速度（像素/秒）- 調慢以便玩家觀察
+    BULLET_MAX_LIFE = 3.0  # 最大存在時間（秒）
+    BULLET_RADIUS = 6  # 碰撞半徑
+
+    def __init__(self, projectile_system=None):
         """
         初始化射擊系統\n
+        \n
+        參數:\n
+        projectile_system (ProjectileSystem): 子彈引擎，None 表示使用全域共用引擎\n
         """
-        self.bullets = []  # 活躍的子彈列表
+        self.projectiles = projectile_system or get_projectile_system()
         self.last_shot_time = 0  # 上次射擊時間
         
         # 全自動射擊設定 - BB槍每秒10發
@@ -178,7 +56,7 @@ class ShootingSystem:
         回傳:\n
         bool: 是否可以射擊\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
         
         # BB槍永遠可以射擊（假設有無限彈藥）
         # 只檢查射速冷卻時間
@@ -206,14 +84,14 @@ class ShootingSystem:
         
         # 創建子彈，使用玩家當前武器的傷害值
         weapon_damage = player.get_weapon_damage()
-        bullet = Bullet(start_pos, target_pos, damage=weapon_damage)
-        self.bullets.append(bullet)
+        self.projectiles.spawn(start_pos, target_pos, weapon_damage, self.BULLET_SPEED,
+                               self.BULLET_MAX_LIFE, self.BULLET_RADIUS, PROJECTILE_OWNER_BB_GUN)
         
         # 播放BB槍射擊音效
         self.sound_manager.play_shot_sound("bb_gun")
         
         # 更新射擊時間和統計
-        self.last_shot_time = time.time()
+        self.last_shot_time = get_game_clock().time()
         self.shots_fired += 1
         
         # 減少射擊調試輸出頻率：每50發才輸出一次
@@ -272,25 +150,16 @@ class ShootingSystem:
 
     def update(self, dt):
         """
-        更新射擊系統（包含全自動射擊邏輯）\n
+        更新射擊系統（推進共用子彈引擎中的所有子彈）\n
         \n
         參數:\n
         dt (float): 時間間隔\n
         """
-        # 更新所有子彈
-        for bullet in self.bullets[:]:  # 使用切片複製避免修改列表時出錯
-            bullet.update(dt)
-            
-            # 大幅減少子彈調試輸出：只在有異常時才輸出
-            # if len(self.bullets) <= 3:  # 只在子彈數量少時顯示，避免刷屏
-            #     print(f"🔹 子彈更新: 位置 ({bullet.x:.1f}, {bullet.y:.1f}), 存活 {bullet.life_time:.2f}s, 狀態: {'活躍' if bullet.is_active else '失效'}")
-            
-            if not bullet.is_active:
-                self.bullets.remove(bullet)
+        self.projectiles.update(dt)
 
     def check_bullet_collisions(self, targets):
         """
-        檢查子彈碰撞\n
+        檢查子彈碰撞（場景中所有子彈共用一次粗篩）\n
         \n
         參數:\n
         targets (list): 目標列表，每個目標應該有 'rect' 屬性或 'get_rect()' 方法，以及可選的 'take_damage' 方法\n
@@ -298,35 +167,13 @@ class ShootingSystem:
         回傳:\n
         list: 命中的目標資訊列表\n
         """
-        hit_targets = []
-
-        for bullet in self.bullets[:]:
-            for target in targets:
-                # 獲取目標的碰撞矩形
-                target_rect = None
-                if hasattr(target, "rect"):
-                    target_rect = target.rect
-                elif hasattr(target, "get_rect"):
-                    target_rect = target.get_rect()
-                
-                # 檢查碰撞
-                if target_rect and bullet.check_collision(target_rect):
-                    # 對目標造成傷害
-                    if hasattr(target, "take_damage"):
-                        target.take_damage(bullet.damage)
-
-                    hit_targets.append({
-                        "target": target,
-                        "damage": bullet.damage,
-                        "position": (bullet.x, bullet.y),
-                    })
-
-                    self.bullets.remove(bullet)
-                    self.hits_count += 1
-                    # 減少命中調試輸出：每10次命中才輸出一次
-                    if self.hits_count % 10 == 0:
-                        print(f"💥 命中目標! 累計命中 {self.hits_count} 次，本次傷害: {bullet.damage}")
-                    break
+        hit_targets = self.projectiles.check_collisions(targets)
+
+        for hit_info in hit_targets:
+            self.hits_count += 1
+            # 減少命中調試輸出：每10次命中才輸出一次
+            if self.hits_count % 10 == 0:
+                print(f"💥 命中目標! 累計命中 {self.hits_count} 次，本次傷害: {hit_info['damage']}")
 
         return hit_targets
 
@@ -338,8 +185,7 @@ class ShootingSystem:
         screen (pygame.Surface): 繪製目標表面\n
         camera_offset (tuple): 攝影機偏移量\n
         """
-        for bullet in self.bullets:
-            bullet.draw(screen, camera_offset)
+        self.projectiles.draw(screen, camera_offset)
 
     def draw_shooting_ui(self, screen, player):
         """
@@ -369,7 +215,7 @@ class ShootingSystem:
             screen.blit(stats_text, (10, SCREEN_HEIGHT - 40))
 
         # 顯示準星（BB槍永遠顯示）
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_input_source().get_mouse_pos()
         self._draw_crosshair(screen, mouse_pos)
 
     def _draw_crosshair(self, screen, mouse_pos):
@@ -400,13 +246,13 @@ class ShootingSystem:
         回傳:\n
         int: 子彈數量\n
         """
-        return len(self.bullets)
+        return len(self.projectiles)
 
     def clear_all_bullets(self):
         """
         清除所有子彈\n
         """
-        self.bullets.clear()
+        self.projectiles.clear()
         print("已清除所有子彈")
 
     def get_statistics(self):
@@ -421,7 +267,8 @@ class ShootingSystem:
             "shots_fired": self.shots_fired,
             "hits_count": self.hits_count,
             "accuracy": accuracy,
-            "active_bullets": len(self.bullets)
+            "active_bullets": len(self.projectiles),
+            "projectiles": self.projectiles.get_statistics(),
         }
 
 
@@ -678,7 +525,7 @@ class BBGun:
         回傳:\n
         bool: 是否可以射擊\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
 
         # 檢查彈藥
         if self.current_ammo <= 0:
@@ -722,7 +569,7 @@ class BBGun:
 
         # 消耗彈藥
         self.current_ammo -= 1
-        self.last_shot_time = time.time()
+        self.last_shot_time = get_game_clock().time()
 
         # 計算命中率
         distance_factor = max(0.3, 1.0 - (distance / self.range) * 0.4)
@@ -755,7 +602,7 @@ class BBGun:
 
         # BB槍有無限彈藥，所以總是可以重新裝彈
         self.is_reloading = True
-        self.reload_start_time = time.time()
+        self.reload_start_time = get_game_clock().time()
         print(f"{self.name} 開始重新裝彈...")
         return True
 
@@ -769,7 +616,7 @@ class BBGun:
         if not self.is_reloading:
             return False
 
-        current_time = time.time()
+        current_time = get_game_clock().time()
         elapsed = current_time - self.reload_start_time
 
         if elapsed >= self.reload_time:
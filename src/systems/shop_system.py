@@ -3,6 +3,7 @@ import os
 from enum import Enum
 from config.settings import *
 from src.utils.font_manager import FontManager
+from src.utils.asset_manager import get_asset_manager
 
 
 class ShopType(Enum):
@@ -29,19 +30,10 @@ class ShopItem:
         self.load_image()
     
     def load_image(self):
-        """載入商品圖片"""
-        if self.image_path and os.path.exists(self.image_path):
-            try:
-                self.image = pygame.image.load(self.image_path).convert_alpha()
-                # 調整圖片大小以適應商品格子
-                self.image = pygame.transform.scale(self.image, (50, 50))
-                print(f"✅ 成功載入圖片: {self.image_path}")
-            except pygame.error as e:
-                print(f"❌ 載入圖片失敗 {self.image_path}: {e}")
-                self.image = None
+        """載入商品圖片（由資源管理器快取，調整大小以適應商品格子）"""
+        if self.image_path:
+            self.image = get_asset_manager().get_scaled(self.image_path, (50, 50))
         else:
-            if self.image_path:
-                print(f"⚠️ 圖片檔案不存在: {self.image_path}")
             self.image = None
 
 
@@ -0,0 +1,699 @@
+######################載入套件######################
+import atexit
+import multiprocessing
+import queue
+import traceback
+from multiprocessing import shared_memory
+from src.systems.npc.npc import NPCState
+from src.systems.npc.farmer_work_scheduler import FarmerWorkPhase
+from src.systems.wildlife.animal import Animal, AnimalState
+from src.systems.wildlife.animal_data import AnimalType
+from src.utils.asset_manager import get_asset_manager
+from src.core.game_clock import get_game_clock
+from src.core.render_interpolation import get_render_interpolation
+from config.settings import SIMULATION_WORKER_ANIMAL_CAPACITY, SIMULATION_WORKER_STOP_TIMEOUT
+
+
+######################快照編碼######################
+# 列舉在快照裡以索引存放
+NPC_STATES = tuple(NPCState)
+NPC_STATE_CODES = {state: code for code, state in enumerate(NPC_STATES)}
+ANIMAL_STATES = tuple(AnimalState)
+ANIMAL_STATE_CODES = {state: code for code, state in enumerate(ANIMAL_STATES)}
+ANIMAL_TYPES = tuple(AnimalType)  # 動物的圖像 ID 就是種類索引
+ANIMAL_TYPE_CODES = {animal_type: code for code, animal_type in enumerate(ANIMAL_TYPES)}
+FARMER_PHASES = tuple(FarmerWorkPhase)
+FARMER_PHASE_CODES = {phase: code for code, phase in enumerate(FARMER_PHASES)}
+
+# 每個快照 slot 開頭的欄位（int64）
+SLOT_HEADER_FIELDS = ("sequence", "tick", "command_sequence", "npc_count", "animal_count", "train_count", "farmer_phase")
+SEQUENCE, TICK, COMMAND_SEQUENCE, NPC_COUNT, ANIMAL_COUNT, TRAIN_COUNT, FARMER_PHASE = range(len(SLOT_HEADER_FIELDS))
+
+# 快照陣列：(名稱, memoryview 型別代碼, 容量群組)
+SNAPSHOT_ARRAYS = (
+    ("npc_x", "d", "npc"),
+    ("npc_y", "d", "npc"),
+    ("npc_hospital_stay", "d", "npc"),
+    ("npc_state", "B", "npc"),
+    ("npc_injured", "B", "npc"),
+    ("animal_id", "q", "animal"),
+    ("animal_x", "d", "animal"),
+    ("animal_y", "d", "animal"),
+    ("animal_health", "d", "animal"),
+    ("animal_state", "B", "animal"),
+    ("animal_sprite", "B", "animal"),
+    ("animal_alive", "B", "animal"),
+    ("train_x", "d", "train"),
+    ("train_y", "d", "train"),
+    ("train_direction", "d", "train"),
+    ("train_moving", "B", "train"),
+)
+ITEM_SIZES = {"q": 8, "d": 8, "B": 1}
+
+
+######################共享記憶體快照######################
+class SnapshotLayout:
+    """
+    快照在共享記憶體中的配置\n
+    \n
+    開頭 8 位元組是最新完成的 slot 編號，後面是兩個相同配置的 slot（雙緩衝）\n
+    每個 slot 是 SLOT_HEADER_FIELDS 加上 SNAPSHOT_ARRAYS，8 位元組的陣列排在前面，讓每個陣列都對齊\n
+    """
+
+    def __init__(self, npc_capacity, animal_capacity, train_capacity):
+        """
+        參數:\n
+        npc_capacity (int): NPC 數量\n
+        animal_capacity (int): 最多容納的動物數量\n
+        train_capacity (int): 火車數量\n
+        """
+        self.capacities = {"npc": npc_capacity, "animal": animal_capacity, "train": train_capacity}
+        self.offsets = {}  # 陣列名稱 -> (slot 內位移, 型別代碼, 長度)
+
+        offset = len(SLOT_HEADER_FIELDS) * 8
+        for name, code, group in sorted(SNAPSHOT_ARRAYS, key=lambda array: -ITEM_SIZES[array[1]]):
+            count = self.capacities[group]
+            self.offsets[name] = (offset, code, count)
+            offset += count * ITEM_SIZES[code]
+
+        self.slot_size = (offset + 7) // 8 * 8
+        self.total_size = 8 + 2 * self.slot_size
+
+
+class SnapshotSlot:
+    """
+    一個快照 slot 的共享記憶體視圖，每個陣列都是 memoryview.cast，讀寫不複製資料\n
+    """
+
+    def __init__(self, buffer, layout, index):
+        """
+        參數:\n
+        buffer (memoryview): 共享記憶體\n
+        layout (SnapshotLayout): 快照配置\n
+        index (int): slot 編號（0 或 1）\n
+        """
+        base = 8 + index * layout.slot_size
+        self.header = buffer[base:base + len(SLOT_HEADER_FIELDS) * 8].cast("q")
+        self.arrays = [self.header]
+        for name, (offset, code, count) in layout.offsets.items():
+            start = base + offset
+            view = buffer[start:start + count * ITEM_SIZES[code]].cast(code)
+            setattr(self, name, view)
+            self.arrays.append(view)
+
+    def release(self):
+        """
+        釋放所有視圖（關閉共享記憶體前必須釋放）\n
+        """
+        for view in self.arrays:
+            view.release()
+        self.arrays = []
+
+
+class SnapshotBuffer:
+    """
+    雙緩衝快照 - 模擬子程序寫入沒在使用的 slot，寫完才把它設為最新\n
+    \n
+    每個 slot 有一個序號：寫入前加一（奇數表示寫入中），寫完再加一，\n
+    讀取端讀完後序號沒變才算讀到完整的快照\n
+    """
+
+    def __init__(self, memory, layout):
+        """
+        參數:\n
+        memory (SharedMemory): 共享記憶體\n
+        layout (SnapshotLayout): 快照配置\n
+        """
+        self.memory = memory
+        self.layout = layout
+        buffer = memory.buf
+        self.latest = buffer[0:8].cast("q")
+        self.slots = (SnapshotSlot(buffer, layout, 0), SnapshotSlot(buffer, layout, 1))
+
+    def get_latest_slot(self):
+        """
+        最新完成的快照 slot\n
+        """
+        return self.slots[self.latest[0]]
+
+    def publish(self, world, tick, command_sequence):
+        """
+        把模擬世界目前的狀態寫成新的快照（模擬子程序呼叫）\n
+        \n
+        參數:\n
+        world (SimulationWorld): 模擬世界\n
+        tick (int): 模擬步編號\n
+        command_sequence (int): 已處理的最後一個指令序號\n
+        """
+        index = 1 - self.latest[0]
+        slot = self.slots[index]
+        header = slot.header
+        header[SEQUENCE] += 1
+
+        npcs = world.npcs
+        for i, npc in enumerate(npcs):
+            slot.npc_x[i] = npc.x
+            slot.npc_y[i] = npc.y
+            slot.npc_state[i] = NPC_STATE_CODES.get(npc.state, 0)
+            slot.npc_injured[i] = npc.is_injured
+            slot.npc_hospital_stay[i] = npc.hospital_stay_time
+
+        animals = world.wildlife_manager.all_animals[:self.layout.capacities["animal"]]
+        for i, animal in enumerate(animals):
+            slot.animal_id[i] = animal.id
+            slot.animal_x[i] = animal.x
+            slot.animal_y[i] = animal.y
+            slot.animal_health[i] = animal.health
+            slot.animal_state[i] = ANIMAL_STATE_CODES.get(animal.state, 0)
+            slot.animal_sprite[i] = ANIMAL_TYPE_CODES[animal.animal_type]
+            slot.animal_alive[i] = animal.is_alive
+
+        trains = world.trains
+        for i, train in enumerate(trains):
+            slot.train_x[i] = train.x
+            slot.train_y[i] = train.y
+            slot.train_direction[i] = train.direction
+            slot.train_moving[i] = train.is_moving
+
+        farmer_scheduler = world.npc_manager.farmer_scheduler
+        header[TICK] = tick
+        header[COMMAND_SEQUENCE] = command_sequence
+        header[NPC_COUNT] = len(npcs)
+        header[ANIMAL_COUNT] = len(animals)
+        header[TRAIN_COUNT] = len(trains)
+        header[FARMER_PHASE] = FARMER_PHASE_CODES[farmer_scheduler.current_phase] if farmer_scheduler else 0
+        header[SEQUENCE] += 1
+        self.latest[0] = index
+
+    def close(self):
+        """
+        釋放視圖並關閉共享記憶體\n
+        """
+        for slot in self.slots:
+            slot.release()
+        self.latest.release()
+        self.memory.close()
+
+
+######################模擬世界######################
+class AttackerPosition:
+    """
+    只有位置的攻擊者 - 子程序重現主程序的攻擊時代替玩家，讓動物朝遠離攻擊者的方向逃跑\n
+    """
+
+    def __init__(self, position):
+        """
+        參數:\n
+        position (tuple): 攻擊發生時玩家的位置 (x, y)\n
+        """
+        self.position = position
+
+    def get_position(self):
+        return self.position
+
+
+class SimulationWorld:
+    """
+    模擬世界 - 交給模擬子程序更新的系統：NPC（含農夫排程、電力工人）、野生動物、鐵路\n
+    """
+
+    def __init__(self, npc_manager, wildlife_manager, railway_system):
+        """
+        參數:\n
+        npc_manager (NPCManager): NPC 管理器\n
+        wildlife_manager (WildlifeManager): 野生動物管理器\n
+        railway_system (RailwaySystem): 鐵路系統\n
+        """
+        self.npc_manager = npc_manager
+        self.wildlife_manager = wildlife_manager
+        self.railway_system = railway_system
+
+    @property
+    def npcs(self):
+        return self.npc_manager.all_npcs
+
+    @property
+    def trains(self):
+        return self.railway_system.trains
+
+    @property
+    def power_manager(self):
+        return getattr(self.npc_manager, "power_manager", None)
+
+    def step(self, dt, player_position, time_state):
+        """
+        推進一個模擬步\n
+        \n
+        參數:\n
+        dt (float): 模擬步長（秒）\n
+        player_position (tuple): 玩家位置\n
+        time_state (tuple): 主程序的遊戲時間 (小時, 分鐘, 星期, 是否工作日)\n
+        """
+        time_manager = self.npc_manager.time_manager
+        if time_manager:
+            time_manager.hour, time_manager.minute, time_manager.day_of_week, time_manager.is_work_day = time_state
+
+        self.npc_manager.update(dt, player_position)
+        self.wildlife_manager.update(dt, player_position, "town")
+        self.railway_system.update(dt)
+
+    def find_npc(self, npc_id):
+        """
+        依 ID 找 NPC\n
+        """
+        for npc in self.npcs:
+            if npc.id == npc_id:
+                return npc
+        return None
+
+    def find_animal(self, animal_id):
+        """
+        依 ID 找動物\n
+        """
+        for animal in self.wildlife_manager.all_animals:
+            if animal.id == animal_id:
+                return animal
+        return None
+
+
+def run_simulation_worker(world, memory, layout, commands, events):
+    """
+    模擬子程序的主迴圈\n
+    \n
+    以 fork 建立，world 是主程序在 fork 當下的完整狀態，之後由這個程序負責更新\n
+    每收到一個 step 指令就推進一步並發布快照；動物生成、移除、攻擊玩家和電力工人出勤變化以事件送回主程序\n
+    \n
+    參數:\n
+    world (SimulationWorld): 模擬世界\n
+    memory (SharedMemory): 快照用的共享記憶體（fork 時繼承）\n
+    layout (SnapshotLayout): 快照配置\n
+    commands (Queue): 主程序送來的指令\n
+    events (Queue): 送回主程序的事件\n
+    """
+    try:
+        snapshot = SnapshotBuffer(memory, layout)
+        wildlife_manager = world.wildlife_manager
+        wildlife_manager.set_player_attack_callback(
+            lambda damage, animal: events.put(("player_attacked", animal.id, damage))
+        )
+        published_animals = {animal.id for animal in wildlife_manager.all_animals}
+        published_duty = _get_power_worker_duty(world.power_manager)
+        tick = 0
+        command_sequence = 0
+
+        while True:
+            command = commands.get()
+            kind = command[0]
+            if kind == "stop":
+                break
+            command_sequence = command[1]
+
+            if kind == "step":
+                world.step(command[2], command[3], command[4])
+                tick += 1
+                published_animals = _report_roster_changes(wildlife_manager, published_animals, events)
+                published_duty = _report_power_worker_changes(world.power_manager, published_duty, events)
+                snapshot.publish(world, tick, command_sequence)
+            elif kind == "move_npc":
+                npc = world.find_npc(command[2])
+                if npc is not None:
+                    npc.x, npc.y = command[3], command[4]
+            elif kind == "injure_npc":
+                npc = world.find_npc(command[2])
+                if npc is not None:
+                    npc.injure(command[3])
+            elif kind == "damage_animal":
+                animal = world.find_animal(command[2])
+                if animal is not None:
+                    animal.take_damage(command[3], AttackerPosition(command[4]))
+    except Exception:
+        events.put(("error", traceback.format_exc()))
+
+
+def _report_roster_changes(wildlife_manager, published_animals, events):
+    """
+    把新生成、已移除的動物送回主程序\n
+    \n
+    回傳:\n
+    set: 目前所有動物的 ID\n
+    """
+    current = {}
+    for animal in wildlife_manager.all_animals:
+        current[animal.id] = animal
+        if animal.id not in published_animals:
+            events.put((
+                "animal_spawned", animal.id, ANIMAL_TYPE_CODES[animal.animal_type],
+                animal.habitat, animal.x, animal.y,
+            ))
+    for animal_id in published_animals - current.keys():
+        events.put(("animal_removed", animal_id))
+    return set(current)
+
+
+def _get_power_worker_duty(power_manager):
+    """
+    取得每個電力工人是否在崗\n
+    \n
+    回傳:\n
+    dict: 工人 ID -> 是否在崗\n
+    """
+    if power_manager is None:
+        return {}
+    return {worker_id: info["on_duty"] for worker_id, info in power_manager.power_workers.items()}
+
+
+def _report_power_worker_changes(power_manager, published_duty, events):
+    """
+    把電力工人住院、復工造成的出勤變化送回主程序，讓主程序的電力管理器跟著停電、復電\n
+    \n
+    回傳:\n
+    dict: 目前每個電力工人是否在崗\n
+    """
+    current = _get_power_worker_duty(power_manager)
+    for worker_id, on_duty in current.items():
+        if published_duty.get(worker_id) != on_duty:
+            events.put(("power_worker_status", worker_id, on_duty))
+    return current
+
+
+######################主程序端######################
+class SimulationWorkerClient:
+    """
+    模擬子程序客戶端 - 在另一個程序更新 NPC、野生動物、農夫排程和鐵路\n
+    \n
+    子程序以 fork 取得主程序當下的完整狀態並持有權威狀態，主程序裡的 NPC、動物、火車成為代理物件：\n
+    - sync(): 處理子程序的事件，再把最新快照的位置、狀態直接從共享記憶體套用到代理物件\n
+    - step(): 把主程序這一步對代理物件的修改（NPC 被推開或受傷、動物被射傷）和推進指令送給子程序\n
+    主程序的修改以「和最後套用的快照不同」找出來，不需要在各個修改的地方掛鉤\n
+    \n
+    代理物件只有快照裡的欄位（路徑、目標、排程、火車停站時間等都只在子程序裡），\n
+    所以子程序啟動後一直執行到遊戲結束，離開小鎮再回來時不重新 fork\n
+    \n
+    送出修改後、子程序確認處理前，快照不會覆蓋該物件，避免修改被舊快照蓋掉\n
+    不支援 fork 的平台、錄製和重播時不啟用，遊戲照常在主程序更新\n
+    """
+
+    def __init__(self, npc_manager, wildlife_manager, railway_system):
+        """
+        參數:\n
+        npc_manager (NPCManager): NPC 管理器\n
+        wildlife_manager (WildlifeManager): 野生動物管理器\n
+        railway_system (RailwaySystem): 鐵路系統\n
+        """
+        self.world = SimulationWorld(npc_manager, wildlife_manager, railway_system)
+        self.process = None
+        self.memory = None
+        self.snapshot = None
+        self.commands = None
+        self.events = None
+        self.disabled = False  # 無法使用或子程序出錯後改回主程序更新
+
+        self.command_sequence = 0
+        self.applied_tick = 0
+        self.pending = {}  # (種類, ID) -> 等待子程序處理的指令序號
+        self.npc_positions = []  # 最後一次套用的 NPC 位置，用來找出主程序的修改
+        self.npc_injured = []  # 最後一次套用的 NPC 受傷狀態
+        self.animal_health = {}  # 動物 ID -> 最後一次套用的血量
+        self.animals_by_id = {}
+        self.player_position = (0, 0)  # 最後一次收到的玩家位置，動物受傷時當作攻擊者位置
+
+    @staticmethod
+    def is_supported():
+        """
+        平台是否支援 fork\n
+        """
+        return "fork" in multiprocessing.get_all_start_methods()
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    def ensure_started(self):
+        """
+        需要時啟動模擬子程序\n
+        \n
+        回傳:\n
+        bool: 子程序是否在執行\n
+        """
+        if self.process is None and not self.disabled:
+            self.start()
+        return self.process is not None
+
+    def start(self):
+        """
+        fork 模擬子程序\n
+        """
+        if not self.is_supported():
+            print("此平台不支援 fork，NPC 和野生動物在主程序更新")
+            self.disabled = True
+            return
+        if get_game_clock().simulated:
+            print("模擬時鐘模式（錄製、重播）不使用模擬子程序")
+            self.disabled = True
+            return
+
+        # 背景預先讀取完成後再 fork，子程序不會繼承被鎖住的資源管理器
+        get_asset_manager().wait_for_preload()
+
+        world = self.world
+        layout = SnapshotLayout(len(world.npcs), SIMULATION_WORKER_ANIMAL_CAPACITY, len(world.trains))
+        self.memory = shared_memory.SharedMemory(create=True, size=layout.total_size)
+        self.snapshot = SnapshotBuffer(self.memory, layout)
+
+        context = multiprocessing.get_context("fork")
+        self.commands = context.Queue()
+        self.events = context.Queue()
+        self.process = context.Process(
+            target=run_simulation_worker,
+            args=(world, self.memory, layout, self.commands, self.events),
+            name="simulation-worker",
+            daemon=True,
+        )
+        self.process.start()
+
+        self.command_sequence = 0
+        self.applied_tick = 0
+        self.pending = {}
+        self.npc_positions = [(npc.x, npc.y) for npc in world.npcs]
+        self.npc_injured = [npc.is_injured for npc in world.npcs]
+        self.animals_by_id = {animal.id: animal for animal in world.wildlife_manager.all_animals}
+        self.animal_health = {animal.id: animal.health for animal in world.wildlife_manager.all_animals}
+        # 遊戲結束時停止子程序並釋放共享記憶體
+        atexit.register(self.stop)
+        print(f"模擬子程序已啟動 (PID: {self.process.pid})")
+
+    def stop(self):
+        """
+        停止模擬子程序並釋放共享記憶體（遊戲結束或子程序出錯時呼叫）\n
+        \n
+        代理物件保留最後套用的狀態，但沒有子程序裡的路徑、排程等細節，停止後不應再啟動\n
+        """
+        if self.process is None:
+            return
+        atexit.unregister(self.stop)
+
+        try:
+            self.commands.put(("stop", self.command_sequence))
+        except (OSError, ValueError):
+            pass
+        self.process.join(SIMULATION_WORKER_STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+        for queue in (self.commands, self.events):
+            queue.close()
+            queue.cancel_join_thread()
+        self.snapshot.close()
+        self.memory.unlink()
+
+        self.process = None
+        self.memory = None
+        self.snapshot = None
+        self.commands = None
+        self.events = None
+        print("模擬子程序已停止")
+
+    ######################套用快照######################
+    def sync(self, player_position):
+        """
+        處理子程序的事件並套用最新的快照\n
+        \n
+        套用前先送出上次 step() 之後對代理物件的修改，快照才不會把它們蓋掉\n
+        \n
+        參數:\n
+        player_position (tuple): 玩家位置\n
+        """
+        if self.process is None:
+            return
+        self.player_position = tuple(player_position)
+        self._handle_events()
+        if self.process is not None:
+            self._forward_local_changes()
+            self._apply_latest_snapshot()
+
+    def _handle_events(self):
+        """
+        處理動物生成、移除、攻擊玩家、電力工人出勤變化和子程序錯誤\n
+        """
+        wildlife_manager = self.world.wildlife_manager
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return
+
+            kind = event[0]
+            if kind == "animal_spawned":
+                _, animal_id, type_code, habitat, x, y = event
+                bounds = wildlife_manager.lake_bounds if habitat == "lake" else wildlife_manager.forest_bounds
+                animal = Animal(ANIMAL_TYPES[type_code], (x, y), bounds, habitat)
+                animal.id = animal_id
+                wildlife_manager.add_animal(animal)
+                self.animals_by_id[animal_id] = animal
+                self.animal_health[animal_id] = animal.health
+            elif kind == "animal_removed":
+                animal = self.animals_by_id.pop(event[1], None)
+                self.animal_health.pop(event[1], None)
+                if animal is not None:
+                    wildlife_manager.remove_animal(animal)
+            elif kind == "player_attacked":
+                animal = self.animals_by_id.get(event[1])
+                callback = getattr(wildlife_manager, "player_attack_callback", None)
+                if animal is not None and callback:
+                    callback(event[2], animal)
+            elif kind == "power_worker_status":
+                power_manager = self.world.power_manager
+                if power_manager is not None:
+                    power_manager.update_worker_status(event[1], event[2])
+            elif kind == "error":
+                print(f"模擬子程序發生錯誤，改回主程序更新:\n{event[1]}")
+                self.disabled = True
+                self.stop()
+                return
+
+    def _apply_latest_snapshot(self):
+        """
+        把最新快照套用到代理物件（直接讀共享記憶體）\n
+        \n
+        讀到一半子程序又寫完兩個快照時序號會改變，這次的結果不算數，下一幀重新套用\n
+        """
+        slot = self.snapshot.get_latest_slot()
+        header = slot.header
+        sequence = header[SEQUENCE]
+        tick = header[TICK]
+        if sequence & 1 or tick == self.applied_tick:
+            return
+
+        acknowledged = header[COMMAND_SEQUENCE]
+        if self.pending:
+            self.pending = {key: command for key, command in self.pending.items() if command > acknowledged}
+        pending = self.pending
+        interpolation = get_render_interpolation()
+
+        # NPC（順序和 fork 時相同）
+        npcs = self.world.npcs
+        npc_positions = self.npc_positions
+        npc_injured = self.npc_injured
+        npc_x, npc_y = slot.npc_x, slot.npc_y
+        for index in range(header[NPC_COUNT]):
+            npc = npcs[index]
+            if ("npc", npc.id) in pending:
+                continue
+            interpolation.record(npc)
+            npc.x = npc_x[index]
+            npc.y = npc_y[index]
+            npc_positions[index] = (npc.x, npc.y)
+            state = NPC_STATES[slot.npc_state[index]]
+            npc.state = state
+            npc.current_state = state
+            npc.is_injured = npc_injured[index] = bool(slot.npc_injured[index])
+            npc.hospital_stay_time = slot.npc_hospital_stay[index]
+
+        # 野生動物（還沒收到生成事件的動物先略過）
+        animals_by_id = self.animals_by_id
+        animal_health = self.animal_health
+        for index in range(header[ANIMAL_COUNT]):
+            animal_id = slot.animal_id[index]
+            animal = animals_by_id.get(animal_id)
+            if animal is None or ("animal", animal_id) in pending:
+                continue
+            interpolation.record(animal)
+            animal.x = slot.animal_x[index]
+            animal.y = slot.animal_y[index]
+            animal.health = slot.animal_health[index]
+            animal.state = ANIMAL_STATES[slot.animal_state[index]]
+            animal.is_alive = bool(slot.animal_alive[index])
+            animal_health[animal_id] = animal.health
+
+        # 火車
+        trains = self.world.trains
+        for index in range(header[TRAIN_COUNT]):
+            train = trains[index]
+            interpolation.record(train)
+            train.x = slot.train_x[index]
+            train.y = slot.train_y[index]
+            train.direction = slot.train_direction[index]
+            train.is_moving = bool(slot.train_moving[index])
+            train.rect.x = train.x
+            train.rect.y = train.y
+
+        farmer_scheduler = self.world.npc_manager.farmer_scheduler
+        if farmer_scheduler:
+            farmer_scheduler.current_phase = FARMER_PHASES[header[FARMER_PHASE]]
+
+        if header[SEQUENCE] == sequence:
+            self.applied_tick = tick
+
+    ######################推進模擬######################
+    def step(self, dt, player_position, time_manager):
+        """
+        把主程序這一步的修改和推進指令送給子程序\n
+        \n
+        參數:\n
+        dt (float): 模擬步長（秒）\n
+        player_position (tuple): 玩家位置\n
+        time_manager (TimeManager): 時間管理器（主程序的遊戲時間是權威狀態）\n
+        """
+        if self.process is None:
+            return
+
+        self.player_position = tuple(player_position)
+        self._forward_local_changes()
+        time_state = (time_manager.hour, time_manager.minute, time_manager.day_of_week, time_manager.is_work_day)
+        self._send("step", dt, self.player_position, time_state)
+
+    def _forward_local_changes(self):
+        """
+        找出主程序對代理物件的修改並送給子程序\n
+        """
+        npc_positions = self.npc_positions
+        npc_injured = self.npc_injured
+        for index, npc in enumerate(self.world.npcs):
+            position = (npc.x, npc.y)
+            if position != npc_positions[index]:
+                npc_positions[index] = position
+                self.pending[("npc", npc.id)] = self._send("move_npc", npc.id, npc.x, npc.y)
+            if npc.is_injured and not npc_injured[index]:
+                npc_injured[index] = True
+                self.pending[("npc", npc.id)] = self._send("injure_npc", npc.id, npc.injury_cause)
+
+        animal_health = self.animal_health
+        for animal in self.world.wildlife_manager.all_animals:
+            health = animal_health.get(animal.id)
+            if health is not None and animal.health < health:
+                animal_health[animal.id] = animal.health
+                self.pending[("animal", animal.id)] = self._send(
+                    "damage_animal", animal.id, health - animal.health, self.player_position
+                )
+
+    def _send(self, kind, *arguments):
+        """
+        送出指令\n
+        \n
+        回傳:\n
+        int: 指令序號\n
+        """
+        self.command_sequence += 1
+        self.commands.put((kind, self.command_sequence) + arguments)
+        return self.command_sequence
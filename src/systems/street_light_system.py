@@ -14,6 +14,9 @@ class StreetLightSystem:
     2. 夜晚時路燈會點亮\n
     3. 路燈會照亮周圍區域\n
     4. 與時間系統整合，根據時間控制開關\n
+    5. 連接電力管理器後，停電區域的路燈不會亮\n
+    \n
+    路燈只在日夜切換或區域停電、復電時改變開關，其他幀不需要走訪路燈\n
     """
 
     def __init__(self, time_manager=None, terrain_system=None):
@@ -29,6 +32,15 @@ class StreetLightSystem:
         
         # 路燈列表
         self.street_lights = []
+
+        # 電力管理器（負責把路燈分到電力區域、停電時更新路燈的 powered 旗標）
+        self.power_manager = None
+
+        # 電力區域 -> 該區域路燈涵蓋的世界範圍（繪製時整區略過畫面外的路燈）
+        self.area_extents = {}
+
+        # 目前路燈是否處於夜晚狀態（日夜切換時才更新路燈）
+        self.is_night = False
         
         # 路燈設定
         self.light_radius = 60  # 路燈照亮範圍
@@ -55,8 +67,9 @@ class StreetLightSystem:
         
         # 遍歷地圖，在道路和高速公路地形上放置路燈
         for y in range(0, self.terrain_system.map_height, 2):  # 每2格放一個路燈
+            terrain_row = self.terrain_system.terrain_store.read_row(y)
             for x in range(0, self.terrain_system.map_width, 2):
-                terrain_code = self.terrain_system.map_data[y][x]
+                terrain_code = terrain_row[x]
                 
                 # 檢查是否為道路或高速公路
                 if terrain_code in [3, 4]:  # 3=道路, 4=高速公路
@@ -70,13 +83,69 @@ class StreetLightSystem:
                         "position": (world_x, world_y),
                         "is_on": False,  # 初始狀態為關閉
                         "terrain_type": "highway" if terrain_code == 4 else "road",
+                        "area_id": None,  # 所屬電力區域
+                        "powered": True,  # 所屬區域是否有電
                     }
                     
                     self.street_lights.append(street_light)
                     light_id += 1
         
+        self.is_night = False
+        if self.power_manager:
+            self._assign_lights_to_areas()
+
         print(f"已放置 {len(self.street_lights)} 盞路燈")
 
+    def connect_power_manager(self, power_manager):
+        """
+        連接電力管理器，停電區域的路燈會熄滅\n
+        \n
+        參數:\n
+        power_manager (PowerManager): 電力管理器\n
+        """
+        if self.power_manager is power_manager:
+            return
+
+        if self.power_manager:
+            self.power_manager.unsubscribe_power_changes(self._on_area_power_changed)
+
+        self.power_manager = power_manager
+        self._assign_lights_to_areas()
+        power_manager.subscribe_power_changes(self._on_area_power_changed)
+
+    def _assign_lights_to_areas(self):
+        """
+        由電力管理器把路燈分到電力區域，並記錄每區路燈的範圍\n
+        """
+        self.power_manager.assign_street_lights(self.street_lights)
+
+        margin = max(self.light_radius, 100)
+        self.area_extents = {}
+        for area_id, area_info in self.power_manager.power_areas.items():
+            lights = area_info["street_lights"]
+            if not lights:
+                continue
+            xs = [light["position"][0] for light in lights]
+            ys = [light["position"][1] for light in lights]
+            self.area_extents[area_id] = pygame.Rect(
+                min(xs) - margin, min(ys) - margin,
+                max(xs) - min(xs) + margin * 2, max(ys) - min(ys) + margin * 2,
+            )
+
+        for light in self.street_lights:
+            light["is_on"] = self.is_night and light["powered"]
+
+    def _on_area_power_changed(self, area_id, has_power):
+        """
+        電力管理器推送的區域供電變化\n
+        \n
+        參數:\n
+        area_id (int): 電力區域 ID\n
+        has_power (bool): 該區域是否有電\n
+        """
+        for light in self.power_manager.power_areas[area_id]["street_lights"]:
+            light["is_on"] = self.is_night and has_power
+
     def update(self, dt):
         """
         更新路燈系統\n
@@ -86,10 +155,13 @@ class StreetLightSystem:
         """
         # 根據時間決定路燈開關狀態
         is_night = self._is_night_time()
-        
-        # 更新所有路燈狀態
+        if is_night == self.is_night:
+            return
+
+        # 日夜切換時才更新所有路燈狀態
+        self.is_night = is_night
         for light in self.street_lights:
-            light["is_on"] = is_night
+            light["is_on"] = is_night and light["powered"]
 
     def _is_night_time(self):
         """
@@ -118,8 +190,32 @@ class StreetLightSystem:
         camera_offset (tuple): 攝影機偏移\n
         """
         camera_x, camera_y = camera_offset
-        
-        for light in self.street_lights:
+
+        for lights in self._get_visible_light_groups(camera_x, camera_y):
+            self._draw_lights(screen, lights, camera_x, camera_y)
+
+    def _get_visible_light_groups(self, camera_x, camera_y):
+        """
+        取得可能在畫面內的路燈群組\n
+        \n
+        連接電力管理器後以電力區域為單位，整區在畫面外就不走訪該區的路燈\n
+        """
+        if not self.power_manager:
+            return [self.street_lights]
+
+        view = pygame.Rect(camera_x, camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+        power_areas = self.power_manager.power_areas
+        return [
+            power_areas[area_id]["street_lights"]
+            for area_id, extent in self.area_extents.items()
+            if extent.colliderect(view)
+        ]
+
+    def _draw_lights(self, screen, lights, camera_x, camera_y):
+        """
+        繪製一組路燈\n
+        """
+        for light in lights:
             light_x, light_y = light["position"]
             
             # 計算螢幕位置
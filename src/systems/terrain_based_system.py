@@ -4,8 +4,10 @@ import random
 import math
 from config.settings import *
 from src.utils.terrain_map_loader import TerrainMapLoader
+from src.utils.terrain_components import TerrainComponentLabels
 from src.systems.building_system import Building, GunShop, Hospital, ResidentialHouse
 from src.systems.railway_system import RailwaySystem
+from src.systems.terrain_chunk_renderer import TerrainChunkRenderer
 from src.utils.font_manager import FontManager
 
 
@@ -45,7 +47,11 @@ class TerrainBasedSystem:
         
         # 地形相關設定
         self.tile_size = 40  # 每個地形格子的像素大小
-        self.map_data = []
+        self.terrain_store = None  # 區塊式地形儲存（TerrainStore）
+        self.map_data = []  # terrain_store 的 [y][x] 相容檢視
+        self.terrain_components = None  # 連通區域標記（TerrainComponentLabels）
+        self._area_cache = {}  # 地形編碼 -> 世界座標區域列表
+        self._area_cache_revision = -1
         self.map_width = 0
         self.map_height = 0
         
@@ -53,9 +59,14 @@ class TerrainBasedSystem:
         self.buildings = []
         self.residential_buildings = []  # 住宅建築
         self.commercial_buildings = []   # 商業建築
+        self.power_manager = None  # 電力管理器（負責把建築分到電力區域）
+        self.power_area_extents = {}  # 電力區域 ID -> 該區建築涵蓋的世界範圍
+        self.power_draw_batches = {}  # 電力區域 ID -> (有電建築, 停電建築與暗色)，停電、復電時失效
         
         # 地形系統
         self.forest_areas = []      # 森林區域
+        self.forest_area_lookup = {}  # (格子 x, 格子 y) -> 森林區域，樹木碰撞和砍樹只查附近格子
+        self.chunk_renderer = None  # 地形和裝飾的區塊繪製器（載入地圖後建立）
         self.water_areas = []       # 水體區域
         self.vegetable_gardens = [] # 蔬果園區域（新增）
         self.farm_areas = []        # 農地區域（新增）
@@ -98,12 +109,15 @@ class TerrainBasedSystem:
         """
         print(f"載入地形地圖: {csv_file_path}")
         
-        # 載入地形數據
-        if not self.terrain_loader.load_from_csv(csv_file_path):
+        # 載入地形數據（.terrain 區塊檔案以 mmap 開啟，其他視為CSV）
+        if not self.terrain_loader.load_map(csv_file_path):
             print("地形地圖載入失敗")
             return False
         
+        self.terrain_store = self.terrain_loader.store
         self.map_data = self.terrain_loader.map_data
+        self.terrain_components = TerrainComponentLabels(self.terrain_store)
+        self._area_cache = {}
         self.map_width = self.terrain_loader.map_width
         self.map_height = self.terrain_loader.map_height
         
@@ -119,6 +133,9 @@ class TerrainBasedSystem:
         self._setup_water_areas()
         self._setup_railway_system()
         
+        # 地形和裝飾都建立好後才能烘焙區塊
+        self.chunk_renderer = TerrainChunkRenderer(self)
+        
         return True
 
     def _analyze_terrain(self):
@@ -127,9 +144,9 @@ class TerrainBasedSystem:
         """
         terrain_stats = {}
         
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                terrain_code = self.map_data[y][x]
+                terrain_code = row[x]
                 terrain_name = self.terrain_loader.get_terrain_name(terrain_code)
                 
                 if terrain_name not in terrain_stats:
@@ -157,9 +174,9 @@ class TerrainBasedSystem:
         
         # 找到住宅區格子
         residential_tiles = []
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                if self.map_data[y][x] == 5:  # 住宅區
+                if row[x] == 5:  # 住宅區
                     residential_tiles.append((x, y))
         
         if not residential_tiles:
@@ -315,9 +332,9 @@ class TerrainBasedSystem:
         commercial_positions = []
         
         # 收集所有商業區格子的位置
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                if self.map_data[y][x] == 6:  # 商業區
+                if row[x] == 6:  # 商業區
                     commercial_positions.append((x, y))
         
         if not commercial_positions:
@@ -421,9 +438,9 @@ class TerrainBasedSystem:
         farm_count = 0
         
         # 遍歷所有地形格子，找到農地（代碼8）
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                if self.map_data[y][x] == 8:  # 農地地形
+                if row[x] == 8:  # 農地地形
                     # 計算農地位置
                     farm_x = x * self.tile_size
                     farm_y = y * self.tile_size
@@ -462,9 +479,9 @@ class TerrainBasedSystem:
         
         # 找到住宅區格子
         residential_tiles = []
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                if self.map_data[y][x] == 5:  # 住宅區
+                if row[x] == 5:  # 住宅區
                     residential_tiles.append((x, y))
         
         if not residential_tiles:
@@ -747,7 +764,7 @@ class TerrainBasedSystem:
                 if (0 <= check_x < self.map_width and 
                     0 <= check_y < self.map_height):
                     # 檢查是否為農地
-                    if self.map_data[check_y][check_x] == 8:  # 農地地形代碼
+                    if self.terrain_store.get_terrain_at(check_x, check_y) == 8:  # 農地地形代碼
                         return True
         
         return False
@@ -786,9 +803,9 @@ class TerrainBasedSystem:
         
         forest_count = 0
         
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                if self.map_data[y][x] == 1:  # 森林/密林
+                if row[x] == 1:  # 森林/密林
                     # 計算格子的世界座標範圍
                     tile_world_x = x * self.tile_size
                     tile_world_y = y * self.tile_size
@@ -840,6 +857,7 @@ class TerrainBasedSystem:
                         self.forest_resources.append(resource)
                     
                     self.forest_areas.append(forest_area)
+                    self.forest_area_lookup[(x, y)] = forest_area
                     forest_count += 1
         
         print(f"森林區域設置完成，共創建 {forest_count} 個森林格子")
@@ -853,9 +871,9 @@ class TerrainBasedSystem:
         
         water_count = 0
         
-        for y in range(self.map_height):
+        for y, row in enumerate(self.terrain_store.iter_rows()):
             for x in range(self.map_width):
-                if self.map_data[y][x] == 2:  # 水體
+                if row[x] == 2:  # 水體
                     # 計算格子的世界座標範圍
                     tile_world_x = x * self.tile_size
                     tile_world_y = y * self.tile_size
@@ -953,6 +971,18 @@ class TerrainBasedSystem:
         
         return nearby_resources
 
+    def collect_forest_resource(self, resource):
+        """
+        拾取森林資源 - 標記為已收集並從可收集列表移除\n
+        \n
+        參數:\n
+        resource (dict): 森林資源\n
+        """
+        resource['collected'] = True
+        if resource in self.forest_resources:
+            self.forest_resources.remove(resource)
+        self.mark_decorations_dirty(resource['rect'])
+
     def get_water_resources_in_area(self, center_pos, radius):
         """
         獲取指定區域內的水邊資源\n
@@ -999,209 +1029,43 @@ class TerrainBasedSystem:
         """
         繪製地形層 (背景) - 隱藏格線\n
         \n
-        參數:\n
-        screen (pygame.Surface): 繪製目標表面\n
-        camera_x (float): 攝影機X偏移\n
-        camera_y (float): 攝影機Y偏移\n
-        """
-        # 計算可見區域的地形格子範圍
-        start_x = max(0, int(camera_x // self.tile_size))
-        start_y = max(0, int(camera_y // self.tile_size))
-        end_x = min(self.map_width, start_x + screen.get_width() // self.tile_size + 2)
-        end_y = min(self.map_height, start_y + screen.get_height() // self.tile_size + 2)
-        
-        # 繪製地形格子
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                if y < len(self.map_data) and x < len(self.map_data[y]):
-                    terrain_code = self.map_data[y][x]
-                    color = self.terrain_loader.get_terrain_color(terrain_code)
-                    
-                    # 如果是水體（地形代碼2），確保使用藍色
-                    if terrain_code == 2:
-                        color = (30, 144, 255)  # 道奇藍色，更明顯的水體顏色
-                    
-                    # 計算螢幕座標
-                    screen_x = x * self.tile_size - camera_x
-                    screen_y = y * self.tile_size - camera_y
-                    
-                    # 繪製地形格子（不繪製邊框）
-                    rect = pygame.Rect(screen_x, screen_y, self.tile_size, self.tile_size)
-                    pygame.draw.rect(screen, color, rect)
-                    
-                    # 移除格子邊框繪製 - 隱藏格線
-                    # pygame.draw.rect(screen, (128, 128, 128), rect, 1)
-
-    def draw_forest_elements(self, screen, camera_x, camera_y):
-        """
-        繪製森林元素\n
+        地形顏色、水波紋、農地犁溝、蔬果園底色都已烘焙在區塊圖片中，這裡只貼上可見區塊\n
         \n
         參數:\n
         screen (pygame.Surface): 繪製目標表面\n
         camera_x (float): 攝影機X偏移\n
         camera_y (float): 攝影機Y偏移\n
         """
-        for forest_area in self.forest_areas:
-            # 檢查森林區域是否在可見範圍內
-            fx, fy, fw, fh = forest_area['world_bounds']
-            if (fx + fw < camera_x or fx > camera_x + screen.get_width() or
-                fy + fh < camera_y or fy > camera_y + screen.get_height()):
-                continue
-            
-            # 繪製樹木
-            for tree in forest_area['trees']:
-                tx, ty = tree['position']
-                screen_x = tx - camera_x
-                screen_y = ty - camera_y
-                
-                # 繪製樹冠
-                pygame.draw.circle(screen, tree['color'], (int(screen_x), int(screen_y)), tree['size'] // 2)
-                
-                # 繪製樹幹
-                trunk_rect = pygame.Rect(screen_x - 2, screen_y, 4, tree['size'] // 3)
-                pygame.draw.rect(screen, (101, 67, 33), trunk_rect)
-            
-            # 繪製資源
-            for resource in forest_area['resources']:
-                if resource['collected']:
-                    continue
-                    
-                rx, ry = resource['position']
-                screen_x = rx - camera_x
-                screen_y = ry - camera_y
-                
-                pygame.draw.circle(screen, resource['color'], (int(screen_x), int(screen_y)), 4)
+        if self.chunk_renderer is None:
+            return
+        
+        self.chunk_renderer.draw_static_layer(screen, camera_x, camera_y)
 
-    def draw_water_elements(self, screen, camera_x, camera_y):
+    def draw_decoration_overlay(self, screen, camera_x, camera_y):
         """
-        繪製水體元素 - 純淨的水體，不繪製任何額外物件\n
+        繪製會改變的裝飾 - 樹木、森林資源、農地作物、蔬果園作物和收穫提示\n
         \n
-        參數:\n
-        screen (pygame.Surface): 繪製目標表面\n
-        camera_x (float): 攝影機X偏移\n
-        camera_y (float): 攝影機Y偏移\n
-        """
-        for water_area in self.water_areas:
-            # 檢查水體區域是否在可見範圍內
-            wx, wy, ww, wh = water_area['world_bounds']
-            if (wx + ww < camera_x or wx > camera_x + screen.get_width() or
-                wy + wh < camera_y or wy > camera_y + screen.get_height()):
-                continue
-            
-            # 繪製簡單的水波效果（可選）
-            for i in range(3):
-                wave_y = wy + (i + 1) * (wh / 4)
-                screen_wave_y = wave_y - camera_y
-                pygame.draw.line(screen, (100, 150, 255), 
-                               (wx - camera_x, screen_wave_y), 
-                               (wx + ww - camera_x, screen_wave_y), 1)
-            
-            # 移除水邊資源繪製 - 保持水體純淨
-
-    def draw_vegetable_gardens(self, screen, camera_x, camera_y):
-        """
-        繪製蔬果園\n
+        同樣以區塊圖片快取，只有狀態改變的區塊會重新烘焙（見 mark_decorations_dirty）\n
         \n
         參數:\n
         screen (pygame.Surface): 繪製目標表面\n
         camera_x (float): 攝影機X偏移\n
         camera_y (float): 攝影機Y偏移\n
         """
-        for garden in self.vegetable_gardens:
-            gx, gy = garden['position']
-            screen_x = gx - camera_x
-            screen_y = gy - camera_y
-            
-            # 繪製蔬果園邊界
-            garden_rect = pygame.Rect(screen_x, screen_y, garden['size'], garden['size'])
-            pygame.draw.rect(screen, garden['color'], garden_rect)
-            pygame.draw.rect(screen, (0, 100, 0), garden_rect, 2)
-            
-            # 繪製農作物
-            for crop in garden['crops']:
-                if crop['harvested']:
-                    continue
-                    
-                cx, cy = crop['position']
-                crop_screen_x = cx - camera_x
-                crop_screen_y = cy - camera_y
-                
-                # 根據生長階段調整大小
-                growth_factor = (garden['growth_stage'] + 1) / 4.0
-                crop_size = max(2, int(4 * growth_factor))
-                
-                pygame.draw.circle(screen, crop['color'], 
-                                 (int(crop_screen_x), int(crop_screen_y)), crop_size)
-            
-            # 如果可以收穫，顯示提示
-            if garden['harvest_ready']:
-                font = self.font_manager.get_font(12)
-                ready_text = font.render("可收穫", True, (255, 255, 0))
-                screen.blit(ready_text, (screen_x, screen_y - 15))
+        if self.chunk_renderer is None:
+            return
+        
+        self.chunk_renderer.draw_overlay_layer(screen, camera_x, camera_y)
 
-    def draw_farm_areas(self, screen, camera_x, camera_y):
+    def mark_decorations_dirty(self, world_rect):
         """
-        繪製農地區域\n
+        樹木、資源、作物或蔬果園狀態改變後呼叫，讓該範圍的裝飾重新烘焙\n
         \n
         參數:\n
-        screen (pygame.Surface): 繪製目標表面\n
-        camera_x (float): 攝影機X偏移\n
-        camera_y (float): 攝影機Y偏移\n
+        world_rect (pygame.Rect): 改變的裝飾範圍（世界座標）\n
         """
-        for farm in self.farm_areas:
-            fx, fy = farm['position']
-            fw, fh = farm['size']
-            
-            # 計算螢幕位置
-            screen_x = fx - camera_x
-            screen_y = fy - camera_y
-            
-            # 檢查是否在螢幕範圍內
-            if (screen_x + fw < 0 or screen_x > screen.get_width() or
-                screen_y + fh < 0 or screen_y > screen.get_height()):
-                continue
-            
-            # 繪製農地基底（已在地形層繪製，這裡添加細節）
-            farm_rect = pygame.Rect(screen_x, screen_y, fw, fh)
-            
-            # 根據耕作狀態繪製不同效果
-            if farm['is_tilled']:
-                # 已耕作：繪製耕作溝紋
-                num_furrows = 4  # 犁溝數量
-                furrow_spacing = fh // num_furrows
-                
-                for i in range(num_furrows):
-                    furrow_y = screen_y + i * furrow_spacing + furrow_spacing // 2
-                    pygame.draw.line(screen, (139, 69, 19), 
-                                   (screen_x + 2, furrow_y), 
-                                   (screen_x + fw - 2, furrow_y), 1)
-            else:
-                # 未耕作：繪製雜草效果
-                for i in range(8):
-                    grass_x = screen_x + random.randint(2, fw - 2)
-                    grass_y = screen_y + random.randint(2, fh - 2)
-                    pygame.draw.circle(screen, (46, 125, 50), (grass_x, grass_y), 1)
-            
-            # 根據作物類型和生長階段繪製作物
-            if farm['is_tilled'] and farm['growth_stage'] > 0:
-                crop_color = self._get_crop_color(farm['crop_type'], farm['growth_stage'])
-                crop_size = max(1, farm['growth_stage'])  # 生長階段決定大小
-                
-                # 在農田中繪製作物（簡化的網格排列）
-                crops_per_row = 3
-                crop_spacing_x = fw // (crops_per_row + 1)
-                crop_spacing_y = fh // (crops_per_row + 1)
-                
-                for row in range(crops_per_row):
-                    for col in range(crops_per_row):
-                        crop_x = screen_x + (col + 1) * crop_spacing_x
-                        crop_y = screen_y + (row + 1) * crop_spacing_y
-                        
-                        pygame.draw.circle(screen, crop_color, 
-                                         (crop_x, crop_y), crop_size)
-            
-            # 繪製農地邊界（淡色）
-            pygame.draw.rect(screen, (101, 67, 33), farm_rect, 1)
+        if self.chunk_renderer is not None:
+            self.chunk_renderer.invalidate_overlay(world_rect)
 
     def _get_crop_color(self, crop_type, growth_stage):
         """
@@ -1248,7 +1112,29 @@ class TerrainBasedSystem:
         camera_y (float): 攝影機Y偏移\n
         font_manager: 字體管理器（用於顯示家的文字）\n
         """
-        for building in self.buildings:
+        if not self.power_manager:
+            self._draw_building_list(screen, self.buildings, camera_x, camera_y)
+            return
+
+        # 以電力區域為單位繪製：整區在畫面外就略過，區內有電、停電的建築分批繪製
+        view = pygame.Rect(camera_x, camera_y, screen.get_width(), screen.get_height())
+        for area_id, extent in self.power_area_extents.items():
+            if not extent.colliderect(view):
+                continue
+
+            lit_buildings, unlit_buildings = self._get_power_draw_batch(area_id)
+            self._draw_building_list(screen, lit_buildings, camera_x, camera_y)
+            self._draw_building_list(screen, unlit_buildings, camera_x, camera_y, dimmed=True)
+
+    def _draw_building_list(self, screen, buildings, camera_x, camera_y, dimmed=False):
+        """
+        繪製一批建築\n
+        \n
+        參數:\n
+        buildings (list): 要繪製的建築列表\n
+        dimmed (bool): 是否以停電的暗色繪製\n
+        """
+        for building in buildings:
             # 檢查建築是否在可見範圍內
             if (building.x + building.width < camera_x or building.x > camera_x + screen.get_width() or
                 building.y + building.height < camera_y or building.y > camera_y + screen.get_height()):
@@ -1261,26 +1147,105 @@ class TerrainBasedSystem:
             # 創建螢幕矩形
             screen_rect = pygame.Rect(screen_x, screen_y, building.width, building.height)
             
-            # 繪製建築
-            pygame.draw.rect(screen, building.color, screen_rect)
+            # 繪製建築（停電的建築顏色減半）
+            color = [channel // 2 for channel in building.color[:3]] if dimmed else building.color
+            pygame.draw.rect(screen, color, screen_rect)
             pygame.draw.rect(screen, (0, 0, 0), screen_rect, 1)
             
             # 建築物名稱顯示已移除（依據新需求）
             
             # 玩家家的特殊文字顯示也已移除（依據新需求）
 
-    def update(self, dt):
+    def connect_power_manager(self, power_manager):
+        """
+        連接電力管理器，停電區域的建築會以較暗的顏色繪製\n
+        \n
+        電力管理器把建築依中心點分到電力區域，繪製時以區域為單位批次處理，\n
+        區域的繪製批次只在該區停電、復電時重建\n
+        \n
+        參數:\n
+        power_manager (PowerManager): 電力管理器\n
+        """
+        if self.power_manager:
+            self.power_manager.unsubscribe_power_changes(self._on_area_power_changed)
+
+        self.power_manager = power_manager
+        power_manager.assign_buildings(self.buildings)
+
+        self.power_area_extents = {}
+        for area_id, area_info in power_manager.power_areas.items():
+            if area_info["buildings"]:
+                rects = [building.rect for building in area_info["buildings"]]
+                self.power_area_extents[area_id] = rects[0].unionall(rects[1:])
+
+        self.power_draw_batches = {}
+        power_manager.subscribe_power_changes(self._on_area_power_changed)
+
+    def _get_power_draw_batch(self, area_id):
+        """
+        取得電力區域的繪製批次（有電建築列表, 停電建築列表），沒有的話重建\n
+        """
+        batch = self.power_draw_batches.get(area_id)
+        if batch is None:
+            buildings = self.power_manager.power_areas[area_id]["buildings"]
+            batch = (
+                [building for building in buildings if building.has_power],
+                [building for building in buildings if not building.has_power],
+            )
+            self.power_draw_batches[area_id] = batch
+        return batch
+
+    def _on_area_power_changed(self, area_id, has_power):
+        """
+        電力管理器推送的區域供電變化，讓該區的繪製批次失效\n
+        \n
+        參數:\n
+        area_id (int): 電力區域 ID\n
+        has_power (bool): 該區域是否有電\n
+        """
+        self.power_draw_batches.pop(area_id, None)
+
+    def update(self, dt, update_railway=True):
         """
         更新地形系統（主要更新鐵路系統和蔬果園）\n
         \n
         參數:\n
         dt (float): 時間增量\n
+        update_railway (bool): 是否更新鐵路系統（由模擬子程序負責時為 False）\n
         """
         # 更新鐵路系統
-        self.railway_system.update(dt)
+        if update_railway:
+            self.railway_system.update(dt)
         
         # 更新蔬果園（每日成熟檢查）
-        self._update_vegetable_gardens()
+        self._update_vegetable_gardens(dt)
+
+    def update_terrain_paging(self, camera_center, player_position):
+        """
+        讓攝影機和玩家模擬半徑附近的地形區塊常駐，其他區塊交還給作業系統\n
+        \n
+        只有中心點跨到另一個區塊時才重新計算\n
+        \n
+        參數:\n
+        camera_center (tuple): 攝影機中心的世界座標\n
+        player_position (tuple): 玩家世界座標\n
+        """
+        if self.terrain_store is None:
+            return
+        
+        shift = self.terrain_store.chunk_shift
+        centers = [
+            (int(camera_center[0] // self.tile_size), int(camera_center[1] // self.tile_size)),
+            (int(player_position[0] // self.tile_size), int(player_position[1] // self.tile_size)),
+        ]
+        paging_key = tuple((x >> shift, y >> shift) for x, y in centers)
+        if paging_key == getattr(self, "_terrain_paging_key", None):
+            return
+        self._terrain_paging_key = paging_key
+        
+        # 半徑涵蓋半個螢幕加上 NPC 模擬半徑
+        radius_pixels = max(SCREEN_WIDTH, SCREEN_HEIGHT) / 2 + NPC_SIMULATION_RADIUS
+        self.terrain_store.page_in(centers, int(radius_pixels // self.tile_size) + 1)
 
     def get_statistics(self):
         """
@@ -1303,7 +1268,9 @@ class TerrainBasedSystem:
             'trains': railway_stats['trains'],
             'railway_tracks': railway_stats['railway_tracks'],
             'forest_resources': len([r for r in self.forest_resources if not r['collected']]),
-            'water_resources': len([r for r in self.water_resources if not r['collected']])
+            'water_resources': len([r for r in self.water_resources if not r['collected']]),
+            'terrain_store': self.terrain_store.get_statistics() if self.terrain_store else None,
+            'terrain_components': self.terrain_components.get_statistics() if self.terrain_components else None,
         }
 
     def get_terrain_at_position(self, world_x, world_y):
@@ -1321,103 +1288,61 @@ class TerrainBasedSystem:
         grid_x = int(world_x // self.tile_size)
         grid_y = int(world_y // self.tile_size)
         
-        # 檢查是否在地圖範圍內
-        if (0 <= grid_x < self.map_width and 0 <= grid_y < self.map_height):
-            return self.map_data[grid_y][grid_x]
-        else:
-            return 0  # 超出範圍默認為草地
+        # 超出範圍默認為草地
+        terrain_code = self.terrain_store.get_terrain_at(grid_x, grid_y) if self.terrain_store else None
+        return 0 if terrain_code is None else terrain_code
 
     def get_areas_by_terrain_type(self, terrain_type):
         """
         獲取指定地形類型的所有區域\n
         \n
+        區域來自連通區域標記，地形有變更時才增量更新，結果依地形快取\n
+        \n
         參數:\n
         terrain_type (int): 地形代碼\n
         \n
         回傳:\n
-        list: 區域列表，每個區域為 (x, y, width, height) 元組\n
-        """
-        areas = []
-        visited = set()
-        
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                if (x, y) in visited:
-                    continue
-                
-                if self.map_data[y][x] == terrain_type:
-                    # 找到符合的地形，使用洪水填充算法找出整個區域
-                    area = self._flood_fill_area(x, y, terrain_type, visited)
-                    if area:
-                        areas.append(area)
-        
-        return areas
+        list: 區域列表，每個區域為 (x, y, width, height) 元組，使用世界座標\n
+        """
+        if self.terrain_components is None:
+            return []
+        
+        self.terrain_components.refresh()
+        if self._area_cache_revision != self.terrain_components.revision:
+            self._area_cache = {}
+            self._area_cache_revision = self.terrain_components.revision
+        
+        areas = self._area_cache.get(terrain_type)
+        if areas is None:
+            tile_size = self.tile_size
+            areas = [
+                (component.min_x * tile_size, component.min_y * tile_size,
+                 (component.max_x - component.min_x + 1) * tile_size,
+                 (component.max_y - component.min_y + 1) * tile_size)
+                for component in self.terrain_components.get_components(terrain_type)
+            ]
+            self._area_cache[terrain_type] = areas
+        
+        return list(areas)
 
-    def _flood_fill_area(self, start_x, start_y, terrain_type, visited):
+    def get_area_at_position(self, world_x, world_y):
         """
-        使用洪水填充算法計算連續地形區域\n
+        獲取指定世界座標所在的連通地形區域\n
         \n
         參數:\n
-        start_x (int): 起始X格子座標\n
-        start_y (int): 起始Y格子座標\n
-        terrain_type (int): 目標地形類型\n
-        visited (set): 已訪問的格子集合\n
+        world_x (float): 世界座標 X\n
+        world_y (float): 世界座標 Y\n
         \n
         回傳:\n
-        tuple: (x, y, width, height) 區域邊界，使用世界座標\n
+        TerrainComponent: 區域統計（地形、格數、邊界、重心），超出範圍回傳 None\n
         """
-        if (start_x, start_y) in visited:
-            return None
-        
-        if (start_x < 0 or start_x >= self.map_width or 
-            start_y < 0 or start_y >= self.map_height):
-            return None
-        
-        if self.map_data[start_y][start_x] != terrain_type:
-            return None
-        
-        # BFS 洪水填充
-        queue = [(start_x, start_y)]
-        area_cells = []
-        
-        while queue:
-            x, y = queue.pop(0)
-            
-            if (x, y) in visited:
-                continue
-            
-            if (x < 0 or x >= self.map_width or 
-                y < 0 or y >= self.map_height):
-                continue
-            
-            if self.map_data[y][x] != terrain_type:
-                continue
-            
-            visited.add((x, y))
-            area_cells.append((x, y))
-            
-            # 檢查四個方向的鄰接格子
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (nx, ny) not in visited:
-                    queue.append((nx, ny))
-        
-        if not area_cells:
+        if self.terrain_components is None:
             return None
         
-        # 計算區域邊界
-        min_x = min(cell[0] for cell in area_cells)
-        max_x = max(cell[0] for cell in area_cells)
-        min_y = min(cell[1] for cell in area_cells)
-        max_y = max(cell[1] for cell in area_cells)
-        
-        # 轉換為世界座標
-        world_x = min_x * self.tile_size
-        world_y = min_y * self.tile_size
-        world_width = (max_x - min_x + 1) * self.tile_size
-        world_height = (max_y - min_y + 1) * self.tile_size
-        
-        return (world_x, world_y, world_width, world_height)
+        self.terrain_components.refresh()
+        return self.terrain_components.get_component_at(
+            int(world_x // self.tile_size), int(world_y // self.tile_size)
+        )
 
     def check_tree_collision(self, player_rect):
         """
@@ -1429,12 +1354,37 @@ class TerrainBasedSystem:
         回傳:\n
         bool: 如果與樹木碰撞則回傳 True\n
         """
-        for forest_area in self.forest_areas:
+        # 樹冠可能略超出所在格子，多查一圈相鄰格子
+        for forest_area in self._iter_forest_areas_in_range(
+            player_rect.left - self.tile_size, player_rect.top - self.tile_size,
+            player_rect.right + self.tile_size, player_rect.bottom + self.tile_size
+        ):
             for tree in forest_area['trees']:
                 if player_rect.colliderect(tree['collision_rect']):
                     return True
         return False
 
+    def _iter_forest_areas_in_range(self, left, top, right, bottom):
+        """
+        列出與世界座標範圍重疊的森林格子\n
+        \n
+        參數:\n
+        left (float): 範圍左邊界\n
+        top (float): 範圍上邊界\n
+        right (float): 範圍右邊界\n
+        bottom (float): 範圍下邊界\n
+        """
+        min_x = max(0, int(left // self.tile_size))
+        min_y = max(0, int(top // self.tile_size))
+        max_x = min(self.map_width - 1, int(right // self.tile_size))
+        max_y = min(self.map_height - 1, int(bottom // self.tile_size))
+        lookup = self.forest_area_lookup
+        for y in range(min_y, max_y + 1):
+            for x in range(min_x, max_x + 1):
+                forest_area = lookup.get((x, y))
+                if forest_area is not None:
+                    yield forest_area
+
     def check_water_collision(self, world_x, world_y):
         """
         檢查指定位置是否為水域（不可通行）\n
@@ -1512,7 +1462,9 @@ class TerrainBasedSystem:
         closest_tree = None
         closest_distance = float('inf')
         
-        for forest_area in self.forest_areas:
+        for forest_area in self._iter_forest_areas_in_range(
+            px - max_distance, py - max_distance, px + max_distance, py + max_distance
+        ):
             for i, tree in enumerate(forest_area['trees']):
                 tx, ty = tree['position']
                 distance = math.sqrt((px - tx) ** 2 + (py - ty) ** 2)
@@ -1549,6 +1501,7 @@ class TerrainBasedSystem:
         
         # 從森林區域中移除樹木
         forest_area['trees'].pop(tree_index)
+        self.mark_decorations_dirty(TerrainChunkRenderer.get_forest_area_bounds(forest_area))
         
         # 給玩家獎勵
         player.add_money(100)
@@ -1617,21 +1570,24 @@ class TerrainBasedSystem:
         """
         return self.railway_system.can_cross_railway(position)
     
-    def _update_vegetable_gardens(self):
+    def _update_vegetable_gardens(self, dt):
         """
         更新蔬果園狀態\n
         根據新需求：蔬果園每天成熟一次\n
+        \n
+        參數:\n
+        dt (float): 時間增量（秒）\n
         """
         # 這裡需要從時間管理器獲取當前遊戲日
-        # 暫時使用簡單的計數器模擬日期變化
-        if not hasattr(self, '_garden_update_counter'):
-            self._garden_update_counter = 0
+        # 暫時使用簡單的計時器模擬日期變化
+        if not hasattr(self, '_garden_update_timer'):
+            self._garden_update_timer = 0.0
         
-        self._garden_update_counter += 1
+        self._garden_update_timer += dt
         
-        # 每1800幀（約30秒）模擬一天
-        if self._garden_update_counter >= 1800:
-            self._garden_update_counter = 0
+        # 每 VEGETABLE_GARDEN_SIMULATED_DAY_TIME 秒模擬一天
+        if self._garden_update_timer >= VEGETABLE_GARDEN_SIMULATED_DAY_TIME:
+            self._garden_update_timer = 0.0
             current_day = getattr(self, '_current_game_day', 0) + 1
             self._current_game_day = current_day
             
@@ -1642,11 +1598,17 @@ class TerrainBasedSystem:
                     garden['last_harvest_day'] = -1
                 
                 if garden['last_harvest_day'] < current_day:
+                    # 已經是成熟狀態的蔬果園不需要重新烘焙
+                    if (garden['harvest_ready'] and garden['growth_stage'] == 3
+                            and not any(crop['harvested'] for crop in garden['crops'])):
+                        continue
+                    
                     # 重置農作物為可收穫狀態
                     garden['harvest_ready'] = True
                     garden['growth_stage'] = 3  # 完全成熟
                     for crop in garden['crops']:
                         crop['harvested'] = False
+                    self.mark_decorations_dirty(TerrainChunkRenderer.get_garden_bounds(garden))
     
     def harvest_vegetable_garden(self, player_position, player):
         """
@@ -1680,6 +1642,7 @@ class TerrainBasedSystem:
                         garden['harvest_ready'] = False
                         garden['growth_stage'] = 0
                         garden['last_harvest_day'] = getattr(self, '_current_game_day', 0)
+                        self.mark_decorations_dirty(TerrainChunkRenderer.get_garden_bounds(garden))
                         
                         # 給予玩家金錢
                         harvest_income = VEGETABLE_GARDEN_HARVEST_INCOME
@@ -0,0 +1,331 @@
+######################載入套件######################
+import random
+from collections import OrderedDict
+import pygame
+from config.settings import TERRAIN_RENDER_CHUNK_TILES, TERRAIN_RENDER_CHUNK_CACHE_SIZE
+
+# 水體格子的顏色（比地形預設顏色更明顯）
+WATER_COLOR = (30, 144, 255)
+WATER_WAVE_COLOR = (100, 150, 255)
+
+# 樹冠、資源超出所在格子的最大距離（像素）
+FOREST_OVERHANG = 8
+
+# 蔬果園「可收穫」提示文字的範圍（相對蔬果園左上角）
+GARDEN_LABEL_OFFSET = 15
+GARDEN_LABEL_WIDTH = 48
+
+
+######################地形區塊繪製器######################
+class TerrainChunkRenderer:
+    """
+    地形區塊繪製器 - 地形和裝飾預先烘焙成區塊圖片，每幀只貼上可見的區塊\n
+    \n
+    分成兩層，各自以 LRU 保留最近使用的區塊：\n
+    - 靜態層：地形顏色、水波紋、農地犁溝和邊框、蔬果園底色，只在地形改變時重新烘焙\n
+    - 動態層：樹木、森林資源、農地作物、蔬果園作物和提示，\n
+      狀態改變（砍樹、拾取、收穫、成熟）時由地形系統標記，只重新烘焙受影響的區塊\n
+    \n
+    每個裝飾依涵蓋範圍登記到所有重疊的區塊，跨區塊的樹冠和提示文字也能完整繪製\n
+    """
+
+    def __init__(self, terrain_system, chunk_tiles=TERRAIN_RENDER_CHUNK_TILES,
+                 cache_size=TERRAIN_RENDER_CHUNK_CACHE_SIZE):
+        """
+        初始化地形區塊繪製器\n
+        \n
+        參數:\n
+        terrain_system (TerrainBasedSystem): 地形系統（地圖和裝飾需已建立）\n
+        chunk_tiles (int): 區塊邊長（格數）\n
+        cache_size (int): 每層最多保留的區塊數\n
+        """
+        self.terrain_system = terrain_system
+        self.tile_size = terrain_system.tile_size
+        self.chunk_tiles = max(1, chunk_tiles)
+        self.chunk_pixels = self.chunk_tiles * self.tile_size
+        self.cache_size = max(1, cache_size)
+        self.chunks_x = (terrain_system.map_width + self.chunk_tiles - 1) // self.chunk_tiles
+        self.chunks_y = (terrain_system.map_height + self.chunk_tiles - 1) // self.chunk_tiles
+
+        self.static_chunks = OrderedDict()  # {(區塊 x, 區塊 y): Surface}
+        self.overlay_chunks = OrderedDict()  # {(區塊 x, 區塊 y): Surface，沒有動態裝飾時為 None}
+        self.static_items = {}  # {(區塊 x, 區塊 y): [(繪製函式, 裝飾)]}
+        self.overlay_items = {}  # {(區塊 x, 區塊 y): [(繪製函式, 裝飾)]}
+        self.terrain_revision = terrain_system.terrain_store.revision
+
+        self._index_decorations()
+
+    ######################裝飾索引######################
+    def _index_decorations(self):
+        """
+        把農地、蔬果園、森林登記到涵蓋範圍重疊的區塊\n
+        """
+        terrain_system = self.terrain_system
+
+        for farm in terrain_system.farm_areas:
+            self._register(self.static_items, farm['rect'], self._draw_farm_plot, farm)
+            self._register(self.overlay_items, farm['rect'], self._draw_farm_crops, farm)
+
+        for garden in terrain_system.vegetable_gardens:
+            garden_x, garden_y = garden['position']
+            plot_rect = pygame.Rect(garden_x, garden_y, garden['size'], garden['size'])
+            self._register(self.static_items, plot_rect, self._draw_garden_plot, garden)
+            self._register(self.overlay_items, self.get_garden_bounds(garden), self._draw_garden_crops, garden)
+
+        for forest_area in terrain_system.forest_areas:
+            self._register(self.overlay_items, self.get_forest_area_bounds(forest_area),
+                           self._draw_forest_area, forest_area)
+
+    def _register(self, items, rect, draw_function, decoration):
+        """
+        把裝飾登記到所有和 rect 重疊的區塊\n
+        """
+        for chunk in self._chunks_in_rect(rect):
+            items.setdefault(chunk, []).append((draw_function, decoration))
+
+    def _chunks_in_rect(self, rect):
+        """
+        和世界座標矩形重疊的區塊\n
+        """
+        first_x = max(0, rect.left // self.chunk_pixels)
+        last_x = min(self.chunks_x - 1, (rect.right - 1) // self.chunk_pixels)
+        first_y = max(0, rect.top // self.chunk_pixels)
+        last_y = min(self.chunks_y - 1, (rect.bottom - 1) // self.chunk_pixels)
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                yield chunk_x, chunk_y
+
+    @staticmethod
+    def get_forest_area_bounds(forest_area):
+        """
+        森林格子的裝飾範圍（包含超出格子的樹冠）\n
+        """
+        return pygame.Rect(forest_area['world_bounds']).inflate(FOREST_OVERHANG * 2, FOREST_OVERHANG * 2)
+
+    @staticmethod
+    def get_garden_bounds(garden):
+        """
+        蔬果園的裝飾範圍（包含上方的提示文字）\n
+        """
+        garden_x, garden_y = garden['position']
+        return pygame.Rect(garden_x, garden_y - GARDEN_LABEL_OFFSET, max(garden['size'], GARDEN_LABEL_WIDTH),
+                           garden['size'] + GARDEN_LABEL_OFFSET)
+
+    ######################失效######################
+    def invalidate_overlay(self, rect):
+        """
+        動態裝飾狀態改變，丟掉和 rect 重疊的動態層區塊（下次繪製時重新烘焙）\n
+        \n
+        參數:\n
+        rect (pygame.Rect): 改變的裝飾範圍（世界座標）\n
+        """
+        for chunk in self._chunks_in_rect(pygame.Rect(rect)):
+            self.overlay_chunks.pop(chunk, None)
+
+    def _sync_terrain_revision(self):
+        """
+        地形改變（例如編輯器）時丟掉受影響的靜態層區塊\n
+        """
+        terrain_store = self.terrain_system.terrain_store
+        if terrain_store.revision == self.terrain_revision:
+            return
+
+        changed_tiles = terrain_store.changes_since(self.terrain_revision)
+        self.terrain_revision = terrain_store.revision
+        if changed_tiles is None:
+            self.static_chunks.clear()
+            return
+        for tile_x, tile_y in changed_tiles:
+            self.static_chunks.pop((tile_x // self.chunk_tiles, tile_y // self.chunk_tiles), None)
+
+    ######################繪製######################
+    def draw_static_layer(self, screen, camera_x, camera_y):
+        """
+        貼上可見範圍的靜態層區塊\n
+        """
+        self._sync_terrain_revision()
+        self._draw_layer(screen, camera_x, camera_y, self.static_chunks, self._bake_static_chunk)
+
+    def draw_overlay_layer(self, screen, camera_x, camera_y):
+        """
+        貼上可見範圍的動態層區塊\n
+        """
+        self._draw_layer(screen, camera_x, camera_y, self.overlay_chunks, self._bake_overlay_chunk)
+
+    def _draw_layer(self, screen, camera_x, camera_y, cache, bake):
+        """
+        貼上可見範圍的區塊，沒有快取的區塊先烘焙\n
+        """
+        chunk_pixels = self.chunk_pixels
+        first_x = max(0, int(camera_x // chunk_pixels))
+        first_y = max(0, int(camera_y // chunk_pixels))
+        last_x = min(self.chunks_x - 1, int((camera_x + screen.get_width()) // chunk_pixels))
+        last_y = min(self.chunks_y - 1, int((camera_y + screen.get_height()) // chunk_pixels))
+
+        blits = []
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                chunk = (chunk_x, chunk_y)
+                if chunk in cache:
+                    cache.move_to_end(chunk)
+                    surface = cache[chunk]
+                else:
+                    surface = bake(chunk_x, chunk_y)
+                    cache[chunk] = surface
+                    if len(cache) > self.cache_size:
+                        cache.popitem(last=False)
+                if surface is not None:
+                    blits.append((surface, (chunk_x * chunk_pixels - camera_x, chunk_y * chunk_pixels - camera_y)))
+
+        screen.blits(blits, False)
+
+    ######################烘焙######################
+    def _bake_static_chunk(self, chunk_x, chunk_y):
+        """
+        烘焙一個靜態層區塊：地形顏色、水波紋、農地和蔬果園的底\n
+        """
+        terrain_system = self.terrain_system
+        tile_size = self.tile_size
+        surface = pygame.Surface((self.chunk_pixels, self.chunk_pixels))
+        origin_x = chunk_x * self.chunk_pixels
+        origin_y = chunk_y * self.chunk_pixels
+
+        start_x = chunk_x * self.chunk_tiles
+        start_y = chunk_y * self.chunk_tiles
+        width = min(self.chunk_tiles, terrain_system.map_width - start_x)
+        height = min(self.chunk_tiles, terrain_system.map_height - start_y)
+        rows = terrain_system.terrain_store.read_region(start_x, start_y, width, height)
+
+        for row_index, row in enumerate(rows):
+            local_y = row_index * tile_size
+            for column_index, terrain_code in enumerate(row):
+                local_x = column_index * tile_size
+                if terrain_code == 2:
+                    surface.fill(WATER_COLOR, (local_x, local_y, tile_size, tile_size))
+                    # 簡單的水波紋
+                    for wave in range(3):
+                        wave_y = local_y + (wave + 1) * (tile_size / 4)
+                        pygame.draw.line(surface, WATER_WAVE_COLOR, (local_x, wave_y),
+                                         (local_x + tile_size, wave_y), 1)
+                else:
+                    surface.fill(terrain_system.terrain_loader.get_terrain_color(terrain_code),
+                                 (local_x, local_y, tile_size, tile_size))
+
+        for draw_function, decoration in self.static_items.get((chunk_x, chunk_y), ()):
+            draw_function(surface, decoration, origin_x, origin_y)
+
+        return surface
+
+    def _bake_overlay_chunk(self, chunk_x, chunk_y):
+        """
+        烘焙一個動態層區塊，沒有任何動態裝飾時回傳 None\n
+        """
+        items = self.overlay_items.get((chunk_x, chunk_y))
+        if not items:
+            return None
+
+        surface = pygame.Surface((self.chunk_pixels, self.chunk_pixels), pygame.SRCALPHA)
+        origin_x = chunk_x * self.chunk_pixels
+        origin_y = chunk_y * self.chunk_pixels
+        for draw_function, decoration in items:
+            draw_function(surface, decoration, origin_x, origin_y)
+        return surface
+
+    ######################裝飾繪製######################
+    def _draw_farm_plot(self, surface, farm, origin_x, origin_y):
+        """
+        農地的犁溝或雜草，以及邊框（雜草位置以格子座標為種子，重新烘焙時不變）\n
+        """
+        farm_x, farm_y = farm['position']
+        farm_width, farm_height = farm['size']
+        local_x = farm_x - origin_x
+        local_y = farm_y - origin_y
+
+        if farm['is_tilled']:
+            # 已耕作：繪製耕作溝紋
+            num_furrows = 4  # 犁溝數量
+            furrow_spacing = farm_height // num_furrows
+            for i in range(num_furrows):
+                furrow_y = local_y + i * furrow_spacing + furrow_spacing // 2
+                pygame.draw.line(surface, (139, 69, 19), (local_x + 2, furrow_y),
+                                 (local_x + farm_width - 2, furrow_y), 1)
+        else:
+            # 未耕作：繪製雜草效果
+            rng = random.Random(hash(farm['grid_pos']))
+            for _ in range(8):
+                grass_x = local_x + rng.randint(2, farm_width - 2)
+                grass_y = local_y + rng.randint(2, farm_height - 2)
+                pygame.draw.circle(surface, (46, 125, 50), (grass_x, grass_y), 1)
+
+        # 繪製農地邊界（淡色）
+        pygame.draw.rect(surface, (101, 67, 33), (local_x, local_y, farm_width, farm_height), 1)
+
+    def _draw_farm_crops(self, surface, farm, origin_x, origin_y):
+        """
+        農地作物（依作物類型和生長階段決定顏色、大小）\n
+        """
+        if not farm['is_tilled'] or farm['growth_stage'] <= 0:
+            return
+
+        farm_x, farm_y = farm['position']
+        farm_width, farm_height = farm['size']
+        crop_color = self.terrain_system._get_crop_color(farm['crop_type'], farm['growth_stage'])
+        crop_size = max(1, farm['growth_stage'])  # 生長階段決定大小
+
+        # 在農田中繪製作物（簡化的網格排列）
+        crops_per_row = 3
+        crop_spacing_x = farm_width // (crops_per_row + 1)
+        crop_spacing_y = farm_height // (crops_per_row + 1)
+        for row in range(crops_per_row):
+            for col in range(crops_per_row):
+                crop_x = farm_x - origin_x + (col + 1) * crop_spacing_x
+                crop_y = farm_y - origin_y + (row + 1) * crop_spacing_y
+                pygame.draw.circle(surface, crop_color, (crop_x, crop_y), crop_size)
+
+    def _draw_garden_plot(self, surface, garden, origin_x, origin_y):
+        """
+        蔬果園底色和邊框\n
+        """
+        garden_x, garden_y = garden['position']
+        garden_rect = pygame.Rect(garden_x - origin_x, garden_y - origin_y, garden['size'], garden['size'])
+        pygame.draw.rect(surface, garden['color'], garden_rect)
+        pygame.draw.rect(surface, (0, 100, 0), garden_rect, 2)
+
+    def _draw_garden_crops(self, surface, garden, origin_x, origin_y):
+        """
+        蔬果園未收穫的作物和「可收穫」提示\n
+        """
+        # 根據生長階段調整大小
+        growth_factor = (garden['growth_stage'] + 1) / 4.0
+        crop_size = max(2, int(4 * growth_factor))
+        for crop in garden['crops']:
+            if crop['harvested']:
+                continue
+            crop_x, crop_y = crop['position']
+            pygame.draw.circle(surface, crop['color'], (int(crop_x - origin_x), int(crop_y - origin_y)), crop_size)
+
+        # 如果可以收穫，顯示提示
+        if garden['harvest_ready']:
+            garden_x, garden_y = garden['position']
+            font = self.terrain_system.font_manager.get_font(12)
+            ready_text = font.render("可收穫", True, (255, 255, 0))
+            surface.blit(ready_text, (garden_x - origin_x, garden_y - origin_y - GARDEN_LABEL_OFFSET))
+
+    def _draw_forest_area(self, surface, forest_area, origin_x, origin_y):
+        """
+        森林格子裡還在的樹木和還沒拾取的資源\n
+        """
+        for tree in forest_area['trees']:
+            tree_x, tree_y = tree['position']
+            local_x = tree_x - origin_x
+            local_y = tree_y - origin_y
+            # 繪製樹冠
+            pygame.draw.circle(surface, tree['color'], (int(local_x), int(local_y)), tree['size'] // 2)
+            # 繪製樹幹
+            pygame.draw.rect(surface, (101, 67, 33), (local_x - 2, local_y, 4, tree['size'] // 3))
+
+        for resource in forest_area['resources']:
+            if resource['collected']:
+                continue
+            resource_x, resource_y = resource['position']
+            pygame.draw.circle(surface, resource['color'], (int(resource_x - origin_x), int(resource_y - origin_y)), 4)
@@ -1,9 +1,9 @@
 ######################載入套件######################
 import pygame
 import random
-import time
 from config.settings import SCREEN_WIDTH, SCREEN_HEIGHT, VEGETABLE_GARDEN_REGROW_TIME
 from src.utils.font_manager import FontManager
+from src.core.game_clock import get_game_clock
 
 
 ######################蔬果園採集系統######################
@@ -137,7 +137,7 @@ class VegetableGardenSystem:
         參數:\n
         garden (dict): 蔬果園物件\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
         
         # 檢查是否到了重新生長時間
         if current_time - garden["last_harvest_time"] >= self.regrow_time:
@@ -223,7 +223,7 @@ class VegetableGardenSystem:
         
         # 標記為已採摘並記錄時間
         garden["is_ready"] = False
-        garden["last_harvest_time"] = time.time()
+        garden["last_harvest_time"] = get_game_clock().time()
         
         # 如果使用遊戲時間系統，也記錄遊戲時間
         if self.use_game_time and self.time_manager:
@@ -235,7 +235,7 @@ class VegetableGardenSystem:
         # 同步更新地形系統中的蔬果園狀態
         if "terrain_garden" in garden:
             garden["terrain_garden"]["harvest_ready"] = False
-            garden["terrain_garden"]["last_harvest_time"] = time.time()
+            garden["terrain_garden"]["last_harvest_time"] = get_game_clock().time()
         
         # 給玩家金錢獎勵
         if hasattr(player, 'money'):
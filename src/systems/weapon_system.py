@@ -1,8 +1,9 @@
 ######################載入套件######################
 import pygame
 import math
-import time
+from src.systems.projectile_system import get_projectile_system, PROJECTILE_OWNER_WEAPON
 from config.settings import *
+from src.core.game_clock import get_game_clock
 
 
 ######################武器類別######################
@@ -112,7 +113,7 @@ class Weapon:
         回傳:\n
         bool: 是否可以射擊\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
 
         # 空手武器不需要彈藥檢查
         if self.weapon_type == "unarmed":
@@ -171,7 +172,7 @@ class Weapon:
             # 消耗彈藥
             self.current_ammo -= 1
         
-        self.last_shot_time = time.time()
+        self.last_shot_time = get_game_clock().time()
 
         # 計算命中率 (考慮距離和武器精確度)
         distance_factor = max(0.2, 1.0 - (distance / self.range) * 0.5)
@@ -205,7 +206,7 @@ class Weapon:
             return False
 
         self.is_reloading = True
-        self.reload_start_time = time.time()
+        self.reload_start_time = get_game_clock().time()
         print(f"開始為 {self.name} 重新裝彈...")
         return True
 
@@ -219,7 +220,7 @@ class Weapon:
         if not self.is_reloading:
             return False
 
-        current_time = time.time()
+        current_time = get_game_clock().time()
         elapsed = current_time - self.reload_start_time
 
         if elapsed >= self.reload_time:
@@ -263,124 +264,30 @@ class Weapon:
         }
 
 
-######################子彈類別######################
-class Bullet:
-    """
-    子彈類別 - 處理子彈的飛行和碰撞\n
-    \n
-    管理子彈從發射到命中或消失的整個生命週期\n
-    包含飛行軌跡、碰撞檢測和視覺效果\n
-    """
-
-    def __init__(self, start_pos, target_pos, damage, speed=BULLET_SPEED):
-        """
-        初始化子彈\n
-        \n
-        參數:\n
-        start_pos (tuple): 起始位置 (x, y)\n
-        target_pos (tuple): 目標位置 (x, y)\n
-        damage (int): 傷害值\n
-        speed (float): 飛行速度\n
-        """
-        self.x, self.y = start_pos
-        self.damage = damage
-        self.speed = speed
-        self.is_active = True
-
-        # 計算飛行方向
-        dx = target_pos[0] - start_pos[0]
-        dy = target_pos[1] - start_pos[1]
-        distance = math.sqrt(dx**2 + dy**2)
-
-        if distance > 0:
-            self.velocity_x = (dx / distance) * speed
-            self.velocity_y = (dy / distance) * speed
-        else:
-            self.velocity_x = 0
-            self.velocity_y = 0
-
-        # 子彈生命週期
-        self.life_time = 0
-        self.max_life_time = 5.0  # 最大存在時間 (秒)
-
-    def update(self, dt):
-        """
-        更新子彈位置\n
-        \n
-        參數:\n
-        dt (float): 時間間隔\n
-        """
-        if not self.is_active:
-            return
-
-        # 更新位置
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-
-        # 更新生命時間
-        self.life_time += dt
-
-        # 檢查生命週期
-        if self.life_time >= self.max_life_time:
-            self.is_active = False
-
-    def check_collision(self, target_rect):
-        """
-        檢查與目標的碰撞\n
-        \n
-        參數:\n
-        target_rect (pygame.Rect): 目標碰撞框\n
-        \n
-        回傳:\n
-        bool: 是否碰撞\n
-        """
-        if not self.is_active:
-            return False
-
-        bullet_rect = pygame.Rect(int(self.x) - 2, int(self.y) - 2, 4, 4)
-
-        if bullet_rect.colliderect(target_rect):
-            self.is_active = False
-            return True
-
-        return False
-
-    def draw(self, screen):
-        """
-        繪製子彈\n
-        \n
-        參數:\n
-        screen (pygame.Surface): 繪製目標表面\n
-        """
-        if self.is_active:
-            # 繪製子彈 (小黃點)
-            pygame.draw.circle(screen, (255, 255, 0), (int(self.x), int(self.y)), 3)
-
-            # 繪製拖尾效果
-            trail_length = 10
-            trail_x = self.x - self.velocity_x * 0.1
-            trail_y = self.y - self.velocity_y * 0.1
-            pygame.draw.line(
-                screen, (255, 200, 0), (trail_x, trail_y), (self.x, self.y), 2
-            )
-
-
 ######################槍械管理器######################
 class WeaponManager:
     """
     槍械管理器 - 統一管理玩家的武器和射擊系統\n
     \n
-    負責武器切換、彈藥管理、射擊邏輯和子彈物理\n
+    負責武器切換、彈藥管理和射擊邏輯\n
     整合武器商店和彈藥補給系統\n
+    子彈發射到與射擊系統共用的子彈引擎，由場景統一推進和繪製\n
     """
 
-    def __init__(self):
+    # 武器子彈參數
+    BULLET_MAX_LIFE = 5.0  # 最大存在時間（秒）
+    BULLET_RADIUS = 2  # 碰撞半徑
+
+    def __init__(self, projectile_system=None):
         """
         初始化槍械管理器\n
+        \n
+        參數:\n
+        projectile_system (ProjectileSystem): 子彈引擎，None 表示使用全域共用引擎\n
         """
         self.weapons = {}  # 玩家擁有的武器
         self.current_weapon = None
-        self.bullets = []  # 活躍的子彈
+        self.projectiles = projectile_system or get_projectile_system()
 
         # 初始化玩家的手槍和空手
         initial_pistol = Weapon("pistol")
@@ -457,8 +364,8 @@ class WeaponManager:
                 print(f"空手攻擊! 距離: {result['distance']:.1f}, 命中: {result['hit']}, 傷害: {result['damage']}")
             else:
                 # 創建子彈
-                bullet = Bullet(shooter_position, target_position, result["damage"])
-                self.bullets.append(bullet)
+                self.projectiles.spawn(shooter_position, target_position, result["damage"], BULLET_SPEED,
+                                       self.BULLET_MAX_LIFE, self.BULLET_RADIUS, PROJECTILE_OWNER_WEAPON)
                 print(f"射擊! 距離: {result['distance']:.1f}, 命中: {result['hit']}, 傷害: {result['damage']}")
 
         return result
@@ -482,18 +389,13 @@ class WeaponManager:
         dt (float): 時間間隔\n
         """
         # 更新當前武器的重新裝彈狀態
+        # 子彈由共用子彈引擎推進，這裡不重複積分
         if self.current_weapon:
             self.current_weapon.update_reload()
 
-        # 更新所有子彈
-        for bullet in self.bullets[:]:  # 使用切片複製避免修改列表時出錯
-            bullet.update(dt)
-            if not bullet.is_active:
-                self.bullets.remove(bullet)
-
     def check_bullet_collisions(self, targets):
         """
-        檢查子彈碰撞\n
+        檢查武器子彈碰撞\n
         \n
         參數:\n
         targets (list): 目標列表，每個目標應該有 'rect' 和 'take_damage' 方法\n
@@ -501,27 +403,7 @@ class WeaponManager:
         回傳:\n
         list: 命中的目標列表\n
         """
-        hit_targets = []
-
-        for bullet in self.bullets[:]:
-            for target in targets:
-                if hasattr(target, "rect") and bullet.check_collision(target.rect):
-                    # 對目標造成傷害
-                    if hasattr(target, "take_damage"):
-                        target.take_damage(bullet.damage)
-
-                    hit_targets.append(
-                        {
-                            "target": target,
-                            "damage": bullet.damage,
-                            "position": (bullet.x, bullet.y),
-                        }
-                    )
-
-                    self.bullets.remove(bullet)
-                    break
-
-        return hit_targets
+        return self.projectiles.check_collisions(targets, owner=PROJECTILE_OWNER_WEAPON)
 
     def get_current_weapon_info(self):
         """
@@ -542,15 +424,15 @@ class WeaponManager:
             "is_reloading": self.current_weapon.is_reloading,
         }
 
-    def draw_bullets(self, screen):
+    def draw_bullets(self, screen, camera_offset=(0, 0)):
         """
-        繪製所有子彈\n
+        繪製武器子彈\n
         \n
         參數:\n
         screen (pygame.Surface): 繪製目標表面\n
+        camera_offset (tuple): 攝影機偏移量\n
         """
-        for bullet in self.bullets:
-            bullet.draw(screen)
+        self.projectiles.draw(screen, camera_offset, owner=PROJECTILE_OWNER_WEAPON)
 
     def draw_weapon_ui(self, screen, font):
         """
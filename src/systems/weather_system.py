@@ -2,8 +2,9 @@
 import pygame
 import random
 import math
-import time
+from src.utils.object_pool import ObjectPool
 from config.settings import *
+from src.core.game_clock import get_game_clock
 
 
 ######################粒子類別######################
@@ -16,6 +17,8 @@ class WeatherParticle:
     2. 生命週期控制\n
     3. 基本物理運動\n
     4. 螢幕邊界處理\n
+    \n
+    粒子由 WeatherEffectSystem 的物件池重複使用，子類別透過 reset 重新初始化\n
     """
 
     def __init__(self, x, y, velocity_x, velocity_y, color, size=1):
@@ -30,6 +33,12 @@ class WeatherParticle:
         color (tuple): RGB顏色值\n
         size (int): 粒子大小（像素）\n
         """
+        self._reset_particle(x, y, velocity_x, velocity_y, color, size)
+
+    def _reset_particle(self, x, y, velocity_x, velocity_y, color, size=1):
+        """
+        設定粒子的基本狀態（初始化和物件池重複使用共用）\n
+        """
         self.x = x
         self.y = y
         self.velocity_x = velocity_x
@@ -101,11 +110,22 @@ class RainDrop(WeatherParticle):
         y (float): 初始Y位置\n
         intensity (float): 雨勢強度（0.5-2.0）\n
         """
+        self.reset(x, y, intensity)
+
+    def reset(self, x, y, intensity=1.0):
+        """
+        重設雨滴狀態（物件池取出時呼叫）\n
+        \n
+        參數:\n
+        x (float): 初始X位置\n
+        y (float): 初始Y位置\n
+        intensity (float): 雨勢強度（0.5-2.0）\n
+        """
         # 雨滴速度受強度影響
         velocity_y = RAIN_PARTICLE_SPEED * intensity
         velocity_x = random.uniform(-50, 50) * intensity  # 輕微的水平偏移
         
-        super().__init__(x, y, velocity_x, velocity_y, RAIN_PARTICLE_COLOR, 1)
+        self._reset_particle(x, y, velocity_x, velocity_y, RAIN_PARTICLE_COLOR, 1)
         self.intensity = intensity
         self.length = max(3, int(5 * intensity))  # 雨滴線條長度
 
@@ -160,17 +180,27 @@ class SnowFlake(WeatherParticle):
         x (float): 初始X位置\n
         y (float): 初始Y位置\n
         """
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """
+        重設雪花狀態（物件池取出時呼叫）\n
+        \n
+        參數:\n
+        x (float): 初始X位置\n
+        y (float): 初始Y位置\n
+        """
         velocity_y = random.uniform(50, SNOW_PARTICLE_SPEED)  # 隨機下降速度
         velocity_x = random.uniform(-20, 20)  # 隨機水平漂移
         size = random.randint(1, 3)  # 隨機雪花大小
         
-        super().__init__(x, y, velocity_x, velocity_y, SNOW_PARTICLE_COLOR, size)
+        self._reset_particle(x, y, velocity_x, velocity_y, SNOW_PARTICLE_COLOR, size)
         
         # 雪花搖擺參數
         self.sway_amplitude = random.uniform(10, 30)  # 搖擺幅度
         self.sway_frequency = random.uniform(1, 3)  # 搖擺頻率
         self.sway_phase = random.uniform(0, 2 * math.pi)  # 搖擺相位
-        self.start_time = time.time()
+        self.start_time = get_game_clock().time()
 
     def update(self, dt, wind_x=0):
         """
@@ -184,7 +214,7 @@ class SnowFlake(WeatherParticle):
             return
 
         # 計算搖擺運動
-        current_time = time.time() - self.start_time
+        current_time = get_game_clock().time() - self.start_time
         sway_offset = self.sway_amplitude * math.sin(
             self.sway_frequency * current_time + self.sway_phase
         )
@@ -229,7 +259,7 @@ class LightningFlash:
         安排下一次閃電時間\n
         """
         interval = random.uniform(LIGHTNING_INTERVAL_MIN, LIGHTNING_INTERVAL_MAX)
-        self.next_lightning_time = time.time() + interval
+        self.next_lightning_time = get_game_clock().time() + interval
 
     def update(self, dt):
         """
@@ -238,7 +268,7 @@ class LightningFlash:
         參數:\n
         dt (float): 時間間隔（秒）\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
 
         # 檢查是否該觸發新的閃電
         if not self.is_active and current_time >= self.next_lightning_time:
@@ -269,7 +299,7 @@ class LightningFlash:
         手動觸發閃電（用於測試或特殊事件）\n
         """
         self.is_active = True
-        self.flash_start_time = time.time()
+        self.flash_start_time = get_game_clock().time()
         print("⚡ 閃電！")
 
     def get_light_modifier(self):
@@ -323,6 +353,11 @@ class WeatherEffectSystem:
         # 粒子系統
         self.particles = []  # 當前活躍的天氣粒子
         self.max_particles = 0  # 最大粒子數量
+
+        # 粒子物件池 - 下雨下雪時不再每幀配置新粒子
+        self.rain_pool = ObjectPool(RainDrop)
+        self.snow_pool = ObjectPool(SnowFlake)
+        self._particle_pools = {RainDrop: self.rain_pool, SnowFlake: self.snow_pool}
         
         # 特殊效果
         self.lightning = LightningFlash()
@@ -355,8 +390,8 @@ class WeatherEffectSystem:
         self.light_modifier = weather_config["light_modifier"]
         self.visibility = weather_config["visibility"]
         
-        # 清除現有粒子
-        self.particles.clear()
+        # 清除現有粒子（歸還物件池）
+        self._release_all_particles()
         
         # 設定新的粒子系統
         particle_type = weather_config.get("particles")
@@ -369,6 +404,12 @@ class WeatherEffectSystem:
         else:
             self.max_particles = 0
 
+        # 依照粒子上限預先建立物件池
+        if particle_type in ["light_rain", "heavy_rain"]:
+            self.rain_pool.prewarm(self.max_particles)
+        elif particle_type == "snow":
+            self.snow_pool.prewarm(self.max_particles)
+
         # 設定風力
         if particle_type in ["light_rain", "heavy_rain"]:
             self.wind_strength = random.uniform(-30, 30)
@@ -415,11 +456,16 @@ class WeatherEffectSystem:
         if self.current_weather == "⛈️ 雷雨":
             self.lightning.update(dt)
 
-        # 更新現有粒子
-        for particle in self.particles[:]:  # 使用切片複製來避免迭代時修改列表
+        # 更新現有粒子，原地壓縮列表並把消失的粒子歸還物件池
+        alive_count = 0
+        for particle in self.particles:
             particle.update(dt, self.wind_strength)
-            if not particle.alive:
-                self.particles.remove(particle)
+            if particle.alive:
+                self.particles[alive_count] = particle
+                alive_count += 1
+            else:
+                self._particle_pools[type(particle)].release(particle)
+        del self.particles[alive_count:]
 
         # 生成新粒子（如果需要）
         self._spawn_particles()
@@ -440,16 +486,37 @@ class WeatherEffectSystem:
             
             # 根據天氣類型創建不同粒子
             if self.current_weather in ["🌧️ 小雨"]:
-                particle = RainDrop(x, y, intensity=0.7)
+                particle = self.rain_pool.acquire(x, y, intensity=0.7)
             elif self.current_weather in ["⛈️ 雷雨"]:
-                particle = RainDrop(x, y, intensity=1.5)
+                particle = self.rain_pool.acquire(x, y, intensity=1.5)
             elif self.current_weather == "🌨️ 下雪":
-                particle = SnowFlake(x, y)
+                particle = self.snow_pool.acquire(x, y)
             else:
                 continue
             
             self.particles.append(particle)
 
+    def _release_all_particles(self):
+        """
+        把所有活躍粒子歸還物件池並清空列表\n
+        """
+        for particle in self.particles:
+            self._particle_pools[type(particle)].release(particle)
+        self.particles.clear()
+
+    def get_pool_statistics(self):
+        """
+        獲取粒子物件池統計資訊\n
+        \n
+        回傳:\n
+        dict: 雨滴和雪花物件池的統計資訊\n
+        """
+        return {
+            "active_particles": len(self.particles),
+            "rain_pool": self.rain_pool.get_statistics(),
+            "snow_pool": self.snow_pool.get_statistics(),
+        }
+
     def get_modified_sky_color(self, original_color):
         """
         獲取天氣修正後的天空顏色\n
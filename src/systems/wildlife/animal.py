@@ -4,6 +4,7 @@ import random
 import math
 import os
 from enum import Enum
+from src.utils.asset_manager import get_asset_manager
 from src.systems.wildlife.animal_data import (
     AnimalType,
     AnimalData,
@@ -11,6 +12,10 @@ from src.systems.wildlife.animal_data import (
     BehaviorType,
     RarityLevel,
 )
+from src.core.game_clock import get_game_clock
+from src.core.render_interpolation import get_render_interpolation
+from src.utils.helpers import chance_per_second
+from config.settings import SPEED_REFERENCE_FPS
 
 
 ######################動物狀態列舉######################
@@ -118,11 +123,9 @@ class Animal:
             128,
         )
         
-        # 載入動物圖像
-        self.image = self._load_animal_image()
+        # 載入動物圖像（同種類、同尺寸的動物共用資源管理器快取的圖片）
         self.image_size = (self.size * 4, self.size * 4)  # 圖像大小為動物大小的4倍
-        if self.image:
-            self.image = pygame.transform.scale(self.image, self.image_size)
+        self.image = self._load_animal_image()
 
         # 視野系統 - 根據需求設定
         # 根據動物類型調整視野角度
@@ -171,10 +174,10 @@ class Animal:
 
     def _load_animal_image(self):
         """
-        載入動物對應的圖像檔案\n
+        從資源管理器取得動物對應的圖像（已縮放到 image_size）\n
         \n
         回傳:\n
-        pygame.Surface: 載入的圖像，失敗時回傳None\n
+        pygame.Surface: 共用的圖像，失敗時回傳None\n
         """
         # 動物類型對應的檔案名稱
         image_map = {
@@ -194,13 +197,8 @@ class Animal:
         # 建構圖像檔案路徑
         image_path = os.path.join("assets", "images", filename)
         
-        try:
-            # 載入圖像
-            image = pygame.image.load(image_path).convert_alpha()
-            return image
-        except (pygame.error, FileNotFoundError) as e:
-            print(f"無法載入動物圖像 {image_path}: {e}")
-            return None
+        # 每個檔案只從磁碟載入一次，縮放版本也由資源管理器快取
+        return get_asset_manager().get_scaled(image_path, self.image_size)
 
     def set_terrain_system(self, terrain_system):
         """
@@ -252,6 +250,9 @@ class Animal:
         if not self.is_alive:
             return
 
+        # 記住這一步開始前的位置，繪製時內插
+        get_render_interpolation().record(self)
+
         # 檢測玩家
         player_distance = self._calculate_distance_to_player(player_position)
         player_in_vision = self._is_player_in_vision(player_position)
@@ -537,7 +538,7 @@ class Animal:
             # 受傷的稀有動物逃跑時更加不穩定
             if self.is_injured:
                 # 隨機改變方向，模擬驚恐中的亂竄
-                if random.random() < 0.15:  # 15% 機率突然改變方向
+                if chance_per_second(9.0, dt):  # 平均每秒 9 次突然改變方向
                     self._set_flee_target(player_position)
                     # 減少頻繁調試輸出
                     if not hasattr(self, '_flee_debug_counter'):
@@ -550,7 +551,7 @@ class Animal:
             self.current_speed = self.max_speed * 1.3  # 加速逃跑
 
         # 持續更新逃跑方向（遠離玩家）
-        if random.random() < 0.08:  # 8% 機率調整逃跑方向
+        if chance_per_second(4.8, dt):  # 平均每秒 4.8 次調整逃跑方向
             self._set_flee_target(player_position)
 
         # 逃跑時間結束或到達安全距離
@@ -635,7 +636,7 @@ class Animal:
         # 躲藏期間稀有動物會逐漸恢復冷靜
         if self.rarity == RarityLevel.RARE and self.is_injured:
             # 受傷的稀有動物在躲藏時會漸漸恢復一些血量（代表休息恢復）
-            if random.random() < 0.05:  # 5% 機率每幀恢復一點血量
+            if chance_per_second(3.0, dt):  # 平均每秒恢復 3 點血量
                 self.health = min(self.max_health, self.health + 1)
                 if self.health >= self.max_health * 0.8:  # 恢復到80%血量時
                     self.is_injured = False
@@ -737,7 +738,7 @@ class Animal:
 
         if distance > 5:  # 還沒到達目標
             # 正規化方向向量並移動
-            move_distance = self.current_speed * dt * 60  # 60 用於幀率補償
+            move_distance = self.current_speed * dt * SPEED_REFERENCE_FPS
 
             if distance > 0:
                 move_x = (dx / distance) * move_distance
@@ -972,7 +973,10 @@ class Animal:
         show_vision (bool): 是否顯示視野範圍\n
         show_territory (bool): 是否顯示領地範圍\n
         """
-        offset_x, offset_y = camera_offset
+        # 畫在前後兩個模擬步之間的內插位置
+        interpolation_x, interpolation_y = get_render_interpolation().get_offset(self)
+        offset_x = camera_offset[0] + interpolation_x
+        offset_y = camera_offset[1] + interpolation_y
         draw_x = int(self.x - offset_x)
         draw_y = int(self.y - offset_y)
         
@@ -1055,7 +1059,7 @@ class Animal:
         elif self.state == AnimalState.FLEEING:
             # 逃跑狀態：閃爍效果，稀有動物閃爍更快
             flash_interval = 150 if self.rarity == RarityLevel.RARE else 200
-            if int(pygame.time.get_ticks() / flash_interval) % 2:  
+            if int(get_game_clock().get_ticks() / flash_interval) % 2:  
                 # 受傷的稀有動物用紅白閃爍表示驚恐
                 if self.rarity == RarityLevel.RARE and self.is_injured:
                     flash_color = (255, 100, 100)  # 淡紅色
@@ -1076,7 +1080,7 @@ class Animal:
             )
         elif self.state == AnimalState.ROARING:
             # 怒吼狀態：橘色邊框閃爍
-            if int(pygame.time.get_ticks() / 150) % 2:
+            if int(get_game_clock().get_ticks() / 150) % 2:
                 pygame.draw.circle(
                     screen, (255, 165, 0), (draw_x, draw_y), effect_radius + 5, 4
                 )
@@ -1252,8 +1256,7 @@ class Animal:
             return False
             
         # 檢查攻擊冷卻
-        import time
-        current_time = time.time()
+        current_time = get_game_clock().time()
         if current_time - self.last_attack_time < self.attack_cooldown:
             return False
             
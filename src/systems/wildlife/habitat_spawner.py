@@ -0,0 +1,247 @@
+######################載入套件######################
+import heapq
+import random
+from config.settings import WILDLIFE_SPAWN_REGIONS, WILDLIFE_SPAWN_MIN_SPACING, WILDLIFE_SPAWN_SAMPLES_PER_REGION
+
+
+# 各棲息地可以生成動物的地形代碼
+HABITAT_TERRAIN_CODES = {
+    "forest": (1, 9),  # 森林、山丘
+    "lake": (2,),  # 水域
+    "grassland": (0, 7, 8),  # 草地、公園、農地
+}
+
+
+######################棲息地生成器######################
+class HabitatSpawner:
+    """
+    棲息地生成器 - 預先算好每個棲息地可以生成的格子，依區域分桶\n
+    \n
+    地圖切成 regions x regions 個區域：\n
+    - 格子池：{棲息地: {區域: [格子索引, ...]}}，第一次在該棲息地生成時掃描地形一次\n
+    - 區域計數：每個區域目前的動物數，每個棲息地用一個最小堆積找出動物最少的區域\n
+    - 間距索引：以最小間距為格子大小的空間雜湊，檢查間距時只比較周圍 3x3 格的動物\n
+    \n
+    生成時從堆積頂端的區域抽幾個格子檢查間距，不再整張地圖反覆重試\n
+    """
+
+    def __init__(self, terrain_system, regions=WILDLIFE_SPAWN_REGIONS, min_spacing=WILDLIFE_SPAWN_MIN_SPACING,
+                 samples_per_region=WILDLIFE_SPAWN_SAMPLES_PER_REGION):
+        """
+        初始化棲息地生成器\n
+        \n
+        參數:\n
+        terrain_system (TerrainBasedSystem): 地形系統（地圖需已載入）\n
+        regions (int): 每邊的區域數\n
+        min_spacing (float): 動物之間的最小距離（像素）\n
+        samples_per_region (int): 每個區域最多抽幾個格子\n
+        """
+        self.terrain_system = terrain_system
+        self.regions = max(1, regions)
+        self.min_spacing = min_spacing
+        self.samples_per_region = max(1, samples_per_region)
+
+        self.map_width = terrain_system.map_width
+        self.map_height = terrain_system.map_height
+        self.tile_size = terrain_system.tile_size
+        self.region_width = max(1, self.map_width // self.regions)
+        self.region_height = max(1, self.map_height // self.regions)
+
+        self.pools = {}  # {棲息地: {區域: [格子索引]}}
+        self.heaps = {}  # {棲息地: [(區域動物數, 亂數, 區域)]}
+        self.region_counts = {}  # {區域: 目前的動物數}
+        self.spacing_cells = {}  # {(間距格 x, 間距格 y): [動物]}
+        self.animal_entries = {}  # {動物 ID: (區域, 間距格)}
+
+    ######################格子池######################
+    def _get_region(self, tile_x, tile_y):
+        """
+        格子所在的區域編號\n
+        """
+        region_x = min(tile_x // self.region_width, self.regions - 1)
+        region_y = min(tile_y // self.region_height, self.regions - 1)
+        return region_y * self.regions + region_x
+
+    def _get_pool(self, habitat):
+        """
+        取得棲息地的格子池，第一次使用時建立\n
+        """
+        pool = self.pools.get(habitat)
+        if pool is None:
+            pool = self._build_pool(HABITAT_TERRAIN_CODES[habitat])
+            self.pools[habitat] = pool
+            self._rebuild_heap(habitat)
+        return pool
+
+    def _build_pool(self, terrain_codes):
+        """
+        掃描地形，把符合地形代碼的格子依區域分桶\n
+        \n
+        每列以 bytes.find 找出符合的格子，不逐格呼叫地形查詢\n
+        """
+        pool = {}
+        store = self.terrain_system.terrain_store
+        width = self.map_width
+        needles = [bytes((terrain_code,)) for terrain_code in terrain_codes]
+
+        for tile_y in range(self.map_height):
+            row = store.read_row(tile_y)
+            row_start = tile_y * width
+            for needle in needles:
+                tile_x = row.find(needle)
+                while tile_x != -1:
+                    region = self._get_region(tile_x, tile_y)
+                    cells = pool.get(region)
+                    if cells is None:
+                        cells = pool[region] = []
+                    cells.append(row_start + tile_x)
+                    tile_x = row.find(needle, tile_x + 1)
+
+        return pool
+
+    def _rebuild_heap(self, habitat):
+        """
+        依目前的區域計數重建棲息地的最小堆積\n
+        """
+        heap = [(self.region_counts.get(region, 0), random.random(), region) for region in self.pools[habitat]]
+        heapq.heapify(heap)
+        self.heaps[habitat] = heap
+
+    def _cell_to_world(self, cell):
+        """
+        格子索引轉成格子中心的世界座標\n
+        """
+        tile_x = cell % self.map_width
+        tile_y = cell // self.map_width
+        half = self.tile_size // 2
+        return tile_x * self.tile_size + half, tile_y * self.tile_size + half
+
+    ######################選擇位置######################
+    def select_position(self, habitat):
+        """
+        為棲息地選擇生成位置\n
+        \n
+        依序取動物最少的區域，在區域內抽幾個格子檢查間距；\n
+        每個區域都太擠時忽略間距，從格子池隨機挑一格\n
+        \n
+        參數:\n
+        habitat (str): 棲息地類型 ("forest", "lake", "grassland")\n
+        \n
+        回傳:\n
+        tuple: (x, y) 世界座標，棲息地沒有任何格子時回傳 None\n
+        """
+        pool = self._get_pool(habitat)
+        if not pool:
+            return None
+
+        heap = self.heaps[habitat]
+        counts = self.region_counts
+        crowded = []
+        position = None
+
+        while heap:
+            count, _, region = heap[0]
+            current = counts.get(region, 0)
+            if count < current:
+                # 區域後來生成了動物，用最新的數量重新排序
+                heapq.heapreplace(heap, (current, random.random(), region))
+                continue
+            if count > current:
+                # 動物移除時已經放入新的項目，這是舊的
+                heapq.heappop(heap)
+                continue
+
+            position = self._sample_region(pool[region])
+            if position is not None:
+                break
+            crowded.append(heapq.heappop(heap))
+
+        for entry in crowded:
+            heapq.heappush(heap, entry)
+
+        if position is None:
+            cells = random.choice(list(pool.values()))
+            position = self._cell_to_world(random.choice(cells))
+        return position
+
+    def _sample_region(self, cells):
+        """
+        在區域內最多抽 samples_per_region 個格子，回傳第一個間距足夠的位置\n
+        """
+        for _ in range(min(self.samples_per_region, len(cells))):
+            x, y = self._cell_to_world(random.choice(cells))
+            if not self._is_too_close(x, y):
+                return x, y
+        return None
+
+    ######################間距索引######################
+    def _get_spacing_cell(self, x, y):
+        """
+        位置所在的間距格\n
+        """
+        return int(x // self.min_spacing), int(y // self.min_spacing)
+
+    def _is_too_close(self, x, y):
+        """
+        檢查位置是否離既有動物太近（只比較周圍 3x3 個間距格）\n
+        \n
+        動物依生成位置分格，比較時使用動物目前的位置\n
+        """
+        cell_x, cell_y = self._get_spacing_cell(x, y)
+        spacing_sq = self.min_spacing * self.min_spacing
+        for neighbor_y in range(cell_y - 1, cell_y + 2):
+            for neighbor_x in range(cell_x - 1, cell_x + 2):
+                for animal in self.spacing_cells.get((neighbor_x, neighbor_y), ()):
+                    dx = x - animal.x
+                    dy = y - animal.y
+                    if dx * dx + dy * dy < spacing_sq:
+                        return True
+        return False
+
+    def register_animal(self, animal):
+        """
+        記錄新生成的動物（更新區域計數和間距索引）\n
+        \n
+        參數:\n
+        animal (Animal): 動物\n
+        """
+        tile_x = min(max(0, int(animal.x // self.tile_size)), self.map_width - 1)
+        tile_y = min(max(0, int(animal.y // self.tile_size)), self.map_height - 1)
+        region = self._get_region(tile_x, tile_y)
+        spacing_cell = self._get_spacing_cell(animal.x, animal.y)
+
+        self.region_counts[region] = self.region_counts.get(region, 0) + 1
+        self.spacing_cells.setdefault(spacing_cell, []).append(animal)
+        self.animal_entries[animal.id] = (region, spacing_cell)
+
+    def unregister_animal(self, animal):
+        """
+        移除動物的記錄，區域數量減少後重新放入各棲息地的堆積\n
+        \n
+        參數:\n
+        animal (Animal): 動物\n
+        """
+        entry = self.animal_entries.pop(animal.id, None)
+        if entry is None:
+            return
+
+        region, spacing_cell = entry
+        self.region_counts[region] -= 1
+        animals = self.spacing_cells[spacing_cell]
+        animals.remove(animal)
+        if not animals:
+            del self.spacing_cells[spacing_cell]
+
+        for habitat, pool in self.pools.items():
+            if region in pool:
+                heapq.heappush(self.heaps[habitat], (self.region_counts[region], random.random(), region))
+
+    def clear_animals(self):
+        """
+        清除所有動物記錄（保留已建立的格子池）\n
+        """
+        self.region_counts.clear()
+        self.spacing_cells.clear()
+        self.animal_entries.clear()
+        for habitat in self.pools:
+            self._rebuild_heap(habitat)
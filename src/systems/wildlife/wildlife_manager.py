@@ -1,11 +1,12 @@
 ######################載入套件######################
 import pygame
 import random
-import time
 import math
 from src.systems.wildlife.animal import Animal, AnimalState
 from src.systems.wildlife.animal_data import AnimalType, AnimalData, RarityLevel
+from src.systems.wildlife.habitat_spawner import HabitatSpawner, HABITAT_TERRAIN_CODES
 from config.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.core.game_clock import get_game_clock
 
 
 ######################野生動物管理器######################
@@ -59,6 +60,9 @@ class WildlifeManager:
         self.lake_animals = []  # 湖泊動物 (地形代碼2)
         self.all_animals = []  # 所有動物的統一列表
 
+        # 傳奇動物領地版本（傳奇動物生成或移除時加一，音樂區域據此重建領地）
+        self.territory_revision = 0
+
         print("野生動物管理器初始化完成")
 
         # 新的動物數量控制（按稀有度）
@@ -88,6 +92,9 @@ class WildlifeManager:
 
         # 地形系統引用 - 用於檢查地形代碼
         self.terrain_system = None
+
+        # 棲息地生成器（預先算好的生成格子池，第一次生成時建立）
+        self.habitat_spawner = None
         
         # 小鎮中心位置（用於計算距離）
         self.town_center = (2000, 3000)  # 小鎮中心座標
@@ -168,6 +175,7 @@ class WildlifeManager:
         terrain_system (TerrainBasedSystem): 地形系統實例\n
         """
         self.terrain_system = terrain_system
+        self.habitat_spawner = None  # 換地形系統後重新建立格子池
         print("野生動物管理器已連結地形系統")
 
     def _find_terrain_positions(self, terrain_code, max_positions=20):
@@ -227,6 +235,8 @@ class WildlifeManager:
         self.lake_animals.clear() 
         self.all_animals.clear()
         self.current_counts = {rarity: 0 for rarity in RarityLevel}
+        if self.habitat_spawner:
+            self.habitat_spawner.clear_animals()
 
         # 按稀有度生成動物
         self._generate_animals_by_rarity()
@@ -296,65 +306,70 @@ class WildlifeManager:
         if rarity and self.current_counts.get(rarity, 0) >= self.target_counts.get(rarity, 0):
             return None  # 達到該稀有度的數量上限
 
-        # 根據棲息地選擇地形代碼
-        if habitat == "forest":
-            terrain_codes = [1, 9]  # 森林、山丘
-            bounds = self.forest_bounds
-        elif habitat == "lake":
-            terrain_codes = [2]  # 水域
-            bounds = self.lake_bounds
-        elif habitat == "grassland":
-            terrain_codes = [0, 7, 8]  # 草地、公園、農地
-            bounds = self.forest_bounds
-        else:
+        # 根據棲息地選擇活動範圍（可生成的地形代碼見 HABITAT_TERRAIN_CODES）
+        if habitat not in HABITAT_TERRAIN_CODES:
             print(f"未知的棲息地類型: {habitat}")
             return None
+        bounds = self.lake_bounds if habitat == "lake" else self.forest_bounds
 
         # 選擇生成位置
         if position:
             x, y = position
         else:
-            x, y = self._select_spawn_position(animal_type, terrain_codes, rarity)
-            if x is None:
+            spawn_position = self._select_spawn_position(habitat)
+            if spawn_position is None:
                 print(f"無法為 {animal_type.value} 找到合適的生成位置")
                 return None
+            x, y = spawn_position
 
         # 創建動物
         animal = Animal(animal_type, (x, y), bounds, habitat)
+        self.add_animal(animal)
+        
+        # 更新數量統計
+        if rarity:
+            self.current_counts[rarity] = self.current_counts.get(rarity, 0) + 1
         
+        self.total_spawned += 1
+
+        print(f"在 {habitat} 生成 {animal_type.value}，距離小鎮: {self._distance_to_town(x, y):.0f}m")
+        return animal
+
+    def add_animal(self, animal):
+        """
+        把動物加入管理器（設定地形系統、放進對應容器、登記到生成間距索引）\n
+        \n
+        參數:\n
+        animal (Animal): 要加入的動物\n
+        """
         # 設定地形系統引用
         if self.terrain_system:
             animal.set_terrain_system(self.terrain_system)
 
         # 添加到對應容器
-        if habitat == "lake":
+        if animal.habitat == "lake":
             self.lake_animals.append(animal)
         else:
             self.forest_animals.append(animal)
         
         self.all_animals.append(animal)
-        
-        # 更新數量統計
-        if rarity:
-            self.current_counts[rarity] = self.current_counts.get(rarity, 0) + 1
-        
-        self.total_spawned += 1
-
-        print(f"在 {habitat} 生成 {animal_type.value}，距離小鎮: {self._distance_to_town(x, y):.0f}m")
-        return animal
+        if self._has_legendary_territory(animal):
+            self.territory_revision += 1
+        if self.habitat_spawner:
+            self.habitat_spawner.register_animal(animal)
 
-    def _select_spawn_position(self, animal_type, terrain_codes, rarity):
+    def _select_spawn_position(self, habitat):
         """
         基於地形和均勻分布選擇生成位置\n
-        新需求：確保動物在地圖上均勻分布，避免聚集在某些區域\n
+        確保動物在地圖上均勻分布，避免聚集在某些區域\n
+        \n
+        由棲息地生成器從動物最少的區域挑選符合地形、且和其他動物保持距離的格子\n
         \n
         參數:\n
-        animal_type (AnimalType): 動物種類\n
-        terrain_codes (list): 允許的地形代碼\n
-        rarity (RarityLevel): 稀有度\n
+        habitat (str): 棲息地類型 ("forest", "lake", "grassland")\n
         \n
         回傳:\n
-        tuple: (x, y) 位置座標，如果找不到則返回 (None, None)\n
+        tuple: (x, y) 位置座標，如果找不到則返回 None\n
         """
         if not self.terrain_system:
             # 沒有地形系統時使用簡單生成
@@ -363,83 +378,12 @@ class WildlifeManager:
             y = random.randint(bounds[1] + 30, bounds[1] + bounds[3] - 30)
             return x, y
 
-        # 將地圖劃分為網格以確保均勻分布
-        grid_size = 10  # 將地圖劃分為 10x10 的網格
-        cell_width = self.terrain_system.map_width // grid_size
-        cell_height = self.terrain_system.map_height // grid_size
-        
-        # 記錄每個網格已生成的動物數量
-        if not hasattr(self, '_spawn_grid'):
-            self._spawn_grid = [[0 for _ in range(grid_size)] for _ in range(grid_size)]
-        
-        # 找到動物數量最少的網格區域
-        min_count = float('inf')
-        candidate_cells = []
-        
-        for grid_y in range(grid_size):
-            for grid_x in range(grid_size):
-                current_count = self._spawn_grid[grid_y][grid_x]
-                if current_count < min_count:
-                    min_count = current_count
-                    candidate_cells = [(grid_x, grid_y)]
-                elif current_count == min_count:
-                    candidate_cells.append((grid_x, grid_y))
-        
-        # 從候選網格中選擇一個進行生成
-        attempts = 0
-        max_attempts = 50
-        
-        while attempts < max_attempts and candidate_cells:
-            # 隨機選擇一個候選網格
-            grid_cell_x, grid_cell_y = random.choice(candidate_cells)
-            
-            # 在該網格內尋找合適的生成位置
-            start_x = grid_cell_x * cell_width
-            start_y = grid_cell_y * cell_height
-            end_x = min((grid_cell_x + 1) * cell_width, self.terrain_system.map_width - 1)
-            end_y = min((grid_cell_y + 1) * cell_height, self.terrain_system.map_height - 1)
-            
-            # 在網格內隨機選擇位置
-            for _ in range(20):  # 在該網格內最多嘗試20次
-                grid_x = random.randint(start_x, end_x)
-                grid_y = random.randint(start_y, end_y)
-                
-                # 檢查地形是否合適
-                world_x = grid_x * 20 + 10
-                world_y = grid_y * 20 + 10
-                terrain_code = self.terrain_system.get_terrain_at_world_pos(world_x, world_y)
-                
-                if terrain_code in terrain_codes:
-                    # 檢查是否與現有動物過於靠近（最小距離100像素）
-                    min_distance = 100
-                    too_close = False
-                    
-                    for existing_animal in self.all_animals:
-                        distance = math.sqrt((world_x - existing_animal.x)**2 + (world_y - existing_animal.y)**2)
-                        if distance < min_distance:
-                            too_close = True
-                            break
-                    
-                    if not too_close:
-                        # 更新網格計數
-                        self._spawn_grid[grid_cell_y][grid_cell_x] += 1
-                        print(f"在網格 ({grid_cell_x}, {grid_cell_y}) 生成 {animal_type.value}，距離其他動物 > {min_distance}px")
-                        return world_x, world_y
-            
-            attempts += 1
-        
-        # 如果均勻分布失敗，使用原有的簡單隨機生成
-        print(f"均勻分布生成失敗，使用隨機位置生成 {animal_type.value}")
-        for _ in range(50):
-            grid_x = random.randint(0, self.terrain_system.map_width - 1)
-            grid_y = random.randint(0, self.terrain_system.map_height - 1)
-            world_x = grid_x * 20 + 10
-            world_y = grid_y * 20 + 10
-            terrain_code = self.terrain_system.get_terrain_at_world_pos(world_x, world_y)
-            if terrain_code in terrain_codes:
-                return world_x, world_y
-        
-        return None, None
+        if self.habitat_spawner is None:
+            self.habitat_spawner = HabitatSpawner(self.terrain_system)
+            for animal in self.all_animals:
+                self.habitat_spawner.register_animal(animal)
+
+        return self.habitat_spawner.select_position(habitat)
 
     def _distance_to_town(self, x, y):
         """計算到小鎮中心的距離"""
@@ -495,8 +439,8 @@ class WildlifeManager:
                     animal.has_attacked_player = False  # 重置攻擊標記
             else:
                 # 移除死亡動物 (延遲一段時間)
-                if time.time() - animal.death_time > 10:  # 死亡10秒後移除
-                    self._remove_animal(animal)
+                if get_game_clock().time() - animal.death_time > 10:  # 死亡10秒後移除
+                    self.remove_animal(animal)
 
         # 嘗試生成新動物
         self._attempt_spawn_animals(current_scene)
@@ -508,7 +452,7 @@ class WildlifeManager:
         參數:\n
         current_scene (str): 當前場景\n
         """
-        current_time = time.time()
+        current_time = get_game_clock().time()
 
         # 檢查生成冷卻
         if current_time - self.last_spawn_time < self.spawn_cooldown:
@@ -599,7 +543,7 @@ class WildlifeManager:
 
         return items[-1]  # 後備選項
 
-    def _remove_animal(self, animal):
+    def remove_animal(self, animal):
         """
         移除動物\n
         \n
@@ -612,6 +556,10 @@ class WildlifeManager:
             self.lake_animals.remove(animal)
         if animal in self.all_animals:
             self.all_animals.remove(animal)
+            if self._has_legendary_territory(animal):
+                self.territory_revision += 1
+        if self.habitat_spawner:
+            self.habitat_spawner.unregister_animal(animal)
 
         print(f"移除動物: {animal.animal_type.value} (ID: {animal.id})")
 
@@ -836,6 +784,26 @@ class WildlifeManager:
                 screen.blit(text_surface, (10, y_offset))
                 y_offset += 20
 
+    def _has_legendary_territory(self, animal):
+        """
+        是否為有領地的傳奇動物\n
+        """
+        return (getattr(animal, 'rarity', None) == RarityLevel.LEGENDARY and
+                getattr(animal, 'territory_radius', 0) > 0)
+
+    def get_legendary_territories(self):
+        """
+        取得所有傳奇動物的領地\n
+        \n
+        回傳:\n
+        list: (中心 x, 中心 y, 半徑) 的列表\n
+        """
+        return [
+            (animal.territory_center[0], animal.territory_center[1], animal.territory_radius)
+            for animal in self.all_animals
+            if self._has_legendary_territory(animal)
+        ]
+
     def is_player_in_legendary_territory(self, player_position):
         """
         檢查玩家是否在傳奇動物的領地範圍內\n
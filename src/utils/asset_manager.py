@@ -0,0 +1,319 @@
+######################載入套件######################
+import os
+import threading
+import pygame
+from config.settings import ASSET_ANGLE_BUCKET_DEGREES
+
+
+######################圖片資源管理器######################
+class AssetManager:
+    """
+    圖片資源管理器 - 集中載入並快取遊戲圖片\n
+    \n
+    每個圖片檔案只從磁碟讀取並轉換一次，之後所有物件共用同一個 Surface\n
+    縮放和旋轉後的版本以 (路徑, 尺寸, 角度區間) 為鍵快取\n
+    \n
+    主要功能:\n
+    1. get_image: 取得原始圖片（已轉換為顯示格式）\n
+    2. get_scaled / get_variant: 取得縮放、旋轉後的快取版本\n
+    3. preload: 在背景執行緒預先讀取清單中的圖片\n
+    4. get_memory_footprint: 統計快取佔用的記憶體\n
+    \n
+    背景執行緒只負責讀檔和解碼，轉換顯示格式留到主執行緒第一次取用時進行\n
+    正在讀取的路徑會登記起來：主執行緒要的圖片背景正在讀時等它讀完，\n
+    主執行緒自己讀過或正在讀的圖片背景執行緒會跳過，每個檔案只讀一次\n
+    """
+
+    def __init__(self, angle_bucket_degrees=ASSET_ANGLE_BUCKET_DEGREES):
+        """
+        初始化資源管理器\n
+        \n
+        參數:\n
+        angle_bucket_degrees (int): 旋轉角度的區間大小，同一區間共用一張旋轉圖\n
+        """
+        self.angle_bucket_degrees = angle_bucket_degrees
+        self._bucket_count = max(1, 360 // angle_bucket_degrees)
+
+        self._images = {}  # 路徑 -> 已轉換的 Surface
+        self._variants = {}  # (路徑, 尺寸, 角度區間) -> Surface
+        self._missing = set()  # 載入失敗的路徑，避免重複讀取磁碟
+
+        # 背景預載入
+        self._preloaded = {}  # 路徑 -> 尚未轉換的 Surface
+        self._in_flight = {}  # 正在讀取的路徑 -> 讀完時設定的 threading.Event
+        self._preload_lock = threading.Lock()
+        self._preload_thread = None
+
+        # 統計資訊
+        self.disk_loads = 0
+        self.cache_hits = 0
+
+    def get_image(self, path):
+        """
+        取得圖片（每個路徑只載入和轉換一次）\n
+        \n
+        參數:\n
+        path (str): 圖片路徑\n
+        \n
+        回傳:\n
+        pygame.Surface: 圖片，載入失敗時回傳 None\n
+        """
+        image = self._images.get(path)
+        if image is not None:
+            self.cache_hits += 1
+            return image
+        if path in self._missing:
+            return None
+
+        pending = None
+        claimed = False
+        with self._preload_lock:
+            image = self._preloaded.pop(path, None)
+            if image is None:
+                pending = self._in_flight.get(path)
+                if pending is None:
+                    # 登記由主執行緒讀取，背景執行緒不會再讀一次
+                    self._in_flight[path] = threading.Event()
+                    claimed = True
+
+        if image is None:
+            if pending is not None:
+                # 背景執行緒正在讀這張圖，等它讀完直接使用
+                pending.wait()
+                with self._preload_lock:
+                    image = self._preloaded.pop(path, None)
+            else:
+                image = self._load_from_disk(path)
+
+        if image is None:
+            self._missing.add(path)
+        else:
+            image = self._convert(image)
+            self._images[path] = image
+
+        # 先放進快取再取消登記，背景執行緒之後看到的是已載入的圖片
+        if claimed:
+            self._finish_loading(path)
+        return image
+
+    def _finish_loading(self, path):
+        """
+        取消路徑的讀取登記，並喚醒等待這張圖的執行緒\n
+        \n
+        參數:\n
+        path (str): 圖片路徑\n
+        """
+        with self._preload_lock:
+            event = self._in_flight.pop(path, None)
+        if event is not None:
+            event.set()
+
+    def get_scaled(self, path, size):
+        """
+        取得縮放後的圖片\n
+        \n
+        參數:\n
+        path (str): 圖片路徑\n
+        size (tuple): 目標尺寸 (width, height)\n
+        \n
+        回傳:\n
+        pygame.Surface: 縮放後的圖片，載入失敗時回傳 None\n
+        """
+        return self.get_variant(path, size)
+
+    def get_variant(self, path, size=None, angle=0):
+        """
+        取得縮放和旋轉後的圖片\n
+        \n
+        角度會對齊到最近的角度區間，相近的角度共用同一張圖\n
+        \n
+        參數:\n
+        path (str): 圖片路徑\n
+        size (tuple): 目標尺寸 (width, height)，None 表示原始尺寸\n
+        angle (float): 旋轉角度（度，逆時針）\n
+        \n
+        回傳:\n
+        pygame.Surface: 處理後的圖片，載入失敗時回傳 None\n
+        """
+        bucket = int(round(angle / self.angle_bucket_degrees)) % self._bucket_count
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+
+        key = (path, size, bucket)
+        variant = self._variants.get(key)
+        if variant is not None:
+            self.cache_hits += 1
+            return variant
+
+        image = self.get_image(path)
+        if image is None:
+            return None
+
+        if size is None and bucket == 0:
+            return image
+
+        variant = image
+        if size is not None and size != image.get_size():
+            variant = pygame.transform.scale(variant, size)
+        if bucket:
+            variant = pygame.transform.rotate(variant, bucket * self.angle_bucket_degrees)
+
+        self._variants[key] = variant
+        return variant
+
+    def preload(self, paths, background=True):
+        """
+        預先載入圖片清單\n
+        \n
+        參數:\n
+        paths (iterable): 圖片路徑清單\n
+        background (bool): 是否在背景執行緒讀取\n
+        """
+        pending = [path for path in paths if path not in self._images and path not in self._missing]
+        if not pending:
+            return
+
+        if not background:
+            for path in pending:
+                self.get_image(path)
+            return
+
+        self._preload_thread = threading.Thread(
+            target=self._preload_worker, args=(pending,), name="asset-preload", daemon=True
+        )
+        self._preload_thread.start()
+
+    def wait_for_preload(self, timeout=None):
+        """
+        等待背景預載入完成\n
+        \n
+        參數:\n
+        timeout (float): 最長等待秒數，None 表示一直等待\n
+        \n
+        回傳:\n
+        bool: 預載入是否已完成\n
+        """
+        if self._preload_thread is None:
+            return True
+        self._preload_thread.join(timeout)
+        return not self._preload_thread.is_alive()
+
+    def _preload_worker(self, paths):
+        """
+        背景執行緒：讀取並解碼圖片\n
+        \n
+        參數:\n
+        paths (list): 圖片路徑清單\n
+        """
+        for path in paths:
+            with self._preload_lock:
+                # 已經讀過、正在由主執行緒讀取或確定不存在的圖片直接跳過
+                if (path in self._preloaded or path in self._in_flight
+                        or path in self._images or path in self._missing):
+                    continue
+                self._in_flight[path] = threading.Event()
+            image = self._load_from_disk(path)
+            if image is not None:
+                with self._preload_lock:
+                    self._preloaded[path] = image
+            self._finish_loading(path)
+
+    def _load_from_disk(self, path):
+        """
+        從磁碟讀取圖片\n
+        \n
+        參數:\n
+        path (str): 圖片路徑\n
+        \n
+        回傳:\n
+        pygame.Surface: 尚未轉換的圖片，失敗時回傳 None\n
+        """
+        if not os.path.exists(path):
+            print(f"⚠️ 圖片檔案不存在: {path}")
+            return None
+        try:
+            image = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"❌ 載入圖片失敗 {path}: {e}")
+            return None
+        self.disk_loads += 1
+        return image
+
+    def _convert(self, image):
+        """
+        轉換成顯示格式（需要已建立視窗）\n
+        \n
+        參數:\n
+        image (pygame.Surface): 原始圖片\n
+        \n
+        回傳:\n
+        pygame.Surface: 轉換後的圖片\n
+        """
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert_alpha()
+
+    def clear_variants(self):
+        """
+        清除所有縮放和旋轉快取（保留原始圖片）\n
+        """
+        self._variants.clear()
+
+    def get_memory_footprint(self):
+        """
+        計算快取圖片佔用的記憶體\n
+        \n
+        回傳:\n
+        dict: 原始圖片、變化版本和總計的位元組數\n
+        """
+        image_bytes = sum(_surface_bytes(image) for image in self._images.values())
+        variant_bytes = sum(
+            _surface_bytes(variant) for variant in self._variants.values()
+        )
+        return {
+            "images": len(self._images),
+            "variants": len(self._variants),
+            "image_bytes": image_bytes,
+            "variant_bytes": variant_bytes,
+            "total_bytes": image_bytes + variant_bytes,
+        }
+
+    def get_statistics(self):
+        """
+        獲取資源管理器統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        stats = self.get_memory_footprint()
+        stats.update({
+            "disk_loads": self.disk_loads,
+            "cache_hits": self.cache_hits,
+            "missing": len(self._missing),
+            "pending_preload": len(self._preloaded),
+        })
+        return stats
+
+
+def _surface_bytes(surface):
+    """
+    計算 Surface 的像素資料大小\n
+    """
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+######################全域資源管理器######################
+asset_manager = None
+
+def get_asset_manager():
+    """
+    取得全域資源管理器實例\n
+    \n
+    回傳:\n
+    AssetManager: 資源管理器實例\n
+    """
+    global asset_manager
+    if asset_manager is None:
+        asset_manager = AssetManager()
+    return asset_manager
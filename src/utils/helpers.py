@@ -1,6 +1,8 @@
 ######################載入套件######################
 import math
+import random
 import pygame
+from config.settings import SPEED_REFERENCE_FPS
 
 
 ######################數學工具函式######################
@@ -115,7 +117,7 @@ def fast_movement_calculate(direction_x, direction_y, speed, dt):
         return (0, 0)
 
     # 計算基礎移動距離
-    base_distance = speed * dt * 60
+    base_distance = speed * dt * SPEED_REFERENCE_FPS
 
     # 針對常見情況做快速計算
     if direction_x == 0 or direction_y == 0:
@@ -127,6 +129,23 @@ def fast_movement_calculate(direction_x, direction_y, speed, dt):
         return (direction_x * diagonal_distance, direction_y * diagonal_distance)
 
 
+def chance_per_second(rate, dt):
+    """
+    依每秒發生率判斷這個時間間隔內是否觸發隨機事件\n
+    \n
+    每次更新都擲骰的機率會隨模擬步長改變，改用每秒發生率換算成這一步的機率，\n
+    不論步長多少，平均每秒觸發的次數都相同\n
+    \n
+    參數:\n
+    rate (float): 平均每秒發生次數\n
+    dt (float): 時間間隔（秒）\n
+    \n
+    回傳:\n
+    bool: 這一步是否觸發\n
+    """
+    return random.random() < 1.0 - math.exp(-rate * dt)
+
+
 ######################碰撞檢測工具######################
 def check_rect_collision(rect1, rect2):
     """
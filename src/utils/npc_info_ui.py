@@ -17,6 +17,8 @@ class NPCInfoUI:
     5. 下一個活動\n
     \n
     支援捲動瀏覽和搜尋功能\n
+    \n
+    每列的文字表面依 NPC ID 快取，欄位內容沒有改變的列不重新繪製文字\n
     """
 
     def __init__(self):
@@ -52,6 +54,9 @@ class NPCInfoUI:
         # 當前顯示的 NPC 清單
         self.npc_list = []
 
+        # 列快取 {npc_id: (欄位內容, 顏色, 各欄位文字表面)}
+        self.row_cache = {}
+
     def update_npc_list(self, npc_status_list):
         """
         更新要顯示的 NPC 清單\n
@@ -171,42 +176,55 @@ class NPCInfoUI:
                 item_bg.fill((255, 255, 255, 20))
                 screen.blit(item_bg, (self.x + 5, y - 2))
 
-            # 決定文字顏色（受傷或隱藏的 NPC 用不同顏色）
-            text_color = self.text_color
-            if npc_info.get("is_injured", False):
-                text_color = (255, 100, 100)  # 紅色表示受傷
-            elif npc_info.get("is_hidden", False):
-                text_color = (150, 150, 150)  # 灰色表示隱藏
-
-            # 繪製各欄位
-            self._draw_field(screen, npc_info["name"], self.x + 10, y, text_color)
-            self._draw_field(
-                screen, npc_info["profession"], self.x + 120, y, text_color
-            )
-            self._draw_field(screen, npc_info["position"], self.x + 220, y, text_color)
-            self._draw_field(
-                screen, npc_info["current_state"], self.x + 320, y, text_color
-            )
+            # 繪製各欄位（內容沒變的列沿用快取的文字表面）
+            field_surfaces = self._get_row_surfaces(npc_info)
+            for surface, x_offset in zip(field_surfaces, (10, 120, 220, 320, 400)):
+                screen.blit(surface, (self.x + x_offset, y))
 
-            # 活動描述可能比較長，需要截短
-            activity = npc_info["current_activity"]
-            if len(activity) > 15:
-                activity = activity[:12] + "..."
-            self._draw_field(screen, activity, self.x + 400, y, text_color)
+        # 捲出畫面的列不再保留
+        if len(self.row_cache) > self.max_visible_items * 4:
+            visible_ids = {npc_info.get("id") for npc_info in visible_npcs}
+            self.row_cache = {
+                npc_id: row for npc_id, row in self.row_cache.items() if npc_id in visible_ids
+            }
 
-    def _draw_field(self, screen, text, x, y, color):
+    def _get_row_surfaces(self, npc_info):
         """
-        繪製單個欄位\n
+        取得一列的各欄位文字表面，欄位內容或顏色改變時才重新繪製\n
         \n
         參數:\n
-        screen (pygame.Surface): 繪製目標表面\n
-        text (str): 文字內容\n
-        x (int): X 座標\n
-        y (int): Y 座標\n
-        color (tuple): 文字顏色\n
+        npc_info (dict): NPC 狀態資訊\n
+        \n
+        回傳:\n
+        list: 姓名、職業、位置、狀態、活動的文字表面\n
         """
-        text_surface = self.content_font.render(str(text), True, color)
-        screen.blit(text_surface, (x, y))
+        # 決定文字顏色（受傷或隱藏的 NPC 用不同顏色）
+        text_color = self.text_color
+        if npc_info.get("is_injured", False):
+            text_color = (255, 100, 100)  # 紅色表示受傷
+        elif npc_info.get("is_hidden", False):
+            text_color = (150, 150, 150)  # 灰色表示隱藏
+
+        # 活動描述可能比較長，需要截短
+        activity = npc_info["current_activity"]
+        if len(activity) > 15:
+            activity = activity[:12] + "..."
+
+        fields = (
+            npc_info["name"],
+            npc_info["profession"],
+            npc_info["position"],
+            npc_info["current_state"],
+            activity,
+        )
+
+        row_id = npc_info.get("id", npc_info["name"])
+        cached = self.row_cache.get(row_id)
+        if cached is None or cached[0] != fields or cached[1] != text_color:
+            surfaces = [self.content_font.render(str(field), True, text_color) for field in fields]
+            cached = (fields, text_color, surfaces)
+            self.row_cache[row_id] = cached
+        return cached[2]
 
     def _draw_scroll_indicators(self, screen):
         """
@@ -11,8 +11,19 @@ class NPCStatusDisplayUI:
     \n
     顯示所有NPC的血量、職業和名字資訊\n
     提供友善的UI介面讓玩家了解NPC狀況\n
+    \n
+    列表內容來自 NPCManager 的狀態表，每幀只取捲動視窗內的 NPC，\n
+    每列的文字表面會快取，只有狀態改變（狀態表標記）或位置文字改變時才重新繪製\n
     """
 
+    # 排序方式和顯示名稱（←→切換）
+    SORT_LABELS = {
+        "name": "姓名",
+        "profession": "職業",
+        "state": "狀態",
+        "distance": "距離",
+    }
+
     def __init__(self):
         """
         初始化NPC狀態顯示UI\n
@@ -39,6 +50,16 @@ class NPCStatusDisplayUI:
         self.max_scroll = 0
         self.line_height = 25
         self.items_per_page = (self.height - 80) // self.line_height  # 扣除標題空間
+
+        # 排序設定
+        self.sort_keys = list(self.SORT_LABELS)
+        self.sort_index = 0
+
+        # 列快取 {npc_id: (文字, 顏色, 文字表面)}，位置文字依間隔重新整理
+        self.row_cache = {}
+        self.row_refresh_timer = 0.0
+        self.refresh_rows = False
+        self.stats_cache = None  # (統計文字, 文字表面)
         
         print("📊 NPC狀態顯示UI已初始化")
 
@@ -48,6 +69,8 @@ class NPCStatusDisplayUI:
         """
         self.is_visible = not self.is_visible
         self.scroll_offset = 0  # 重置滾動位置
+        if not self.is_visible:
+            self.row_cache.clear()
         print(f"📊 NPC狀態顯示: {'開啟' if self.is_visible else '關閉'}")
 
     def show(self):
@@ -62,6 +85,7 @@ class NPCStatusDisplayUI:
         隱藏NPC狀態\n
         """
         self.is_visible = False
+        self.row_cache.clear()
 
     def scroll_up(self):
         """
@@ -77,6 +101,16 @@ class NPCStatusDisplayUI:
         if self.scroll_offset < self.max_scroll:
             self.scroll_offset += 1
 
+    def change_sort(self, direction):
+        """
+        切換排序方式\n
+        \n
+        參數:\n
+        direction (int): 1 下一種、-1 上一種\n
+        """
+        self.sort_index = (self.sort_index + direction) % len(self.sort_keys)
+        self.scroll_offset = 0
+
     def handle_event(self, event):
         """
         處理輸入事件\n
@@ -92,6 +126,10 @@ class NPCStatusDisplayUI:
                 self.scroll_up()
             elif event.key == pygame.K_DOWN:
                 self.scroll_down()
+            elif event.key == pygame.K_LEFT:
+                self.change_sort(-1)
+            elif event.key == pygame.K_RIGHT:
+                self.change_sort(1)
             elif event.key == pygame.K_TAB:
                 self.hide()
 
@@ -102,16 +140,23 @@ class NPCStatusDisplayUI:
         參數:\n
         dt (float): 時間間隔\n
         """
-        # UI本身不需要特別的更新邏輯
-        pass
+        if not self.is_visible:
+            return
+
+        # 位置文字每隔一段時間才重新整理
+        self.row_refresh_timer += dt
+        if self.row_refresh_timer >= NPC_STATUS_ROW_REFRESH_INTERVAL:
+            self.row_refresh_timer = 0.0
+            self.refresh_rows = True
 
-    def draw(self, screen, npc_manager):
+    def draw(self, screen, npc_manager, player_position=None):
         """
         繪製NPC狀態顯示\n
         \n
         參數:\n
         screen (pygame.Surface): 繪製目標\n
         npc_manager (NPCManager): NPC管理器\n
+        player_position (tuple): 玩家位置（依距離排序用）\n
         """
         if not self.is_visible:
             return
@@ -126,17 +171,19 @@ class NPCStatusDisplayUI:
         
         # 繪製標題
         title_font = self.font_manager.get_font(UI_FONT_SIZE + 4)
-        title_text = title_font.render("NPC 狀態總覽 (按↑↓滾動, TAB關閉)", True, self.header_color)
+        sort_label = self.SORT_LABELS[self.sort_keys[self.sort_index]]
+        title_text = title_font.render(f"NPC 狀態總覽 (按↑↓滾動, ←→排序: {sort_label}, TAB關閉)", True, self.header_color)
         screen.blit(title_text, (self.x + 10, self.y + 10))
         
         # 繪製統計資訊
         stats_text = self._get_statistics_text(npc_manager)
-        stats_font = self.font_manager.get_font(UI_FONT_SIZE - 2)
-        stats_surface = stats_font.render(stats_text, True, self.text_color)
-        screen.blit(stats_surface, (self.x + 10, self.y + 40))
+        if self.stats_cache is None or self.stats_cache[0] != stats_text:
+            stats_font = self.font_manager.get_font(UI_FONT_SIZE - 2)
+            self.stats_cache = (stats_text, stats_font.render(stats_text, True, self.text_color))
+        screen.blit(self.stats_cache[1], (self.x + 10, self.y + 40))
         
         # 繪製NPC列表
-        self._draw_npc_list(screen, npc_manager)
+        self._draw_npc_list(screen, npc_manager, player_position)
 
     def _get_statistics_text(self, npc_manager):
         """
@@ -148,66 +195,90 @@ class NPCStatusDisplayUI:
         回傳:\n
         str: 統計資訊\n
         """
-        if not hasattr(npc_manager, 'all_npcs'):
+        if not hasattr(npc_manager, 'status_table'):
             return "無NPC資料"
         
-        total_npcs = len(npc_manager.all_npcs)
-        healthy_count = sum(1 for npc in npc_manager.all_npcs if not npc.is_injured)
-        injured_count = total_npcs - healthy_count
-        working_count = sum(1 for npc in npc_manager.all_npcs if hasattr(npc, 'state') and npc.state.name == 'WORKING')
+        # 人數由狀態表在狀態改變時增量維護
+        stats = npc_manager.status_table.get_statistics()
         
-        return f"總計: {total_npcs} | 健康: {healthy_count} | 受傷: {injured_count} | 工作中: {working_count}"
+        return f"總計: {stats['total']} | 健康: {stats['healthy']} | 受傷: {stats['injured']} | 工作中: {stats['working']}"
 
-    def _draw_npc_list(self, screen, npc_manager):
+    def _draw_npc_list(self, screen, npc_manager, player_position=None):
         """
         繪製NPC列表\n
         \n
         參數:\n
         screen (pygame.Surface): 繪製目標\n
         npc_manager (NPCManager): NPC管理器\n
+        player_position (tuple): 玩家位置（依距離排序用）\n
         """
-        if not hasattr(npc_manager, 'all_npcs'):
+        if not hasattr(npc_manager, 'status_table'):
             return
         
+        table = npc_manager.status_table
+        sort_key = self.sort_keys[self.sort_index]
+        if sort_key == "distance":
+            if player_position is None:
+                sort_key = "name"
+            else:
+                table.refresh_distances(player_position)
+        
         # 計算可顯示的NPC數量和滾動範圍
-        total_npcs = len(npc_manager.all_npcs)
+        total_npcs = len(table)
         self.max_scroll = max(0, total_npcs - self.items_per_page)
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll)
         
         # 起始Y位置
         start_y = self.y + 70
         font = self.font_manager.get_font(UI_FONT_SIZE - 4)
         
-        # 顯示當前頁面的NPC
-        start_index = self.scroll_offset
-        end_index = min(start_index + self.items_per_page, total_npcs)
+        # 只取當前頁面的NPC，狀態改變過的列要重新繪製
+        visible_npcs = table.get_window(sort_key, self.scroll_offset, self.items_per_page)
+        dirty_ids = table.take_dirty(visible_npcs)
         
-        for i in range(start_index, end_index):
-            npc = npc_manager.all_npcs[i]
-            y_pos = start_y + (i - start_index) * self.line_height
+        for row, npc in enumerate(visible_npcs):
+            y_pos = start_y + row * self.line_height
             
-            # 準備NPC資訊
-            npc_info = self._format_npc_info(npc)
+            cached = self.row_cache.get(npc.id)
+            if cached is None or npc.id in dirty_ids or self.refresh_rows:
+                info_text, text_color = self._format_row(npc)
+                if cached is None or cached[0] != info_text or cached[1] != text_color:
+                    cached = (info_text, text_color, font.render(info_text, True, text_color))
+                    self.row_cache[npc.id] = cached
             
-            # 選擇顏色
-            if npc.is_injured:
-                text_color = self.injured_color
-                status_icon = "🩹"
-            elif hasattr(npc, 'state') and npc.state.name == 'WORKING':
-                text_color = self.working_color
-                status_icon = "🔧"
-            else:
-                text_color = self.healthy_color
-                status_icon = "✅"
-            
-            # 繪製NPC資訊
-            info_text = f"{status_icon} {npc_info}"
-            text_surface = font.render(info_text, True, text_color)
-            screen.blit(text_surface, (self.x + 15, y_pos))
+            screen.blit(cached[2], (self.x + 15, y_pos))
+        
+        self.refresh_rows = False
         
         # 顯示滾動指示器
         if self.max_scroll > 0:
             self._draw_scroll_indicator(screen, total_npcs)
 
+    def _format_row(self, npc):
+        """
+        格式化一列NPC資訊並決定顏色\n
+        \n
+        參數:\n
+        npc (NPC): NPC物件\n
+        \n
+        回傳:\n
+        tuple: (文字, 顏色)\n
+        """
+        npc_info = self._format_npc_info(npc)
+        
+        # 選擇顏色
+        if npc.is_injured:
+            text_color = self.injured_color
+            status_icon = "🩹"
+        elif hasattr(npc, 'state') and npc.state.name == 'WORKING':
+            text_color = self.working_color
+            status_icon = "🔧"
+        else:
+            text_color = self.healthy_color
+            status_icon = "✅"
+        
+        return f"{status_icon} {npc_info}", text_color
+
     def _format_npc_info(self, npc):
         """
         格式化NPC資訊\n
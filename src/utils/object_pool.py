@@ -0,0 +1,127 @@
+######################載入套件######################
+from typing import Callable, Generic, Iterable, List, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+######################物件池######################
+class ObjectPool(Generic[T]):
+    """
+    通用物件池 - 重複使用短生命週期物件，避免每幀配置新物件\n
+    \n
+    池內物件類別需要提供 reset(*args, **kwargs) 方法\n
+    取出物件時會以 acquire 的參數呼叫 reset，讓物件回到剛建立的狀態\n
+    \n
+    使用方式:\n
+    pool = ObjectPool(Bullet, prewarm=32)\n
+    bullet = pool.acquire(start_pos, target_pos, damage=25)\n
+    pool.release(bullet)\n
+    \n
+    統計資訊包含目前使用中數量、歷史最高使用量 (high-water mark)\n
+    以及實際建立的物件總數，可用來確認穩定狀態下不再配置新物件\n
+    """
+
+    def __init__(self, item_type: Type[T], prewarm: int = 0, max_size: Optional[int] = None,
+                 factory: Optional[Callable[[], T]] = None, name: Optional[str] = None):
+        """
+        初始化物件池\n
+        \n
+        參數:\n
+        item_type (type): 池內物件的類別\n
+        prewarm (int): 預先建立的物件數量\n
+        max_size (int): 閒置物件的保留上限，None 表示不限制\n
+        factory (callable): 建立空物件的函數，預設略過 __init__ 直接配置\n
+        name (str): 池名稱，用於統計顯示\n
+        """
+        self.item_type = item_type
+        self.max_size = max_size
+        self.name = name or item_type.__name__
+        self._factory = factory or (lambda: item_type.__new__(item_type))
+        self._free: List[T] = []
+
+        # 統計資訊
+        self.in_use = 0
+        self.high_water_mark = 0
+        self.created_count = 0
+        self.acquire_count = 0
+        self.discarded_count = 0
+
+        self.prewarm(prewarm)
+
+    def prewarm(self, count: int) -> None:
+        """
+        確保池內（閒置加使用中）至少有指定數量的物件\n
+        \n
+        參數:\n
+        count (int): 目標物件數量\n
+        """
+        missing = count - (len(self._free) + self.in_use)
+        if self.max_size is not None:
+            missing = min(missing, self.max_size - len(self._free))
+
+        for _ in range(max(0, missing)):
+            self._free.append(self._factory())
+            self.created_count += 1
+
+    def acquire(self, *args, **kwargs) -> T:
+        """
+        取出一個物件並以參數重設\n
+        \n
+        回傳:\n
+        T: 重設後的物件\n
+        """
+        if self._free:
+            item = self._free.pop()
+        else:
+            item = self._factory()
+            self.created_count += 1
+
+        item.reset(*args, **kwargs)
+
+        self.acquire_count += 1
+        self.in_use += 1
+        if self.in_use > self.high_water_mark:
+            self.high_water_mark = self.in_use
+        return item
+
+    def release(self, item: T) -> None:
+        """
+        歸還物件到池中\n
+        \n
+        同一個物件在再次取出前只能歸還一次\n
+        \n
+        參數:\n
+        item (T): 要歸還的物件\n
+        """
+        self.in_use -= 1
+        if self.max_size is not None and len(self._free) >= self.max_size:
+            self.discarded_count += 1
+            return
+        self._free.append(item)
+
+    def release_all(self, items: Iterable[T]) -> None:
+        """
+        歸還多個物件\n
+        \n
+        參數:\n
+        items (iterable): 要歸還的物件\n
+        """
+        for item in items:
+            self.release(item)
+
+    def get_statistics(self) -> dict:
+        """
+        獲取物件池統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "name": self.name,
+            "in_use": self.in_use,
+            "free": len(self._free),
+            "high_water_mark": self.high_water_mark,
+            "created": self.created_count,
+            "acquired": self.acquire_count,
+            "discarded": self.discarded_count,
+        }
@@ -0,0 +1,82 @@
+######################載入套件######################
+import math
+import random
+from typing import Callable, Iterable, List, Tuple
+
+Point = Tuple[float, float]
+
+
+######################Poisson 圓盤取樣######################
+def poisson_disk_sample(width: float, height: float, min_distance: float,
+                        is_valid: Callable[[float, float], bool], seed_points: Iterable[Point],
+                        attempts: int = 30) -> List[Point]:
+    """
+    Bridson Poisson 圓盤取樣 - 在有效區域內產生彼此距離至少 min_distance 的點\n
+    \n
+    背景格子邊長 min_distance / √2，每格最多一個點，檢查距離時只看周圍 5x5 格；\n
+    每個活躍點最多嘗試 attempts 次在 [r, 2r) 的環內放新點，失敗就移出活躍列表，\n
+    所以總成本和點數成正比，不會整張地圖反覆重試\n
+    \n
+    有效區域不相連時（例如分散的森林），依序把 seed_points 當作新一輪擴散的起點，\n
+    已經被既有點涵蓋的起點直接略過\n
+    \n
+    參數:\n
+    width (float): 取樣範圍寬度\n
+    height (float): 取樣範圍高度\n
+    min_distance (float): 點之間的最小距離\n
+    is_valid (callable): is_valid(x, y) 判斷位置是否可以放點\n
+    seed_points (iterable): 每輪擴散的候選起點（需已在有效區域內）\n
+    attempts (int): 每個活躍點的嘗試次數\n
+    \n
+    回傳:\n
+    list: 取樣點 [(x, y), ...]，依產生順序\n
+    """
+    cell_size = min_distance / math.sqrt(2)
+    grid_width = int(width / cell_size) + 1
+    grid_height = int(height / cell_size) + 1
+    grid = [None] * (grid_width * grid_height)
+    min_distance_sq = min_distance * min_distance
+    samples = []
+
+    def fits(x, y):
+        cell_x = int(x / cell_size)
+        cell_y = int(y / cell_size)
+        for neighbor_y in range(max(0, cell_y - 2), min(grid_height, cell_y + 3)):
+            row = neighbor_y * grid_width
+            for neighbor_x in range(max(0, cell_x - 2), min(grid_width, cell_x + 3)):
+                other = grid[row + neighbor_x]
+                if other is not None:
+                    dx = other[0] - x
+                    dy = other[1] - y
+                    if dx * dx + dy * dy < min_distance_sq:
+                        return False
+        return True
+
+    def add(x, y):
+        point = (x, y)
+        grid[int(y / cell_size) * grid_width + int(x / cell_size)] = point
+        samples.append(point)
+        return point
+
+    for seed_x, seed_y in seed_points:
+        if not fits(seed_x, seed_y):
+            continue
+
+        active = [add(seed_x, seed_y)]
+        while active:
+            index = random.randrange(len(active))
+            active_x, active_y = active[index]
+            for _ in range(attempts):
+                angle = random.uniform(0, 2 * math.pi)
+                radius = min_distance * (1 + random.random())
+                x = active_x + math.cos(angle) * radius
+                y = active_y + math.sin(angle) * radius
+                if 0 <= x < width and 0 <= y < height and is_valid(x, y) and fits(x, y):
+                    active.append(add(x, y))
+                    break
+            else:
+                # 周圍放不下新點，移出活躍列表（和最後一個交換後刪除）
+                active[index] = active[-1]
+                active.pop()
+
+    return samples
@@ -0,0 +1,539 @@
+######################載入套件######################
+import re
+from array import array
+from collections import deque
+from typing import Dict, List, Optional
+
+# 找出一列中相同地形編碼的連續片段（在 C 層完成，不必逐格比較）
+TERRAIN_RUN_PATTERN = re.compile(rb"(.)\1*", re.DOTALL)
+
+
+######################連通區域資料######################
+class TerrainComponent:
+    """
+    一個連通地形區域（上下左右相鄰、地形編碼相同的格子集合）的統計資料\n
+    \n
+    座標都是格子座標，sum_x / sum_y 用來計算重心\n
+    anchor 是區域中依列優先順序最前面的格子索引 (y * 寬 + x)，\n
+    用來讓查詢結果維持和逐格掃描相同的順序\n
+    """
+
+    __slots__ = ("label", "terrain", "count", "min_x", "min_y", "max_x", "max_y",
+                 "sum_x", "sum_y", "anchor", "bounds_dirty")
+
+    def __init__(self, label: int, terrain: int):
+        """
+        初始化空的連通區域\n
+        \n
+        參數:\n
+        label (int): 區域標籤\n
+        terrain (int): 地形編碼\n
+        """
+        self.label = label
+        self.terrain = terrain
+        self.count = 0
+        self.min_x = self.min_y = 1 << 30
+        self.max_x = self.max_y = -1
+        self.sum_x = 0
+        self.sum_y = 0
+        self.anchor = 1 << 62
+        self.bounds_dirty = False  # 邊界可能比實際大，查詢前需要重新掃描
+
+    def add_cell(self, x: int, y: int, width: int) -> None:
+        """
+        把一個格子計入區域統計\n
+        """
+        self.count += 1
+        self.sum_x += x
+        self.sum_y += y
+        if x < self.min_x:
+            self.min_x = x
+        if x > self.max_x:
+            self.max_x = x
+        if y < self.min_y:
+            self.min_y = y
+        if y > self.max_y:
+            self.max_y = y
+        index = y * width + x
+        if index < self.anchor:
+            self.anchor = index
+
+    @property
+    def centroid(self) -> tuple:
+        """
+        區域重心（格子座標）\n
+        """
+        return (self.sum_x / self.count, self.sum_y / self.count)
+
+    @property
+    def bounds(self) -> tuple:
+        """
+        區域邊界 (x, y, 寬格數, 高格數)\n
+        """
+        return (self.min_x, self.min_y, self.max_x - self.min_x + 1, self.max_y - self.min_y + 1)
+
+
+######################連通區域標記######################
+class TerrainComponentLabels:
+    """
+    地形連通區域標記 - 一次掃描替整張地圖的所有地形編碼標記連通區域\n
+    \n
+    每格在 labels 陣列中記錄所屬區域的標籤，每個區域另外保存格數、邊界、重心\n
+    查詢某種地形的所有區域、某格屬於哪個區域都只是查表\n
+    \n
+    建立時以「列片段」為單位做兩階段標記：每列先切成相同地形的連續片段，\n
+    和上一列重疊的同地形片段合併 (union-find)，最後再寫入每格的標籤\n
+    \n
+    地形儲存的變更紀錄完整時逐格更新：\n
+    1. 變更的格子離開原本的區域，必要時把原區域拆成多塊\n
+    2. 再和上下左右同地形的區域合併（小區域併入大區域）\n
+    變更紀錄不完整（大範圍寫入）時整張重建\n
+    """
+
+    def __init__(self, store):
+        """
+        初始化連通區域標記並立即建立\n
+        \n
+        參數:\n
+        store (TerrainStore): 地形儲存\n
+        """
+        self.store = store
+        self.width = store.width
+        self.height = store.height
+        self.labels = array("I")
+        self.components: Dict[int, TerrainComponent] = {}
+        self._by_terrain: Dict[int, set] = {}
+        self._sorted_cache: Dict[int, List[TerrainComponent]] = {}
+        self._next_label = 1
+
+        # 已經套用到哪個地形版本；revision 在區域有任何變化時遞增
+        self.store_revision = store.revision
+        self.revision = 0
+
+        # 統計資訊
+        self.rebuild_count = 0
+        self.incremental_updates = 0
+
+        self.rebuild()
+
+    ######################整張建立######################
+    def rebuild(self) -> None:
+        """
+        整張地圖重新標記\n
+        """
+        width = self.width
+        parent = []
+
+        def find(node):
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        # 第一階段：切出每列的片段並和上一列重疊的同地形片段合併
+        row_runs = []
+        previous = []
+        for row in self.store.iter_rows():
+            runs = []
+            j = 0
+            for match in TERRAIN_RUN_PATTERN.finditer(row):
+                start, end = match.span()
+                terrain = row[start]
+                node = len(parent)
+                parent.append(node)
+
+                # 跳過已經完全在左邊的上一列片段
+                while j < len(previous) and previous[j][1] <= start:
+                    j += 1
+                k = j
+                while k < len(previous) and previous[k][0] < end:
+                    if previous[k][2] == terrain:
+                        root_a, root_b = find(node), find(previous[k][3])
+                        if root_a != root_b:
+                            # 保留較早的根，讓標籤編號依掃描順序排列
+                            if root_a < root_b:
+                                parent[root_b] = root_a
+                            else:
+                                parent[root_a] = root_b
+                    k += 1
+
+                runs.append((start, end, terrain, node))
+            row_runs.append(runs)
+            previous = runs
+
+        # 第二階段：寫入標籤並累計區域統計
+        labels = array("I", bytes(4 * width * self.height))
+        components = {}
+        by_terrain = {}
+        root_labels = {}
+        next_label = 1
+        for y, runs in enumerate(row_runs):
+            row_offset = y * width
+            for start, end, terrain, node in runs:
+                root = find(node)
+                label = root_labels.get(root)
+                if label is None:
+                    label = next_label
+                    next_label += 1
+                    root_labels[root] = label
+                    component = TerrainComponent(label, terrain)
+                    component.anchor = row_offset + start
+                    component.min_y = y
+                    components[label] = component
+                    by_terrain.setdefault(terrain, set()).add(label)
+                else:
+                    component = components[label]
+
+                length = end - start
+                component.count += length
+                component.sum_x += (start + end - 1) * length // 2
+                component.sum_y += y * length
+                if start < component.min_x:
+                    component.min_x = start
+                if end - 1 > component.max_x:
+                    component.max_x = end - 1
+                component.max_y = y
+                labels[row_offset + start:row_offset + end] = array("I", [label]) * length
+
+        self.labels = labels
+        self.components = components
+        self._by_terrain = by_terrain
+        self._sorted_cache = {}
+        self._next_label = next_label
+        self.store_revision = self.store.revision
+        self.revision += 1
+        self.rebuild_count += 1
+
+    ######################增量更新######################
+    def refresh(self) -> bool:
+        """
+        套用地形儲存上次同步後的變更\n
+        \n
+        回傳:\n
+        bool: 有任何變更回傳 True\n
+        """
+        store = self.store
+        if store.revision == self.store_revision:
+            return False
+
+        changes = store.changes_since(self.store_revision)
+        if changes is None:
+            self.rebuild()
+            return True
+
+        for x, y in dict.fromkeys(changes):
+            self._apply_cell(x, y)
+        self.store_revision = store.revision
+        self.revision += 1
+        return True
+
+    def _apply_cell(self, x: int, y: int) -> None:
+        """
+        讓單一格子的標籤符合目前的地形編碼\n
+        \n
+        連通判斷只依據標籤（各區域記錄的地形），\n
+        同一批尚未處理的變更格子會在輪到它們時再修正\n
+        """
+        terrain = self.store.get_terrain_at(x, y)
+        if terrain is None:
+            return
+        index = y * self.width + x
+        old_label = self.labels[index]
+        old_component = self.components.get(old_label)
+        if old_component is not None and old_component.terrain == terrain:
+            return
+
+        self.incremental_updates += 1
+        if old_component is not None:
+            self._remove_cell(old_component, x, y)
+        self._add_cell(terrain, x, y)
+
+    def _neighbors(self, index: int):
+        """
+        上下左右相鄰格子的索引\n
+        """
+        width = self.width
+        x = index % width
+        if x > 0:
+            yield index - 1
+        if x < width - 1:
+            yield index + 1
+        if index >= width:
+            yield index - width
+        if index + width < width * self.height:
+            yield index + width
+
+    def _remove_cell(self, component: TerrainComponent, x: int, y: int) -> None:
+        """
+        格子離開原本的區域，原區域斷開時拆成多塊\n
+        """
+        labels = self.labels
+        label = component.label
+        index = y * self.width + x
+        labels[index] = 0
+
+        component.count -= 1
+        component.sum_x -= x
+        component.sum_y -= y
+        component.bounds_dirty = True
+        self._touch(component.terrain)
+        if component.count == 0:
+            self._drop_component(component)
+            return
+
+        seeds = [n for n in self._neighbors(index) if labels[n] == label]
+        if len(seeds) > 1:
+            self._split_component(component, seeds)
+
+    def _split_component(self, component: TerrainComponent, seeds: List[int]) -> None:
+        """
+        從移除格子的各個鄰居同時展開，找出斷開的部分\n
+        \n
+        各鄰居輪流前進一格，碰到彼此就合併；只剩一個還在展開的群組時停止，\n
+        已經展開完畢的群組就是斷開的區域，花費只和較小的部分成正比\n
+        """
+        labels = self.labels
+        label = component.label
+        group_count = len(seeds)
+        group_parent = list(range(group_count))
+
+        def find(group):
+            while group_parent[group] != group:
+                group = group_parent[group]
+            return group
+
+        owner = {}
+        members = []
+        frontiers = []
+        for group, seed in enumerate(seeds):
+            owner[seed] = group
+            members.append([seed])
+            frontiers.append(deque([seed]))
+
+        while True:
+            roots = {find(group) for group in range(group_count)}
+            if len(roots) == 1:
+                return
+            open_roots = {find(group) for group in range(group_count) if frontiers[group]}
+            if len(open_roots) <= 1:
+                break
+
+            for group in range(group_count):
+                frontier = frontiers[group]
+                if not frontier:
+                    continue
+                cell = frontier.popleft()
+                for neighbor in self._neighbors(cell):
+                    if labels[neighbor] != label:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = group
+                        members[group].append(neighbor)
+                        frontier.append(neighbor)
+                    else:
+                        root_a, root_b = find(group), find(other)
+                        if root_a != root_b:
+                            group_parent[root_b] = root_a
+
+        # 仍在展開的群組（或全部結束時最大的群組）保留原標籤，其他的成為新區域
+        parts = {}
+        for group in range(group_count):
+            parts.setdefault(find(group), []).extend(members[group])
+        if open_roots:
+            keep_root = next(iter(open_roots))
+        else:
+            keep_root = max(parts, key=lambda root: len(parts[root]))
+
+        width = self.width
+        for root, cells in parts.items():
+            if root == keep_root:
+                continue
+            new_component = self._new_component(component.terrain)
+            new_label = new_component.label
+            for cell in cells:
+                labels[cell] = new_label
+                cell_x = cell % width
+                cell_y = cell // width
+                new_component.add_cell(cell_x, cell_y, width)
+            component.count -= new_component.count
+            component.sum_x -= new_component.sum_x
+            component.sum_y -= new_component.sum_y
+
+    def _add_cell(self, terrain: int, x: int, y: int) -> None:
+        """
+        格子加入新地形的區域，和相鄰的同地形區域合併\n
+        """
+        labels = self.labels
+        components = self.components
+        width = self.width
+        index = y * width + x
+
+        neighbor_components = {}
+        for neighbor in self._neighbors(index):
+            neighbor_component = components.get(labels[neighbor])
+            if neighbor_component is not None and neighbor_component.terrain == terrain:
+                neighbor_components[neighbor_component.label] = (neighbor_component, neighbor)
+
+        if not neighbor_components:
+            target = self._new_component(terrain)
+        else:
+            # 併入最大的相鄰區域，較小的區域逐格改標籤
+            target = max((item[0] for item in neighbor_components.values()), key=lambda c: c.count)
+            for other, seed in neighbor_components.values():
+                if other is not target:
+                    self._merge_into(target, other, seed)
+
+        labels[index] = target.label
+        target.add_cell(x, y, width)
+        self._touch(terrain)
+
+    def _merge_into(self, target: TerrainComponent, other: TerrainComponent, seed: int) -> None:
+        """
+        把 other 區域的所有格子改成 target 的標籤\n
+        """
+        labels = self.labels
+        other_label = other.label
+        target_label = target.label
+        labels[seed] = target_label
+        queue = deque([seed])
+        while queue:
+            cell = queue.popleft()
+            for neighbor in self._neighbors(cell):
+                if labels[neighbor] == other_label:
+                    labels[neighbor] = target_label
+                    queue.append(neighbor)
+
+        # 兩個邊界的聯集仍然涵蓋合併後的區域
+        target.count += other.count
+        target.sum_x += other.sum_x
+        target.sum_y += other.sum_y
+        target.min_x = min(target.min_x, other.min_x)
+        target.min_y = min(target.min_y, other.min_y)
+        target.max_x = max(target.max_x, other.max_x)
+        target.max_y = max(target.max_y, other.max_y)
+        target.anchor = min(target.anchor, other.anchor)
+        target.bounds_dirty = target.bounds_dirty or other.bounds_dirty
+        self._drop_component(other)
+
+    def _new_component(self, terrain: int) -> TerrainComponent:
+        """
+        建立新區域並登記\n
+        """
+        component = TerrainComponent(self._next_label, terrain)
+        self._next_label += 1
+        self.components[component.label] = component
+        self._by_terrain.setdefault(terrain, set()).add(component.label)
+        self._touch(terrain)
+        return component
+
+    def _drop_component(self, component: TerrainComponent) -> None:
+        """
+        移除區域登記\n
+        """
+        del self.components[component.label]
+        labels = self._by_terrain.get(component.terrain)
+        if labels is not None:
+            labels.discard(component.label)
+        self._touch(component.terrain)
+
+    def _touch(self, terrain: int) -> None:
+        """
+        讓某種地形的排序快取失效\n
+        """
+        self._sorted_cache.pop(terrain, None)
+
+    def _update_bounds(self, component: TerrainComponent) -> None:
+        """
+        在舊邊界範圍內重新掃描標籤，算出精確的邊界和 anchor\n
+        """
+        labels = self.labels
+        width = self.width
+        label = component.label
+        min_x = min_y = 1 << 30
+        max_x = max_y = -1
+        anchor = None
+        for y in range(component.min_y, component.max_y + 1):
+            row_offset = y * width
+            row = labels[row_offset + component.min_x:row_offset + component.max_x + 1]
+            if label not in row:
+                continue
+            first = row.index(label)
+            last = len(row) - 1
+            while row[last] != label:
+                last -= 1
+            if anchor is None:
+                anchor = row_offset + component.min_x + first
+                min_y = y
+            max_y = y
+            min_x = min(min_x, component.min_x + first)
+            max_x = max(max_x, component.min_x + last)
+
+        component.min_x, component.min_y = min_x, min_y
+        component.max_x, component.max_y = max_x, max_y
+        component.anchor = anchor
+        component.bounds_dirty = False
+
+    ######################查詢######################
+    def get_label_at(self, x: int, y: int) -> int:
+        """
+        取得格子的區域標籤，超出範圍回傳 0\n
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.labels[y * self.width + x]
+        return 0
+
+    def get_component_at(self, x: int, y: int) -> Optional[TerrainComponent]:
+        """
+        取得格子所屬的連通區域\n
+        \n
+        參數:\n
+        x (int): 格子 X 座標\n
+        y (int): 格子 Y 座標\n
+        \n
+        回傳:\n
+        TerrainComponent: 連通區域，超出範圍回傳 None\n
+        """
+        component = self.components.get(self.get_label_at(x, y))
+        if component is not None and component.bounds_dirty:
+            self._update_bounds(component)
+        return component
+
+    def get_components(self, terrain: int) -> List[TerrainComponent]:
+        """
+        取得某種地形的所有連通區域，依區域最前面格子的掃描順序排列\n
+        \n
+        參數:\n
+        terrain (int): 地形編碼\n
+        \n
+        回傳:\n
+        list: TerrainComponent 列表（快取，呼叫端不應修改）\n
+        """
+        cached = self._sorted_cache.get(terrain)
+        if cached is not None:
+            return cached
+
+        components = [self.components[label] for label in self._by_terrain.get(terrain, ())]
+        for component in components:
+            if component.bounds_dirty:
+                self._update_bounds(component)
+        components.sort(key=lambda component: component.anchor)
+        self._sorted_cache[terrain] = components
+        return components
+
+    def get_statistics(self) -> dict:
+        """
+        獲取連通區域統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "components": len(self.components),
+            "terrain_types": sum(1 for labels in self._by_terrain.values() if labels),
+            "rebuilds": self.rebuild_count,
+            "incremental_updates": self.incremental_updates,
+            "revision": self.revision,
+        }
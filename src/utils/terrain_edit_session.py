@@ -0,0 +1,594 @@
+######################載入套件######################
+import pygame
+from array import array
+from collections import deque
+from typing import List, Optional, Tuple
+
+# 編輯紀錄最多保留的筆畫數
+MAX_UNDO_STEPS = 200
+
+# 一次變更超過地圖格數的這個比例時，改為整張重畫
+FULL_REDRAW_RATIO = 0.25
+
+# 快取地圖表面的像素上限（約 4096x2048），超過時改為只畫可見格子
+MAX_CACHED_SURFACE_PIXELS = 4096 * 2048
+
+# 格子邊框顏色
+GRID_LINE_COLOR = (128, 128, 128)
+
+
+######################編輯筆畫######################
+class TerrainEditStroke:
+    """
+    編輯筆畫 - 一次操作（一筆拖曳、一次填色、一個矩形）改動的所有格子\n
+    \n
+    以三條連續陣列記錄：格子索引 (y * 寬 + x)、舊地形、新地形\n
+    復原時寫回舊地形，重做時寫回新地形\n
+    """
+
+    __slots__ = ("cells", "old_values", "new_values")
+
+    def __init__(self):
+        """
+        初始化空筆畫\n
+        """
+        self.cells = array("I")
+        self.old_values = array("B")
+        self.new_values = array("B")
+
+    def __len__(self):
+        """
+        筆畫改動的格子數\n
+        """
+        return len(self.cells)
+
+
+######################地形編輯工作階段######################
+class TerrainEditSession:
+    """
+    地形編輯工作階段 - 所有地圖修改都經過這裡\n
+    \n
+    主要功能:\n
+    1. 筆刷、油漆桶（區域填色）、矩形、全圖填滿工具，直接整批改寫地圖陣列\n
+    2. 以筆畫為單位的編輯紀錄，支援復原 / 重做\n
+    3. 記錄變更過的格子，讓地圖表面只重畫這些格子\n
+    4. 記錄變更過的行，儲存時只重新轉換這些行的 CSV 文字\n
+    """
+
+    def __init__(self, map_loader, max_undo_steps: int = MAX_UNDO_STEPS):
+        """
+        初始化編輯工作階段\n
+        \n
+        參數:\n
+        map_loader (TerrainMapLoader): 地圖載入器（持有 map_data）\n
+        max_undo_steps (int): 最多可復原的筆畫數\n
+        """
+        self.map_loader = map_loader
+        self.undo_stack = deque(maxlen=max_undo_steps)
+        self.redo_stack = []
+
+        self._stroke_changes = None  # 進行中的筆刷筆畫：格子索引 -> [舊地形, 新地形]
+        self._dirty_cells = set()  # 等待重畫的格子 (x, y)
+        self._full_redraw = True
+        self._unsaved_rows = set()  # 上次儲存後改動過的行
+
+        # 增量儲存用的每行 CSV 文字快取
+        self._saved_path = None
+        self._row_lines = None
+
+    ######################地圖資訊######################
+    @property
+    def width(self) -> int:
+        """
+        地圖寬度（格數）\n
+        """
+        return self.map_loader.map_width
+
+    @property
+    def height(self) -> int:
+        """
+        地圖高度（格數）\n
+        """
+        return self.map_loader.map_height
+
+    def reset(self):
+        """
+        重新載入地圖後呼叫，清除編輯紀錄和所有快取\n
+        """
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._stroke_changes = None
+        self._dirty_cells.clear()
+        self._full_redraw = True
+        self._unsaved_rows.clear()
+        self._saved_path = None
+        self._row_lines = None
+
+    def is_valid_terrain(self, terrain_code: int) -> bool:
+        """
+        檢查地形編碼是否有效\n
+        """
+        return terrain_code in self.map_loader.terrain_types
+
+    def _mark_dirty(self, x: int, y: int):
+        """
+        標記格子需要重畫、所在行需要重新儲存\n
+        """
+        if not self._full_redraw:
+            self._dirty_cells.add((x, y))
+        self._unsaved_rows.add(y)
+
+    def _mark_region_dirty(self, x0: int, y0: int, x1: int, y1: int):
+        """
+        標記矩形範圍（含邊界）需要重畫，範圍太大時改為整張重畫\n
+        """
+        self._unsaved_rows.update(range(y0, y1 + 1))
+        if self._full_redraw:
+            return
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.width * self.height * FULL_REDRAW_RATIO:
+            self._full_redraw = True
+            self._dirty_cells.clear()
+            return
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                self._dirty_cells.add((x, y))
+
+    def consume_dirty(self) -> Tuple[List[Tuple[int, int]], bool]:
+        """
+        取出並清除等待重畫的格子\n
+        \n
+        回傳:\n
+        tuple: (格子座標列表, 是否需要整張重畫)\n
+        """
+        full_redraw = self._full_redraw
+        cells = list(self._dirty_cells)
+        self._dirty_cells.clear()
+        self._full_redraw = False
+        return cells, full_redraw
+
+    ######################筆刷######################
+    def begin_stroke(self):
+        """
+        開始一筆筆刷（滑鼠按下）\n
+        """
+        self._stroke_changes = {}
+
+    def paint(self, x: int, y: int, terrain_code: int) -> bool:
+        """
+        以筆刷設定單一格子\n
+        \n
+        在 begin_stroke / end_stroke 之間的所有格子合併成同一筆紀錄\n
+        \n
+        參數:\n
+        x (int): 格子 X 座標\n
+        y (int): 格子 Y 座標\n
+        terrain_code (int): 地形編碼\n
+        \n
+        回傳:\n
+        bool: 地形是否真的改變\n
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        if not self.is_valid_terrain(terrain_code):
+            return False
+
+        row = self.map_loader.map_data[y]
+        old_value = row[x]
+        if old_value == terrain_code:
+            return False
+
+        row[x] = terrain_code
+        self._mark_dirty(x, y)
+
+        index = y * self.width + x
+        if self._stroke_changes is None:
+            # 沒有進行中的筆畫時，單獨成為一筆紀錄
+            stroke = TerrainEditStroke()
+            stroke.cells.append(index)
+            stroke.old_values.append(old_value)
+            stroke.new_values.append(terrain_code)
+            self._push_stroke(stroke)
+        elif index in self._stroke_changes:
+            self._stroke_changes[index][1] = terrain_code
+        else:
+            self._stroke_changes[index] = [old_value, terrain_code]
+        return True
+
+    def end_stroke(self) -> int:
+        """
+        結束筆刷（滑鼠放開），把這一筆的改動寫入編輯紀錄\n
+        \n
+        回傳:\n
+        int: 這一筆改動的格子數\n
+        """
+        changes = self._stroke_changes
+        self._stroke_changes = None
+        if not changes:
+            return 0
+
+        stroke = TerrainEditStroke()
+        for index, (old_value, new_value) in changes.items():
+            if old_value != new_value:
+                stroke.cells.append(index)
+                stroke.old_values.append(old_value)
+                stroke.new_values.append(new_value)
+        self._push_stroke(stroke)
+        return len(stroke)
+
+    ######################整批工具######################
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, terrain_code: int) -> int:
+        """
+        矩形工具 - 把矩形範圍（含兩個角）整批設為同一地形\n
+        \n
+        參數:\n
+        x0, y0 (int): 第一個角的格子座標\n
+        x1, y1 (int): 對角的格子座標\n
+        terrain_code (int): 地形編碼\n
+        \n
+        回傳:\n
+        int: 改動的格子數\n
+        """
+        if not self.is_valid_terrain(terrain_code) or not self.map_loader.map_data:
+            return 0
+
+        # 排序並裁切到地圖範圍內
+        x0, x1 = max(0, min(x0, x1)), min(self.width - 1, max(x0, x1))
+        y0, y1 = max(0, min(y0, y1)), min(self.height - 1, max(y0, y1))
+        if x0 > x1 or y0 > y1:
+            return 0
+
+        stroke = TerrainEditStroke()
+        width = self.width
+        span = x1 - x0 + 1
+        for y in range(y0, y1 + 1):
+            row = self.map_loader.map_data[y]
+            base = y * width
+            for x in range(x0, x1 + 1):
+                old_value = row[x]
+                if old_value != terrain_code:
+                    stroke.cells.append(base + x)
+                    stroke.old_values.append(old_value)
+            row[x0:x1 + 1] = [terrain_code] * span
+
+        if not stroke:
+            return 0
+        stroke.new_values = array("B", [terrain_code]) * len(stroke)
+        self._mark_region_dirty(x0, y0, x1, y1)
+        self._push_stroke(stroke)
+        return len(stroke)
+
+    def fill_all(self, terrain_code: int) -> int:
+        """
+        全圖填滿為同一地形\n
+        \n
+        回傳:\n
+        int: 改動的格子數\n
+        """
+        return self.fill_rect(0, 0, self.width - 1, self.height - 1, terrain_code)
+
+    def flood_fill(self, x: int, y: int, terrain_code: int) -> int:
+        """
+        油漆桶工具 - 把與起點相連（上下左右）且地形相同的區域改為新地形\n
+        \n
+        使用掃描線填色，每次整段改寫一行中連續的同地形格子\n
+        \n
+        參數:\n
+        x (int): 起點格子 X 座標\n
+        y (int): 起點格子 Y 座標\n
+        terrain_code (int): 地形編碼\n
+        \n
+        回傳:\n
+        int: 改動的格子數\n
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        if not self.is_valid_terrain(terrain_code):
+            return 0
+
+        rows = self.map_loader.map_data
+        width, height = self.width, self.height
+        target = rows[y][x]
+        if target == terrain_code:
+            return 0
+
+        stroke = TerrainEditStroke()
+        min_x, min_y, max_x, max_y = x, y, x, y
+        stack = [(x, y)]
+
+        while stack:
+            seed_x, seed_y = stack.pop()
+            row = rows[seed_y]
+            if row[seed_x] != target:
+                continue
+
+            # 找出這一行連續同地形的範圍
+            left = seed_x
+            while left > 0 and row[left - 1] == target:
+                left -= 1
+            right = seed_x
+            while right < width - 1 and row[right + 1] == target:
+                right += 1
+
+            span = right - left + 1
+            base = seed_y * width
+            stroke.cells.extend(range(base + left, base + right + 1))
+            row[left:right + 1] = [terrain_code] * span
+
+            min_x, max_x = min(min_x, left), max(max_x, right)
+            min_y, max_y = min(min_y, seed_y), max(max_y, seed_y)
+
+            # 上下兩行中，每一段同地形的連續範圍放一個種子
+            for next_y in (seed_y - 1, seed_y + 1):
+                if not 0 <= next_y < height:
+                    continue
+                next_row = rows[next_y]
+                in_run = False
+                for next_x in range(left, right + 1):
+                    if next_row[next_x] == target:
+                        if not in_run:
+                            stack.append((next_x, next_y))
+                            in_run = True
+                    else:
+                        in_run = False
+
+        count = len(stroke)
+        stroke.old_values = array("B", [target]) * count
+        stroke.new_values = array("B", [terrain_code]) * count
+
+        if count > width * height * FULL_REDRAW_RATIO:
+            self._mark_region_dirty(min_x, min_y, max_x, max_y)
+        else:
+            for index in stroke.cells:
+                self._mark_dirty(index % width, index // width)
+        self._push_stroke(stroke)
+        return count
+
+    ######################復原 / 重做######################
+    def _push_stroke(self, stroke: TerrainEditStroke):
+        """
+        寫入一筆新紀錄，並清除重做紀錄\n
+        """
+        if not stroke:
+            return
+        self.undo_stack.append(stroke)
+        self.redo_stack.clear()
+
+    def _apply_values(self, stroke: TerrainEditStroke, values: array):
+        """
+        把筆畫中每個格子寫成指定的值\n
+        """
+        rows = self.map_loader.map_data
+        width = self.width
+        if len(stroke) > width * self.height * FULL_REDRAW_RATIO:
+            self._full_redraw = True
+            self._dirty_cells.clear()
+        for index, value in zip(stroke.cells, values):
+            y, x = divmod(index, width)
+            rows[y][x] = value
+            self._mark_dirty(x, y)
+
+    def can_undo(self) -> bool:
+        """
+        是否有可復原的操作\n
+        """
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        """
+        是否有可重做的操作\n
+        """
+        return bool(self.redo_stack)
+
+    def undo(self) -> int:
+        """
+        復原上一筆操作\n
+        \n
+        回傳:\n
+        int: 還原的格子數，沒有可復原的操作時為 0\n
+        """
+        if self._stroke_changes:
+            self.end_stroke()
+        if not self.undo_stack:
+            return 0
+        stroke = self.undo_stack.pop()
+        self._apply_values(stroke, stroke.old_values)
+        self.redo_stack.append(stroke)
+        return len(stroke)
+
+    def redo(self) -> int:
+        """
+        重做上一筆被復原的操作\n
+        \n
+        回傳:\n
+        int: 重做的格子數，沒有可重做的操作時為 0\n
+        """
+        if not self.redo_stack:
+            return 0
+        stroke = self.redo_stack.pop()
+        self._apply_values(stroke, stroke.new_values)
+        self.undo_stack.append(stroke)
+        return len(stroke)
+
+    ######################增量儲存######################
+    def save(self, file_path: str) -> bool:
+        """
+        儲存地圖為 CSV 檔案\n
+        \n
+        每行的 CSV 文字會快取起來，再次儲存到同一個檔案時只重新轉換改動過的行\n
+        輸出格式與 TerrainMapLoader.save_to_csv 相同\n
+        \n
+        參數:\n
+        file_path (str): CSV 檔案路徑\n
+        \n
+        回傳:\n
+        bool: 儲存成功回傳 True\n
+        """
+        # .terrain 區塊檔案直接整份寫出（檔案本身就是二進位陣列）
+        if file_path.endswith(".terrain"):
+            if not self.map_loader.save_to_store(file_path):
+                return False
+            self._unsaved_rows.clear()
+            return True
+
+        rows = self.map_loader.map_data
+        if self._row_lines is None or self._saved_path != file_path or len(self._row_lines) != len(rows):
+            lines = [_format_csv_row(row) for row in rows]
+        else:
+            lines = self._row_lines
+            for y in self._unsaved_rows:
+                lines[y] = _format_csv_row(rows[y])
+
+        try:
+            with open(file_path, "w", newline="", encoding="utf-8") as file:
+                file.write("".join(lines))
+        except OSError as e:
+            print(f"儲存地圖時發生錯誤：{e}")
+            # 檔案狀態不確定，下次整份重寫
+            self._row_lines = None
+            return False
+
+        self._row_lines = lines
+        self._saved_path = file_path
+        self._unsaved_rows.clear()
+        return True
+
+    def get_statistics(self) -> dict:
+        """
+        獲取編輯統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "undo_steps": len(self.undo_stack),
+            "redo_steps": len(self.redo_stack),
+            "journal_cells": sum(len(stroke) for stroke in self.undo_stack),
+            "unsaved_rows": len(self._unsaved_rows),
+        }
+
+
+def _format_csv_row(row) -> str:
+    """
+    把一行地形編碼轉成 CSV 文字（與 csv.writer 的預設格式相同）\n
+    """
+    return ",".join(map(str, row)) + "\r\n"
+
+
+######################快取地圖表面######################
+class TerrainMapSurface:
+    """
+    快取地圖表面 - 地圖只完整畫一次，之後只重畫改動過的格子\n
+    \n
+    格子大小改變（縮放）或重新載入地圖時整張重建\n
+    地圖在目前縮放下大於 MAX_CACHED_SURFACE_PIXELS 時不建立快取，\n
+    改為每幀只畫螢幕範圍內的格子\n
+    """
+
+    def __init__(self, map_loader, max_pixels: int = MAX_CACHED_SURFACE_PIXELS):
+        """
+        初始化地圖表面\n
+        \n
+        參數:\n
+        map_loader (TerrainMapLoader): 地圖載入器\n
+        max_pixels (int): 快取表面的像素上限\n
+        """
+        self.map_loader = map_loader
+        self.max_pixels = max_pixels
+        self.surface = None
+        self.tile_size = 0
+
+        # 統計資訊
+        self.full_redraws = 0
+        self.tiles_redrawn = 0
+
+    def invalidate(self):
+        """
+        丟棄快取，下次繪製時整張重建\n
+        """
+        self.surface = None
+
+    def _draw_tile(self, target, x: int, y: int, left: int, top: int, tile_size: int):
+        """
+        在目標表面畫一個格子\n
+        """
+        color = self.map_loader.get_terrain_color(self.map_loader.map_data[y][x])
+        rect = pygame.Rect(left, top, tile_size, tile_size)
+        pygame.draw.rect(target, color, rect)
+        # 繪製格子邊框（當瓦片夠大時）
+        if tile_size >= 10:
+            pygame.draw.rect(target, GRID_LINE_COLOR, rect, 1)
+
+    def _rebuild(self, tile_size: int):
+        """
+        以指定格子大小重建整張快取表面\n
+        """
+        width = self.map_loader.map_width
+        height = self.map_loader.map_height
+        self.surface = pygame.Surface((width * tile_size, height * tile_size))
+        self.tile_size = tile_size
+        for y in range(height):
+            for x in range(width):
+                self._draw_tile(self.surface, x, y, x * tile_size, y * tile_size, tile_size)
+        self.full_redraws += 1
+
+    def draw(self, screen, offset_x: int, offset_y: int, tile_size: int,
+             dirty_cells: Optional[List[Tuple[int, int]]] = None, full_redraw: bool = False):
+        """
+        把地圖畫到螢幕上\n
+        \n
+        參數:\n
+        screen (pygame.Surface): 繪製目標\n
+        offset_x, offset_y (int): 地圖左上角的螢幕座標\n
+        tile_size (int): 每格的像素大小\n
+        dirty_cells (list): 上次繪製後改動過的格子\n
+        full_redraw (bool): 是否需要整張重建\n
+        """
+        if not self.map_loader.map_data:
+            return
+
+        width = self.map_loader.map_width
+        height = self.map_loader.map_height
+
+        if width * height * tile_size * tile_size > self.max_pixels:
+            # 地圖太大，直接畫可見範圍
+            self.surface = None
+            self._draw_visible(screen, offset_x, offset_y, tile_size)
+            return
+
+        if self.surface is None or full_redraw or tile_size != self.tile_size:
+            self._rebuild(tile_size)
+        elif dirty_cells:
+            for x, y in dirty_cells:
+                self._draw_tile(self.surface, x, y, x * tile_size, y * tile_size, tile_size)
+            self.tiles_redrawn += len(dirty_cells)
+
+        screen.blit(self.surface, (offset_x, offset_y))
+
+    def _draw_visible(self, screen, offset_x: int, offset_y: int, tile_size: int):
+        """
+        只畫螢幕範圍內的格子（不使用快取）\n
+        """
+        screen_width, screen_height = screen.get_size()
+        first_x = max(0, -offset_x // tile_size)
+        first_y = max(0, -offset_y // tile_size)
+        last_x = min(self.map_loader.map_width, (screen_width - offset_x) // tile_size + 1)
+        last_y = min(self.map_loader.map_height, (screen_height - offset_y) // tile_size + 1)
+
+        for y in range(first_y, last_y):
+            top = offset_y + y * tile_size
+            for x in range(first_x, last_x):
+                self._draw_tile(screen, x, y, offset_x + x * tile_size, top, tile_size)
+
+    def get_statistics(self) -> dict:
+        """
+        獲取地圖表面統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "cached": self.surface is not None,
+            "tile_size": self.tile_size,
+            "full_redraws": self.full_redraws,
+            "tiles_redrawn": self.tiles_redrawn,
+        }
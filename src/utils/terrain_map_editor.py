@@ -5,6 +5,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.terrain_map_loader import TerrainMapLoader
+from utils.terrain_edit_session import TerrainEditSession, TerrainMapSurface
 from utils.font_manager import get_font_manager, init_font_system
 
 ######################物件類別######################
@@ -47,6 +48,10 @@ class TerrainMapEditor:
         # 初始化地圖載入器
         self.map_loader = TerrainMapLoader()
         
+        # 編輯工作階段（整批工具、復原/重做、增量儲存）和快取地圖表面
+        self.edit_session = TerrainEditSession(self.map_loader)
+        self.map_surface = TerrainMapSurface(self.map_loader)
+        
         # 編輯器設定
         self.tile_size = 20  # 每個地形格子的顯示大小
         self.selected_terrain = 0  # 當前選擇的地形類型
@@ -62,6 +67,8 @@ class TerrainMapEditor:
         self.running = True
         self.current_file_info = "未載入檔案"  # 追蹤當前檔案狀態
         self.has_unsaved_changes = False  # 追蹤是否有未儲存的變更
+        self.current_tool = "brush"  # 目前工具：brush 筆刷、fill 油漆桶、rect 矩形
+        self.rect_start = None  # 矩形工具按下時的格子座標
         
     def load_map(self, file_path: str) -> bool:
         """
@@ -73,9 +80,12 @@ class TerrainMapEditor:
         回傳:\n
         bool: 載入成功回傳True\n
         """
-        success = self.map_loader.load_from_csv(file_path)
+        success = self.map_loader.load_map(file_path, editable=True)
         if success:
             print(f"地圖載入成功：{file_path}")
+            # 新地圖：清除編輯紀錄和快取表面
+            self.edit_session.reset()
+            self.map_surface.invalidate()
             # 更新當前檔案資訊
             if "edited" in file_path:
                 self.current_file_info = "編輯版本 (已修改)"
@@ -132,8 +142,7 @@ class TerrainMapEditor:
             # 滑鼠左鍵點擊（繪製地形/填滿）
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
-                    self.is_painting = True
-                    self._handle_map_click(event.pos)
+                    self._begin_tool(event.pos)
                     # 檢查是否點擊到填滿按鈕
                     if hasattr(event, 'pos') and self._is_fill_button_clicked(event.pos):
                         self.fill_map_with_selected_terrain()
@@ -143,7 +152,7 @@ class TerrainMapEditor:
             # 滑鼠左鍵放開（停止繪製）
             if event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
-                    self.is_painting = False
+                    self._end_tool(event.pos)
             # 滑鼠拖曳（持續繪製地形）
             if event.type == pygame.MOUSEMOTION:
                 if self.is_painting:
@@ -179,17 +188,18 @@ class TerrainMapEditor:
         """
         if not self.map_loader.map_data:
             return
-        # 逐格填滿地圖
-        for y in range(self.map_loader.map_height):
-            for x in range(self.map_loader.map_width):
-                self.map_loader.set_terrain_at(x, y, self.selected_terrain)
+        # 整批填滿地圖（可復原）
+        self.edit_session.fill_all(self.selected_terrain)
     
-    def _handle_map_click(self, mouse_pos: tuple):
+    def _screen_to_cell(self, mouse_pos: tuple):
         """
-        處理地圖區域的滑鼠點擊\n
+        把螢幕座標轉換成地圖格子座標\n
         \n
         參數:\n
         mouse_pos (tuple): 滑鼠座標 (x, y)\n
+        \n
+        回傳:\n
+        tuple: 格子座標 (x, y)，不在地圖上時回傳 None\n
         """
         mouse_x, mouse_y = mouse_pos
         
@@ -197,20 +207,83 @@ class TerrainMapEditor:
         if (mouse_x < self.map_offset_x or 
             mouse_x >= self.panel_x or
             mouse_y < self.map_offset_y):
-            return
+            return None
             
         # 轉換螢幕座標為地圖格子座標
         map_x = (mouse_x - self.map_offset_x) // self.tile_size
         map_y = (mouse_y - self.map_offset_y) // self.tile_size
+        if 0 <= map_x < self.map_loader.map_width and 0 <= map_y < self.map_loader.map_height:
+            return map_x, map_y
+        return None
+    
+    def _begin_tool(self, mouse_pos: tuple):
+        """
+        左鍵按下時依照目前工具開始操作\n
+        \n
+        參數:\n
+        mouse_pos (tuple): 滑鼠座標 (x, y)\n
+        """
+        cell = self._screen_to_cell(mouse_pos)
+        if cell is None:
+            return
+        
+        if self.current_tool == "brush":
+            # 一次按下到放開之間的筆刷合併成一筆紀錄
+            self.is_painting = True
+            self.edit_session.begin_stroke()
+            self._handle_map_click(mouse_pos)
+        elif self.current_tool == "fill":
+            changed = self.edit_session.flood_fill(cell[0], cell[1], self.selected_terrain)
+            if changed:
+                print(f"區域填色({cell[0]},{cell[1]})：{changed} 格改為{self.map_loader.get_terrain_name(self.selected_terrain)}")
+                self._mark_edited()
+        elif self.current_tool == "rect":
+            self.rect_start = cell
+    
+    def _end_tool(self, mouse_pos: tuple):
+        """
+        左鍵放開時結束目前工具的操作\n
+        \n
+        參數:\n
+        mouse_pos (tuple): 滑鼠座標 (x, y)\n
+        """
+        if self.is_painting:
+            self.is_painting = False
+            self.edit_session.end_stroke()
+        
+        if self.rect_start is not None:
+            cell = self._screen_to_cell(mouse_pos)
+            if cell is not None:
+                start_x, start_y = self.rect_start
+                changed = self.edit_session.fill_rect(start_x, start_y, cell[0], cell[1], self.selected_terrain)
+                if changed:
+                    print(f"矩形({start_x},{start_y})-({cell[0]},{cell[1]})：{changed} 格改為{self.map_loader.get_terrain_name(self.selected_terrain)}")
+                    self._mark_edited()
+            self.rect_start = None
+    
+    def _mark_edited(self):
+        """
+        標記地圖有未儲存的變更\n
+        """
+        self.has_unsaved_changes = True  # 標記有未儲存的變更
+        self.current_file_info = "編輯版本 (有未儲存變更)"
+    
+    def _handle_map_click(self, mouse_pos: tuple):
+        """
+        處理地圖區域的滑鼠點擊（筆刷）\n
+        \n
+        參數:\n
+        mouse_pos (tuple): 滑鼠座標 (x, y)\n
+        """
+        cell = self._screen_to_cell(mouse_pos)
+        if cell is None:
+            return
+        map_x, map_y = cell
         
-        # 檢查是否真的改變了地形
-        current_terrain = self.map_loader.get_terrain_at(map_x, map_y)
-        if current_terrain != self.selected_terrain:
-            # 設定地形類型
-            if self.map_loader.set_terrain_at(map_x, map_y, self.selected_terrain):
-                print(f"設定座標({map_x},{map_y})為{self.map_loader.get_terrain_name(self.selected_terrain)}")
-                self.has_unsaved_changes = True  # 標記有未儲存的變更
-                self.current_file_info = "編輯版本 (有未儲存變更)"
+        # 只有地形真的改變時才記錄
+        if self.edit_session.paint(map_x, map_y, self.selected_terrain):
+            print(f"設定座標({map_x},{map_y})為{self.map_loader.get_terrain_name(self.selected_terrain)}")
+            self._mark_edited()
     
     def _handle_keyboard(self, key):
         """
@@ -219,6 +292,25 @@ class TerrainMapEditor:
         參數:\n
         key: pygame鍵盤事件鍵值\n
         """
+        # Ctrl+Z 復原、Ctrl+Y 重做
+        if pygame.key.get_mods() & pygame.KMOD_CTRL:
+            if key == pygame.K_z:
+                if self.edit_session.undo():
+                    print("復原上一步")
+                    self._mark_edited()
+            elif key == pygame.K_y:
+                if self.edit_session.redo():
+                    print("重做上一步")
+                    self._mark_edited()
+            return
+        
+        # 工具選擇：B 筆刷、G 油漆桶、X 矩形
+        tools = {pygame.K_b: ("brush", "筆刷"), pygame.K_g: ("fill", "油漆桶"), pygame.K_x: ("rect", "矩形")}
+        if key in tools:
+            self.current_tool, tool_name = tools[key]
+            print(f"選擇工具：{tool_name}")
+            return
+        
         # 數字鍵0-9選擇地形類型
         if pygame.K_0 <= key <= pygame.K_9:
             terrain_code = key - pygame.K_0
@@ -252,7 +344,7 @@ class TerrainMapEditor:
         始終儲存至編輯版本檔案，保持編輯連續性\n
         """
         file_path = "config/cupertino_map_edited.csv"
-        if self.map_loader.save_to_csv(file_path):
+        if self.edit_session.save(file_path):
             print(f"地圖已儲存至：{file_path}")
             print("下次開啟編輯器時將自動載入此版本")
             self.has_unsaved_changes = False  # 清除未儲存變更標記
@@ -280,28 +372,27 @@ class TerrainMapEditor:
     def _draw_map(self):
         """
         繪製地圖網格\n
+        地圖畫在快取表面上，每幀只重畫編輯過的格子\n
         """
         if not self.map_loader.map_data:
             return
-            
-        # 繪製每個地形格子
-        for y in range(self.map_loader.map_height):
-            for x in range(self.map_loader.map_width):
-                terrain_code = self.map_loader.get_terrain_at(x, y)
-                if terrain_code is not None:
-                    color = self.map_loader.get_terrain_color(terrain_code)
-                    
-                    # 計算繪製位置
-                    rect_x = self.map_offset_x + x * self.tile_size
-                    rect_y = self.map_offset_y + y * self.tile_size
-                    
-                    # 繪製地形格子
-                    rect = pygame.Rect(rect_x, rect_y, self.tile_size, self.tile_size)
-                    pygame.draw.rect(self.screen, color, rect)
-                    
-                    # 繪製格子邊框（當瓦片夠大時）
-                    if self.tile_size >= 10:
-                        pygame.draw.rect(self.screen, (128, 128, 128), rect, 1)
+        
+        dirty_cells, full_redraw = self.edit_session.consume_dirty()
+        self.map_surface.draw(self.screen, self.map_offset_x, self.map_offset_y, self.tile_size,
+                              dirty_cells, full_redraw)
+        
+        # 矩形工具拖曳中：顯示預覽框
+        if self.rect_start is not None:
+            cell = self._screen_to_cell(pygame.mouse.get_pos())
+            if cell is not None:
+                left = min(self.rect_start[0], cell[0])
+                top = min(self.rect_start[1], cell[1])
+                width = abs(cell[0] - self.rect_start[0]) + 1
+                height = abs(cell[1] - self.rect_start[1]) + 1
+                preview_rect = pygame.Rect(self.map_offset_x + left * self.tile_size,
+                                           self.map_offset_y + top * self.tile_size,
+                                           width * self.tile_size, height * self.tile_size)
+                pygame.draw.rect(self.screen, (255, 255, 0), preview_rect, 2)
     
     def _draw_tool_panel(self):
         """
@@ -348,6 +439,12 @@ class TerrainMapEditor:
         
         name_text = self.font_manager.render_text(f"{self.selected_terrain}: {terrain_name}", 18, (255, 255, 255))
         self.screen.blit(name_text, (self.panel_x + 35, y_offset + 2))
+        y_offset += 22
+        
+        # 當前工具
+        tool_names = {"brush": "筆刷", "fill": "油漆桶", "rect": "矩形"}
+        tool_text = self.font_manager.render_text(f"工具: {tool_names[self.current_tool]}", 18, (255, 255, 255))
+        self.screen.blit(tool_text, (self.panel_x + 10, y_offset + 2))
         y_offset += 40
         
         # 地形選項
@@ -395,6 +492,8 @@ class TerrainMapEditor:
         instructions = [
             "左鍵: 繪製地形",
             "0-9: 選擇地形",
+            "B/G/X: 筆刷/油漆桶/矩形",
+            "Ctrl+Z/Y: 復原/重做",
             "R: 選擇鐵軌",
             "T: 選擇火車站",
             "S: 儲存地圖",
@@ -10,6 +10,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.join(current_dir, '..', '..')
 sys.path.insert(0, project_root)
 
+from src.utils.terrain_store import TerrainStore
+
 try:
     from src.utils.font_manager import get_font_manager, init_font_system
 except ImportError:
@@ -25,10 +27,12 @@ class TerrainMapLoader:
     地形地圖載入器 - 從CSV檔案載入地形數據並轉換為遊戲可用的格式\n
     \n
     此類別負責：\n
-    1. 讀取CSV格式的地形文件\n
+    1. 讀取CSV格式或 .terrain 區塊檔案格式的地形文件\n
     2. 將數字編碼轉換為地形類型\n
     3. 提供地形查詢和渲染支援\n
     4. 支援地形編輯和儲存功能\n
+    \n
+    地形資料存放在 TerrainStore (self.store)，map_data 是它的 [y][x] 相容檢視\n
     """
     
     def __init__(self):
@@ -70,9 +74,38 @@ class TerrainMapLoader:
         }
         
         # 地圖數據儲存
-        self.map_data: List[List[int]] = []
+        self.store: Optional[TerrainStore] = None
+        self._rows = []
         self.map_width: int = 0
         self.map_height: int = 0
+
+    @property
+    def map_data(self):
+        """
+        地圖數據的 [y][x] 檢視（TerrainRows），尚未載入時為空列表\n
+        """
+        return self._rows
+
+    @map_data.setter
+    def map_data(self, rows):
+        """
+        以二維列表設定地圖數據（轉存為 TerrainStore）\n
+        """
+        self.set_store(TerrainStore.from_rows(rows) if rows else None)
+
+    def set_store(self, store: Optional[TerrainStore]) -> None:
+        """
+        改用指定的地形儲存，並更新地圖尺寸\n
+        \n
+        參數:\n
+        store (TerrainStore): 地形儲存，None 表示清空\n
+        """
+        if self.store is not None and self.store is not store:
+            self.store.close()
+        self.store = store
+        self._rows = store.rows_view() if store else []
+        self.map_width = store.width if store else 0
+        self.map_height = store.height if store else 0
         
     def load_from_csv(self, file_path: str) -> bool:
         """
@@ -87,19 +120,18 @@ class TerrainMapLoader:
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 csv_reader = csv.reader(file)
-                self.map_data = []
+                rows = []
                 
                 # 逐行讀取CSV數據
                 for row in csv_reader:
                     # 將字串轉換為整數列表
                     terrain_row = [int(cell.strip()) for cell in row if cell.strip()]
                     if terrain_row:  # 只加入非空白行
-                        self.map_data.append(terrain_row)
+                        rows.append(terrain_row)
                 
-                # 更新地圖尺寸資訊
-                if self.map_data:
-                    self.map_height = len(self.map_data)
-                    self.map_width = len(self.map_data[0]) if self.map_data[0] else 0
+                # 轉存為區塊式地形儲存並更新地圖尺寸資訊
+                if rows:
+                    self.set_store(TerrainStore.from_rows(rows))
                     print(f"地圖載入成功：{self.map_width}x{self.map_height}")
                     return True
                 else:
@@ -116,6 +148,64 @@ class TerrainMapLoader:
             print(f"載入地圖時發生未知錯誤：{e}")
             return False
     
+    def load_from_store(self, file_path: str, writable: bool = False, copy_on_write: bool = False) -> bool:
+        """
+        以記憶體對應 (mmap) 開啟 .terrain 區塊檔案，不需要解析文字\n
+        \n
+        參數:\n
+        file_path (str): .terrain 檔案路徑\n
+        writable (bool): 是否允許修改直接寫回檔案\n
+        copy_on_write (bool): 允許修改但只改記憶體中的副本，儲存時才寫回\n
+        \n
+        回傳:\n
+        bool: 載入成功回傳True，失敗回傳False\n
+        """
+        try:
+            self.set_store(TerrainStore.open(file_path, writable, copy_on_write))
+        except FileNotFoundError:
+            print(f"錯誤：找不到檔案 {file_path}")
+            return False
+        except (ValueError, OSError) as e:
+            print(f"載入地圖時發生錯誤：{e}")
+            return False
+        print(f"地圖載入成功：{self.map_width}x{self.map_height}（區塊檔案）")
+        return True
+
+    def load_map(self, file_path: str, editable: bool = False) -> bool:
+        """
+        依副檔名載入地圖：.terrain 使用區塊檔案，其他視為CSV\n
+        \n
+        參數:\n
+        file_path (str): 地圖檔案路徑\n
+        editable (bool): 是否會修改地圖（.terrain 檔案以寫入時複製開啟，儲存時才寫回）\n
+        \n
+        回傳:\n
+        bool: 載入成功回傳True，失敗回傳False\n
+        """
+        if file_path.endswith(".terrain"):
+            return self.load_from_store(file_path, copy_on_write=editable)
+        return self.load_from_csv(file_path)
+
+    def save_to_store(self, file_path: str) -> bool:
+        """
+        將當前地圖儲存為 .terrain 區塊檔案\n
+        \n
+        參數:\n
+        file_path (str): 要儲存的檔案路徑\n
+        \n
+        回傳:\n
+        bool: 儲存成功回傳True，失敗回傳False\n
+        """
+        if self.store is None:
+            return False
+        try:
+            self.store.save(file_path)
+            print(f"地圖儲存成功：{file_path}")
+            return True
+        except OSError as e:
+            print(f"儲存地圖時發生錯誤：{e}")
+            return False
+
     def save_to_csv(self, file_path: str) -> bool:
         """
         將當前地圖數據儲存為CSV檔案\n
@@ -129,7 +219,7 @@ class TerrainMapLoader:
         try:
             with open(file_path, 'w', newline='', encoding='utf-8') as file:
                 csv_writer = csv.writer(file)
-                for row in self.map_data:
+                for row in self.store.iter_rows():
                     csv_writer.writerow(row)
             print(f"地圖儲存成功：{file_path}")
             return True
@@ -148,10 +238,10 @@ class TerrainMapLoader:
         回傳:\n
         Optional[int]: 地形編碼，超出範圍回傳None\n
         """
-        # 檢查座標是否在有效範圍內
-        if 0 <= y < self.map_height and 0 <= x < self.map_width:
-            return self.map_data[y][x]
-        return None
+        # 超出範圍時地形儲存回傳None
+        if self.store is None:
+            return None
+        return self.store.get_terrain_at(x, y)
     
     def set_terrain_at(self, x: int, y: int, terrain_code: int) -> bool:
         """
@@ -165,12 +255,10 @@ class TerrainMapLoader:
         回傳:\n
         bool: 設定成功回傳True，失敗回傳False\n
         """
-        # 檢查座標和編碼是否有效
-        if (0 <= y < self.map_height and 0 <= x < self.map_width and 
-            terrain_code in self.terrain_types):
-            self.map_data[y][x] = terrain_code
-            return True
-        return False
+        # 檢查編碼是否有效，座標範圍由地形儲存檢查
+        if self.store is None or terrain_code not in self.terrain_types:
+            return False
+        return self.store.set_terrain_at(x, y, terrain_code)
     
     def get_terrain_name(self, terrain_code: int) -> str:
         """
@@ -267,12 +355,15 @@ class TerrainMapLoader:
         if not self.map_data:
             return {"width": 0, "height": 0, "terrain_count": {}}
         
-        # 統計各種地形的數量
+        # 統計各種地形的數量（逐列整批計數）
+        code_count = {}
+        for row in self.store.iter_rows():
+            for terrain_code in set(row):
+                code_count[terrain_code] = code_count.get(terrain_code, 0) + row.count(terrain_code)
         terrain_count = {}
-        for row in self.map_data:
-            for terrain_code in row:
-                terrain_name = self.get_terrain_name(terrain_code)
-                terrain_count[terrain_name] = terrain_count.get(terrain_name, 0) + 1
+        for terrain_code, count in code_count.items():
+            terrain_name = self.get_terrain_name(terrain_code)
+            terrain_count[terrain_name] = terrain_count.get(terrain_name, 0) + count
         
         return {
             "width": self.map_width,
@@ -0,0 +1,587 @@
+######################載入套件######################
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, List, Optional
+
+# 地形檔案格式：檔頭 + 依區塊排列的 uint8 地形編碼
+# 檔頭: 魔術字 "CTRN"、版本、區塊邊長的位移量、地圖寬、地圖高，之後補零到一個記憶體分頁
+TERRAIN_FILE_MAGIC = b"CTRN"
+TERRAIN_FILE_VERSION = 1
+TERRAIN_HEADER_FORMAT = "<4sHHII"
+TERRAIN_HEADER_SIZE = mmap.PAGESIZE
+
+# 預設區塊邊長 64 格（64x64 = 4096 bytes，剛好一個記憶體分頁）
+DEFAULT_CHUNK_SHIFT = 6
+
+# 變更紀錄最多保留的格子數，超過時只保留版本號
+MAX_CHANGE_LOG = 4096
+
+
+######################區塊式地形儲存######################
+class TerrainStore:
+    """
+    區塊式地形儲存 - 每格一個 byte 的地形編碼，依固定大小的區塊排列\n
+    \n
+    同一個區塊的格子在記憶體中連續存放，讀取玩家附近的一片區域只會碰到少數幾個區塊\n
+    資料可以放在記憶體 (bytearray) 或以 mmap 對應到 .terrain 檔案：\n
+    檔案模式下作業系統只會把用到的區塊讀進記憶體，2000x2000 的地圖只佔 4MB 檔案，\n
+    開啟時不需要解析任何文字\n
+    \n
+    主要功能:\n
+    1. get_terrain_at / set_terrain_at: 單格讀寫\n
+    2. read_row / read_region / iter_rows: 整批讀取（回傳 bytes，每個元素就是地形編碼）\n
+    3. fill_region / write_region: 整批寫入\n
+    4. page_in: 預先載入某個中心點附近的區塊，釋放遠處的區塊\n
+    5. revision / changes_since: 變更版本號和最近的變更紀錄，讓快取判斷是否需要更新\n
+    """
+
+    def __init__(self, width: int, height: int, buffer=None, chunk_shift: int = DEFAULT_CHUNK_SHIFT,
+                 data_offset: int = 0, file_handle=None, path: Optional[str] = None):
+        """
+        初始化地形儲存（一般透過 create / open / from_rows 建立）\n
+        \n
+        參數:\n
+        width (int): 地圖寬度（格數）\n
+        height (int): 地圖高度（格數）\n
+        buffer (bytearray | mmap.mmap): 地形資料緩衝區，None 表示建立新的記憶體緩衝區\n
+        chunk_shift (int): 區塊邊長的位移量（邊長 = 2 ** chunk_shift）\n
+        data_offset (int): 地形資料在緩衝區中的起始位置\n
+        file_handle: mmap 對應的檔案物件\n
+        path (str): 檔案路徑\n
+        """
+        self.width = width
+        self.height = height
+        self.chunk_shift = chunk_shift
+        self.chunk_size = 1 << chunk_shift
+        self._chunk_mask = self.chunk_size - 1
+        self._chunk_bytes = self.chunk_size * self.chunk_size
+        self.chunks_x = (width + self.chunk_size - 1) >> chunk_shift
+        self.chunks_y = (height + self.chunk_size - 1) >> chunk_shift
+
+        self._offset = data_offset
+        if buffer is None:
+            buffer = bytearray(self.chunks_x * self.chunks_y * self._chunk_bytes)
+        self._buffer = buffer
+        self._file = file_handle
+        self.path = path
+        self.is_mapped = isinstance(buffer, mmap.mmap)
+        self.copy_on_write = False  # mmap 以 ACCESS_COPY 開啟，修改不會自動寫回檔案
+
+        # 變更追蹤
+        self.revision = 0
+        self._change_log = []  # (版本號, x, y)
+        self._log_start_revision = 0
+
+        # 分頁狀態
+        self.resident_chunks = set()
+        self.page_in_count = 0
+        self.page_out_count = 0
+
+    ######################建立與開啟######################
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int]], chunk_shift: int = DEFAULT_CHUNK_SHIFT) -> "TerrainStore":
+        """
+        以二維列表建立記憶體中的地形儲存\n
+        \n
+        參數:\n
+        rows (iterable): 每列的地形編碼\n
+        chunk_shift (int): 區塊邊長的位移量\n
+        \n
+        回傳:\n
+        TerrainStore: 地形儲存\n
+        """
+        rows = [bytes(row) for row in rows]
+        height = len(rows)
+        width = len(rows[0]) if rows else 0
+        store = cls(width, height, chunk_shift=chunk_shift)
+        for y, row in enumerate(rows):
+            store._write_row(0, y, row[:width])
+        return store
+
+    @classmethod
+    def create(cls, path: str, width: int, height: int, fill: int = 0,
+               chunk_shift: int = DEFAULT_CHUNK_SHIFT) -> "TerrainStore":
+        """
+        建立新的 .terrain 檔案並以 mmap 開啟\n
+        \n
+        參數:\n
+        path (str): 檔案路徑\n
+        width (int): 地圖寬度（格數）\n
+        height (int): 地圖高度（格數）\n
+        fill (int): 初始地形編碼\n
+        chunk_shift (int): 區塊邊長的位移量\n
+        \n
+        回傳:\n
+        TerrainStore: 地形儲存\n
+        """
+        chunk_size = 1 << chunk_shift
+        chunks_x = (width + chunk_size - 1) >> chunk_shift
+        chunks_y = (height + chunk_size - 1) >> chunk_shift
+        data_size = chunks_x * chunks_y * chunk_size * chunk_size
+
+        header = struct.pack(TERRAIN_HEADER_FORMAT, TERRAIN_FILE_MAGIC, TERRAIN_FILE_VERSION,
+                             chunk_shift, width, height)
+        with open(path, "wb") as file:
+            file.write(header.ljust(TERRAIN_HEADER_SIZE, b"\0"))
+            if fill:
+                block = bytes([fill]) * chunk_size * chunk_size
+                for _ in range(chunks_x * chunks_y):
+                    file.write(block)
+            else:
+                file.truncate(TERRAIN_HEADER_SIZE + data_size)
+
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False, copy_on_write: bool = False) -> "TerrainStore":
+        """
+        以 mmap 開啟 .terrain 檔案（不會一次讀入整個檔案）\n
+        \n
+        參數:\n
+        path (str): 檔案路徑\n
+        writable (bool): 是否允許寫入（寫入會直接反映到檔案）\n
+        copy_on_write (bool): 允許寫入但只改記憶體中的副本，要呼叫 save() 才會寫回檔案\n
+        \n
+        回傳:\n
+        TerrainStore: 地形儲存\n
+        """
+        file = open(path, "r+b" if writable else "rb")
+        try:
+            header = file.read(struct.calcsize(TERRAIN_HEADER_FORMAT))
+            magic, version, chunk_shift, width, height = struct.unpack(TERRAIN_HEADER_FORMAT, header)
+            if magic != TERRAIN_FILE_MAGIC or version != TERRAIN_FILE_VERSION:
+                raise ValueError(f"不是有效的地形檔案：{path}")
+            if writable:
+                access = mmap.ACCESS_WRITE
+            elif copy_on_write:
+                access = mmap.ACCESS_COPY
+            else:
+                access = mmap.ACCESS_READ
+            buffer = mmap.mmap(file.fileno(), 0, access=access)
+        except Exception:
+            file.close()
+            raise
+        store = cls(width, height, buffer, chunk_shift, TERRAIN_HEADER_SIZE, file, path)
+        store.copy_on_write = copy_on_write and not writable
+        return store
+
+    def save(self, path: str) -> None:
+        """
+        把地形資料寫成 .terrain 檔案（記憶體模式也可使用）\n
+        \n
+        參數:\n
+        path (str): 檔案路徑\n
+        """
+        same_file = self.is_mapped and self.path and os.path.abspath(path) == os.path.abspath(self.path)
+        if same_file and not self.copy_on_write:
+            self.flush()
+            return
+
+        header = struct.pack(TERRAIN_HEADER_FORMAT, TERRAIN_FILE_MAGIC, TERRAIN_FILE_VERSION,
+                             self.chunk_shift, self.width, self.height)
+        data_size = self.chunks_x * self.chunks_y * self._chunk_bytes
+        # 寫回自己對應的檔案時先寫到暫存檔再替換，避免截斷仍在 mmap 中的檔案
+        target = path + ".tmp" if same_file else path
+        with open(target, "wb") as file:
+            file.write(header.ljust(TERRAIN_HEADER_SIZE, b"\0"))
+            file.write(self._buffer[self._offset:self._offset + data_size])
+        if same_file:
+            os.replace(target, path)
+
+    def flush(self) -> None:
+        """
+        把 mmap 中的修改寫回檔案\n
+        """
+        if self.is_mapped and not self._buffer.closed:
+            self._buffer.flush()
+
+    def close(self) -> None:
+        """
+        關閉 mmap 和檔案\n
+        """
+        if self.is_mapped and not self._buffer.closed:
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    ######################單格讀寫######################
+    def _index(self, x: int, y: int) -> int:
+        """
+        計算格子在緩衝區中的位置（呼叫前需先確認在地圖範圍內）\n
+        """
+        shift = self.chunk_shift
+        mask = self._chunk_mask
+        chunk = (y >> shift) * self.chunks_x + (x >> shift)
+        return self._offset + (chunk << (shift + shift)) + ((y & mask) << shift) + (x & mask)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """
+        檢查格子座標是否在地圖範圍內\n
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_terrain_at(self, x: int, y: int) -> Optional[int]:
+        """
+        獲取指定格子的地形編碼\n
+        \n
+        參數:\n
+        x (int): 格子 X 座標\n
+        y (int): 格子 Y 座標\n
+        \n
+        回傳:\n
+        int: 地形編碼，超出範圍回傳 None\n
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._buffer[self._index(x, y)]
+        return None
+
+    def set_terrain_at(self, x: int, y: int, terrain_code: int) -> bool:
+        """
+        設定指定格子的地形編碼\n
+        \n
+        參數:\n
+        x (int): 格子 X 座標\n
+        y (int): 格子 Y 座標\n
+        terrain_code (int): 地形編碼 (0-255)\n
+        \n
+        回傳:\n
+        bool: 設定成功回傳 True\n
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        index = self._index(x, y)
+        if self._buffer[index] != terrain_code:
+            self._buffer[index] = terrain_code
+            self._record_change(x, y)
+        return True
+
+    ######################整批讀取######################
+    def read_row(self, y: int, x0: int = 0, x1: Optional[int] = None) -> bytes:
+        """
+        讀取一列中 [x0, x1) 範圍的地形編碼\n
+        \n
+        參數:\n
+        y (int): 列索引\n
+        x0 (int): 起始 X（含）\n
+        x1 (int): 結束 X（不含），None 表示到地圖右邊界\n
+        \n
+        回傳:\n
+        bytes: 地形編碼，每個 byte 一格\n
+        """
+        if x1 is None or x1 > self.width:
+            x1 = self.width
+        x0 = max(0, x0)
+        if not (0 <= y < self.height) or x0 >= x1:
+            return b""
+
+        buffer = self._buffer
+        shift = self.chunk_shift
+        parts = []
+        x = x0
+        while x < x1:
+            # 每段讀到區塊右邊界為止
+            run = min(x1, ((x >> shift) + 1) << shift) - x
+            start = self._index(x, y)
+            parts.append(buffer[start:start + run])
+            x += run
+        return b"".join(parts)
+
+    def read_region(self, x: int, y: int, width: int, height: int) -> List[bytes]:
+        """
+        讀取矩形範圍的地形編碼（自動裁切到地圖範圍內）\n
+        \n
+        參數:\n
+        x (int): 左上角 X\n
+        y (int): 左上角 Y\n
+        width (int): 寬度（格數）\n
+        height (int): 高度（格數）\n
+        \n
+        回傳:\n
+        list: 每列一個 bytes，從 max(y, 0) 開始\n
+        """
+        y0 = max(0, y)
+        y1 = min(self.height, y + height)
+        return [self.read_row(row_y, x, x + width) for row_y in range(y0, y1)]
+
+    def iter_rows(self) -> Iterator[bytes]:
+        """
+        逐列讀取整張地圖\n
+        """
+        for y in range(self.height):
+            yield self.read_row(y)
+
+    def count(self, terrain_code: int) -> int:
+        """
+        計算整張地圖中某種地形的格數\n
+        """
+        return sum(row.count(terrain_code) for row in self.iter_rows())
+
+    ######################整批寫入######################
+    def _write_row(self, x: int, y: int, data: bytes) -> None:
+        """
+        直接寫入一列資料（不檢查範圍、不記錄變更）\n
+        """
+        buffer = self._buffer
+        shift = self.chunk_shift
+        end = x + len(data)
+        pos = 0
+        while x < end:
+            run = min(end, ((x >> shift) + 1) << shift) - x
+            start = self._index(x, y)
+            buffer[start:start + run] = data[pos:pos + run]
+            x += run
+            pos += run
+
+    def write_region(self, x: int, y: int, rows: List[bytes]) -> None:
+        """
+        把多列資料寫入以 (x, y) 為左上角的矩形（超出地圖的部分會被裁掉）\n
+        \n
+        參數:\n
+        x (int): 左上角 X\n
+        y (int): 左上角 Y\n
+        rows (list): 每列的地形編碼\n
+        """
+        for row_offset, data in enumerate(rows):
+            row_y = y + row_offset
+            if not 0 <= row_y < self.height:
+                continue
+            data = bytes(data)
+            start_x = x
+            if start_x < 0:
+                data = data[-start_x:]
+                start_x = 0
+            data = data[:max(0, self.width - start_x)]
+            if data:
+                self._write_row(start_x, row_y, data)
+        self._record_region(x, y, max((len(row) for row in rows), default=0), len(rows))
+
+    def fill_region(self, x0: int, y0: int, x1: int, y1: int, terrain_code: int) -> None:
+        """
+        把矩形範圍（含兩個角）填成同一種地形\n
+        \n
+        參數:\n
+        x0, y0 (int): 第一個角\n
+        x1, y1 (int): 對角\n
+        terrain_code (int): 地形編碼\n
+        """
+        x0, x1 = max(0, min(x0, x1)), min(self.width - 1, max(x0, x1))
+        y0, y1 = max(0, min(y0, y1)), min(self.height - 1, max(y0, y1))
+        if x0 > x1 or y0 > y1:
+            return
+        data = bytes([terrain_code]) * (x1 - x0 + 1)
+        for y in range(y0, y1 + 1):
+            self._write_row(x0, y, data)
+        self._record_region(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+
+    ######################變更追蹤######################
+    def _record_change(self, x: int, y: int) -> None:
+        """
+        記錄單格變更\n
+        """
+        self.revision += 1
+        self._change_log.append((self.revision, x, y))
+        if len(self._change_log) > MAX_CHANGE_LOG:
+            self._truncate_log()
+
+    def _record_region(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        記錄矩形範圍變更，範圍太大時只更新版本號\n
+        """
+        if width * height > MAX_CHANGE_LOG // 4:
+            self.revision += 1
+            self._change_log.clear()
+            self._log_start_revision = self.revision
+            return
+        for row_y in range(max(0, y), min(self.height, y + height)):
+            for col_x in range(max(0, x), min(self.width, x + width)):
+                self._record_change(col_x, row_y)
+
+    def _truncate_log(self) -> None:
+        """
+        丟掉較舊的一半變更紀錄\n
+        """
+        drop = len(self._change_log) // 2
+        self._log_start_revision = self._change_log[drop - 1][0]
+        del self._change_log[:drop]
+
+    def changes_since(self, revision: int) -> Optional[List[tuple]]:
+        """
+        取得某個版本之後變更過的格子\n
+        \n
+        參數:\n
+        revision (int): 呼叫端上次看到的版本號\n
+        \n
+        回傳:\n
+        list: 格子座標 (x, y) 列表；紀錄已不完整時回傳 None，呼叫端需整個重建\n
+        """
+        if revision >= self.revision:
+            return []
+        if revision < self._log_start_revision:
+            return None
+        return [(x, y) for change_revision, x, y in self._change_log if change_revision > revision]
+
+    ######################區塊分頁######################
+    def chunks_around(self, center_x: int, center_y: int, radius: int) -> set:
+        """
+        計算以某格為中心、半徑 radius 格範圍內的區塊\n
+        """
+        shift = self.chunk_shift
+        first_x = max(0, (center_x - radius) >> shift)
+        last_x = min(self.chunks_x - 1, (center_x + radius) >> shift)
+        first_y = max(0, (center_y - radius) >> shift)
+        last_y = min(self.chunks_y - 1, (center_y + radius) >> shift)
+        return {
+            (chunk_x, chunk_y)
+            for chunk_y in range(first_y, last_y + 1)
+            for chunk_x in range(first_x, last_x + 1)
+        }
+
+    def page_in(self, centers: Iterable[tuple], radius: int) -> None:
+        """
+        讓指定中心點附近的區塊常駐，其他區塊交還給作業系統\n
+        \n
+        檔案模式下以 madvise 提示作業系統預讀或釋放，記憶體模式只更新常駐集合\n
+        \n
+        參數:\n
+        centers (iterable): 中心格子座標 (x, y) 列表（例如攝影機中心、玩家位置）\n
+        radius (int): 半徑（格數）\n
+        """
+        wanted = set()
+        for center_x, center_y in centers:
+            wanted |= self.chunks_around(int(center_x), int(center_y), radius)
+
+        entering = wanted - self.resident_chunks
+        leaving = self.resident_chunks - wanted
+        if self.is_mapped:
+            for chunk in entering:
+                self._advise_chunk(chunk, getattr(mmap, "MADV_WILLNEED", None))
+            for chunk in leaving:
+                self._advise_chunk(chunk, getattr(mmap, "MADV_DONTNEED", None))
+
+        self.page_in_count += len(entering)
+        self.page_out_count += len(leaving)
+        self.resident_chunks = wanted
+
+    def _advise_chunk(self, chunk: tuple, advice: Optional[int]) -> None:
+        """
+        對單一區塊發出 madvise 提示（平台不支援時略過）\n
+        """
+        if advice is None or not hasattr(self._buffer, "madvise"):
+            return
+        chunk_x, chunk_y = chunk
+        start = self._offset + (chunk_y * self.chunks_x + chunk_x) * self._chunk_bytes
+        aligned = start - start % mmap.PAGESIZE
+        try:
+            self._buffer.madvise(advice, aligned, self._chunk_bytes + start - aligned)
+        except (OSError, ValueError):
+            pass
+
+    ######################相容介面######################
+    def to_rows(self) -> List[List[int]]:
+        """
+        轉成二維列表（只建議小地圖使用）\n
+        """
+        return [list(row) for row in self.iter_rows()]
+
+    def rows_view(self) -> "TerrainRows":
+        """
+        取得可以用 rows[y][x] 存取的檢視\n
+        """
+        return TerrainRows(self)
+
+    def get_statistics(self) -> dict:
+        """
+        獲取地形儲存統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "width": self.width,
+            "height": self.height,
+            "chunk_size": self.chunk_size,
+            "chunks": self.chunks_x * self.chunks_y,
+            "bytes": self.chunks_x * self.chunks_y * self._chunk_bytes,
+            "memory_mapped": self.is_mapped,
+            "resident_chunks": len(self.resident_chunks),
+            "page_ins": self.page_in_count,
+            "page_outs": self.page_out_count,
+            "revision": self.revision,
+        }
+
+
+######################列檢視######################
+class TerrainRowView:
+    """
+    地形列檢視 - 讓舊程式碼可以繼續用 map_data[y][x] 讀寫\n
+    \n
+    單格存取會轉成 get_terrain_at / set_terrain_at，迭代和切片一次讀出整列\n
+    效能敏感的程式碼應直接使用 TerrainStore 的整批讀取\n
+    """
+
+    __slots__ = ("store", "y")
+
+    def __init__(self, store: TerrainStore, y: int):
+        self.store = store
+        self.y = y
+
+    def __len__(self):
+        return self.store.width
+
+    def __iter__(self):
+        return iter(self.store.read_row(self.y))
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return list(self.store.read_row(self.y)[x])
+        if x < 0:
+            x += self.store.width
+        value = self.store.get_terrain_at(x, self.y)
+        if value is None:
+            raise IndexError("地形列索引超出範圍")
+        return value
+
+    def __setitem__(self, x, value):
+        if isinstance(x, slice):
+            start, stop, step = x.indices(self.store.width)
+            values = bytes(value)
+            if step != 1 or len(values) != stop - start:
+                raise ValueError("地形列只支援等長的連續切片寫入")
+            self.store.write_region(start, self.y, [values])
+            return
+        if x < 0:
+            x += self.store.width
+        if not self.store.set_terrain_at(x, self.y, value):
+            raise IndexError("地形列索引超出範圍")
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"TerrainRowView(y={self.y}, {list(self)!r})"
+
+
+class TerrainRows:
+    """
+    地形列集合檢視 - 提供 len()、rows[y]、迭代等二維列表介面\n
+    """
+
+    __slots__ = ("store", "_rows")
+
+    def __init__(self, store: TerrainStore):
+        self.store = store
+        self._rows = [TerrainRowView(store, y) for y in range(store.height)]
+
+    def __len__(self):
+        return self.store.height
+
+    def __bool__(self):
+        return self.store.height > 0
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, y):
+        return self._rows[y]
@@ -0,0 +1,130 @@
+######################載入套件######################
+import pygame
+from src.utils.asset_manager import get_asset_manager
+
+
+######################材質圖集######################
+class TextureAtlas:
+    """
+    材質圖集 - 從一張圖集 (sprite sheet) 切出具名的子區域\n
+    \n
+    圖集只透過資源管理器載入一次，每個區域依照要求的尺寸縮放後快取\n
+    所有使用同一區域、同一尺寸的物件共用同一張 Surface\n
+    \n
+    區域以格子座標定義 (col, row, 寬格數, 高格數)，\n
+    根據 tile_size 和 spacing 換算成像素矩形\n
+    """
+
+    def __init__(self, sheet_path, tile_size=16, spacing=0, colorkey=None, regions=None):
+        """
+        初始化材質圖集\n
+        \n
+        參數:\n
+        sheet_path (str): 圖集檔案路徑\n
+        tile_size (int): 每格的像素大小\n
+        spacing (int): 格子之間的間隔像素\n
+        colorkey (tuple): 透明色，None 表示不處理\n
+        regions (dict): 名稱 -> (col, row, 寬格數, 高格數)\n
+        """
+        self.sheet_path = sheet_path
+        self.tile_size = tile_size
+        self.spacing = spacing
+        self.colorkey = colorkey
+
+        self._regions = {}  # 名稱 -> pygame.Rect（像素座標）
+        self._cache = {}  # (名稱, 尺寸) -> Surface
+
+        for name, tiles in (regions or {}).items():
+            self.define_tiles(name, *tiles)
+
+    def define(self, name, rect):
+        """
+        以像素矩形定義區域\n
+        \n
+        參數:\n
+        name (str): 區域名稱\n
+        rect (tuple): (x, y, width, height)\n
+        """
+        self._regions[name] = pygame.Rect(rect)
+        self._drop_cached(name)
+
+    def define_tiles(self, name, col, row, cols=1, rows=1):
+        """
+        以格子座標定義區域\n
+        \n
+        參數:\n
+        name (str): 區域名稱\n
+        col (int): 起始欄\n
+        row (int): 起始列\n
+        cols (int): 寬度格數\n
+        rows (int): 高度格數\n
+        """
+        stride = self.tile_size + self.spacing
+        self.define(name, (
+            col * stride,
+            row * stride,
+            cols * stride - self.spacing,
+            rows * stride - self.spacing,
+        ))
+
+    def has_region(self, name):
+        """
+        檢查區域是否已定義\n
+        """
+        return name in self._regions
+
+    def get(self, name, size=None):
+        """
+        取得區域圖片（縮放結果會快取並共用）\n
+        \n
+        參數:\n
+        name (str): 區域名稱\n
+        size (tuple): 目標尺寸 (width, height)，None 表示原始尺寸\n
+        \n
+        回傳:\n
+        pygame.Surface: 區域圖片，圖集不存在或區域未定義時回傳 None\n
+        """
+        key = (name, size)
+        image = self._cache.get(key)
+        if image is not None:
+            return image
+
+        rect = self._regions.get(name)
+        if rect is None:
+            return None
+
+        sheet = get_asset_manager().get_image(self.sheet_path)
+        if sheet is None:
+            return None
+
+        # 複製子區域後再縮放，不影響圖集本身
+        image = sheet.subsurface(rect).copy()
+        if size is not None and size != rect.size:
+            image = pygame.transform.scale(image, size)
+        if self.colorkey is not None:
+            image.set_colorkey(self.colorkey)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+
+        self._cache[key] = image
+        return image
+
+    def _drop_cached(self, name):
+        """
+        移除指定區域的所有快取尺寸\n
+        """
+        for key in [key for key in self._cache if key[0] == name]:
+            del self._cache[key]
+
+    def get_statistics(self):
+        """
+        獲取圖集統計資訊\n
+        \n
+        回傳:\n
+        dict: 統計資訊\n
+        """
+        return {
+            "sheet": self.sheet_path,
+            "regions": len(self._regions),
+            "cached_images": len(self._cache),
+        }
@@ -0,0 +1,44 @@
+######################載入套件######################
+import threading
+import pygame
+from src.utils.asset_manager import AssetManager
+
+
+######################背景預載入######################
+def _make_images(tmp_path, count):
+    """
+    建立測試用的圖片檔案\n
+    """
+    paths = []
+    for i in range(count):
+        path = str(tmp_path / f"image_{i}.png")
+        pygame.image.save(pygame.Surface((4, 4)), path)
+        paths.append(path)
+    return paths
+
+
+def test_main_thread_waits_for_in_flight_preload(tmp_path):
+    paths = _make_images(tmp_path, 1)
+    manager = AssetManager()
+    started = threading.Event()
+    release = threading.Event()
+    load_from_disk = manager._load_from_disk
+
+    def slow_load(path):
+        started.set()
+        release.wait()
+        return load_from_disk(path)
+
+    manager._load_from_disk = slow_load
+    manager.preload(paths)
+    started.wait()
+
+    # 背景執行緒正在讀取時主執行緒要同一張圖
+    threading.Timer(0.05, release.set).start()
+    image = manager.get_image(paths[0])
+    manager.wait_for_preload()
+
+    assert image is not None
+    assert manager.disk_loads == 1
+    assert manager.get_statistics()["pending_preload"] == 0
+
@@ -0,0 +1,126 @@
+######################載入套件######################
+from types import SimpleNamespace
+import pytest
+from src.core.game_clock import get_game_clock
+from src.systems.audio_zone_system import AudioZoneMap, AudioZoneController
+from src.systems.music_system import MusicType
+from src.utils.terrain_map_loader import TerrainMapLoader
+
+MAP_PATH = "config/cupertino_map_edited.csv"
+TILE_SIZE = 40
+STEP_PIXELS = 4  # 玩家每個模擬步移動的距離
+STEP_TIME = 1 / 60
+
+
+######################測試工具######################
+class RecordingMusicManager:
+    """
+    記錄音樂切換的音樂管理器\n
+    """
+
+    def __init__(self):
+        self.music = None
+        self.ambient = False
+        self.crossfades = []
+
+    def crossfade_to(self, music_type):
+        if music_type != self.music:
+            self.crossfades.append(music_type)
+        self.music = music_type
+
+    def set_grassland_ambient(self, enabled):
+        self.ambient = enabled
+
+    def preload_music(self, music_type):
+        pass
+
+
+@pytest.fixture(scope="module")
+def zone_map():
+    loader = TerrainMapLoader()
+    assert loader.load_from_csv(MAP_PATH)
+    terrain_system = SimpleNamespace(
+        map_width=loader.map_width,
+        map_height=loader.map_height,
+        tile_size=TILE_SIZE,
+        terrain_store=loader.store,
+    )
+    return AudioZoneMap(terrain_system)
+
+
+@pytest.fixture
+def clock():
+    game_clock = get_game_clock()
+    game_clock.use_simulated_time()
+    yield game_clock
+    game_clock.use_real_time()
+
+
+def _tile_center(tile_x, tile_y):
+    return (tile_x * TILE_SIZE + TILE_SIZE / 2, tile_y * TILE_SIZE + TILE_SIZE / 2)
+
+
+def _walk(controller, clock, start_tile, end_tile):
+    """
+    讓玩家以固定速度從一格的中心直線走到另一格的中心\n
+    """
+    start_x, start_y = _tile_center(*start_tile)
+    end_x, end_y = _tile_center(*end_tile)
+    steps = int(max(abs(end_x - start_x), abs(end_y - start_y)) // STEP_PIXELS)
+    for step in range(steps + 1):
+        t = step / steps if steps else 1.0
+        controller.update((start_x + (end_x - start_x) * t, start_y + (end_y - start_y) * t))
+        clock.advance(STEP_TIME)
+
+
+######################窄區域######################
+def test_walking_along_one_tile_town_strip_starts_town_music(zone_map, clock):
+    # 第 62 列 x=34..45 是一格高的住宅區，上下都是草原
+    music_manager = RecordingMusicManager()
+    controller = AudioZoneController(music_manager, zone_map)
+
+    _walk(controller, clock, (32, 62), (32, 62))
+    assert music_manager.music == MusicType.DEFAULT
+    assert music_manager.ambient
+
+    _walk(controller, clock, (32, 62), (44, 62))
+    assert music_manager.music == MusicType.TOWN
+    assert not music_manager.ambient
+
+
+def test_crossing_town_strip_quickly_keeps_current_music(zone_map, clock):
+    music_manager = RecordingMusicManager()
+    controller = AudioZoneController(music_manager, zone_map)
+
+    # 垂直穿過一格高的住宅區再回到草原，來回走也不會反覆切換
+    _walk(controller, clock, (40, 61), (40, 63))
+    _walk(controller, clock, (40, 63), (40, 61))
+
+    assert music_manager.crossfades == [MusicType.DEFAULT]
+    assert music_manager.ambient
+
+
+def test_standing_in_town_strip_starts_town_music(zone_map, clock):
+    music_manager = RecordingMusicManager()
+    controller = AudioZoneController(music_manager, zone_map)
+
+    _walk(controller, clock, (40, 61), (40, 62))
+    for _ in range(int(1.5 / STEP_TIME)):
+        controller.update(_tile_center(40, 62))
+        clock.advance(STEP_TIME)
+
+    assert music_manager.music == MusicType.TOWN
+
+
+def test_grassland_ambient_starts_without_hysteresis(zone_map, clock):
+    # 第 61 列 x=48 是草原東側的空地，x=47 開始是草原（兩邊都是預設音樂）
+    music_manager = RecordingMusicManager()
+    controller = AudioZoneController(music_manager, zone_map)
+
+    _walk(controller, clock, (48, 61), (48, 61))
+    assert not music_manager.ambient
+
+    _walk(controller, clock, (48, 61), (47, 61))
+
+    assert music_manager.crossfades == [MusicType.DEFAULT]
+    assert music_manager.ambient
@@ -0,0 +1,49 @@
+######################載入套件######################
+from types import SimpleNamespace
+from src.systems.npc.npc import NPC, NPCState
+from src.systems.npc.npc_manager import NPCManager
+from src.systems.npc.npc_status_table import NPCStatusTable
+from src.systems.npc.profession import Profession
+
+
+######################NPC 狀態資訊######################
+def _make_power_worker():
+    """
+    建立一個已分配負責區域的電力工人\n
+    """
+    npc = NPC(Profession.RESIDENT, (100, 200))
+    npc.worker_id = f"power_worker_{npc.id}"
+    npc.assign_area((640, 480))
+    return npc
+
+
+def test_assign_area_requires_worker_id():
+    npc = NPC(Profession.RESIDENT, (0, 0))
+    npc.assign_area((640, 480))
+    assert npc.assigned_area is None
+
+
+def test_working_power_worker_status_info():
+    npc = _make_power_worker()
+    npc.state = NPCState.WORKING
+
+    info = npc.get_status_info()
+
+    assert info["current_state"] == NPCState.WORKING.value
+    assert info["current_activity"] == "在區域 (640, 480) 巡查電力設施"
+    assert info["position"] == "(100, 200)"
+
+
+def test_status_list_sorted_by_exact_distance():
+    # 兩個 NPC 在同一個距離分級內，名字排序和距離排序相反
+    far = NPC(Profession.RESIDENT, (45, 0))
+    near = NPC(Profession.RESIDENT, (5, 0))
+    far.name, near.name = "乙", "甲"
+
+    table = NPCStatusTable()
+    table.set_npcs([far, near])
+    manager = SimpleNamespace(status_table=table)
+
+    status_list = NPCManager.get_npc_status_list(manager, (0, 0))
+
+    assert [info["distance"] for info in status_list] == [5, 45]